@@ -72,10 +72,10 @@ CELERYBEAT_CHARACTERS = [
         },
     ),
     (
-        "[Characters] Update Characters (assets, skills, killmails)",
+        "[Characters] Schedule due character refreshes",
         {
-            "task": "eveonline.tasks.characters.update_alliance_characters",
-            "schedule": crontab(minute=37, hour="*/4"),
+            "task": "eveonline.tasks.characters.schedule_character_refreshes",
+            "schedule": crontab(minute="*/5"),
             "options": {"queue": "eveonline"},
         },
     ),
@@ -424,6 +424,14 @@ CELERYBEAT_FEED = [
             "options": {"queue": "celery"},
         },
     ),
+    (
+        "[Feed] Archive old killmails",
+        {
+            "task": "feed.tasks.archive_feed_killmails",
+            "schedule": crontab(minute=45, hour=4),
+            "options": {"queue": "celery"},
+        },
+    ),
     (
         "[Feed] Purge old killmails",
         {
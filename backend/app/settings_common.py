@@ -6,6 +6,10 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # Celery beat
 BROKER_URL = "redis://localhost:6379/1"  # Allianceauth uses 0
 CACHE_URL = "redis://localhost:6379/2"
+# Pub/sub for the live feed stream (feed.live); empty disables it. Off until
+# /api/feed/stream is routed to an ASGI server (app.asgi): app-start.sh
+# serves WSGI, which answers the stream with 503.
+FEED_LIVE_REDIS_URL = ""
 CELERY_IMPORTS = (
     "eveonline.tasks",
     "structures.tasks",
@@ -102,6 +102,7 @@ CACHES = {
         "LOCATION": "test-unique-snowflake",
     }
 }
+FEED_LIVE_REDIS_URL = None
 
 # Always use SQLite for tests - no database permissions needed
 DATABASES = {
@@ -53,6 +53,7 @@ from users.eve_views import eve_mobile_sso_complete
 from subscriptions.router import router as subscription_router
 from notifications.router import router as notifications_router
 from feed.router import router as feed_router
+from feed.views import feed_stream
 from help_tickets.router import router as help_tickets_router
 from creators.router import router as creators_router
 from surveys.router import router as surveys_router
@@ -103,6 +104,7 @@ urlpatterns = [
         eve_mobile_sso_complete,
         name="eve_mobile_sso_complete",
     ),
+    path("api/feed/stream", feed_stream, name="feed_stream"),
     path("api/", api.urls),
     path("admin/login/", discord_login, name="discord_login_override"),
     path(
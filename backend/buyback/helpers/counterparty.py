@@ -5,10 +5,8 @@ from __future__ import annotations
 import logging
 from dataclasses import dataclass
 
-import requests
-
-from eveonline.client import ESI_BASE_URL
 from eveonline.models import EveCharacter, EveCorporation
+from eveonline.universe_names import resolve_universe_names
 
 logger = logging.getLogger(__name__)
 
@@ -43,33 +41,17 @@ def _from_local(entity_id: int) -> Counterparty | None:
 def _from_esi_names(entity_ids: list[int]) -> dict[int, Counterparty]:
     if not entity_ids:
         return {}
-    try:
-        resp = requests.post(
-            f"{ESI_BASE_URL}/universe/names/",
-            json=entity_ids,
-            timeout=30,
-        )
-    except Exception as exc:
-        logger.warning("universe/names failed: %s", exc)
-        return {}
-    if resp.status_code >= 400:
-        logger.warning("universe/names HTTP %s", resp.status_code)
-        return {}
     result: dict[int, Counterparty] = {}
-    for row in resp.json() or []:
-        try:
-            eid = int(row["id"])
-            category = str(row.get("category") or "")
-            name = str(row.get("name") or eid)
-        except (KeyError, TypeError, ValueError):
-            continue
-        if category == "character":
+    for eid, resolved in resolve_universe_names(entity_ids).items():
+        if resolved.category == "character":
             kind = KIND_CHARACTER
-        elif category == "corporation":
+        elif resolved.category == "corporation":
             kind = KIND_CORPORATION
         else:
-            kind = category or ""
-        result[eid] = Counterparty(id=eid, name=name, kind=kind)
+            kind = resolved.category
+        result[eid] = Counterparty(
+            id=eid, name=resolved.name or str(eid), kind=kind
+        )
     return result
 
 
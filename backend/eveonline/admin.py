@@ -21,6 +21,7 @@ from .models import (
     EveCharacterIndustryJob,
     EveCharacterPlanet,
     EveCharacterPlanetOutput,
+    EveCharacterRefreshState,
     EveCorporation,
     EveCorporationBlueprint,
     EveCorporationContract,
@@ -35,6 +36,7 @@ from .models import (
     EveUniverseSchematic,
 )
 from .helpers.characters import user_primary_character
+from .refresh_scheduler import refresh_backlog_summary
 from .tasks import update_corporation
 from groups.helpers import (
     ensure_corporation_groups_for_corp,
@@ -374,6 +376,28 @@ class EveCharacterCloneAdmin(admin.ModelAdmin):
     readonly_fields = ("implants", "total_value_isk")
 
 
+@admin.register(EveCharacterRefreshState)
+class EveCharacterRefreshStateAdmin(admin.ModelAdmin):
+    list_display = (
+        "character",
+        "data_type",
+        "refreshed_at",
+        "due_at",
+        "queued_at",
+        "lag_seconds",
+        "last_error",
+    )
+    list_filter = ("data_type",)
+    search_fields = ("character__character_name",)
+    autocomplete_fields = ("character",)
+    ordering = ("due_at",)
+
+    def changelist_view(self, request, extra_context=None):
+        extra_context = extra_context or {}
+        extra_context["refresh_summary"] = refresh_backlog_summary()
+        return super().changelist_view(request, extra_context=extra_context)
+
+
 class EveCharacterPlanetOutputInline(admin.TabularInline):
     model = EveCharacterPlanetOutput
     extra = 0
@@ -1,5 +1,7 @@
+import hashlib
 import logging
-import requests
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, List
 
 from django.conf import settings
@@ -18,6 +20,13 @@ from eveuniverse.models import (
     EveStation,
 )
 
+from eveonline.response_cache import conditional_get
+from eveonline.token_resolver import (
+    active_character_tokens,
+    valid_access_token,
+)
+from eveonline.transport import esi_transport
+
 logger = logging.getLogger(__name__)
 
 SUCCESS = 0
@@ -31,6 +40,10 @@ ERROR_CALLING_ESI = 906
 ESI_BASE_URL = "https://esi.evetech.net/latest"
 ESI_COMPATIBILITY_DATE = "2026-06-09"
 
+# Region order books (The Forge is ~400 pages) are fetched with a bounded
+# number of requests in flight over one keep-alive session.
+REGION_ORDERS_CONCURRENCY = 8
+
 
 def live_esi_allowed() -> bool:
     """
@@ -103,11 +116,26 @@ class EsiResponse:
     data: any
     response: any
     response_code: int
-
-    def __init__(self, response_code, data=None, response=None):
+    not_modified: bool
+    etag: str | None
+
+    def __init__(
+        self,
+        response_code,
+        data=None,
+        response=None,
+        not_modified=False,
+        etag=None,
+    ):
         self.data = data
         self.response = response
         self.response_code = response_code
+        # True when the data came from the shared response cache (served
+        # under Expires or revalidated by a 304). Any caller of the same
+        # route may have fetched it, so consumers that skip writes compare
+        # etag with the one they stored when they last applied the data.
+        self.not_modified = not_modified
+        self.etag = etag
 
     def success(self):
         """Returns true of the ESI call was successful."""
@@ -173,8 +201,10 @@ class EsiClient:
 
         OpenAPI fleet (and other rate-limited) operations require the Token
         object so django-esi can read ``token.character_id`` for rate buckets.
-        Callers that use raw ``requests`` must pass
+        Callers that go through ``esi_transport()`` must pass
         ``token.valid_access_token()`` in the Authorization header.
+        Inside ``use_character_tokens`` the token comes from that run's
+        CharacterTokens instead of the database.
         """
         if not self.character_id:
             return None, NO_CLIENT_CHAR
@@ -182,12 +212,16 @@ class EsiClient:
         if self.character_esi_suspended:
             return None, CHAR_ESI_SUSPENDED
 
-        token = Token.get_token(self.character_id, required_scopes)
+        tokens = active_character_tokens(self.character_id)
+        if tokens is not None:
+            token = tokens.token_for(required_scopes)
+        else:
+            token = Token.get_token(self.character_id, required_scopes)
         if not token:
             return None, NO_VALID_ESI_TOKEN
 
         try:
-            token.valid_access_token()
+            valid_access_token(token)
             return token, SUCCESS
         except (InvalidGrantError, TokenInvalidError):
             # Import here to avoid circular import (eveonline.models loads client)
@@ -210,6 +244,34 @@ class EsiClient:
     def _bearer_headers(token: Token) -> dict:
         return {"Authorization": f"Bearer {token.valid_access_token()}"}
 
+    def _conditional_esi_get(
+        self, url: str, token: Token, params: dict | None = None
+    ) -> EsiResponse:
+        """
+        GET a raw ESI route through the ETag/Expires response cache.
+
+        The returned EsiResponse has ``not_modified`` set when the body came
+        from the response cache, and ``etag`` set to the body's ETag.
+        """
+        try:
+            resp = conditional_get(
+                url,
+                params=params,
+                headers=self._bearer_headers(token),
+                character_id=self.character_id,
+            )
+        except Exception as e:
+            return EsiResponse(response_code=ERROR_CALLING_ESI, response=e)
+        if resp.status_code >= 400:
+            return EsiResponse(response_code=resp.status_code)
+        return EsiResponse(
+            response_code=SUCCESS,
+            data=resp.data,
+            response=resp,
+            not_modified=resp.not_modified,
+            etag=resp.etag,
+        )
+
     def _operation_results(self, operation, **kwargs) -> EsiResponse:
         # django-esi raises HTTPNotModified on 304 instead of returning the
         # cached body, which surfaces as opaque 906. Default off for sync paths.
@@ -343,19 +405,13 @@ class EsiClient:
         if status > 0:
             return EsiResponse(status)
 
-        operation = esi_provider.client.Skills.GetCharactersCharacterIdSkills(
-            character_id=self.character_id,
-            token=token,
+        response = self._conditional_esi_get(
+            f"{ESI_BASE_URL}/characters/{self.character_id}/skills/", token
         )
-
-        try:
-            data = _esi_to_python(operation.result(use_etag=False))
-            return EsiResponse(
-                data=data["skills"] if data else None,
-                response_code=SUCCESS,
-            )
-        except Exception as e:
-            return EsiResponse(response_code=ERROR_CALLING_ESI, response=e)
+        if response.success():
+            data = response.data
+            response.data = data["skills"] if data else None
+        return response
 
     def get_character_assets(self) -> EsiResponse:
         """Returns the assets of the character this ESI client was created for."""
@@ -416,7 +472,7 @@ class EsiClient:
         url = f"{ESI_BASE_URL}/characters/{self.character_id}/blueprints/"
         headers = self._bearer_headers(token)
         try:
-            resp = requests.get(
+            resp = esi_transport().get(
                 url,
                 params={"page": 1},
                 headers=headers,
@@ -432,7 +488,7 @@ class EsiClient:
 
         for page in range(2, total_pages + 1):
             try:
-                page_resp = requests.get(
+                page_resp = esi_transport().get(
                     url,
                     params={"page": page},
                     headers=headers,
@@ -551,7 +607,7 @@ class EsiClient:
         url = f"{ESI_BASE_URL}/corporations/{corporation_id}/blueprints/"
         headers = self._bearer_headers(token)
         try:
-            resp = requests.get(
+            resp = esi_transport().get(
                 url,
                 params={"page": 1},
                 headers=headers,
@@ -567,7 +623,7 @@ class EsiClient:
 
         for page in range(2, total_pages + 1):
             try:
-                page_resp = requests.get(
+                page_resp = esi_transport().get(
                     url,
                     params={"page": page},
                     headers=headers,
@@ -600,7 +656,7 @@ class EsiClient:
         headers = self._bearer_headers(token)
 
         try:
-            resp = requests.get(
+            resp = esi_transport().get(
                 url,
                 params={**params, "page": 1},
                 headers=headers,
@@ -616,7 +672,7 @@ class EsiClient:
 
         for page in range(2, total_pages + 1):
             try:
-                page_resp = requests.get(
+                page_resp = esi_transport().get(
                     url,
                     params={**params, "page": page},
                     headers=headers,
@@ -647,7 +703,7 @@ class EsiClient:
         url = f"{ESI_BASE_URL}/corporations/{corporation_id}/wallets/{division}/journal/"
         headers = self._bearer_headers(token)
         try:
-            resp = requests.get(
+            resp = esi_transport().get(
                 url,
                 params={"page": page},
                 headers=headers,
@@ -661,49 +717,47 @@ class EsiClient:
         data = resp.json() if resp.content else []
         return EsiResponse(response_code=SUCCESS, data=data)
 
-    def get_corporation_wallet_journal_all_divisions(
-        self, corporation_id: int
-    ) -> EsiResponse:
+    def iter_corporation_wallet_journal_pages(
+        self, corporation_id: int, division: int
+    ):
         """
-        Fetches all wallet journal entries for all divisions (1-7), all pages.
+        Yields one EsiResponse per wallet journal page of one division. ESI
+        returns the newest entries first, so callers can stop iterating once
+        they reach entries they already have. Stops after the last page or
+        after yielding a failed response.
         Requires esi-wallet.read_corporation_wallets.v1.
-        Returns EsiResponse with data = list of (division, entries) or flat list.
         """
         token, status = self._valid_token(
             ["esi-wallet.read_corporation_wallets.v1"]
         )
         if status > 0:
-            return EsiResponse(status)
-
-        all_entries = []
-        for division in range(1, 8):
-            page = 1
-            while True:
-                url = f"{ESI_BASE_URL}/corporations/{corporation_id}/wallets/{division}/journal/"
-                headers = self._bearer_headers(token)
-                try:
-                    resp = requests.get(
-                        url,
-                        params={"page": page},
-                        headers=headers,
-                        timeout=30,
-                    )
-                except Exception as e:
-                    return EsiResponse(
-                        response_code=ERROR_CALLING_ESI, response=e
-                    )
-                if resp.status_code >= 400:
-                    return EsiResponse(response_code=resp.status_code)
-                entries = resp.json() if resp.content else []
-                for e in entries:
-                    e["division"] = division
-                all_entries.extend(entries)
-                total_pages = int(resp.headers.get("X-Pages", 1))
-                if page >= total_pages:
-                    break
-                page += 1
+            yield EsiResponse(status)
+            return
 
-        return EsiResponse(response_code=SUCCESS, data=all_entries)
+        url = f"{ESI_BASE_URL}/corporations/{corporation_id}/wallets/{division}/journal/"
+        headers = self._bearer_headers(token)
+        page = 1
+        while True:
+            try:
+                resp = esi_transport().get(
+                    url,
+                    params={"page": page},
+                    headers=headers,
+                    timeout=30,
+                )
+            except Exception as e:
+                yield EsiResponse(response_code=ERROR_CALLING_ESI, response=e)
+                return
+            if resp.status_code >= 400:
+                yield EsiResponse(response_code=resp.status_code)
+                return
+            entries = resp.json() if resp.content else []
+            for entry in entries:
+                entry["division"] = division
+            yield EsiResponse(response_code=SUCCESS, data=entries)
+            if page >= int(resp.headers.get("X-Pages", 1)):
+                return
+            page += 1
 
     def get_corporation_assets(self, corporation_id: int) -> EsiResponse:
         """
@@ -739,7 +793,7 @@ class EsiClient:
         url = f"{ESI_BASE_URL}/corporations/{corporation_id}/wallets/"
         headers = self._bearer_headers(token)
         try:
-            resp = requests.get(url, headers=headers, timeout=30)
+            resp = esi_transport().get(url, headers=headers, timeout=30)
         except Exception as e:
             return EsiResponse(response_code=ERROR_CALLING_ESI, response=e)
         if resp.status_code >= 400:
@@ -769,7 +823,7 @@ class EsiClient:
             )
             headers = self._bearer_headers(token)
             try:
-                resp = requests.get(url, headers=headers, timeout=30)
+                resp = esi_transport().get(url, headers=headers, timeout=30)
             except Exception as e:
                 return EsiResponse(response_code=ERROR_CALLING_ESI, response=e)
             if resp.status_code >= 400:
@@ -836,7 +890,7 @@ class EsiClient:
         """
         url = f"{ESI_BASE_URL}/markets/{region_id}/history/"
         try:
-            resp = requests.get(
+            resp = esi_transport().get(
                 url,
                 params={"type_id": type_id},
                 timeout=30,
@@ -859,14 +913,51 @@ class EsiClient:
         Returns all market orders in a structure (requires character with
         esi-markets.structure_markets.v1 and docking access to the structure).
         Paginates automatically and returns the full list.
-        Prefer get_structure_market_orders_pages() for large structures to avoid OOM.
+
+        Pages go through the ETag/Expires response cache; ``not_modified``
+        is set when every page came from it, and ``etag`` combines the page
+        ETags (None when a page has none).
         """
-        all_orders = []
-        for page_data in self.get_structure_market_orders_pages(structure_id):
-            if page_data is None:
-                return EsiResponse(response_code=NO_VALID_ESI_TOKEN)
-            all_orders.extend(page_data)
-        return EsiResponse(response_code=SUCCESS, data=all_orders)
+        token, status = self._valid_token(["esi-markets.structure_markets.v1"])
+        if status > 0:
+            return EsiResponse(status)
+
+        url = f"{ESI_BASE_URL}/markets/structures/{structure_id}/"
+        first = self._conditional_esi_get(url, token, params={"page": 1})
+        if not first.success():
+            return first
+        all_orders = list(first.data or [])
+        not_modified = first.not_modified
+        etags = [first.etag]
+        total_pages = int(first.response.headers.get("X-Pages", 1))
+
+        for page in range(2, total_pages + 1):
+            page_resp = self._conditional_esi_get(
+                url, token, params={"page": page}
+            )
+            if not page_resp.success():
+                return page_resp
+            all_orders.extend(page_resp.data or [])
+            not_modified = not_modified and page_resp.not_modified
+            etags.append(page_resp.etag)
+
+        logger.info(
+            "get_structure_market_orders: structure_id=%s pages=%s orders_count=%s not_modified=%s",
+            structure_id,
+            total_pages,
+            len(all_orders),
+            not_modified,
+        )
+        return EsiResponse(
+            response_code=SUCCESS,
+            data=all_orders,
+            not_modified=not_modified,
+            etag=(
+                hashlib.sha1("\n".join(etags).encode()).hexdigest()
+                if all(etags)
+                else None
+            ),
+        )
 
     def get_structure_market_orders_first_page_and_total(
         self, structure_id: int
@@ -882,7 +973,7 @@ class EsiClient:
 
         url = f"{ESI_BASE_URL}/markets/structures/{structure_id}/"
         try:
-            resp = requests.get(
+            resp = esi_transport().get(
                 url,
                 params={"page": 1},
                 headers=self._bearer_headers(token),
@@ -922,44 +1013,27 @@ class EsiClient:
         """
         Yields all market orders for the structure in one chunk (requires
         character with esi-markets.structure_markets.v1 and docking access).
-        Uses django-esi's results(), which fetches all pages internally.
-        Yields None once if token is invalid.
+        Uses get_structure_market_orders(), which fetches all pages.
+        Yields None once if the token is invalid or the request fails.
         """
-        logger.info(
-            "get_structure_market_orders_pages: structure_id=%s character_id=%s — fetching all pages via results()",
-            structure_id,
-            self.character_id,
-        )
-        token, status = self._valid_token(["esi-markets.structure_markets.v1"])
-        if status > 0:
+        response = self.get_structure_market_orders(structure_id)
+        if not response.success():
             logger.warning(
-                "get_structure_market_orders_pages: structure_id=%s — invalid token (status=%s), yielding None",
+                "get_structure_market_orders_pages: structure_id=%s — failed (%s), yielding None",
                 structure_id,
-                status,
+                response.error_text(),
             )
             yield None
             return
-
-        operation = esi_provider.client.Market.GetMarketsStructuresStructureId(
-            structure_id=structure_id,
-            token=token,
-        )
-        all_orders = _esi_to_python(operation.results(use_etag=False))
-        count = len(all_orders) if all_orders else 0
-        logger.info(
-            "get_structure_market_orders_pages: structure_id=%s — received all pages, orders_count=%s",
-            structure_id,
-            count,
-        )
-        if all_orders:
-            yield all_orders
+        if response.data:
+            yield response.data
 
     def get_active_fleet(self) -> EsiResponse:
         token, status = self._valid_token(["esi-fleets.read_fleet.v1"])
         if status > 0:
             return EsiResponse(status)
 
-        response = requests.get(
+        response = esi_transport().get(
             url=f"{ESI_BASE_URL}/characters/{self.character_id}/fleet/",
             timeout=10,
             headers=self._bearer_headers(token),
@@ -1010,13 +1084,10 @@ class EsiClient:
         if status > 0:
             return EsiResponse(status)
 
-        operation = esi_provider.client.Corporation.GetCorporationsCorporationIdMembers(
-            corporation_id=corporation_id,
-            token=token,
+        return self._conditional_esi_get(
+            f"{ESI_BASE_URL}/corporations/{corporation_id}/members/", token
         )
 
-        return self._operation_results(operation)
-
     def get_corporation_roles(self, corporation_id: int) -> EsiResponse:
         """
         Returns roles of all corporation members. Paginated; fetches all pages.
@@ -1030,7 +1101,7 @@ class EsiClient:
         url = f"{ESI_BASE_URL}/corporations/{corporation_id}/roles/"
         headers = self._bearer_headers(token)
         try:
-            resp = requests.get(
+            resp = esi_transport().get(
                 url,
                 params={"page": 1},
                 headers=headers,
@@ -1046,7 +1117,7 @@ class EsiClient:
 
         for page in range(2, total_pages + 1):
             try:
-                page_resp = requests.get(
+                page_resp = esi_transport().get(
                     url,
                     params={"page": page},
                     headers=headers,
@@ -1093,7 +1164,7 @@ class EsiClient:
         url = f"{ESI_BASE_URL}{path}"
         headers = self._bearer_headers(token)
         try:
-            resp = requests.get(
+            resp = esi_transport().get(
                 url,
                 params={"page": 1},
                 headers=headers,
@@ -1109,7 +1180,7 @@ class EsiClient:
 
         for page in range(2, total_pages + 1):
             try:
-                page_resp = requests.get(
+                page_resp = esi_transport().get(
                     url,
                     params={"page": page},
                     headers=headers,
@@ -1181,7 +1252,7 @@ class EsiClient:
         if status > 0:
             return EsiResponse(status)
 
-        response = requests.get(
+        response = esi_transport().get(
             url=f"{ESI_BASE_URL}/characters/{self.character_id}/planets/",
             timeout=30,
             headers=self._bearer_headers(token),
@@ -1196,7 +1267,7 @@ class EsiClient:
         if status > 0:
             return EsiResponse(status)
 
-        response = requests.get(
+        response = esi_transport().get(
             url=f"{ESI_BASE_URL}/characters/{self.character_id}/planets/{planet_id}/",
             timeout=30,
             headers=self._bearer_headers(token),
@@ -1211,7 +1282,7 @@ class EsiClient:
 
         Public endpoint; no auth required. Cached by ESI for up to 3600 seconds.
         """
-        response = requests.get(
+        response = esi_transport().get(
             url=f"{ESI_BASE_URL}/universe/schematics/{schematic_id}/",
             timeout=30,
         )
@@ -1225,7 +1296,7 @@ class EsiClient:
         if status > 0:
             return EsiResponse(status)
 
-        response = requests.get(
+        response = esi_transport().get(
             url=f"{ESI_BASE_URL}/characters/{self.character_id}/clones/",
             timeout=30,
             headers=self._bearer_headers(token),
@@ -1240,7 +1311,7 @@ class EsiClient:
         if status > 0:
             return EsiResponse(status)
 
-        response = requests.get(
+        response = esi_transport().get(
             url=f"{ESI_BASE_URL}/characters/{self.character_id}/implants/",
             timeout=30,
             headers=self._bearer_headers(token),
@@ -1257,7 +1328,7 @@ class EsiClient:
         if status > 0:
             return EsiResponse(status)
 
-        response = requests.get(
+        response = esi_transport().get(
             url=f"{ESI_BASE_URL}/characters/{self.character_id}/mining/",
             timeout=30,
             headers=self._bearer_headers(token),
@@ -1276,7 +1347,7 @@ class EsiClient:
             return EsiResponse(status)
 
         # Use direct call as Swagger validation fails
-        response = requests.get(
+        response = esi_transport().get(
             url=f"{ESI_BASE_URL}/characters/{self.character_id}/notifications/",
             timeout=10,
             headers=self._bearer_headers(token),
@@ -1327,7 +1398,7 @@ class EsiClient:
             "X-Compatibility-Date": ESI_COMPATIBILITY_DATE,
         }
         try:
-            resp = requests.get(url, headers=headers, timeout=30)
+            resp = esi_transport().get(url, headers=headers, timeout=30)
         except Exception as e:
             return EsiResponse(response_code=ERROR_CALLING_ESI, response=e)
         if resp.status_code >= 400:
@@ -1426,64 +1497,139 @@ class EsiClient:
         return station
 
 
-def get_region_market_orders_pages(region_id: int, type_id: int | None = None):
+def _fetch_region_market_orders_page(url: str, params: dict, page: int):
+    return esi_transport().get(
+        url, params={**params, "page": page}, timeout=30
+    )
+
+
+def _region_market_orders_response(fetch, region_id: int, page: int):
+    """Run one page fetch; returns the response, or None (logged) on failure."""
+    try:
+        resp = fetch()
+    except Exception as e:
+        logger.exception(
+            "ESI request failed for region %s page %s: %s",
+            region_id,
+            page,
+            e,
+        )
+        return None
+    if resp.status_code >= 400:
+        logger.warning(
+            "get_region_market_orders_pages: region_id=%s page=%s — status %s",
+            region_id,
+            page,
+            resp.status_code,
+        )
+        return None
+    return resp
+
+
+def get_region_market_orders_pages(
+    region_id: int,
+    type_id: int | None = None,
+    concurrency: int = REGION_ORDERS_CONCURRENCY,
+    base_url: str = ESI_BASE_URL,
+):
     """
     Yields one page of market orders at a time for a region (public endpoint,
     no auth). Each order includes location_id, type_id, price, is_buy_order,
     range, etc. Use this for NPC station locations; filter by location_id.
     If type_id is set, only orders for that type are returned (fewer pages).
+
+    Page 1 is fetched first to read X-Pages; the remaining pages are fetched
+    over a shared keep-alive session with at most `concurrency` requests in
+    flight. Pages are still yielded in page order and at most `concurrency`
+    pages are buffered, so callers can aggregate them as a stream. Yields
+    None once (and stops) if any page fails.
     """
     logger.info(
         "get_region_market_orders_pages: region_id=%s type_id=%s — starting",
         region_id,
         type_id,
     )
-    page = 1
-    page_size = 1000
-    params: dict = {"page": page}
+    url = f"{base_url}/markets/{region_id}/orders/"
+    params: dict = {}
     if type_id is not None:
         params["type_id"] = type_id
-    while True:
-        logger.info(
-            "get_region_market_orders_pages: region_id=%s — requesting page %s",
-            region_id,
-            page,
-        )
-        url = f"{ESI_BASE_URL}/markets/{region_id}/orders/"
+
+    resp = _region_market_orders_response(
+        lambda: _fetch_region_market_orders_page(url, params, 1),
+        region_id,
+        1,
+    )
+    if resp is None:
+        yield None
+        return
+    page_data = resp.json() if resp.content else []
+    total_pages = int(resp.headers.get("X-Pages", 1))
+    logger.info(
+        "get_region_market_orders_pages: region_id=%s — page 1/%s received, orders_count=%s",
+        region_id,
+        total_pages,
+        len(page_data),
+    )
+    if not page_data:
+        return
+    yield page_data
+    if total_pages <= 1:
+        return
+
+    workers = max(1, min(concurrency, total_pages - 1))
+    pending: deque = deque()
+    next_page = 2
+    with ThreadPoolExecutor(max_workers=workers) as pool:
         try:
-            resp = requests.get(url, params=params, timeout=30)
-        except Exception as e:
-            logger.exception(
-                "ESI request failed for region %s page %s: %s",
-                region_id,
-                page,
-                e,
-            )
-            yield None
-            return
-        if resp.status_code >= 400:
-            logger.warning(
-                "get_region_market_orders_pages: region_id=%s page=%s — status %s",
-                region_id,
-                page,
-                resp.status_code,
-            )
-            yield None
-            return
-        page_data = resp.json() if resp.content else []
-        logger.info(
-            "get_region_market_orders_pages: region_id=%s — page %s received, orders_count=%s",
-            region_id,
-            page,
-            len(page_data),
-        )
-        if not page_data:
-            break
-        yield page_data
-        if len(page_data) < page_size:
-            break
-        page += 1
-        params["page"] = page
+            while next_page <= total_pages and len(pending) < workers:
+                pending.append(
+                    (
+                        next_page,
+                        pool.submit(
+                            _fetch_region_market_orders_page,
+                            url,
+                            params,
+                            next_page,
+                        ),
+                    )
+                )
+                next_page += 1
+
+            while pending:
+                page, future = pending.popleft()
+                resp = _region_market_orders_response(
+                    future.result, region_id, page
+                )
+                if resp is None:
+                    yield None
+                    return
+                # Keep the window full while the caller processes this page.
+                if next_page <= total_pages:
+                    pending.append(
+                        (
+                            next_page,
+                            pool.submit(
+                                _fetch_region_market_orders_page,
+                                url,
+                                params,
+                                next_page,
+                            ),
+                        )
+                    )
+                    next_page += 1
+                page_data = resp.json() if resp.content else []
+                logger.info(
+                    "get_region_market_orders_pages: region_id=%s — page %s/%s received, orders_count=%s",
+                    region_id,
+                    page,
+                    total_pages,
+                    len(page_data),
+                )
+                if page_data:
+                    yield page_data
+        finally:
+            for _, future in pending:
+                future.cancel()
 
 
 def esi_for(character) -> EsiClient:
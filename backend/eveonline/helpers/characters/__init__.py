@@ -1,6 +1,7 @@
 # Character helpers. Re-export for backward compatibility:
 #   from eveonline.helpers.characters import user_primary_character
 from eveonline.helpers.characters.affiliations import (
+    apply_character_affiliations,
     update_character_with_affiliations,
 )
 from eveonline.helpers.characters.assets import (
@@ -25,8 +26,12 @@ from eveonline.helpers.characters.characters import (
     user_primary_character,
 )
 from eveonline.helpers.characters.skills import (
+    characters_ready_for_skillset,
     compare_skills_to_skillset,
     create_eve_character_skillset,
+    refresh_character_skillsets,
+    refresh_skillset_readiness,
+    sync_character_skills,
     upsert_character_skill,
     upsert_character_skills,
 )
@@ -63,15 +68,19 @@ __all__ = [
     "market_scope_character_ids",
     "scope_groups_for_token_add",
     "character_primary",
+    "characters_ready_for_skillset",
     "user_ids_with_market_scopes",
     "create_character_assets",
     "create_eve_character_skillset",
     "compare_skills_to_skillset",
     "non_ship_location",
     "orphan_character",
+    "refresh_character_skillsets",
+    "refresh_skillset_readiness",
     "related_characters",
     "set_primary_character",
     "sync_character_corporation_history",
+    "sync_character_skills",
     "update_character_assets",
     "update_character_blueprints",
     "update_character_contracts",
@@ -85,6 +94,7 @@ __all__ = [
     "mark_character_esi_deleted",
     "update_character_skills",
     "update_character_with_affiliations",
+    "apply_character_affiliations",
     "user_characters",
     "user_player",
     "user_primary_character",
@@ -1,3 +1,5 @@
+from django.utils import timezone
+
 from eveonline.models import EveCharacter
 
 
@@ -27,3 +29,36 @@ def update_character_with_affiliations(
     if updated:
         character.save()
     return updated
+
+
+AFFILIATION_FIELDS = ("corporation_id", "alliance_id", "faction_id")
+
+
+def apply_character_affiliations(affiliations) -> list:
+    """
+    Bulk form of update_character_with_affiliations for an ESI
+    /characters/affiliation/ batch: one read, changes compared in memory,
+    one bulk_update. Returns the characters that changed.
+    """
+    by_character_id = {a["character_id"]: a for a in affiliations}
+    characters = EveCharacter.objects.filter(
+        character_id__in=by_character_id
+    ).only("pk", "character_id", "user_id", *AFFILIATION_FIELDS)
+    now = timezone.now()
+    changed = []
+    for character in characters:
+        affiliation = by_character_id[character.character_id]
+        dirty = False
+        for field in AFFILIATION_FIELDS:
+            value = affiliation.get(field) or None
+            if getattr(character, field) != value:
+                setattr(character, field, value)
+                dirty = True
+        if dirty:
+            character.updated_at = now
+            changed.append(character)
+    if changed:
+        EveCharacter.objects.bulk_update(
+            changed, [*AFFILIATION_FIELDS, "updated_at"], batch_size=500
+        )
+    return changed
@@ -6,6 +6,7 @@ from datetime import date
 from eveuniverse.models import EveType, EveTypeMaterial
 
 from eveonline.client import EsiClient
+from eveonline.helpers.db_sync import bulk_upsert
 from eveonline.models import EveCharacter
 from eveonline.models.characters import EveCharacterMiningEntry
 
@@ -61,31 +62,40 @@ def update_character_mining(eve_character_id: int) -> int:
         return 0
 
     entries = response.results() or []
-    seen_type_ids: set[int] = set()
+    eve_types: dict[int, EveType] = {}
+    rows = []
 
     for entry in entries:
         type_id = entry["type_id"]
-        entry_date = date.fromisoformat(entry["date"])
-        quantity = entry["quantity"]
-        solar_system_id = entry["solar_system_id"]
-
-        eve_type, _ = EveType.objects.get_or_create_esi(id=type_id)
-
-        if type_id not in seen_type_ids:
-            seen_type_ids.add(type_id)
+        if type_id not in eve_types:
+            eve_type, _ = EveType.objects.get_or_create_esi(id=type_id)
+            eve_types[type_id] = eve_type
             _ensure_type_materials(eve_type)
 
-        EveCharacterMiningEntry.objects.update_or_create(
-            character=character,
-            eve_type=eve_type,
-            date=entry_date,
-            solar_system_id=solar_system_id,
-            defaults={"quantity": quantity},
+        rows.append(
+            EveCharacterMiningEntry(
+                character=character,
+                eve_type=eve_types[type_id],
+                date=date.fromisoformat(entry["date"]),
+                solar_system_id=entry["solar_system_id"],
+                quantity=entry["quantity"],
+            )
         )
 
+    result = bulk_upsert(
+        queryset=EveCharacterMiningEntry.objects.filter(character=character),
+        instances=rows,
+        key_fields=["character", "eve_type", "date", "solar_system_id"],
+        update_fields=["quantity"],
+    )
+
     logger.info(
-        "Synced %s mining entry(ies) for character %s",
+        "Synced %s mining entry(ies) for character %s: "
+        "%s inserted, %s updated, %s unchanged",
         len(entries),
         eve_character_id,
+        result.inserted,
+        result.updated,
+        result.unchanged,
     )
     return len(entries)
@@ -9,6 +9,7 @@ from django.utils import timezone
 from eveuniverse.models import EveType
 
 from eveonline.client import EsiClient, esi_public
+from eveonline.helpers.db_sync import bulk_upsert
 from eveonline.models import EveCharacter
 from eveonline.models.characters import (
     EveCharacterPlanet,
@@ -19,6 +20,14 @@ from eveonline.models.universe import EveUniverseSchematic
 logger = logging.getLogger(__name__)
 
 SECONDS_PER_DAY = 86400
+# Columns bulk_upsert compares and rewrites on re-sync.
+PLANET_UPSERT_FIELDS = [
+    "planet_type",
+    "solar_system_id",
+    "upgrade_level",
+    "num_pins",
+]
+OUTPUT_UPSERT_FIELDS = ["daily_quantity", "extractor_count", "factory_count"]
 
 
 def _parse_esi_date(value):
@@ -545,26 +554,39 @@ def update_character_planets(eve_character_id: int) -> int:
         return 0
 
     planets_data = planets_response.results() or []
-    active_planet_ids = set()
+    active_planet_ids = {entry["planet_id"] for entry in planets_data}
     seen_schematic_ids = set()
 
+    # last_update is only written for new planets here: it is reset below
+    # once a planet's detail has been synced (or marked stale if not).
+    result = bulk_upsert(
+        queryset=EveCharacterPlanet.objects.filter(character=character),
+        instances=[
+            EveCharacterPlanet(
+                character=character,
+                planet_id=entry["planet_id"],
+                planet_type=entry.get("planet_type", ""),
+                solar_system_id=entry.get("solar_system_id", 0),
+                upgrade_level=entry.get("upgrade_level", 0),
+                num_pins=entry.get("num_pins", 0),
+                last_update=_parse_esi_date(entry.get("last_update")),
+            )
+            for entry in planets_data
+        ],
+        key_fields=["character", "planet_id"],
+        update_fields=PLANET_UPSERT_FIELDS,
+    )
+    planets = {
+        planet.planet_id: planet
+        for planet in EveCharacterPlanet.objects.filter(
+            character=character, planet_id__in=active_planet_ids
+        )
+    }
+    synced_planet_ids = []
+
     for planet_entry in planets_data:
         planet_id = planet_entry["planet_id"]
-        active_planet_ids.add(planet_id)
-
-        planet_obj, _ = EveCharacterPlanet.objects.update_or_create(
-            character=character,
-            planet_id=planet_id,
-            defaults={
-                "planet_type": planet_entry.get("planet_type", ""),
-                "solar_system_id": planet_entry.get("solar_system_id", 0),
-                "upgrade_level": planet_entry.get("upgrade_level", 0),
-                "num_pins": planet_entry.get("num_pins", 0),
-                "last_update": _parse_esi_date(
-                    planet_entry.get("last_update")
-                ),
-            },
-        )
+        planet_obj = planets[planet_id]
 
         detail_response = esi.get_character_planet_details(planet_id)
         if not detail_response.success():
@@ -574,6 +596,9 @@ def update_character_planets(eve_character_id: int) -> int:
                 eve_character_id,
                 detail_response.response_code,
             )
+            EveCharacterPlanet.objects.filter(pk=planet_obj.pk).update(
+                last_update=_parse_esi_date(planet_entry.get("last_update"))
+            )
             continue
 
         detail_data = detail_response.results()
@@ -593,11 +618,13 @@ def update_character_planets(eve_character_id: int) -> int:
         _sync_planet_outputs(
             planet_obj, harvested, produced, harvest_counts, factory_counts
         )
+        synced_planet_ids.append(planet_obj.pk)
 
-        # Record that we successfully synced this planet (used to exclude stale
-        # planets from industry producer lists).
-        planet_obj.last_update = timezone.now()
-        planet_obj.save(update_fields=["last_update"])
+    # Record that we successfully synced these planets (used to exclude stale
+    # planets from industry producer lists).
+    EveCharacterPlanet.objects.filter(pk__in=synced_planet_ids).update(
+        last_update=timezone.now()
+    )
 
     ensure_schematics_cached(seen_schematic_ids)
 
@@ -607,9 +634,13 @@ def update_character_planets(eve_character_id: int) -> int:
     ).delete()
 
     logger.info(
-        "Synced %s planet(s) for character %s",
+        "Synced %s planet(s) for character %s: "
+        "%s inserted, %s updated, %s unchanged",
         len(planets_data),
         eve_character_id,
+        result.inserted,
+        result.updated,
+        result.unchanged,
     )
     return len(planets_data)
 
@@ -631,75 +662,46 @@ def _sync_planet_outputs(
     if factory_counts is None:
         factory_counts = {}
 
-    desired = set()
-    for type_id in harvested_dict:
-        desired.add((type_id, EveCharacterPlanetOutput.OutputType.HARVESTED))
-    for type_id in produced_dict:
-        desired.add((type_id, EveCharacterPlanetOutput.OutputType.PRODUCED))
-
-    existing = {
-        (o.eve_type_id, o.output_type): o
-        for o in planet_obj.outputs.select_related("eve_type").all()
-    }
-    to_delete = set(existing.keys()) - desired
-    to_create = desired - set(existing.keys())
-
-    if to_delete:
-        ids = [existing[key].pk for key in to_delete]
-        EveCharacterPlanetOutput.objects.filter(pk__in=ids).delete()
-
-    for type_id, output_type in to_create:
-        eve_type, _ = EveType.objects.get_or_create_esi(id=type_id)
-        daily = (
-            harvested_dict.get(type_id, Decimal(0))
-            if output_type == EveCharacterPlanetOutput.OutputType.HARVESTED
-            else produced_dict.get(type_id, Decimal(0))
-        )
-        ext_count = (
-            harvest_counts.get(type_id)
-            if output_type == EveCharacterPlanetOutput.OutputType.HARVESTED
-            else None
-        )
-        fact_count = (
-            factory_counts.get(type_id)
-            if output_type == EveCharacterPlanetOutput.OutputType.PRODUCED
-            else None
+    outputs = [
+        EveCharacterPlanetOutput(
+            planet=planet_obj,
+            eve_type_id=type_id,
+            output_type=EveCharacterPlanetOutput.OutputType.HARVESTED,
+            daily_quantity=daily,
+            extractor_count=harvest_counts.get(type_id),
+            factory_count=None,
         )
-        EveCharacterPlanetOutput.objects.create(
+        for type_id, daily in harvested_dict.items()
+    ] + [
+        EveCharacterPlanetOutput(
             planet=planet_obj,
-            eve_type=eve_type,
-            output_type=output_type,
+            eve_type_id=type_id,
+            output_type=EveCharacterPlanetOutput.OutputType.PRODUCED,
             daily_quantity=daily,
-            extractor_count=ext_count,
-            factory_count=fact_count,
+            extractor_count=None,
+            factory_count=factory_counts.get(type_id),
         )
+        for type_id, daily in produced_dict.items()
+    ]
 
-    for (type_id, output_type), obj in existing.items():
-        if (type_id, output_type) in desired:
-            daily = (
-                harvested_dict.get(type_id, Decimal(0))
-                if output_type == EveCharacterPlanetOutput.OutputType.HARVESTED
-                else produced_dict.get(type_id, Decimal(0))
-            )
-            ext_count = (
-                harvest_counts.get(type_id)
-                if output_type == EveCharacterPlanetOutput.OutputType.HARVESTED
-                else None
-            )
-            fact_count = (
-                factory_counts.get(type_id)
-                if output_type == EveCharacterPlanetOutput.OutputType.PRODUCED
-                else None
-            )
-            update_fields = []
-            if obj.daily_quantity != daily:
-                obj.daily_quantity = daily
-                update_fields.append("daily_quantity")
-            if obj.extractor_count != ext_count:
-                obj.extractor_count = ext_count
-                update_fields.append("extractor_count")
-            if obj.factory_count != fact_count:
-                obj.factory_count = fact_count
-                update_fields.append("factory_count")
-            if update_fields:
-                obj.save(update_fields=update_fields)
+    existing = {
+        (type_id, output_type): pk
+        for pk, type_id, output_type in planet_obj.outputs.values_list(
+            "pk", "eve_type_id", "output_type"
+        )
+    }
+    desired = {(o.eve_type_id, o.output_type) for o in outputs}
+    to_delete = [pk for key, pk in existing.items() if key not in desired]
+    if to_delete:
+        EveCharacterPlanetOutput.objects.filter(pk__in=to_delete).delete()
+
+    known_type_ids = {type_id for type_id, _ in existing}
+    for type_id in {o.eve_type_id for o in outputs} - known_type_ids:
+        EveType.objects.get_or_create_esi(id=type_id)
+
+    bulk_upsert(
+        queryset=planet_obj.outputs.all(),
+        instances=outputs,
+        key_fields=["planet", "eve_type", "output_type"],
+        update_fields=OUTPUT_UPSERT_FIELDS,
+    )
@@ -1,12 +1,18 @@
 import json
 import logging
-from typing import List
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
 
 import pydantic
+from django.db import transaction
+from django.utils import timezone
+from eveuniverse.models import EveType
+
 from eveonline.client import EsiClient
 
 from eveonline.models import (
     EveCharacter,
+    EveCharacterRefreshState,
     EveCharacterSkill,
     EveCharacterSkillset,
     EveSkillset,
@@ -22,8 +28,12 @@ class EveCharacterSkillResponse(pydantic.BaseModel):
     trained_skill_level: int
 
 
-def upsert_character_skills(character_id: int):
-    """Populate skills from eve and save them to the character."""
+def upsert_character_skills(character_id: int) -> bool:
+    """
+    Populate skills from eve and save them to the character.
+
+    Returns True when stored skills changed.
+    """
     logger.debug("Upserting skills for character %s", character_id)
     character = EveCharacter.objects.get(character_id=character_id)
     response = EsiClient(character).get_character_skills()
@@ -38,82 +48,154 @@ def upsert_character_skills(character_id: int):
             response.error_text(),
             character.summary(),
         )
-        return
-    for skill in response.results():
-        upsert_character_skill(character, skill)
+        return False
+    esi_skills = response.results()
+    refresh_state = EveCharacterRefreshState.objects.filter(
+        character=character,
+        data_type=EveCharacterRefreshState.DataType.SKILLS,
+    )
+    # Skipped only when this sync applied the same ETag before and no
+    # stored skill rows have gone missing since.
+    if (
+        response.etag
+        and refresh_state.filter(applied_etag=response.etag).exists()
+        and EveCharacterSkill.objects.filter(character=character).count()
+        >= len(esi_skills)
+    ):
+        logger.debug(
+            "Skills unchanged for %s, skipping DB writes", character.summary()
+        )
+        return False
+    changed = any(sync_character_skills(character, esi_skills))
+    # Created here for characters the refresh scheduler has not seeded.
+    EveCharacterRefreshState.objects.update_or_create(
+        character=character,
+        data_type=EveCharacterRefreshState.DataType.SKILLS,
+        defaults={"applied_etag": response.etag or ""},
+        create_defaults={
+            "applied_etag": response.etag or "",
+            "due_at": timezone.now(),
+        },
+    )
+    return changed
 
 
-def upsert_character_skill(character: EveCharacter, esi_skill):
-    skill_type = EsiClient(None).get_eve_type(esi_skill["skill_id"])
-    qry = EveCharacterSkill.objects.filter(
-        character=character, skill_id=esi_skill["skill_id"]
-    ).order_by("-skill_points")
-    logger.debug("Query count %d", qry.count())
-    if qry.count() == 0:
-        skill = EveCharacterSkill(
-            character=character,
-            skill_id=esi_skill["skill_id"],
-            skill_name=skill_type.name,
-            skill_points=esi_skill["skillpoints_in_skill"],
-            skill_level=esi_skill["trained_skill_level"],
-        )
-    else:
-        skill = qry.first()
-        skill.skill_points = esi_skill["skillpoints_in_skill"]
-        skill.skill_level = esi_skill["trained_skill_level"]
-    skill.save()
-    if qry.count() > 1:
+def _skill_names(skill_ids: Iterable[int]) -> Dict[int, str]:
+    """Names for skill type ids; types not cached locally come from ESI."""
+    ids = set(skill_ids)
+    names = dict(EveType.objects.filter(id__in=ids).values_list("id", "name"))
+    for skill_id in ids - names.keys():
+        names[skill_id] = EsiClient(None).get_eve_type(skill_id).name
+    return names
+
+
+def sync_character_skills(
+    character: EveCharacter, esi_skills: Iterable[dict]
+) -> Tuple[int, int, int]:
+    """
+    Diff ESI skills against stored EveCharacterSkill rows and write changes.
+
+    Creates missing skills, updates changed points / levels and deletes
+    duplicate rows (keeping the one with the most skill points) in a fixed
+    handful of queries. Skills missing from ``esi_skills`` are kept.
+    Returns ``(created, updated, deleted)``.
+    """
+    existing: Dict[int, EveCharacterSkill] = {}
+    duplicates: List[int] = []
+    for skill in EveCharacterSkill.objects.filter(
+        character=character
+    ).order_by("skill_id", "-skill_points", "id"):
+        if skill.skill_id in existing:
+            duplicates.append(skill.pk)
+        else:
+            existing[skill.skill_id] = skill
+
+    incoming = {
+        int(esi_skill["skill_id"]): esi_skill for esi_skill in esi_skills
+    }
+    now = timezone.now()
+    to_update: List[EveCharacterSkill] = []
+    new_ids = []
+    for skill_id, esi_skill in incoming.items():
+        skill = existing.get(skill_id)
+        if skill is None:
+            new_ids.append(skill_id)
+            continue
+        points = esi_skill["skillpoints_in_skill"]
+        level = esi_skill["trained_skill_level"]
+        if skill.skill_points != points or skill.skill_level != level:
+            skill.skill_points = points
+            skill.skill_level = level
+            skill.updated_at = now
+            to_update.append(skill)
+
+    to_create: List[EveCharacterSkill] = []
+    if new_ids:
+        names = _skill_names(new_ids)
+        to_create = [
+            EveCharacterSkill(
+                character=character,
+                skill_id=skill_id,
+                skill_name=names[skill_id],
+                skill_points=incoming[skill_id]["skillpoints_in_skill"],
+                skill_level=incoming[skill_id]["trained_skill_level"],
+            )
+            for skill_id in new_ids
+        ]
+
+    if not (duplicates or to_create or to_update):
+        return 0, 0, 0
+    if duplicates:
         logger.error(
-            "Duplicate skill %d for character %d, deleting one",
-            esi_skill["skill_id"],
+            "Deleting %d duplicate skill row(s) for character %d",
+            len(duplicates),
             character.character_id,
         )
-        qry.last().delete()
+    with transaction.atomic():
+        if duplicates:
+            EveCharacterSkill.objects.filter(pk__in=duplicates).delete()
+        if to_create:
+            EveCharacterSkill.objects.bulk_create(to_create)
+        if to_update:
+            EveCharacterSkill.objects.bulk_update(
+                to_update, ["skill_points", "skill_level", "updated_at"]
+            )
+    return len(to_create), len(to_update), len(duplicates)
 
 
-def compare_skills_to_skillset(character_id: int, skillset: EveSkillset):
-    """Compare a character's skills to a skillset"""
-    character = EveCharacter.objects.get(character_id=character_id)
-    character_skills = EveCharacterSkill.objects.filter(character=character)
-    skills: List[EveCharacterSkillResponse] = []
-    for skill in character_skills:
-        skills.append(
-            EveCharacterSkillResponse(
-                skill_id=skill.skill_id,
-                skill_name=skill.skill_name,
-                skillpoints_in_skill=skill.skill_points,
-                trained_skill_level=skill.skill_level,
-            )
-        )
-    skillset_lookup = {}
-    for skill in skillset.skills.split("\n"):
-        skill = skill.strip()
-        skillset_lookup[skill] = True
-    hydrated_skills = {}
-    for skill in skills:
-        hydrated_skills[skill.skill_name] = skill.model_dump()
+def upsert_character_skill(character: EveCharacter, esi_skill):
+    """Create or update one skill; see sync_character_skills."""
+    sync_character_skills(character, [esi_skill])
+
+
+@lru_cache(maxsize=512)
+def skillset_requirements(skills: str) -> Tuple[Tuple[str, str, int], ...]:
+    """
+    ``(line, skill name, level)`` for each distinct line of
+    EveSkillset.skills, which save() normalises to "Skill Name 4".
+    """
+    requirements = {}
+    for line in skills.split("\n"):
+        line = line.strip()
+        if line and line not in requirements:
+            requirements[line] = (line, line[:-1].strip(), int(line[-1]))
+    return tuple(requirements.values())
+
+
+def skillset_readiness(
+    requirements: Iterable[Tuple[str, str, int]],
+    levels: Dict[str, int],
+) -> Tuple[List[str], int]:
+    """Missing skill lines and progress for trained ``{name: level}``."""
     missing_skills = []
     player_skill_count = 0
     total_skill_count = 0
-    for skill in skillset_lookup:
-        logger.debug("Checking skill %s", skill)
-        skill_name = skill[:-1].strip()
-        skill_level = int(skill[-1])
-        if skill_name not in hydrated_skills:
-            missing_skills.append(skill)
+    for line, skill_name, skill_level in requirements:
+        trained = levels.get(skill_name)
+        if trained is None or trained < skill_level:
+            missing_skills.append(line)
             total_skill_count += skill_level * 12
-        else:
-            logger.debug(
-                "Player has skill %s at level %s",
-                skill_name,
-                hydrated_skills[skill_name]["trained_skill_level"],
-            )
-            if (
-                hydrated_skills[skill_name]["trained_skill_level"]
-                < skill_level
-            ):
-                missing_skills.append(skill)
-                total_skill_count += skill_level * 12
+        if trained is not None:
             player_skill_count += skill_level * 12
     if missing_skills:
         progress = player_skill_count / total_skill_count
@@ -122,6 +204,161 @@ def compare_skills_to_skillset(character_id: int, skillset: EveSkillset):
     return missing_skills, int(progress)
 
 
+def _skill_levels(
+    character_pks: Iterable[int], skill_names: Iterable[str] = None
+) -> Dict[int, Dict[str, int]]:
+    """``{EveCharacter.pk: {skill name: trained level}}`` in one query."""
+    qs = EveCharacterSkill.objects.filter(character_id__in=character_pks)
+    if skill_names is not None:
+        qs = qs.filter(skill_name__in=skill_names)
+    levels: Dict[int, Dict[str, int]] = {}
+    for character_pk, name, level in qs.values_list(
+        "character_id", "skill_name", "skill_level"
+    ):
+        levels.setdefault(character_pk, {})[name] = level
+    return levels
+
+
+def compare_skills_to_skillset(character_id: int, skillset: EveSkillset):
+    """Compare a character's skills to a skillset"""
+    character = EveCharacter.objects.get(character_id=character_id)
+    levels = _skill_levels([character.pk]).get(character.pk, {})
+    return skillset_readiness(skillset_requirements(skillset.skills), levels)
+
+
+def _write_readiness(
+    existing: Iterable[EveCharacterSkillset],
+    readiness: Dict[Tuple[int, int], Tuple[List[str], int]],
+) -> int:
+    """
+    Upsert ``{(character pk, skillset pk): (missing, progress)}`` rows.
+
+    ``existing`` are the stored rows for those keys; unchanged rows are
+    left alone and duplicates are deleted. Returns rows written.
+    """
+    stored: Dict[Tuple[int, int], EveCharacterSkillset] = {}
+    duplicates = []
+    for row in existing:
+        key = (row.character_id, row.eve_skillset_id)
+        if key in stored:
+            duplicates.append(row.pk)
+        else:
+            stored[key] = row
+
+    to_create = []
+    to_update = []
+    for (character_pk, skillset_pk), (missing, progress) in readiness.items():
+        missing_json = json.dumps(missing)
+        row = stored.get((character_pk, skillset_pk))
+        if row is None:
+            to_create.append(
+                EveCharacterSkillset(
+                    character_id=character_pk,
+                    eve_skillset_id=skillset_pk,
+                    progress=progress,
+                    missing_skills=missing_json,
+                    is_ready=not missing,
+                )
+            )
+        elif (row.progress, row.missing_skills, row.is_ready) != (
+            progress,
+            missing_json,
+            not missing,
+        ):
+            row.progress = progress
+            row.missing_skills = missing_json
+            row.is_ready = not missing
+            to_update.append(row)
+
+    if not (duplicates or to_create or to_update):
+        return 0
+    with transaction.atomic():
+        if duplicates:
+            EveCharacterSkillset.objects.filter(pk__in=duplicates).delete()
+        if to_create:
+            EveCharacterSkillset.objects.bulk_create(to_create)
+        if to_update:
+            EveCharacterSkillset.objects.bulk_update(
+                to_update, ["progress", "missing_skills", "is_ready"]
+            )
+    return len(to_create) + len(to_update)
+
+
+def refresh_character_skillsets(
+    character: EveCharacter,
+    skillsets: Iterable[EveSkillset] = None,
+    *,
+    only_missing: bool = False,
+) -> int:
+    """
+    Recompute a character's readiness rows from their stored skills.
+
+    Defaults to every skillset; ``only_missing`` limits it to skillsets the
+    character has no row for yet. Returns rows written.
+    """
+    skillsets = list(
+        EveSkillset.objects.all() if skillsets is None else skillsets
+    )
+    existing = list(
+        EveCharacterSkillset.objects.filter(
+            character=character,
+            eve_skillset_id__in=[skillset.pk for skillset in skillsets],
+        )
+    )
+    if only_missing:
+        stored = {row.eve_skillset_id for row in existing}
+        skillsets = [s for s in skillsets if s.pk not in stored]
+    if not skillsets:
+        return 0
+    levels = _skill_levels([character.pk]).get(character.pk, {})
+    return _write_readiness(
+        existing,
+        {
+            (character.pk, skillset.pk): skillset_readiness(
+                skillset_requirements(skillset.skills), levels
+            )
+            for skillset in skillsets
+        },
+    )
+
+
+def refresh_skillset_readiness(skillset: EveSkillset) -> int:
+    """
+    Recompute one skillset for every character with stored skills.
+
+    Reads only the skills the skillset names. Returns rows written.
+    """
+    requirements = skillset_requirements(skillset.skills)
+    character_pks = set(
+        EveCharacterSkill.objects.values_list(
+            "character_id", flat=True
+        ).distinct()
+    )
+    existing = list(EveCharacterSkillset.objects.filter(eve_skillset=skillset))
+    character_pks.update(row.character_id for row in existing)
+    levels = _skill_levels(
+        character_pks, {skill_name for _, skill_name, _ in requirements}
+    )
+    return _write_readiness(
+        existing,
+        {
+            (character_pk, skillset.pk): skillset_readiness(
+                requirements, levels.get(character_pk, {})
+            )
+            for character_pk in character_pks
+        },
+    )
+
+
+def characters_ready_for_skillset(skillset: EveSkillset):
+    """EveCharacters with every skill in the skillset, from readiness rows."""
+    return EveCharacter.objects.filter(
+        pk__in=EveCharacterSkillset.objects.filter(
+            eve_skillset=skillset, is_ready=True
+        ).values("character_id")
+    )
+
+
 def create_eve_character_skillset(character_id: int, skillset: EveSkillset):
     """Create a skillset for a character"""
     logger.debug(
@@ -130,21 +367,7 @@ def create_eve_character_skillset(character_id: int, skillset: EveSkillset):
         skillset.name,
     )
     character = EveCharacter.objects.get(character_id=character_id)
-    EveCharacterSkillset.objects.filter(
+    refresh_character_skillsets(character, [skillset])
+    return EveCharacterSkillset.objects.get(
         character=character, eve_skillset=skillset
-    ).delete()
-    missing_skills, progress = compare_skills_to_skillset(
-        character_id, skillset
-    )
-    logger.debug(
-        "Character %s has %s missing skills for skillset %s",
-        character.character_id,
-        len(missing_skills),
-        skillset.name,
-    )
-    return EveCharacterSkillset.objects.create(
-        character=character,
-        eve_skillset=skillset,
-        progress=progress,
-        missing_skills=json.dumps(missing_skills),
     )
@@ -6,6 +6,8 @@ from datetime import datetime
 from decimal import Decimal
 
 import pytz
+from django.core.cache import cache
+from django.db import transaction
 from django.utils import timezone
 
 from eveonline.client import EsiClient
@@ -16,18 +18,67 @@ from eveonline.models import (
     EveCharacterIndustryJob,
     EveCharacterKillmail,
     EveCharacterKillmailAttacker,
-    EveSkillset,
 )
 
 from eveonline.helpers.characters.assets import create_character_assets
-from eveonline.helpers.db_sync import replace_with_bulk_create
+from eveonline.helpers.db_sync import bulk_upsert, replace_with_bulk_create
 from eveonline.helpers.characters.skills import (
-    create_eve_character_skillset,
+    refresh_character_skillsets,
     upsert_character_skills,
 )
 
 logger = logging.getLogger(__name__)
 
+KILLMAIL_INSERT_BATCH = 500
+# Upper bound on one character's detail fetches; claims are released when
+# the batch is stored.
+KILLMAIL_FETCH_CLAIM_TTL = 600
+# Columns bulk_upsert compares and rewrites on re-sync.
+CONTRACT_UPSERT_FIELDS = [
+    "character",
+    "type",
+    "status",
+    "availability",
+    "issuer_id",
+    "issuer_corporation_id",
+    "assignee_id",
+    "acceptor_id",
+    "for_corporation",
+    "date_issued",
+    "date_expired",
+    "date_accepted",
+    "date_completed",
+    "days_to_complete",
+    "price",
+    "reward",
+    "collateral",
+    "buyout",
+    "volume",
+    "start_location_id",
+    "end_location_id",
+    "title",
+]
+INDUSTRY_JOB_UPSERT_FIELDS = [
+    "character",
+    "activity_id",
+    "blueprint_id",
+    "blueprint_type_id",
+    "blueprint_location_id",
+    "facility_id",
+    "location_id",
+    "output_location_id",
+    "status",
+    "installer_id",
+    "start_date",
+    "end_date",
+    "duration",
+    "completed_date",
+    "completed_character_id",
+    "runs",
+    "licensed_runs",
+    "cost",
+]
+
 
 def _parse_esi_date(value):
     """Parse ESI ISO date string to timezone-aware datetime."""
@@ -92,13 +143,88 @@ def update_character_skills(eve_character_id: int) -> None:
         return
 
     logger.info("Updating skills for character %s", eve_character_id)
-    upsert_character_skills(eve_character_id)
-    for skillset in EveSkillset.objects.all():
-        create_eve_character_skillset(eve_character_id, skillset)
+    changed = upsert_character_skills(eve_character_id)
+    # Skillset edits refresh every character (refresh_skillset_readiness),
+    # so unchanged skills only need rows for skillsets added since.
+    refresh_character_skillsets(character, only_missing=not changed)
+
+
+def _killmail_fetch_claim_key(killmail_id: int) -> str:
+    return f"eveonline:killmail_fetch:{killmail_id}"
+
+
+def _optional(data, key):
+    return data[key] if key in data else None
+
+
+def _killmail_records(character, killmail, details):
+    """Unsaved EveCharacterKillmail and its attacker rows."""
+    killmail_id = killmail["killmail_id"]
+    victim = details["victim"]
+    killmail_obj = EveCharacterKillmail(
+        id=killmail_id,
+        killmail_id=killmail_id,
+        killmail_hash=killmail["killmail_hash"],
+        solar_system_id=details["solar_system_id"],
+        ship_type_id=victim["ship_type_id"],
+        killmail_time=details["killmail_time"],
+        victim_character_id=_optional(victim, "character_id"),
+        victim_corporation_id=_optional(victim, "corporation_id"),
+        victim_alliance_id=_optional(victim, "alliance_id"),
+        victim_faction_id=_optional(victim, "faction_id"),
+        attackers=details["attackers"],
+        items=victim["items"],
+        character=character,
+    )
+    attackers = [
+        EveCharacterKillmailAttacker(
+            killmail=killmail_obj,
+            character_id=_optional(attacker, "character_id"),
+            corporation_id=_optional(attacker, "corporation_id"),
+            alliance_id=_optional(attacker, "alliance_id"),
+            faction_id=_optional(attacker, "faction_id"),
+            ship_type_id=_optional(attacker, "ship_type_id"),
+        )
+        for attacker in details["attackers"]
+    ]
+    return killmail_obj, attackers
+
+
+def _store_killmails(records) -> int:
+    """Bulk insert ``(killmail, attackers)`` pairs not stored meanwhile."""
+    with transaction.atomic():
+        stored = set(
+            EveCharacterKillmail.objects.filter(
+                id__in=[killmail.id for killmail, _ in records]
+            ).values_list("id", flat=True)
+        )
+        records = [
+            (killmail, attackers)
+            for killmail, attackers in records
+            if killmail.id not in stored
+        ]
+        EveCharacterKillmail.objects.bulk_create(
+            [killmail for killmail, _ in records],
+            batch_size=KILLMAIL_INSERT_BATCH,
+            ignore_conflicts=True,
+        )
+        EveCharacterKillmailAttacker.objects.bulk_create(
+            [attacker for _, attackers in records for attacker in attackers],
+            batch_size=KILLMAIL_INSERT_BATCH,
+        )
+    return len(records)
 
 
-def update_character_killmails(eve_character_id: int) -> None:
-    """Fetch recent killmails from ESI and create missing records."""
+def update_character_killmails(eve_character_id: int) -> int:
+    """
+    Fetch recent killmails from ESI and create missing records.
+
+    Killmails are immutable, so ids already stored are dropped in one query
+    before any detail fetch. Each fetch holds a short cache claim on its
+    killmail id; a character refreshed at the same time as another pilot
+    from the same fight skips the ids that pilot is already fetching.
+    Returns the number of killmails inserted.
+    """
     character = EveCharacter.objects.get(character_id=eve_character_id)
     logger.info("Updating killmails for character %s", eve_character_id)
     esi = EsiClient(eve_character_id)
@@ -110,84 +236,56 @@ def update_character_killmails(eve_character_id: int) -> None:
             eve_character_id,
             response.response_code,
         )
-        return
+        return 0
 
-    for killmail in response.results():
-        killmail_id = killmail["killmail_id"]
-        response = esi.get_character_killmail(
-            killmail_id, killmail["killmail_hash"]
+    recent = {
+        killmail["killmail_id"]: killmail for killmail in response.results()
+    }
+    known = set(
+        EveCharacterKillmail.objects.filter(id__in=list(recent)).values_list(
+            "id", flat=True
         )
-        if not response.success():
-            logger.warning(
-                "Skipping killmail %s for character %s: %s",
-                killmail_id,
-                eve_character_id,
-                response.error_text(),
+    )
+    claimed = []
+    records = []
+    try:
+        for killmail_id, killmail in recent.items():
+            if killmail_id in known:
+                continue
+            claim_key = _killmail_fetch_claim_key(killmail_id)
+            if not cache.add(
+                claim_key, eve_character_id, timeout=KILLMAIL_FETCH_CLAIM_TTL
+            ):
+                continue
+            claimed.append(claim_key)
+            response = esi.get_character_killmail(
+                killmail_id, killmail["killmail_hash"]
             )
-            continue
-        details = response.results()
-        if not EveCharacterKillmail.objects.filter(id=killmail_id).exists():
-            killmail_obj = EveCharacterKillmail.objects.create(
-                id=killmail_id,
-                killmail_id=killmail_id,
-                killmail_hash=killmail["killmail_hash"],
-                solar_system_id=details["solar_system_id"],
-                ship_type_id=details["victim"]["ship_type_id"],
-                killmail_time=details["killmail_time"],
-                victim_character_id=(
-                    details["victim"]["character_id"]
-                    if "character_id" in details["victim"]
-                    else None
-                ),
-                victim_corporation_id=(
-                    details["victim"]["corporation_id"]
-                    if "corporation_id" in details["victim"]
-                    else None
-                ),
-                victim_alliance_id=(
-                    details["victim"]["alliance_id"]
-                    if "alliance_id" in details["victim"]
-                    else None
-                ),
-                victim_faction_id=(
-                    details["victim"]["faction_id"]
-                    if "faction_id" in details["victim"]
-                    else None
-                ),
-                attackers=details["attackers"],
-                items=details["victim"]["items"],
-                character=character,
+            if not response.success():
+                logger.warning(
+                    "Skipping killmail %s for character %s: %s",
+                    killmail_id,
+                    eve_character_id,
+                    response.error_text(),
+                )
+                continue
+            records.append(
+                _killmail_records(character, killmail, response.results())
             )
+        inserted = _store_killmails(records) if records else 0
+    finally:
+        cache.delete_many(claimed)
 
-            for attacker in details["attackers"]:
-                EveCharacterKillmailAttacker.objects.create(
-                    killmail=killmail_obj,
-                    character_id=(
-                        attacker["character_id"]
-                        if "character_id" in attacker
-                        else None
-                    ),
-                    corporation_id=(
-                        attacker["corporation_id"]
-                        if "corporation_id" in attacker
-                        else None
-                    ),
-                    alliance_id=(
-                        attacker["alliance_id"]
-                        if "alliance_id" in attacker
-                        else None
-                    ),
-                    faction_id=(
-                        attacker["faction_id"]
-                        if "faction_id" in attacker
-                        else None
-                    ),
-                    ship_type_id=(
-                        attacker["ship_type_id"]
-                        if "ship_type_id" in attacker
-                        else None
-                    ),
-                )
+    logger.info(
+        "Killmails for character %s: %d recent, %d known, %d fetched, "
+        "%d inserted",
+        eve_character_id,
+        len(recent),
+        len(known),
+        len(claimed),
+        inserted,
+    )
+    return inserted
 
 
 def update_character_contracts(eve_character_id: int) -> int:
@@ -217,8 +315,8 @@ def update_character_contracts(eve_character_id: int) -> int:
         return 0
 
     contracts_data = response.results() or []
+    contracts = []
     for raw in contracts_data:
-        contract_id = raw["contract_id"]
         price = raw.get("price")
         if price is not None:
             price = Decimal(str(price))
@@ -235,37 +333,47 @@ def update_character_contracts(eve_character_id: int) -> int:
         if volume is not None:
             volume = Decimal(str(volume))
 
-        EveCharacterContract.objects.update_or_create(
-            contract_id=contract_id,
-            defaults={
-                "character_id": character.pk,
-                "type": raw.get("type", ""),
-                "status": raw.get("status", ""),
-                "availability": raw.get("availability", ""),
-                "issuer_id": raw.get("issuer_id"),
-                "issuer_corporation_id": raw.get("issuer_corporation_id"),
-                "assignee_id": raw.get("assignee_id"),
-                "acceptor_id": raw.get("acceptor_id"),
-                "for_corporation": raw.get("for_corporation", False),
-                "date_issued": _parse_esi_date(raw.get("date_issued")),
-                "date_expired": _parse_esi_date(raw.get("date_expired")),
-                "date_accepted": _parse_esi_date(raw.get("date_accepted")),
-                "date_completed": _parse_esi_date(raw.get("date_completed")),
-                "days_to_complete": raw.get("days_to_complete"),
-                "price": price,
-                "reward": reward,
-                "collateral": collateral,
-                "buyout": buyout,
-                "volume": volume,
-                "start_location_id": raw.get("start_location_id"),
-                "end_location_id": raw.get("end_location_id"),
-                "title": raw.get("title", ""),
-            },
+        contracts.append(
+            EveCharacterContract(
+                contract_id=raw["contract_id"],
+                character_id=character.pk,
+                type=raw.get("type", ""),
+                status=raw.get("status", ""),
+                availability=raw.get("availability", ""),
+                issuer_id=raw.get("issuer_id"),
+                issuer_corporation_id=raw.get("issuer_corporation_id"),
+                assignee_id=raw.get("assignee_id"),
+                acceptor_id=raw.get("acceptor_id"),
+                for_corporation=raw.get("for_corporation", False),
+                date_issued=_parse_esi_date(raw.get("date_issued")),
+                date_expired=_parse_esi_date(raw.get("date_expired")),
+                date_accepted=_parse_esi_date(raw.get("date_accepted")),
+                date_completed=_parse_esi_date(raw.get("date_completed")),
+                days_to_complete=raw.get("days_to_complete"),
+                price=price,
+                reward=reward,
+                collateral=collateral,
+                buyout=buyout,
+                volume=volume,
+                start_location_id=raw.get("start_location_id"),
+                end_location_id=raw.get("end_location_id"),
+                title=raw.get("title", ""),
+            )
         )
+    result = bulk_upsert(
+        queryset=EveCharacterContract.objects.all(),
+        instances=contracts,
+        key_fields=["contract_id"],
+        update_fields=CONTRACT_UPSERT_FIELDS,
+    )
     logger.info(
-        "Synced %s contract(s) for character %s",
+        "Synced %s contract(s) for character %s: "
+        "%s inserted, %s updated, %s unchanged",
         len(contracts_data),
         eve_character_id,
+        result.inserted,
+        result.updated,
+        result.unchanged,
     )
     return len(contracts_data)
 
@@ -306,45 +414,52 @@ def update_character_industry_jobs(
         return 0, []
 
     jobs_data = response.results() or []
-    created_job_ids: list[int] = []
+    jobs = []
     for raw in jobs_data:
-        job_id = raw["job_id"]
         completed_date = _parse_esi_date(raw.get("completed_date"))
         cost = raw.get("cost")
         if cost is not None:
             cost = Decimal(str(cost))
 
-        job, created = EveCharacterIndustryJob.objects.update_or_create(
-            job_id=job_id,
-            defaults={
-                "character_id": character.pk,
-                "activity_id": raw["activity_id"],
-                "blueprint_id": raw["blueprint_id"],
-                "blueprint_type_id": raw["blueprint_type_id"],
-                "blueprint_location_id": raw["blueprint_location_id"],
-                "facility_id": raw["facility_id"],
-                "location_id": raw["station_id"],
-                "output_location_id": raw["output_location_id"],
-                "status": raw["status"],
-                "installer_id": raw["installer_id"],
-                "start_date": _parse_esi_date(raw["start_date"]),
-                "end_date": _parse_esi_date(raw["end_date"]),
-                "duration": raw["duration"],
-                "completed_date": completed_date,
-                "completed_character_id": raw.get("completed_character_id"),
-                "runs": raw["runs"],
-                "licensed_runs": raw.get("licensed_runs", 0),
-                "cost": cost,
-            },
+        jobs.append(
+            EveCharacterIndustryJob(
+                job_id=raw["job_id"],
+                character_id=character.pk,
+                activity_id=raw["activity_id"],
+                blueprint_id=raw["blueprint_id"],
+                blueprint_type_id=raw["blueprint_type_id"],
+                blueprint_location_id=raw["blueprint_location_id"],
+                facility_id=raw["facility_id"],
+                location_id=raw["station_id"],
+                output_location_id=raw["output_location_id"],
+                status=raw["status"],
+                installer_id=raw["installer_id"],
+                start_date=_parse_esi_date(raw["start_date"]),
+                end_date=_parse_esi_date(raw["end_date"]),
+                duration=raw["duration"],
+                completed_date=completed_date,
+                completed_character_id=raw.get("completed_character_id"),
+                runs=raw["runs"],
+                licensed_runs=raw.get("licensed_runs", 0),
+                cost=cost,
+            )
         )
-        if created:
-            created_job_ids.append(job.job_id)
+    result = bulk_upsert(
+        queryset=EveCharacterIndustryJob.objects.all(),
+        instances=jobs,
+        key_fields=["job_id"],
+        update_fields=INDUSTRY_JOB_UPSERT_FIELDS,
+    )
     logger.info(
-        "Synced %s industry job(s) for character %s",
+        "Synced %s industry job(s) for character %s: "
+        "%s inserted, %s updated, %s unchanged",
         len(jobs_data),
         eve_character_id,
+        result.inserted,
+        result.updated,
+        result.unchanged,
     )
-    return len(jobs_data), created_job_ids
+    return len(jobs_data), [job.job_id for job in result.created]
 
 
 def update_character_blueprints(eve_character_id: int) -> int:
@@ -5,10 +5,11 @@ from collections import defaultdict
 from decimal import Decimal
 
 from django.db import models
+from django.utils import timezone
 from esi.models import Token
 
 from eveonline.client import EsiClient
-from eveonline.helpers.db_sync import replace_with_bulk_create
+from eveonline.helpers.db_sync import bulk_upsert, replace_with_bulk_create
 from eveonline.helpers.esi import parse_esi_date
 from eveonline.models import (
     EveAlliance,
@@ -18,6 +19,7 @@ from eveonline.models import (
     EveCorporationContract,
     EveCorporationIndustryJob,
     EveCorporationWalletJournalEntry,
+    EveCorporationWalletJournalWatermark,
 )
 
 logger = logging.getLogger(__name__)
@@ -31,7 +33,53 @@ SCOPE_CHARACTER_CONTRACTS = ["esi-contracts.read_character_contracts.v1"]
 SCOPE_CORPORATION_INDUSTRY_JOBS = ["esi-industry.read_corporation_jobs.v1"]
 SCOPE_CORPORATION_BLUEPRINTS = ["esi-corporations.read_blueprints.v1"]
 SCOPE_CORPORATION_WALLET = ["esi-wallet.read_corporation_wallets.v1"]
+WALLET_DIVISIONS = range(1, 8)
 CONTRACT_FETCH_SPREAD_SECONDS = 4 * 3600  # 4 hours
+# Columns bulk_upsert compares and rewrites on re-sync.
+CONTRACT_UPSERT_FIELDS = [
+    "corporation",
+    "type",
+    "status",
+    "availability",
+    "issuer_id",
+    "issuer_corporation_id",
+    "assignee_id",
+    "acceptor_id",
+    "for_corporation",
+    "date_issued",
+    "date_expired",
+    "date_accepted",
+    "date_completed",
+    "days_to_complete",
+    "price",
+    "reward",
+    "collateral",
+    "buyout",
+    "volume",
+    "start_location_id",
+    "end_location_id",
+    "title",
+]
+INDUSTRY_JOB_UPSERT_FIELDS = [
+    "corporation",
+    "activity_id",
+    "blueprint_id",
+    "blueprint_type_id",
+    "blueprint_location_id",
+    "facility_id",
+    "location_id",
+    "output_location_id",
+    "status",
+    "installer_id",
+    "start_date",
+    "end_date",
+    "duration",
+    "completed_date",
+    "completed_character_id",
+    "runs",
+    "licensed_runs",
+    "cost",
+]
 
 
 def alliance_corporation_ids():
@@ -323,6 +371,8 @@ def update_corporation_members_and_roles(corporation_id: int) -> None:
         )
         return
 
+    # Applied even when served from the response cache: the cache is shared
+    # with other callers, and this is a single query when nothing is new.
     member_ids = esi_members.results()
     existing_member_ids = set(
         EveCharacter.objects.filter(character_id__in=member_ids).values_list(
@@ -425,8 +475,8 @@ def update_corporation_contracts(corporation_id: int) -> int:
         return 0
 
     contracts_data = response.results() or []
+    contracts = []
     for raw in contracts_data:
-        contract_id = raw["contract_id"]
         price = raw.get("price")
         if price is not None:
             price = Decimal(str(price))
@@ -443,38 +493,48 @@ def update_corporation_contracts(corporation_id: int) -> int:
         if volume is not None:
             volume = Decimal(str(volume))
 
-        EveCorporationContract.objects.update_or_create(
-            contract_id=contract_id,
-            defaults={
-                "corporation_id": corporation.pk,
-                "type": raw.get("type", ""),
-                "status": raw.get("status", ""),
-                "availability": raw.get("availability", ""),
-                "issuer_id": raw.get("issuer_id"),
-                "issuer_corporation_id": raw.get("issuer_corporation_id"),
-                "assignee_id": raw.get("assignee_id"),
-                "acceptor_id": raw.get("acceptor_id"),
-                "for_corporation": raw.get("for_corporation", False),
-                "date_issued": parse_esi_date(raw.get("date_issued")),
-                "date_expired": parse_esi_date(raw.get("date_expired")),
-                "date_accepted": parse_esi_date(raw.get("date_accepted")),
-                "date_completed": parse_esi_date(raw.get("date_completed")),
-                "days_to_complete": raw.get("days_to_complete"),
-                "price": price,
-                "reward": reward,
-                "collateral": collateral,
-                "buyout": buyout,
-                "volume": volume,
-                "start_location_id": raw.get("start_location_id"),
-                "end_location_id": raw.get("end_location_id"),
-                "title": raw.get("title", ""),
-            },
+        contracts.append(
+            EveCorporationContract(
+                contract_id=raw["contract_id"],
+                corporation_id=corporation.pk,
+                type=raw.get("type", ""),
+                status=raw.get("status", ""),
+                availability=raw.get("availability", ""),
+                issuer_id=raw.get("issuer_id"),
+                issuer_corporation_id=raw.get("issuer_corporation_id"),
+                assignee_id=raw.get("assignee_id"),
+                acceptor_id=raw.get("acceptor_id"),
+                for_corporation=raw.get("for_corporation", False),
+                date_issued=parse_esi_date(raw.get("date_issued")),
+                date_expired=parse_esi_date(raw.get("date_expired")),
+                date_accepted=parse_esi_date(raw.get("date_accepted")),
+                date_completed=parse_esi_date(raw.get("date_completed")),
+                days_to_complete=raw.get("days_to_complete"),
+                price=price,
+                reward=reward,
+                collateral=collateral,
+                buyout=buyout,
+                volume=volume,
+                start_location_id=raw.get("start_location_id"),
+                end_location_id=raw.get("end_location_id"),
+                title=raw.get("title", ""),
+            )
         )
+    result = bulk_upsert(
+        queryset=EveCorporationContract.objects.all(),
+        instances=contracts,
+        key_fields=["contract_id"],
+        update_fields=CONTRACT_UPSERT_FIELDS,
+    )
     logger.info(
-        "Synced %s contract(s) for corporation %s (%s)",
+        "Synced %s contract(s) for corporation %s (%s): "
+        "%s inserted, %s updated, %s unchanged",
         len(contracts_data),
         corporation.name,
         corporation_id,
+        result.inserted,
+        result.updated,
+        result.unchanged,
     )
     return len(contracts_data)
 
@@ -518,8 +578,8 @@ def update_corporation_industry_jobs(corporation_id: int) -> int:
         return 0
 
     jobs_data = response.results() or []
+    jobs = []
     for raw in jobs_data:
-        job_id = raw["job_id"]
         completed_date = parse_esi_date(raw.get("completed_date"))
         cost = raw.get("cost")
         if cost is not None:
@@ -527,34 +587,44 @@ def update_corporation_industry_jobs(corporation_id: int) -> int:
         # ESI uses station_id for corporation jobs too
         location_id = raw.get("station_id", raw.get("location_id"))
 
-        EveCorporationIndustryJob.objects.update_or_create(
-            job_id=job_id,
-            defaults={
-                "corporation_id": corporation.pk,
-                "activity_id": raw["activity_id"],
-                "blueprint_id": raw["blueprint_id"],
-                "blueprint_type_id": raw["blueprint_type_id"],
-                "blueprint_location_id": raw["blueprint_location_id"],
-                "facility_id": raw["facility_id"],
-                "location_id": location_id,
-                "output_location_id": raw["output_location_id"],
-                "status": raw["status"],
-                "installer_id": raw["installer_id"],
-                "start_date": parse_esi_date(raw["start_date"]),
-                "end_date": parse_esi_date(raw["end_date"]),
-                "duration": raw["duration"],
-                "completed_date": completed_date,
-                "completed_character_id": raw.get("completed_character_id"),
-                "runs": raw["runs"],
-                "licensed_runs": raw.get("licensed_runs", 0),
-                "cost": cost,
-            },
+        jobs.append(
+            EveCorporationIndustryJob(
+                job_id=raw["job_id"],
+                corporation_id=corporation.pk,
+                activity_id=raw["activity_id"],
+                blueprint_id=raw["blueprint_id"],
+                blueprint_type_id=raw["blueprint_type_id"],
+                blueprint_location_id=raw["blueprint_location_id"],
+                facility_id=raw["facility_id"],
+                location_id=location_id,
+                output_location_id=raw["output_location_id"],
+                status=raw["status"],
+                installer_id=raw["installer_id"],
+                start_date=parse_esi_date(raw["start_date"]),
+                end_date=parse_esi_date(raw["end_date"]),
+                duration=raw["duration"],
+                completed_date=completed_date,
+                completed_character_id=raw.get("completed_character_id"),
+                runs=raw["runs"],
+                licensed_runs=raw.get("licensed_runs", 0),
+                cost=cost,
+            )
         )
+    result = bulk_upsert(
+        queryset=EveCorporationIndustryJob.objects.all(),
+        instances=jobs,
+        key_fields=["job_id"],
+        update_fields=INDUSTRY_JOB_UPSERT_FIELDS,
+    )
     logger.info(
-        "Synced %s industry job(s) for corporation %s (%s)",
+        "Synced %s industry job(s) for corporation %s (%s): "
+        "%s inserted, %s updated, %s unchanged",
         len(jobs_data),
         corporation.name,
         corporation_id,
+        result.inserted,
+        result.updated,
+        result.unchanged,
     )
     return len(jobs_data)
 
@@ -629,11 +699,117 @@ def update_corporation_blueprints(corporation_id: int) -> int:
     return len(deduped_blueprints)
 
 
+def _wallet_journal_entry(
+    corporation, raw
+) -> EveCorporationWalletJournalEntry:
+    amount = raw.get("amount")
+    balance = raw.get("balance")
+    return EveCorporationWalletJournalEntry(
+        corporation=corporation,
+        division=raw.get("division", 1),
+        ref_id=raw["id"],
+        date=parse_esi_date(raw.get("date")),
+        ref_type=raw.get("ref_type", ""),
+        first_party_id=raw.get("first_party_id"),
+        second_party_id=raw.get("second_party_id"),
+        amount=Decimal(str(amount)) if amount is not None else None,
+        balance=Decimal(str(balance)) if balance is not None else None,
+        description=raw.get("description", ""),
+        context_id=raw.get("context_id"),
+        context_id_type=raw.get("context_id_type", ""),
+        reason=raw.get("reason", ""),
+    )
+
+
+def _wallet_journal_watermarks(corporation) -> dict:
+    """Watermark per division; divisions without one start at the stored max."""
+    watermarks = {
+        watermark.division: watermark
+        for watermark in EveCorporationWalletJournalWatermark.objects.filter(
+            corporation=corporation
+        )
+    }
+    missing = [d for d in WALLET_DIVISIONS if d not in watermarks]
+    if missing:
+        stored_max = dict(
+            EveCorporationWalletJournalEntry.objects.filter(
+                corporation=corporation, division__in=missing
+            )
+            .values("division")
+            .annotate(max_ref_id=models.Max("ref_id"))
+            .values_list("division", "max_ref_id")
+        )
+        for division in missing:
+            watermarks[division] = EveCorporationWalletJournalWatermark(
+                corporation=corporation,
+                division=division,
+                max_ref_id=stored_max.get(division) or 0,
+            )
+    return watermarks
+
+
+def _sync_wallet_journal_division(client, corporation, watermark) -> bool:
+    """
+    Page one division back to its watermark, inserting new entries page by
+    page. Pages come newest first, so the first page that reaches the
+    watermark is the last one needed. Advances the watermark (and records
+    pages/inserted on it) only when the division synced without error.
+    """
+    known = watermark.max_ref_id
+    highest = known
+    pages = inserted = 0
+    for response in client.iter_corporation_wallet_journal_pages(
+        corporation.corporation_id, watermark.division
+    ):
+        if not response.success():
+            logger.warning(
+                "ESI error %s fetching wallet journal division %s for "
+                "corporation %s (%s)",
+                response.response_code,
+                watermark.division,
+                corporation.name,
+                corporation.corporation_id,
+            )
+            return False
+        pages += 1
+        rows = [raw for raw in response.results() or [] if raw.get("id")]
+        new_rows = [raw for raw in rows if raw["id"] > known]
+        # A run that failed part-way stored pages above the watermark;
+        # leave those out so last_inserted counts only rows written now.
+        stored = set(
+            EveCorporationWalletJournalEntry.objects.filter(
+                corporation=corporation,
+                division=watermark.division,
+                ref_id__in=[raw["id"] for raw in new_rows],
+            ).values_list("ref_id", flat=True)
+        )
+        entries = [
+            _wallet_journal_entry(corporation, raw)
+            for raw in new_rows
+            if raw["id"] not in stored
+        ]
+        EveCorporationWalletJournalEntry.objects.bulk_create(
+            entries, ignore_conflicts=True, batch_size=1000
+        )
+        inserted += len(entries)
+        highest = max([highest, *(raw["id"] for raw in new_rows)])
+        if len(new_rows) < len(rows):
+            break
+    watermark.max_ref_id = highest
+    watermark.synced_at = timezone.now()
+    watermark.last_pages = pages
+    watermark.last_inserted = inserted
+    return True
+
+
 def update_corporation_wallet_journal(corporation_id: int) -> int:
     """
     Sync corporation wallet journal from ESI into EveCorporationWalletJournalEntry.
-    Fetches all divisions (1-7) and all pages. Only runs when a director (or CEO)
-    has esi-wallet.read_corporation_wallets.v1. Returns count of entries synced.
+
+    Journal entries never change once written, so each division is only paged
+    back to the highest ref_id already stored (its watermark) and new entries
+    are bulk inserted. Only runs when a director (or CEO) has
+    esi-wallet.read_corporation_wallets.v1. Returns count of entries inserted.
     """
     corporation = EveCorporation.objects.filter(
         corporation_id=corporation_id
@@ -654,55 +830,29 @@ def update_corporation_wallet_journal(corporation_id: int) -> int:
         )
         return 0
 
-    response = EsiClient(
-        character
-    ).get_corporation_wallet_journal_all_divisions(corporation.corporation_id)
-    if not response.success():
-        logger.warning(
-            "ESI error %s fetching wallet journal for corporation %s (%s)",
-            response.response_code,
-            corporation.name,
-            corporation_id,
-        )
-        return 0
-
-    entries_data = response.results() or []
-    synced = 0
-    for raw in entries_data:
-        ref_id = raw.get("id")
-        if ref_id is None:
-            continue
-        division = raw.get("division", 1)
-        amount = raw.get("amount")
-        if amount is not None:
-            amount = Decimal(str(amount))
-        balance = raw.get("balance")
-        if balance is not None:
-            balance = Decimal(str(balance))
-
-        EveCorporationWalletJournalEntry.objects.update_or_create(
-            corporation=corporation,
-            division=division,
-            ref_id=ref_id,
-            defaults={
-                "date": parse_esi_date(raw.get("date")),
-                "ref_type": raw.get("ref_type", ""),
-                "first_party_id": raw.get("first_party_id"),
-                "second_party_id": raw.get("second_party_id"),
-                "amount": amount,
-                "balance": balance,
-                "description": raw.get("description", ""),
-                "context_id": raw.get("context_id"),
-                "context_id_type": raw.get("context_id_type", ""),
-                "reason": raw.get("reason", ""),
-            },
-        )
-        synced += 1
-
+    client = EsiClient(character)
+    watermarks = _wallet_journal_watermarks(corporation)
+    synced = [
+        watermark
+        for watermark in watermarks.values()
+        if _sync_wallet_journal_division(client, corporation, watermark)
+    ]
+    EveCorporationWalletJournalWatermark.objects.bulk_create(
+        [watermark for watermark in synced if watermark.pk is None]
+    )
+    EveCorporationWalletJournalWatermark.objects.bulk_update(
+        [watermark for watermark in synced if watermark.pk is not None],
+        ["max_ref_id", "synced_at", "last_pages", "last_inserted"],
+    )
+    inserted = sum(watermark.last_inserted for watermark in synced)
     logger.info(
-        "Synced %s wallet journal entry(ies) for corporation %s (%s)",
-        synced,
+        "Synced %s new wallet journal entry(ies) for corporation %s (%s): %s",
+        inserted,
         corporation.name,
         corporation_id,
+        ", ".join(
+            f"div {w.division} pages={w.last_pages} inserted={w.last_inserted}"
+            for w in sorted(synced, key=lambda w: w.division)
+        ),
     )
-    return synced
+    return inserted
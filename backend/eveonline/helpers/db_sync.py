@@ -1,8 +1,19 @@
-"""Shared helpers for atomic delete-and-bulk-insert sync patterns."""
+"""
+Shared helpers for syncing ESI data into tables: atomic delete-and-bulk-insert
+(replace_with_bulk_create) and keyed bulk upsert (bulk_upsert).
+"""
 
 import time
+from dataclasses import dataclass, field
+from decimal import Decimal
 
-from django.db import IntegrityError, OperationalError, transaction
+from django.db import (
+    IntegrityError,
+    OperationalError,
+    connections,
+    models,
+    transaction,
+)
 
 DEADLOCK_MAX_ATTEMPTS = 3
 BULK_CREATE_BATCH = 500
@@ -10,24 +21,15 @@ MYSQL_DEADLOCK_ERRNO = 1213
 MYSQL_DUPLICATE_ERRNO = 1062
 
 
-def replace_with_bulk_create(*, delete_queryset, instances):
+def _retry_on_conflict(func):
     """
-    Delete rows matching delete_queryset, then bulk_create instances inside
-    one transaction. Retries on MySQL deadlock (1213) and duplicate-key
-    races (1062) from concurrent syncs.
-    Returns the number of rows created.
+    Run func inside a transaction. Retries on MySQL deadlock (1213) and
+    duplicate-key races (1062) from concurrent syncs.
     """
-    model = delete_queryset.model
     for attempt in range(DEADLOCK_MAX_ATTEMPTS):
         try:
             with transaction.atomic():
-                delete_queryset.delete()
-                if instances:
-                    for offset in range(0, len(instances), BULK_CREATE_BATCH):
-                        model.objects.bulk_create(
-                            instances[offset : offset + BULK_CREATE_BATCH]
-                        )
-            return len(instances)
+                return func()
         except OperationalError as exc:
             errno = exc.args[0] if exc.args else None
             if errno != MYSQL_DEADLOCK_ERRNO or attempt >= (
@@ -42,4 +44,149 @@ def replace_with_bulk_create(*, delete_queryset, instances):
             ):
                 raise
             time.sleep(0.1 * (attempt + 1))
-    return 0
+    return None
+
+
+def replace_with_bulk_create(*, delete_queryset, instances):
+    """
+    Delete rows matching delete_queryset, then bulk_create instances inside
+    one transaction. Retries on MySQL deadlock (1213) and duplicate-key
+    races (1062) from concurrent syncs.
+    Returns the number of rows created.
+    """
+    model = delete_queryset.model
+
+    def replace():
+        delete_queryset.delete()
+        for offset in range(0, len(instances), BULK_CREATE_BATCH):
+            model.objects.bulk_create(
+                instances[offset : offset + BULK_CREATE_BATCH]
+            )
+        return len(instances)
+
+    return _retry_on_conflict(replace) or 0
+
+
+def conflict_unique_fields(using, unique_fields):
+    """
+    unique_fields for bulk_create(update_conflicts=True) on this database.
+    MySQL's ON DUPLICATE KEY UPDATE takes no conflict target, and Django
+    raises NotSupportedError when one is given, so None is returned there.
+    """
+    if connections[using].features.supports_update_conflicts_with_target:
+        return list(unique_fields)
+    return None
+
+
+@dataclass
+class UpsertResult:
+    """Row counts from one bulk_upsert call."""
+
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    created: list = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        return self.inserted + self.updated + self.unchanged
+
+
+def _comparable(model_field, value):
+    """Value as the column stores it, so re-synced rows compare equal."""
+    if isinstance(model_field, models.DecimalField) and value is not None:
+        return Decimal(value).quantize(
+            Decimal(1).scaleb(-model_field.decimal_places)
+        )
+    return value
+
+
+def bulk_upsert(*, queryset, instances, key_fields, update_fields):
+    """
+    Insert or update instances keyed by key_fields (a unique constraint on
+    the model), inside one transaction with the same retries as
+    replace_with_bulk_create.
+
+    Existing rows are prefetched from queryset in one query and compared on
+    update_fields: new keys are bulk inserted (insert-on-duplicate-key-update,
+    so a concurrent sync inserting the same key updates instead of failing),
+    changed rows are written with bulk_update, and unchanged rows are not
+    written at all. auto_now fields only move when a row changes. Rows are
+    never deleted. Later instances win when a key repeats.
+    Returns an UpsertResult; created holds the inserted instances.
+    """
+    model = queryset.model
+    opts = model._meta
+    key_attnames = [opts.get_field(name).attname for name in key_fields]
+    compared = [opts.get_field(name) for name in update_fields]
+    auto_now = [
+        f.name
+        for f in opts.concrete_fields
+        if getattr(f, "auto_now", False) and f.name not in update_fields
+    ]
+
+    def key_of(obj):
+        return tuple(getattr(obj, attname) for attname in key_attnames)
+
+    incoming = {key_of(obj): obj for obj in instances}
+    unique_fields = conflict_unique_fields(queryset.db, key_fields)
+
+    def upsert():
+        result = UpsertResult()
+        existing = {}
+        if incoming:
+            lookups = {
+                f"{attname}__in": {key[i] for key in incoming}
+                for i, attname in enumerate(key_attnames)
+            }
+            existing = {key_of(obj): obj for obj in queryset.filter(**lookups)}
+        changed, changed_fields = [], set()
+        for key, obj in incoming.items():
+            row = existing.get(key)
+            if row is None:
+                result.created.append(obj)
+                continue
+            fields = [
+                f
+                for f in compared
+                if _comparable(f, getattr(row, f.attname))
+                != _comparable(f, getattr(obj, f.attname))
+            ]
+            if not fields:
+                result.unchanged += 1
+                continue
+            for f in fields:
+                setattr(row, f.attname, getattr(obj, f.attname))
+                changed_fields.add(f.name)
+            changed.append(row)
+
+        if result.created:
+            if update_fields:
+                model.objects.bulk_create(
+                    result.created,
+                    batch_size=BULK_CREATE_BATCH,
+                    update_conflicts=True,
+                    unique_fields=unique_fields,
+                    update_fields=list(update_fields) + auto_now,
+                )
+            else:
+                model.objects.bulk_create(
+                    result.created,
+                    batch_size=BULK_CREATE_BATCH,
+                    ignore_conflicts=True,
+                )
+        if changed:
+            for name in auto_now:
+                touch = opts.get_field(name).pre_save
+                for row in changed:
+                    touch(row, add=False)
+            model.objects.bulk_update(
+                changed,
+                sorted(changed_fields) + auto_now,
+                batch_size=BULK_CREATE_BATCH,
+            )
+        result.inserted = len(result.created)
+        result.updated = len(changed)
+        return result
+
+    return _retry_on_conflict(upsert)
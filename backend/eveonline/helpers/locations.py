@@ -4,8 +4,8 @@ import logging
 
 from eveuniverse.models import EveStation
 
-from eveonline.client import EsiClient
 from eveonline.models import EveLocation
+from eveonline.universe_names import resolve_universe_name_map
 
 logger = logging.getLogger(__name__)
 
@@ -38,11 +38,9 @@ def resolve_location_name(
             )
 
     try:
-        response = EsiClient(None).resolve_universe_names([location_id])
-        if response.success():
-            results = response.results() or []
-            if results:
-                return results[0].get("name") or ""
+        resolved = resolve_universe_name_map([location_id])
+        if location_id in resolved:
+            return resolved[location_id]
     except Exception:
         logger.debug(
             "Could not resolve location %s via ESI names",
@@ -0,0 +1,171 @@
+"""
+Time the ESI skill sync for one synthetic character two ways:
+
+- ``per-skill``: the previous upsert path, a type lookup, up to three
+  counts and a save for every skill;
+- ``bulk``: sync_character_skills, one diff against the stored rows.
+
+Each mode replays a first sync (every skill new) and a refresh where a
+tenth of the skills gained points. Everything runs inside a transaction
+that is rolled back, so no rows are left behind. The command fails if the
+two modes leave different skill rows.
+
+    pipenv run python manage.py benchmark_skill_sync
+    pipenv run python manage.py benchmark_skill_sync --skills 500
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from eveuniverse.models import EveCategory, EveGroup, EveType
+from eveuniverse.models.base import determine_effective_sections
+
+from eveonline.client import EsiClient
+from eveonline.helpers.characters.skills import sync_character_skills
+from eveonline.models import EveCharacter, EveCharacterSkill
+
+FIRST_SKILL_TYPE_ID = 990000
+BENCH_CHARACTER_ID = 2099999999
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _per_skill_upsert(character: EveCharacter, esi_skill) -> None:
+    """The skill upsert before sync_character_skills."""
+    skill_type = EsiClient(None).get_eve_type(esi_skill["skill_id"])
+    qry = EveCharacterSkill.objects.filter(
+        character=character, skill_id=esi_skill["skill_id"]
+    ).order_by("-skill_points")
+    if qry.count() == 0:
+        skill = EveCharacterSkill(
+            character=character,
+            skill_id=esi_skill["skill_id"],
+            skill_name=skill_type.name,
+            skill_points=esi_skill["skillpoints_in_skill"],
+            skill_level=esi_skill["trained_skill_level"],
+        )
+    else:
+        skill = qry.first()
+        skill.skill_points = esi_skill["skillpoints_in_skill"]
+        skill.skill_level = esi_skill["trained_skill_level"]
+    skill.save()
+    if qry.count() > 1:
+        qry.last().delete()
+
+
+def _esi_skills(count: int, trained_every: int = 0) -> list:
+    skills = []
+    for n in range(count):
+        level = 1 + n % 5
+        if trained_every and n % trained_every == 0:
+            level = min(level + 1, 5)
+        skills.append(
+            {
+                "skill_id": FIRST_SKILL_TYPE_ID + n,
+                "skillpoints_in_skill": level * 8000,
+                "trained_skill_level": level,
+            }
+        )
+    return skills
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark character skill sync with per-skill upserts versus the "
+        "bulk diff."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--skills", type=int, default=300)
+
+    def handle(self, *args, **options):
+        if options["skills"] < 1:
+            raise CommandError("--skills must be at least 1")
+        passes = (
+            ("first", _esi_skills(options["skills"])),
+            ("refresh", _esi_skills(options["skills"], trained_every=10)),
+        )
+        results = {}
+        for mode in ("per-skill", "bulk"):
+            results[mode] = self._run(mode, passes)
+        if results["per-skill"] != results["bulk"]:
+            raise CommandError("Per-skill and bulk sync left different rows")
+        self.stdout.write("Skill rows identical")
+
+    def _run(self, mode: str, passes) -> list:
+        rows = []
+        try:
+            with transaction.atomic():
+                character = self._fixture(len(passes[0][1]))
+                for label, esi_skills in passes:
+                    with CaptureQueriesContext(connection) as queries:
+                        start = time.perf_counter()
+                        if mode == "bulk":
+                            sync_character_skills(character, esi_skills)
+                        else:
+                            for esi_skill in esi_skills:
+                                _per_skill_upsert(character, esi_skill)
+                        elapsed = time.perf_counter() - start
+                    self.stdout.write(
+                        f"{mode:<9} {label:<7} {elapsed * 1000:.1f}ms "
+                        f"queries={len(queries)}"
+                    )
+                rows = list(
+                    EveCharacterSkill.objects.filter(character=character)
+                    .order_by("skill_id")
+                    .values_list(
+                        "skill_id", "skill_name", "skill_points", "skill_level"
+                    )
+                )
+                raise _Rollback
+        except _Rollback:
+            pass
+        return rows
+
+    def _fixture(self, count: int) -> EveCharacter:
+        category, _ = EveCategory.objects.get_or_create(
+            id=16, defaults={"name": "Skill", "published": True}
+        )
+        group, _ = EveGroup.objects.get_or_create(
+            id=255,
+            defaults={
+                "name": "Gunnery",
+                "published": True,
+                "eve_category": category,
+            },
+        )
+        types = EveType.objects.bulk_create(
+            [
+                EveType(
+                    id=FIRST_SKILL_TYPE_ID + n,
+                    name=f"Benchmark Skill {n}",
+                    published=True,
+                    eve_group=group,
+                )
+                for n in range(count)
+            ],
+            ignore_conflicts=True,
+        )
+        # Mark the types as fully loaded so get_or_create_esi in the
+        # per-skill path finds them instead of calling ESI.
+        EveType.objects.filter(pk__in=[t.pk for t in types]).update(
+            enabled_sections=sum(
+                int(getattr(EveType.enabled_sections, section))
+                for section in determine_effective_sections(None)
+                if str(section) in EveType.Section.values()
+            )
+        )
+        # bulk_create skips the post_save hooks that would call ESI.
+        EveCharacter.objects.bulk_create(
+            [
+                EveCharacter(
+                    character_id=BENCH_CHARACTER_ID,
+                    character_name="Skill Benchmark",
+                )
+            ]
+        )
+        return EveCharacter.objects.get(character_id=BENCH_CHARACTER_ID)
@@ -2,7 +2,9 @@
 Copy EveSkillset rows from production_readonly into the local default database.
 
 Reads production via the read-only alias; writes only to default. Upserts by
-primary key so local FKs stay aligned with production IDs.
+primary key so local FKs stay aligned with production IDs, then rebuilds
+character readiness for every synced skillset in-process, so it works
+without a Celery worker.
 
 Usage (from backend/, with DB_READONLY_* / production_readonly configured):
 
@@ -19,9 +21,10 @@ Options:
 from django.core.management.base import BaseCommand
 from django.db import transaction
 
-from eveonline.helpers.characters import create_eve_character_skillset
+from eveonline.helpers.characters import refresh_skillset_readiness
+from eveonline.helpers.db_sync import bulk_upsert
 from eveonline.helpers.production_import import validate_source_alias
-from eveonline.models import EveCharacterSkill, EveSkillset
+from eveonline.models import EveSkillset
 
 SKILLSET_FIELDS = ("name", "skills", "total_skill_points")
 
@@ -75,50 +78,40 @@ class Command(BaseCommand):
                     )
                 )
 
-            created = 0
-            updated = 0
-            for prod in prod_skillsets:
-                defaults = {
-                    field: getattr(prod, field) for field in SKILLSET_FIELDS
-                }
-                _, was_created = EveSkillset.objects.using(
-                    local
-                ).update_or_create(
-                    pk=prod.pk,
-                    defaults=defaults,
-                )
-                if was_created:
-                    created += 1
-                else:
-                    updated += 1
+            # bulk_upsert sends no post_save, so on_skillset_saved does not
+            # also queue a readiness refresh for each row.
+            result = bulk_upsert(
+                queryset=EveSkillset.objects.using(local).all(),
+                instances=[
+                    EveSkillset(
+                        pk=prod.pk,
+                        **{
+                            field: getattr(prod, field)
+                            for field in SKILLSET_FIELDS
+                        },
+                    )
+                    for prod in prod_skillsets
+                ],
+                key_fields=["id"],
+                update_fields=list(SKILLSET_FIELDS),
+            )
 
         local_count = EveSkillset.objects.using(local).count()
         self.stdout.write(
             self.style.SUCCESS(
-                f"Done. created={created} updated={updated} "
-                f"local_total={local_count}"
+                f"Done. created={result.inserted} updated={result.updated} "
+                f"unchanged={result.unchanged} local_total={local_count}"
             )
         )
 
-        rebuilt = self._rebuild_character_skillsets(local)
-        if rebuilt:
-            self.stdout.write(
-                self.style.SUCCESS(
-                    f"Rebuilt EveCharacterSkillset for {rebuilt} characters."
-                )
+        written = 0
+        for skillset in EveSkillset.objects.using(local).filter(
+            pk__in=[prod.pk for prod in prod_skillsets]
+        ):
+            written += refresh_skillset_readiness(skillset)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Refreshed readiness for {len(prod_skillsets)} skillsets "
+                f"({written} rows written)."
             )
-
-    def _rebuild_character_skillsets(self, local: str) -> int:
-        character_ids = list(
-            EveCharacterSkill.objects.using(local)
-            .values_list("character__character_id", flat=True)
-            .distinct()
         )
-        skillsets = list(EveSkillset.objects.using(local).all())
-        if not character_ids or not skillsets:
-            return 0
-
-        for character_id in character_ids:
-            for skillset in skillsets:
-                create_eve_character_skillset(character_id, skillset)
-        return len(character_ids)
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:16
+
+from django.db import migrations, models
+
+
+def backfill_is_ready(apps, schema_editor):
+    """Rows written so far store an empty JSON list when nothing is missing."""
+    EveCharacterSkillset = apps.get_model("eveonline", "EveCharacterSkillset")
+    EveCharacterSkillset.objects.filter(missing_skills__in=["[]", ""]).update(
+        is_ready=True
+    )
+
+
+def noop(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("eveonline", "0102_character_corporation_history"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="evecharacterskillset",
+            name="is_ready",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name="evecharacterskillset",
+            index=models.Index(
+                fields=["eve_skillset", "is_ready"],
+                name="eveonline_skillset_ready",
+            ),
+        ),
+        migrations.RunPython(backfill_is_ready, noop),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("eveonline", "0103_evecharacterskillset_is_ready"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EveCharacterRefreshState",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "data_type",
+                    models.CharField(
+                        choices=[
+                            ("assets", "Assets"),
+                            ("skills", "Skills"),
+                            ("killmails", "Killmails"),
+                            ("contracts", "Contracts"),
+                            ("industry_jobs", "Industry jobs"),
+                            ("mining", "Mining"),
+                            ("planets", "Planets"),
+                            ("blueprints", "Blueprints"),
+                            ("clones", "Clones"),
+                        ],
+                        max_length=16,
+                    ),
+                ),
+                ("refreshed_at", models.DateTimeField(blank=True, null=True)),
+                ("due_at", models.DateTimeField()),
+                ("queued_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "lag_seconds",
+                    models.PositiveIntegerField(blank=True, null=True),
+                ),
+                (
+                    "last_error",
+                    models.CharField(blank=True, default="", max_length=255),
+                ),
+                (
+                    "character",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="refresh_states",
+                        to="eveonline.evecharacter",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["due_at"], name="eveonline_e_due_at_273fd2_idx"
+                    )
+                ],
+                "unique_together": {("character", "data_type")},
+            },
+        ),
+    ]
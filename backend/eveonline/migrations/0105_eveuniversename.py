@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("eveonline", "0104_evecharacterrefreshstate"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EveUniverseName",
+            fields=[
+                (
+                    "id",
+                    models.BigIntegerField(primary_key=True, serialize=False),
+                ),
+                (
+                    "name",
+                    models.CharField(blank=True, default="", max_length=255),
+                ),
+                (
+                    "category",
+                    models.CharField(blank=True, default="", max_length=32),
+                ),
+                ("missing", models.BooleanField(default=False)),
+                ("resolved_at", models.DateTimeField()),
+            ],
+            options={
+                "verbose_name": "Universe name",
+            },
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("eveonline", "0105_eveuniversename"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EveCorporationWalletJournalWatermark",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "division",
+                    models.PositiveSmallIntegerField(
+                        help_text="Wallet division 1-7."
+                    ),
+                ),
+                ("max_ref_id", models.BigIntegerField(default=0)),
+                ("synced_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "last_pages",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="ESI pages fetched by the last sync.",
+                    ),
+                ),
+                (
+                    "last_inserted",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="New entries written by the last sync.",
+                    ),
+                ),
+                (
+                    "corporation",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="wallet_journal_watermarks",
+                        to="eveonline.evecorporation",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "corporation wallet journal watermark",
+                "unique_together": {("corporation", "division")},
+            },
+        ),
+    ]
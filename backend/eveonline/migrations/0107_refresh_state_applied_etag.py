@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("eveonline", "0106_evecorporationwalletjournalwatermark"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="evecharacterrefreshstate",
+            name="applied_etag",
+            field=models.CharField(blank=True, default="", max_length=128),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Remove the every-4h full character update beat entry; it was replaced by
+# the staleness scheduler (schedule_character_refreshes).
+
+from django.db import migrations
+
+STALE_TASK_NAMES = (
+    "[Characters] Update Characters (assets, skills, killmails)",
+)
+
+
+def remove_stale_periodic_tasks(apps, schema_editor):
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+    PeriodicTask.objects.filter(name__in=STALE_TASK_NAMES).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("eveonline", "0107_refresh_state_applied_etag"),
+        ("django_celery_beat", "0019_alter_periodictasks_options"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            remove_stale_periodic_tasks,
+            migrations.RunPython.noop,
+        ),
+    ]
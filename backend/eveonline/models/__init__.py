@@ -14,6 +14,7 @@ from eveonline.models.characters import (
     EveCharacterMiningEntry,
     EveCharacterPlanet,
     EveCharacterPlanetOutput,
+    EveCharacterRefreshState,
     EveCharacterSkill,
     EveCharacterSkillset,
     EveCharacterTag,
@@ -29,8 +30,9 @@ from eveonline.models.corporations import (
     EveCorporationContract,
     EveCorporationIndustryJob,
     EveCorporationWalletJournalEntry,
+    EveCorporationWalletJournalWatermark,
 )
-from eveonline.models.universe import EveUniverseSchematic
+from eveonline.models.universe import EveUniverseName, EveUniverseSchematic
 
 __all__ = [
     "EveAlliance",
@@ -47,6 +49,7 @@ __all__ = [
     "EveCharacterMiningEntry",
     "EveCharacterPlanet",
     "EveCharacterPlanetOutput",
+    "EveCharacterRefreshState",
     "EveCharacterSkill",
     "EveCharacterSkillset",
     "EveCharacterTag",
@@ -57,9 +60,11 @@ __all__ = [
     "EveCorporationContract",
     "EveCorporationIndustryJob",
     "EveCorporationWalletJournalEntry",
+    "EveCorporationWalletJournalWatermark",
     "EveLocation",
     "EvePlayer",
     "EveSkillset",
     "EveTag",
+    "EveUniverseName",
     "EveUniverseSchematic",
 ]
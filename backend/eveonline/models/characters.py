@@ -464,6 +464,50 @@ class EveCharacterClone(models.Model):
         )
 
 
+class EveCharacterRefreshState(models.Model):
+    """
+    Freshness of one ESI data set of a character.
+
+    The refresh scheduler (eveonline.refresh_scheduler) queues rows whose
+    due_at has passed; lag_seconds is how long past due_at the last refresh
+    ran, which the admin reports as percentiles.
+    """
+
+    class DataType(models.TextChoices):
+        ASSETS = "assets", "Assets"
+        SKILLS = "skills", "Skills"
+        KILLMAILS = "killmails", "Killmails"
+        CONTRACTS = "contracts", "Contracts"
+        INDUSTRY_JOBS = "industry_jobs", "Industry jobs"
+        MINING = "mining", "Mining"
+        PLANETS = "planets", "Planets"
+        BLUEPRINTS = "blueprints", "Blueprints"
+        CLONES = "clones", "Clones"
+
+    character = models.ForeignKey(
+        "EveCharacter",
+        on_delete=models.CASCADE,
+        related_name="refresh_states",
+    )
+    data_type = models.CharField(max_length=16, choices=DataType.choices)
+    refreshed_at = models.DateTimeField(null=True, blank=True)
+    due_at = models.DateTimeField()
+    queued_at = models.DateTimeField(null=True, blank=True)
+    lag_seconds = models.PositiveIntegerField(null=True, blank=True)
+    last_error = models.CharField(max_length=255, blank=True, default="")
+    # ETag of the ESI data last applied for this data set (skills).
+    applied_etag = models.CharField(max_length=128, blank=True, default="")
+
+    class Meta:
+        unique_together = ("character", "data_type")
+        indexes = [
+            models.Index(fields=["due_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.character_id} {self.data_type}"
+
+
 class EveCharacterMiningEntry(models.Model):
     """
     A single row from a character's personal mining ledger (ESI).
@@ -501,11 +545,23 @@ class EveCharacterMiningEntry(models.Model):
 
 
 class EveCharacterSkillset(models.Model):
+    """Readiness of one character for one skillset (see helpers.skills)."""
+
     progress = models.FloatField()
     missing_skills = models.TextField(blank=True)
+    # No missing skills; lets "who can fly X" read one index.
+    is_ready = models.BooleanField(default=False)
     character = models.ForeignKey("EveCharacter", on_delete=models.CASCADE)
     eve_skillset = models.ForeignKey("EveSkillset", on_delete=models.CASCADE)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["eve_skillset", "is_ready"],
+                name="eveonline_skillset_ready",
+            ),
+        ]
+
 
 class EveSkillset(models.Model):
     name = models.CharField(max_length=255)
@@ -286,6 +286,40 @@ class EveCorporationWalletJournalEntry(models.Model):
         )
 
 
+class EveCorporationWalletJournalWatermark(models.Model):
+    """
+    Highest journal ref_id stored per corporation wallet division, so the
+    next sync only pages back until it reaches entries it already has.
+    """
+
+    corporation = models.ForeignKey(
+        EveCorporation,
+        on_delete=models.CASCADE,
+        related_name="wallet_journal_watermarks",
+    )
+    division = models.PositiveSmallIntegerField(
+        help_text="Wallet division 1-7."
+    )
+    max_ref_id = models.BigIntegerField(default=0)
+    synced_at = models.DateTimeField(null=True, blank=True)
+    last_pages = models.PositiveIntegerField(
+        default=0, help_text="ESI pages fetched by the last sync."
+    )
+    last_inserted = models.PositiveIntegerField(
+        default=0, help_text="New entries written by the last sync."
+    )
+
+    class Meta:
+        unique_together = (("corporation", "division"),)
+        verbose_name = "corporation wallet journal watermark"
+
+    def __str__(self):
+        return (
+            f"Journal watermark {self.max_ref_id} ({self.corporation.name}, "
+            f"div {self.division})"
+        )
+
+
 class EveCorporationAllianceHistory(models.Model):
     """Cached ESI corporation alliance-history row (public, no token)."""
 
@@ -25,3 +25,23 @@ class EveUniverseSchematic(models.Model):
 
     def __str__(self):
         return f"{self.schematic_name} (schematic_id={self.schematic_id})"
+
+
+class EveUniverseName(models.Model):
+    """
+    A name resolved through ESI POST /universe/names/ (see
+    eveonline.universe_names). ``missing`` rows record ids ESI did not know,
+    so they are not asked for again until they expire.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    name = models.CharField(max_length=255, blank=True, default="")
+    category = models.CharField(max_length=32, blank=True, default="")
+    missing = models.BooleanField(default=False)
+    resolved_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "Universe name"
+
+    def __str__(self):
+        return f"{self.name or '?'} ({self.id})"
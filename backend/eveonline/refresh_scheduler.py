@@ -0,0 +1,280 @@
+"""
+Staleness-driven scheduling of character ESI refreshes.
+
+Every refreshable character has one EveCharacterRefreshState row per data
+set (assets, skills, killmails, ...). A refresh moves the row's ``due_at``
+to whichever is later: the data set's interval, or the latest ``Expires``
+ESI sent while it ran (no point asking again before ESI has new data).
+Expires is only seen on routes read through eveonline.response_cache
+(skills, today); the other data sets run on their interval alone.
+Characters whose player logged in recently get the short interval; the
+rest are refreshed about daily.
+
+``due_refreshes`` picks rows whose ``due_at`` has passed, active players
+first and then most overdue, until the estimated ESI call cost of the
+batch reaches the budget. The Celery side lives in
+eveonline.tasks.characters (schedule_character_refreshes,
+refresh_character_data).
+"""
+
+import math
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from django.contrib.auth.models import User
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.utils import timezone
+
+from eveonline.models import (
+    EveAlliance,
+    EveCharacter,
+    EveCharacterRefreshState,
+)
+
+DataType = EveCharacterRefreshState.DataType
+
+# Players who logged in within this window get the active intervals.
+ACTIVE_PLAYER_WINDOW = timedelta(days=14)
+
+# (active, idle) refresh interval per data set.
+REFRESH_INTERVALS: Dict[str, tuple] = {
+    DataType.ASSETS: (timedelta(hours=4), timedelta(hours=24)),
+    DataType.SKILLS: (timedelta(hours=4), timedelta(hours=24)),
+    DataType.KILLMAILS: (timedelta(hours=4), timedelta(hours=24)),
+    DataType.CONTRACTS: (timedelta(hours=1), timedelta(hours=12)),
+    DataType.INDUSTRY_JOBS: (timedelta(hours=1), timedelta(hours=12)),
+    DataType.MINING: (timedelta(hours=4), timedelta(hours=24)),
+    DataType.PLANETS: (timedelta(hours=4), timedelta(hours=24)),
+    DataType.BLUEPRINTS: (timedelta(hours=4), timedelta(hours=24)),
+    DataType.CLONES: (timedelta(hours=4), timedelta(hours=24)),
+}
+
+# Rough ESI calls per refresh (pages, detail and name lookups included).
+REFRESH_COSTS: Dict[str, int] = {
+    DataType.ASSETS: 4,
+    DataType.SKILLS: 1,
+    DataType.KILLMAILS: 5,
+    DataType.CONTRACTS: 2,
+    DataType.INDUSTRY_JOBS: 1,
+    DataType.MINING: 1,
+    DataType.PLANETS: 6,
+    DataType.BLUEPRINTS: 1,
+    DataType.CLONES: 2,
+}
+
+# Estimated ESI calls the scheduler may queue per run (every 5 minutes).
+CHARACTER_REFRESH_ESI_BUDGET = 600
+
+# A row queued this long ago without a refresh is assumed lost and requeued.
+REFRESH_QUEUE_TIMEOUT = timedelta(hours=1)
+
+# A failed refresh is retried after this delay.
+REFRESH_RETRY_DELAY = timedelta(minutes=30)
+
+
+def refreshable_characters():
+    """Characters of alliance members that have a token and are not deleted."""
+    alliance_characters = EveCharacter.objects.filter(
+        alliance_id__in=EveAlliance.objects.all().values_list(
+            "alliance_id", flat=True
+        )
+    )
+    users_with_alliance_chars = User.objects.filter(
+        evecharacter__in=alliance_characters
+    ).distinct()
+    return EveCharacter.objects.filter(
+        user__in=users_with_alliance_chars,
+        esi_deleted=False,
+    ).exclude(token=None)
+
+
+def is_active(character: EveCharacter, now: Optional[datetime] = None) -> bool:
+    user = character.user
+    if user is None or user.last_login is None:
+        return False
+    return user.last_login >= (now or timezone.now()) - ACTIVE_PLAYER_WINDOW
+
+
+def next_due(
+    data_type: str,
+    active: bool,
+    now: datetime,
+    expires_at: float = 0.0,
+) -> datetime:
+    active_interval, idle_interval = REFRESH_INTERVALS[data_type]
+    due = now + (active_interval if active else idle_interval)
+    if expires_at:
+        due = max(due, datetime.fromtimestamp(expires_at, tz=dt_timezone.utc))
+    return due
+
+
+def ensure_refresh_states(now: Optional[datetime] = None) -> int:
+    """
+    Create due-now state rows for every (refreshable character, data type)
+    pair that has none, so data types added later are scheduled too.
+    Returns the number of rows created.
+    """
+    now = now or timezone.now()
+    missing = [
+        EveCharacterRefreshState(
+            character_id=character_id, data_type=data_type, due_at=now
+        )
+        for data_type in DataType.values
+        for character_id in refreshable_characters()
+        .exclude(refresh_states__data_type=data_type)
+        .values_list("pk", flat=True)
+    ]
+    EveCharacterRefreshState.objects.bulk_create(
+        missing, ignore_conflicts=True
+    )
+    return len(missing)
+
+
+def due_refreshes(
+    budget: int = CHARACTER_REFRESH_ESI_BUDGET,
+    now: Optional[datetime] = None,
+) -> Dict[int, List[str]]:
+    """
+    Due data types per character id, in priority order, within ``budget``
+    estimated ESI calls. Marks the picked rows as queued.
+    """
+    now = now or timezone.now()
+    rows = (
+        EveCharacterRefreshState.objects.filter(
+            due_at__lte=now,
+            character__in=refreshable_characters(),
+        )
+        .filter(
+            Q(queued_at__isnull=True)
+            | Q(queued_at__lt=now - REFRESH_QUEUE_TIMEOUT)
+        )
+        .annotate(
+            active=Case(
+                When(
+                    character__user__last_login__gte=now
+                    - ACTIVE_PLAYER_WINDOW,
+                    then=Value(1),
+                ),
+                default=Value(0),
+                output_field=IntegerField(),
+            )
+        )
+        .order_by("-active", "due_at", "pk")
+        .values_list("pk", "character__character_id", "data_type")
+    )
+    picked = []
+    due: Dict[int, List[str]] = {}
+    spent = 0
+    # Every refresh costs at least one call, so ``budget`` rows is enough.
+    for pk, character_id, data_type in rows[:budget]:
+        cost = REFRESH_COSTS[data_type]
+        if spent + cost > budget:
+            break
+        spent += cost
+        picked.append(pk)
+        due.setdefault(character_id, []).append(data_type)
+    EveCharacterRefreshState.objects.filter(pk__in=picked).update(
+        queued_at=now
+    )
+    return due
+
+
+@dataclass
+class RefreshOutcome:
+    """Result of refreshing one data set, as passed to record_refreshes."""
+
+    data_type: str
+    started_at: datetime
+    expires_at: float = 0.0
+    skipped: bool = False
+    error: str = ""
+
+
+def record_refreshes(
+    character: EveCharacter, outcomes: Iterable[RefreshOutcome]
+) -> None:
+    """Store refresh outcomes and the next due time of each data set."""
+    now = timezone.now()
+    active = is_active(character, now)
+    states = {
+        state.data_type: state
+        for state in EveCharacterRefreshState.objects.filter(
+            character=character
+        )
+    }
+    created, updated = [], []
+    for outcome in outcomes:
+        state = states.get(outcome.data_type)
+        if state is None:
+            state = EveCharacterRefreshState(
+                character=character, data_type=outcome.data_type
+            )
+            created.append(state)
+        else:
+            updated.append(state)
+        state.queued_at = None
+        state.last_error = outcome.error[:255]
+        if outcome.error:
+            state.due_at = now + REFRESH_RETRY_DELAY
+            continue
+        if not outcome.skipped:
+            if state.due_at is not None:
+                state.lag_seconds = max(
+                    0, int((outcome.started_at - state.due_at).total_seconds())
+                )
+            state.refreshed_at = now
+        state.due_at = next_due(
+            outcome.data_type, active, now, outcome.expires_at
+        )
+    if created:
+        EveCharacterRefreshState.objects.bulk_create(
+            created, ignore_conflicts=True
+        )
+    if updated:
+        EveCharacterRefreshState.objects.bulk_update(
+            updated,
+            [
+                "refreshed_at",
+                "due_at",
+                "queued_at",
+                "lag_seconds",
+                "last_error",
+            ],
+        )
+
+
+def percentile(values: Sequence[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of ``values`` (None when empty)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def refresh_backlog_summary(now: Optional[datetime] = None) -> dict:
+    """Backlog depth and refresh lag percentiles for the admin."""
+    now = now or timezone.now()
+    states = EveCharacterRefreshState.objects.all()
+    due = states.filter(due_at__lte=now)
+    lags = list(
+        states.exclude(lag_seconds=None).values_list("lag_seconds", flat=True)
+    )
+    overdue = [
+        (now - due_at).total_seconds()
+        for due_at in due.filter(queued_at=None).values_list(
+            "due_at", flat=True
+        )
+    ]
+    return {
+        "tracked": states.count(),
+        "due": due.count(),
+        "queued": states.exclude(queued_at=None).count(),
+        "failing": states.exclude(last_error="").count(),
+        "oldest_due_seconds": max(overdue) if overdue else None,
+        "lag_percentiles": [
+            (label, percentile(lags, pct))
+            for label, pct in (("p50", 50), ("p90", 90), ("p99", 99))
+        ],
+    }
@@ -0,0 +1,206 @@
+"""
+ETag / Expires-aware conditional GETs for raw ESI reads.
+
+ESI sends ``ETag`` and ``Expires`` on almost every route. Responses are
+kept in the Django cache (Redis in production) keyed on URL, query params
+and the character whose token made the call:
+
+- while ``Expires`` is in the future the cached body is returned without
+  touching ESI;
+- after that the request is sent with ``If-None-Match`` and a 304 reuses
+  the cached body.
+
+Both cases are reported as ``not_modified``. That only says the body came
+from the shared cache, which any caller of the same URL and character may
+have warmed; it does not mean *this* caller has applied it. Consumers that
+skip writes compare ``etag`` with the ETag they stored when they last
+applied the data (e.g. the order-book sync watermark). Per-route hit /
+miss / 304 counters are available from ``esi_cache_stats()``. Inside ``track_esi_expiry()`` the latest ``Expires``
+seen is collected, so the refresh scheduler knows when ESI will next have
+new data for a character.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+from django.core.cache import cache
+
+from eveonline.transport import esi_route, esi_transport
+
+logger = logging.getLogger(__name__)
+
+ESI_RESPONSE_CACHE_PREFIX = "esi:resp:"
+# Entries outlive Expires so the ETag can still be revalidated later.
+ESI_RESPONSE_CACHE_TTL = 60 * 60 * 24
+# Response headers callers read from cached pages (pagination).
+CACHED_HEADERS = ("X-Pages",)
+
+
+@dataclass
+class ConditionalResponse:
+    """Result of a conditional ESI GET."""
+
+    status_code: int
+    data: Any = None
+    headers: dict = field(default_factory=dict)
+    not_modified: bool = False
+    # ETag of ``data``, for consumers to compare with what they applied.
+    etag: str | None = None
+
+
+def _cache_key(url: str, params: dict | None, character_id) -> str:
+    raw = json.dumps(
+        [url, sorted((params or {}).items()), character_id], default=str
+    )
+    return ESI_RESPONSE_CACHE_PREFIX + hashlib.sha1(raw.encode()).hexdigest()
+
+
+def _expires_at(resp) -> float:
+    value = resp.headers.get("Expires")
+    if not value:
+        return 0.0
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return 0.0
+
+
+_stats_lock = threading.Lock()
+_stats: dict[str, dict[str, int]] = {}
+
+
+def _record(route: str, outcome: str) -> None:
+    with _stats_lock:
+        counters = _stats.setdefault(
+            route, {"hit": 0, "miss": 0, "not_modified": 0}
+        )
+        counters[outcome] += 1
+
+
+def esi_cache_stats() -> dict[str, dict[str, int]]:
+    """Per-route hit (Expires short-circuit), miss and 304 counters."""
+    with _stats_lock:
+        return {route: dict(c) for route, c in sorted(_stats.items())}
+
+
+def reset_esi_cache_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
+
+
+_local = threading.local()
+
+
+class EsiExpiry:
+    """Latest ``Expires`` (epoch seconds, 0 if none) seen while tracking."""
+
+    def __init__(self):
+        self.expires_at = 0.0
+
+
+@contextmanager
+def track_esi_expiry():
+    """Collect the latest ``Expires`` of conditional GETs made inside."""
+    previous = getattr(_local, "expiry", None)
+    expiry = EsiExpiry()
+    _local.expiry = expiry
+    try:
+        yield expiry
+    finally:
+        _local.expiry = previous
+        if previous is not None:
+            _note_expiry(expiry.expires_at, previous)
+
+
+def _note_expiry(expires_at: float, expiry=None) -> None:
+    expiry = expiry or getattr(_local, "expiry", None)
+    if expiry is not None and expires_at > expiry.expires_at:
+        expiry.expires_at = expires_at
+
+
+def conditional_get(
+    url: str,
+    params: dict | None = None,
+    headers: dict | None = None,
+    character_id: int | None = None,
+    timeout: int = 30,
+) -> ConditionalResponse:
+    """
+    GET an ESI URL, honouring cached Expires/ETag for the same
+    URL + params + character. Raises whatever the transport raises.
+    """
+    route = esi_route(url)
+    key = _cache_key(url, params, character_id)
+    entry = cache.get(key)
+
+    if entry and entry["expires_at"] > time.time():
+        _record(route, "hit")
+        _note_expiry(entry["expires_at"])
+        return ConditionalResponse(
+            status_code=200,
+            data=entry["data"],
+            headers=entry["headers"],
+            not_modified=True,
+            etag=entry.get("etag"),
+        )
+
+    request_headers = dict(headers or {})
+    if entry and entry.get("etag"):
+        request_headers["If-None-Match"] = entry["etag"]
+
+    resp = esi_transport().get(
+        url, params=params, headers=request_headers, timeout=timeout
+    )
+
+    if resp.status_code == 304 and entry:
+        _record(route, "not_modified")
+        entry["expires_at"] = _expires_at(resp) or entry["expires_at"]
+        entry["etag"] = resp.headers.get("ETag") or entry.get("etag")
+        _note_expiry(entry["expires_at"])
+        cache.set(key, entry, ESI_RESPONSE_CACHE_TTL)
+        return ConditionalResponse(
+            status_code=200,
+            data=entry["data"],
+            headers=entry["headers"],
+            not_modified=True,
+            etag=entry["etag"],
+        )
+
+    _record(route, "miss")
+    if resp.status_code >= 400:
+        return ConditionalResponse(status_code=resp.status_code)
+
+    data = resp.json() if resp.content else None
+    etag = resp.headers.get("ETag")
+    cached_headers = {
+        name: resp.headers[name]
+        for name in CACHED_HEADERS
+        if name in resp.headers
+    }
+    expires_at = _expires_at(resp)
+    _note_expiry(expires_at)
+    if etag or expires_at:
+        cache.set(
+            key,
+            {
+                "etag": etag,
+                "expires_at": expires_at,
+                "data": data,
+                "headers": cached_headers,
+            },
+            ESI_RESPONSE_CACHE_TTL,
+        )
+    return ConditionalResponse(
+        status_code=resp.status_code,
+        data=data,
+        headers=cached_headers,
+        not_modified=bool(entry and etag and entry.get("etag") == etag),
+        etag=etag,
+    )
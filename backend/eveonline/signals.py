@@ -1,12 +1,16 @@
 import logging
 
+from django.db import transaction
 from django.db.models import signals
 from django.dispatch import receiver
 
 from esi.models import Token
 
 from discord.client import DiscordClient
-from eveonline.tasks import update_character_urgent
+from eveonline.tasks import (
+    refresh_skillset_readiness_task,
+    update_character_urgent,
+)
 from eveonline.client import EsiClient, live_esi_allowed
 from eveonline.helpers.characters.public_data import (
     update_character_public_data,
@@ -14,6 +18,7 @@ from eveonline.helpers.characters.public_data import (
 from .models import (
     EveAlliance,
     EveCharacter,
+    EveSkillset,
 )
 
 logger = logging.getLogger(__name__)
@@ -96,6 +101,19 @@ def eve_alliance_post_save(sender, instance, created, **kwargs):
         instance.save()
 
 
+@receiver(
+    signals.post_save,
+    sender=EveSkillset,
+    dispatch_uid="on_skillset_saved",
+)
+def on_skillset_saved(sender, instance, **kwargs):
+    """Recompute character readiness once an edited skillset commits."""
+    skillset_id = instance.pk
+    transaction.on_commit(
+        lambda: refresh_skillset_readiness_task.delay(skillset_id)
+    )
+
+
 @receiver(
     signals.post_save,
     sender=Token,
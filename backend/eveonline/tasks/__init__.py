@@ -21,9 +21,12 @@ __all__ = [
     "update_character",
     "update_character_urgent",
     "update_alliance_characters",
+    "schedule_character_refreshes",
+    "refresh_character_data",
     "update_all_character_public_data",
     "queue_stale_character_corporation_history",
     "sync_character_corporation_history_task",
+    "refresh_skillset_readiness_task",
     "fixup_character_tokens",
     "update_corporations",
     "sync_alliance_corporations",
@@ -36,6 +39,8 @@ update_character_affilliations = affiliations.update_character_affilliations
 update_character = characters.update_character
 update_character_urgent = characters.update_character_urgent
 update_alliance_characters = characters.update_alliance_characters
+schedule_character_refreshes = characters.schedule_character_refreshes
+refresh_character_data = characters.refresh_character_data
 update_all_character_public_data = characters.update_all_character_public_data
 queue_stale_character_corporation_history = (
     characters.queue_stale_character_corporation_history
@@ -43,6 +48,7 @@ queue_stale_character_corporation_history = (
 sync_character_corporation_history_task = (
     characters.sync_character_corporation_history_task
 )
+refresh_skillset_readiness_task = characters.refresh_skillset_readiness_task
 fixup_character_tokens = players.fixup_character_tokens
 
 update_corporations = corporations.update_corporations
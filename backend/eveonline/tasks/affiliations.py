@@ -1,8 +1,10 @@
 import logging
 
+from django.db import connection
+
 from app.celery import app
 from eveonline.client import EsiClient
-from eveonline.helpers.characters import update_character_with_affiliations
+from eveonline.helpers.characters import apply_character_affiliations
 from eveonline.models import EveCharacter
 from groups.tasks import update_affiliation
 
@@ -26,57 +28,57 @@ def update_character_affilliations() -> int:
     for i in range(0, len(character_ids), 1000):
         character_id_batches.append(character_ids[i : i + 1000])
 
-    update_count = 0
+    stats = {"scanned": 0, "changed": 0, "users": 0, "queries": 0}
+    changed_user_ids = set()
 
-    for character_ids_batch in character_id_batches:
-        response = EsiClient(None).get_character_affiliations(
-            character_ids_batch
-        )
-        if not response.success():
-            logger.warning(
-                "Skipping affiliations batch of %d characters, ESI error %s",
-                len(character_ids_batch),
-                response.response_code,
-            )
-            continue
-        results = response.results()
-        logger.info(
-            "Update character affiliations, processing %d characters, %d results",
-            len(character_ids_batch),
-            len(results),
-        )
-        for result in results:
-            character_id = result["character_id"]
-            corporation_id = result.get("corporation_id")
-            alliance_id = result.get("alliance_id")
-            faction_id = result.get("faction_id")
+    def count_query(execute, sql, params, many, context):
+        stats["queries"] += 1
+        return execute(sql, params, many, context)
 
-            character = EveCharacter.objects.get(character_id=character_id)
-
-            updated = update_character_with_affiliations(
-                character_id=character_id,
-                corporation_id=corporation_id,
-                alliance_id=alliance_id,
-                faction_id=faction_id,
+    with connection.execute_wrapper(count_query):
+        for character_ids_batch in character_id_batches:
+            response = EsiClient(None).get_character_affiliations(
+                character_ids_batch
             )
-
-            if updated:
+            if not response.success():
+                logger.warning(
+                    "Skipping affiliations batch of %d characters, ESI error %s",
+                    len(character_ids_batch),
+                    response.response_code,
+                )
+                continue
+            results = response.results()
+            logger.info(
+                "Update character affiliations, processing %d characters, %d results",
+                len(character_ids_batch),
+                len(results),
+            )
+            changed = apply_character_affiliations(results)
+            stats["scanned"] += len(results)
+            stats["changed"] += len(changed)
+            for character in changed:
                 logger.info(
                     "Update character affiliations, character updated: %s (%s)",
-                    character_id,
+                    character.character_id,
                     character.user_id,
                 )
-                update_count += 1
-                if character.user:
-                    if task_config["async_apply_affiliations"]:
-                        update_affiliation.apply_async(
-                            args=[character.user.id]
-                        )
-                    else:
-                        update_affiliation(character.user.id)
+                if character.user_id:
+                    changed_user_ids.add(character.user_id)
+
+    # Once per user, however many of their characters moved.
+    stats["users"] = len(changed_user_ids)
+    for user_id in sorted(changed_user_ids):
+        if task_config["async_apply_affiliations"]:
+            update_affiliation.apply_async(args=[user_id])
+        else:
+            update_affiliation(user_id)
 
     logger.info(
-        "Update character affiliations complete with %d changes",
-        update_count,
+        "Update character affiliations complete: %d scanned, %d changed, "
+        "%d user(s) to update, %d queries",
+        stats["scanned"],
+        stats["changed"],
+        stats["users"],
+        stats["queries"],
     )
-    return update_count
+    return stats["changed"]
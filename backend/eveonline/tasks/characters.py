@@ -1,10 +1,8 @@
 import logging
 
-from django.contrib.auth.models import User
 from django.db.models import Q
 from django.utils import timezone
 from esi.exceptions import ESIErrorLimitException
-from esi.models import Token
 
 from app.celery import app
 from eveonline.helpers.characters import (
@@ -19,11 +17,23 @@ from eveonline.helpers.characters import (
     update_character_planets as refresh_character_planets,
     update_character_skills as refresh_character_skills,
 )
+from eveonline.helpers.characters.skills import refresh_skillset_readiness
 from eveonline.helpers.characters.corporation_history import (
     CORPORATION_HISTORY_TTL,
     sync_character_corporation_history,
 )
-from eveonline.models import EveCharacter, EveAlliance
+from eveonline.models import EveCharacter, EveSkillset
+from eveonline.refresh_scheduler import (
+    CHARACTER_REFRESH_ESI_BUDGET,
+    DataType,
+    RefreshOutcome,
+    due_refreshes,
+    ensure_refresh_states,
+    record_refreshes,
+    refreshable_characters,
+)
+from eveonline.response_cache import track_esi_expiry
+from eveonline.token_resolver import CharacterTokens, use_character_tokens
 from eveonline.utils import get_esi_downtime_countdown
 
 logger = logging.getLogger(__name__)
@@ -61,6 +71,68 @@ def _refresh_industry_jobs_and_notify(eve_character_id: int) -> None:
         )
 
 
+# (data type, scope lists that must each be granted, refresh) in update order.
+CHARACTER_REFRESH_STEPS = (
+    (DataType.ASSETS, (SCOPE_ASSETS,), refresh_character_assets),
+    (DataType.SKILLS, (SCOPE_SKILLS,), refresh_character_skills),
+    (DataType.KILLMAILS, (SCOPE_KILLMAILS,), refresh_character_killmails),
+    (DataType.CONTRACTS, (SCOPE_CONTRACTS,), _refresh_contracts_and_reconcile),
+    (
+        DataType.INDUSTRY_JOBS,
+        (SCOPE_INDUSTRY_JOBS,),
+        _refresh_industry_jobs_and_notify,
+    ),
+    (DataType.MINING, (SCOPE_MINING,), refresh_character_mining),
+    (DataType.PLANETS, (SCOPE_PLANETS,), refresh_character_planets),
+    (DataType.BLUEPRINTS, (SCOPE_BLUEPRINTS,), refresh_character_blueprints),
+    (
+        DataType.CLONES,
+        (SCOPE_CLONES, SCOPE_IMPLANTS),
+        refresh_character_clones,
+    ),
+)
+
+
+def _run_refresh_steps(character: EveCharacter, data_types=None) -> None:
+    """
+    Run the refresh steps for ``data_types`` (all when None) and record the
+    outcome of each in the character's refresh state. A failing step is
+    logged and retried later; the ESI error limit stops the run.
+    """
+    tokens = CharacterTokens.load(character.character_id)
+    outcomes = []
+    try:
+        with use_character_tokens(tokens):
+            for data_type, scope_lists, refresh in CHARACTER_REFRESH_STEPS:
+                if data_types is not None and data_type not in data_types:
+                    continue
+                outcome = RefreshOutcome(data_type, timezone.now())
+                outcomes.append(outcome)
+                if not tokens.has_scopes(*scope_lists):
+                    outcome.skipped = True
+                    continue
+                try:
+                    with track_esi_expiry() as expiry:
+                        refresh(character.character_id)
+                    outcome.expires_at = expiry.expires_at
+                except ESIErrorLimitException:
+                    outcome.error = "ESI error limited"
+                    raise
+                except Exception as exc:  # pylint: disable=broad-except
+                    logger.exception(
+                        "Failed to refresh %s for character %s",
+                        data_type,
+                        character.character_id,
+                    )
+                    outcome.error = f"{type(exc).__name__}: {exc}"
+    finally:
+        record_refreshes(character, outcomes)
+
+
+# Both limits come to roughly 120 ESI calls a minute per worker:
+# update_character fetches every data set (~23 calls, see REFRESH_COSTS),
+# while refresh_character_data gets only the due ones, queued in batches of
+# CHARACTER_REFRESH_ESI_BUDGET (600 calls per 5-minute run, ~4 per task).
 @app.task(rate_limit="5/m")
 def update_character(eve_character_id):
     """Update a character's assets, skills, killmails, contracts, and industry jobs."""
@@ -78,7 +150,9 @@ def update_character(eve_character_id):
         )
         return
 
-    character = EveCharacter.objects.get(character_id=eve_character_id)
+    character = EveCharacter.objects.select_related("user").get(
+        character_id=eve_character_id
+    )
     if character.esi_deleted:
         logger.info(
             "Skipping update for ESI-deleted character %s (%s)",
@@ -99,26 +173,7 @@ def update_character(eve_character_id):
             eve_character_id,
         )
         return
-    if Token.get_token(eve_character_id, SCOPE_ASSETS):
-        refresh_character_assets(eve_character_id)
-    if Token.get_token(eve_character_id, SCOPE_SKILLS):
-        refresh_character_skills(eve_character_id)
-    if Token.get_token(eve_character_id, SCOPE_KILLMAILS):
-        refresh_character_killmails(eve_character_id)
-    if Token.get_token(eve_character_id, SCOPE_CONTRACTS):
-        _refresh_contracts_and_reconcile(eve_character_id)
-    if Token.get_token(eve_character_id, SCOPE_INDUSTRY_JOBS):
-        _refresh_industry_jobs_and_notify(eve_character_id)
-    if Token.get_token(eve_character_id, SCOPE_MINING):
-        refresh_character_mining(eve_character_id)
-    if Token.get_token(eve_character_id, SCOPE_PLANETS):
-        refresh_character_planets(eve_character_id)
-    if Token.get_token(eve_character_id, SCOPE_BLUEPRINTS):
-        refresh_character_blueprints(eve_character_id)
-    if Token.get_token(eve_character_id, SCOPE_CLONES) and Token.get_token(
-        eve_character_id, SCOPE_IMPLANTS
-    ):
-        refresh_character_clones(eve_character_id)
+    _run_refresh_steps(character)
 
 
 @app.task()
@@ -203,19 +258,13 @@ def queue_stale_character_corporation_history(
 
 @app.task
 def update_alliance_characters():
-    """Queue update_character for each alliance character (assets, skills, killmails)."""
-    alliance_characters = EveCharacter.objects.filter(
-        alliance_id__in=EveAlliance.objects.all().values_list(
-            "alliance_id", flat=True
-        )
-    )
-    users_with_alliance_chars = User.objects.filter(
-        evecharacter__in=alliance_characters
-    ).distinct()
-    all_characters = EveCharacter.objects.filter(
-        user__in=users_with_alliance_chars,
-        esi_deleted=False,
-    ).exclude(token=None)
+    """
+    Queue update_character for every alliance character at once.
+
+    Kept for manual full refreshes; the beat schedule runs
+    schedule_character_refreshes instead.
+    """
+    all_characters = refreshable_characters()
 
     logger.info(
         "Queuing update_character for %d alliance character(s)",
@@ -225,3 +274,67 @@ def update_alliance_characters():
         update_character.apply_async(
             args=[character.character_id], queue="eveonline"
         )
+
+
+@app.task
+def schedule_character_refreshes(
+    budget: int = CHARACTER_REFRESH_ESI_BUDGET,
+) -> int:
+    """Queue due character data refreshes within an ESI call budget."""
+    if get_esi_downtime_countdown() > 0:
+        logger.info("Not scheduling character refreshes during ESI downtime")
+        return 0
+    ensure_refresh_states()
+    due = due_refreshes(budget)
+    for character_id, data_types in due.items():
+        refresh_character_data.apply_async(
+            args=[character_id, data_types], queue="eveonline"
+        )
+    logger.info(
+        "Queued %d refresh(es) for %d character(s)",
+        sum(len(data_types) for data_types in due.values()),
+        len(due),
+    )
+    return len(due)
+
+
+# See update_character for how the two rate limits relate.
+@app.task(rate_limit="30/m")
+def refresh_character_data(eve_character_id: int, data_types: list) -> None:
+    """Refresh the given data types of one character (see refresh_scheduler)."""
+    countdown = get_esi_downtime_countdown()
+    if countdown > 0:
+        refresh_character_data.apply_async(
+            args=[eve_character_id, data_types],
+            countdown=countdown,
+            queue="eveonline",
+        )
+        return
+
+    character = (
+        EveCharacter.objects.select_related("user")
+        .filter(character_id=eve_character_id)
+        .first()
+    )
+    if character is None or character.esi_deleted:
+        return
+    if character.esi_suspended:
+        # Nothing to fetch until the tokens are restored; check again later.
+        record_refreshes(
+            character,
+            [
+                RefreshOutcome(data_type, timezone.now(), skipped=True)
+                for data_type in data_types
+            ],
+        )
+        return
+    _run_refresh_steps(character, set(data_types))
+
+
+@app.task
+def refresh_skillset_readiness_task(skillset_id: int) -> int:
+    """Recompute every character's readiness for an edited skillset."""
+    skillset = EveSkillset.objects.filter(pk=skillset_id).first()
+    if skillset is None:
+        return 0
+    return refresh_skillset_readiness(skillset)
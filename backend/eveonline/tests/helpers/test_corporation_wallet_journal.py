@@ -0,0 +1,159 @@
+"""Tests for the watermarked corporation wallet journal sync."""
+
+from unittest.mock import patch
+
+import factory
+from django.db.models import signals
+from esi.models import Scope, Token
+
+from app.test import TestCase
+from eveonline.client import EsiResponse
+from eveonline.helpers.corporations.update import (
+    update_corporation_wallet_journal,
+)
+from eveonline.models import (
+    EveCharacter,
+    EveCorporation,
+    EveCorporationWalletJournalEntry,
+    EveCorporationWalletJournalWatermark,
+)
+from eveonline.scopes import scopes_for, TokenType
+
+
+def _entry(ref_id: int) -> dict:
+    return {
+        "id": ref_id,
+        "date": "2026-10-01T12:00:00Z",
+        "ref_type": "planetary_import_tax",
+        "amount": 1000.5,
+        "balance": 5000000.25,
+        "description": "PI tax",
+    }
+
+
+class UpdateCorporationWalletJournalTestCase(TestCase):
+    @factory.django.mute_signals(signals.pre_save, signals.post_save)
+    def setUp(self):
+        self.corporation = EveCorporation.objects.create(
+            corporation_id=98733885,
+            name="Ballah Inc.",
+        )
+        token = Token.objects.create(character_id=90000001)
+        for scope_name in scopes_for(TokenType.DIRECTOR):
+            scope, _ = Scope.objects.get_or_create(name=scope_name)
+            token.scopes.add(scope)
+        self.corporation.ceo = EveCharacter.objects.create(
+            character_id=token.character_id,
+            token=token,
+        )
+        self.corporation.save()
+        # Division 1 has two pages of three entries, newest first.
+        self.journal = {1: [[_entry(106), _entry(105), _entry(104)]]}
+        self.journal[1].append([_entry(103), _entry(102), _entry(101)])
+        self.fetched = []
+
+    def _pages(self, corporation_id, division):
+        for page in self.journal.get(division, [[]]):
+            self.fetched.append(division)
+            yield EsiResponse(
+                response_code=200,
+                data=[dict(raw, division=division) for raw in page],
+            )
+
+    def _sync(self):
+        self.fetched = []
+        with patch(
+            "eveonline.helpers.corporations.update.EsiClient"
+        ) as esi_client_cls:
+            esi = esi_client_cls.return_value
+            esi.iter_corporation_wallet_journal_pages.side_effect = self._pages
+            return update_corporation_wallet_journal(
+                self.corporation.corporation_id
+            )
+
+    def test_pages_back_only_to_the_watermark(self):
+        self.assertEqual(6, self._sync())
+        self.assertEqual([1, 1, 2, 3, 4, 5, 6, 7], self.fetched)
+        watermark = EveCorporationWalletJournalWatermark.objects.get(
+            corporation=self.corporation, division=1
+        )
+        self.assertEqual(
+            (106, 2, 6),
+            (
+                watermark.max_ref_id,
+                watermark.last_pages,
+                watermark.last_inserted,
+            ),
+        )
+
+        self.journal[1][0] = [_entry(108), _entry(107), _entry(106)]
+        self.assertEqual(2, self._sync())
+
+        # Page 1 reached the watermark, so page 2 was not requested.
+        self.assertEqual([1, 2, 3, 4, 5, 6, 7], self.fetched)
+        self.assertEqual(
+            list(range(101, 109)),
+            sorted(
+                EveCorporationWalletJournalEntry.objects.values_list(
+                    "ref_id", flat=True
+                )
+            ),
+        )
+        watermark.refresh_from_db()
+        self.assertEqual(
+            (108, 1, 2),
+            (
+                watermark.max_ref_id,
+                watermark.last_pages,
+                watermark.last_inserted,
+            ),
+        )
+
+    def test_entries_stored_by_a_failed_run_are_not_counted(self):
+        self._sync()
+        self.journal[1][0] = [_entry(108), _entry(107), _entry(106)]
+        # A failed run already stored 108 but kept the watermark at 106.
+        EveCorporationWalletJournalEntry.objects.create(
+            corporation=self.corporation,
+            division=1,
+            ref_id=108,
+            date="2026-10-01T12:00:00Z",
+            ref_type="planetary_import_tax",
+        )
+
+        self.assertEqual(1, self._sync())
+        watermark = EveCorporationWalletJournalWatermark.objects.get(
+            corporation=self.corporation, division=1
+        )
+        self.assertEqual(
+            (108, 1), (watermark.max_ref_id, watermark.last_inserted)
+        )
+
+    def test_failed_division_keeps_its_watermark(self):
+        self._sync()
+        self.journal[1][0] = [_entry(107), _entry(106), _entry(105)]
+
+        def failing(corporation_id, division):
+            if division == 1:
+                yield EsiResponse(response_code=502)
+                return
+            yield from self._pages(corporation_id, division)
+
+        with patch(
+            "eveonline.helpers.corporations.update.EsiClient"
+        ) as esi_client_cls:
+            esi = esi_client_cls.return_value
+            esi.iter_corporation_wallet_journal_pages.side_effect = failing
+            self.assertEqual(
+                0,
+                update_corporation_wallet_journal(
+                    self.corporation.corporation_id
+                ),
+            )
+
+        self.assertEqual(
+            106,
+            EveCorporationWalletJournalWatermark.objects.get(
+                corporation=self.corporation, division=1
+            ).max_ref_id,
+        )
@@ -0,0 +1,91 @@
+"""Tests for eveonline.helpers.db_sync – bulk_upsert."""
+
+from datetime import timedelta
+from decimal import Decimal
+
+import factory
+from django.db.models import signals
+from django.utils import timezone
+
+from app.test import TestCase
+from eveonline.helpers.db_sync import bulk_upsert
+from eveonline.models import EveCharacter, EveCharacterContract
+
+UPSERT_FIELDS = ["character", "status", "price", "title"]
+
+
+def _contract(character, contract_id, status="outstanding", price="100.5"):
+    return EveCharacterContract(
+        contract_id=contract_id,
+        character=character,
+        type="item_exchange",
+        status=status,
+        issuer_id=character.character_id,
+        price=Decimal(price),
+        title=f"Contract {contract_id}",
+    )
+
+
+class BulkUpsertTestCase(TestCase):
+    @factory.django.mute_signals(signals.pre_save, signals.post_save)
+    def setUp(self):
+        super().setUp()
+        self.character = EveCharacter.objects.create(
+            character_id=7001, character_name="Upsert Tester"
+        )
+
+    def _upsert(self, instances):
+        return bulk_upsert(
+            queryset=EveCharacterContract.objects.all(),
+            instances=instances,
+            key_fields=["contract_id"],
+            update_fields=UPSERT_FIELDS,
+        )
+
+    def test_inserts_updates_and_skips_unchanged_rows(self):
+        self._upsert([_contract(self.character, cid) for cid in (1, 2, 3)])
+        stale = timezone.now() - timedelta(days=1)
+        EveCharacterContract.objects.update(updated_at=stale)
+
+        result = self._upsert(
+            [
+                _contract(self.character, 1),
+                _contract(self.character, 2, status="finished"),
+                _contract(self.character, 4),
+            ]
+        )
+
+        self.assertEqual(
+            (1, 1, 1), (result.inserted, result.updated, result.unchanged)
+        )
+        self.assertEqual([4], [c.contract_id for c in result.created])
+        rows = EveCharacterContract.objects.in_bulk()
+        self.assertEqual("finished", rows[2].status)
+        self.assertEqual(stale, rows[1].updated_at)
+        self.assertGreater(rows[2].updated_at, stale)
+        self.assertEqual(4, len(rows))
+
+    def test_values_equal_after_column_rounding_are_unchanged(self):
+        self._upsert([_contract(self.character, 1, price="100.123")])
+
+        result = self._upsert([_contract(self.character, 1, price="100.12")])
+
+        self.assertEqual(1, result.unchanged)
+        self.assertEqual(0, result.updated)
+
+    def test_insert_of_existing_key_updates_the_row(self):
+        """A row inserted concurrently after the prefetch is overwritten."""
+        self._upsert([_contract(self.character, 1)])
+        instance = _contract(self.character, 1, status="deleted")
+
+        result = bulk_upsert(
+            queryset=EveCharacterContract.objects.none(),
+            instances=[instance],
+            key_fields=["contract_id"],
+            update_fields=UPSERT_FIELDS,
+        )
+
+        self.assertEqual(1, result.inserted)
+        self.assertEqual(
+            "deleted", EveCharacterContract.objects.get(pk=1).status
+        )
@@ -1,11 +1,26 @@
+import json
+from unittest.mock import patch
+
 from django.db.models import signals
+from eveuniverse.models import EveCategory, EveGroup, EveType
+
 from app.test import TestCase
+from eveonline.client import EsiResponse
+from eveonline.helpers.characters import skills as skills_helpers
 from eveonline.models import (
     EveCharacter,
+    EveCharacterRefreshState,
     EveCharacterSkill,
+    EveCharacterSkillset,
     EveSkillset,
 )
-from eveonline.helpers.characters import compare_skills_to_skillset
+from eveonline.helpers.characters import (
+    characters_ready_for_skillset,
+    compare_skills_to_skillset,
+    refresh_character_skillsets,
+    refresh_skillset_readiness,
+    sync_character_skills,
+)
 
 
 class EveSkillsHelperTestCase(TestCase):
@@ -59,3 +74,214 @@ class EveSkillsHelperTestCase(TestCase):
             skillset2,
         )
         self.assertEqual(1, len(missing))
+
+
+class SyncCharacterSkillsTestCase(TestCase):
+    """Tests for the bulk ESI skill sync"""
+
+    def setUp(self):
+        super().setUp()
+        signals.post_save.disconnect(
+            sender=EveCharacter,
+            dispatch_uid="populate_eve_character_public_data",
+        )
+        signals.post_save.disconnect(
+            sender=EveCharacter,
+            dispatch_uid="populate_eve_character_private_data",
+        )
+        self.char = EveCharacter.objects.create(
+            character_id=1234, character_name="Test Char"
+        )
+        category = EveCategory.objects.create(
+            id=16, name="Skill", published=True
+        )
+        group = EveGroup.objects.create(
+            id=255, name="Gunnery", published=True, eve_category=category
+        )
+        for skill_id in range(3300, 3320):
+            EveType.objects.create(
+                id=skill_id,
+                name=f"Skill {skill_id}",
+                published=True,
+                eve_group=group,
+            )
+
+    def _esi_skills(self, level=3):
+        return [
+            {
+                "skill_id": skill_id,
+                "skillpoints_in_skill": level * 1000,
+                "trained_skill_level": level,
+            }
+            for skill_id in range(3300, 3320)
+        ]
+
+    def test_creates_then_updates_in_constant_queries(self):
+        with self.assertNumQueries(5):
+            result = sync_character_skills(self.char, self._esi_skills())
+        self.assertEqual((20, 0, 0), result)
+        self.assertEqual(
+            "Skill 3305",
+            EveCharacterSkill.objects.get(skill_id=3305).skill_name,
+        )
+
+        with self.assertNumQueries(1):
+            result = sync_character_skills(self.char, self._esi_skills())
+        self.assertEqual((0, 0, 0), result)
+
+        with self.assertNumQueries(4):
+            result = sync_character_skills(
+                self.char, self._esi_skills(level=4)
+            )
+        self.assertEqual((0, 20, 0), result)
+        self.assertEqual(
+            {4},
+            set(
+                EveCharacterSkill.objects.values_list("skill_level", flat=True)
+            ),
+        )
+
+    @patch("eveonline.helpers.characters.skills.EsiClient")
+    def test_upsert_skips_only_an_etag_it_applied(self, esi_client):
+        # No refresh-state row yet: the first sync creates it.
+        # Served from the shared response cache, but never applied here.
+        esi_client.return_value.get_character_skills.return_value = (
+            EsiResponse(
+                200, data=self._esi_skills(), not_modified=True, etag='"e1"'
+            )
+        )
+        character_id = self.char.character_id
+
+        with patch.object(
+            skills_helpers,
+            "sync_character_skills",
+            wraps=skills_helpers.sync_character_skills,
+        ) as sync:
+            self.assertTrue(
+                skills_helpers.upsert_character_skills(character_id)
+            )
+            self.assertFalse(
+                skills_helpers.upsert_character_skills(character_id)
+            )
+            self.assertEqual(1, sync.call_count)
+
+            EveCharacterSkill.objects.filter(skill_id=3305).delete()
+            skills_helpers.upsert_character_skills(character_id)
+
+        self.assertEqual(2, sync.call_count)
+        self.assertTrue(
+            EveCharacterSkill.objects.filter(skill_id=3305).exists()
+        )
+        self.assertEqual(
+            '"e1"', EveCharacterRefreshState.objects.get().applied_etag
+        )
+
+    def test_deletes_duplicates_and_keeps_unlisted_skills(self):
+        EveCharacterSkill.objects.create(
+            character=self.char,
+            skill_id=3300,
+            skill_name="Skill 3300",
+            skill_points=5000,
+            skill_level=4,
+        )
+        EveCharacterSkill.objects.create(
+            character=self.char,
+            skill_id=3300,
+            skill_name="Duplicate",
+            skill_points=0,
+            skill_level=0,
+        )
+        EveCharacterSkill.objects.create(
+            character=self.char,
+            skill_id=1,
+            skill_name="Unlisted",
+            skill_points=0,
+            skill_level=1,
+        )
+        result = sync_character_skills(self.char, self._esi_skills(level=4))
+        self.assertEqual((19, 1, 1), result)
+        self.assertEqual(
+            ["Skill 3300"],
+            list(
+                EveCharacterSkill.objects.filter(skill_id=3300).values_list(
+                    "skill_name", flat=True
+                )
+            ),
+        )
+        self.assertTrue(EveCharacterSkill.objects.filter(skill_id=1).exists())
+
+
+class SkillsetReadinessTestCase(TestCase):
+    """Tests for the character x skillset readiness rows"""
+
+    def setUp(self):
+        super().setUp()
+        signals.post_save.disconnect(
+            sender=EveCharacter,
+            dispatch_uid="populate_eve_character_public_data",
+        )
+        signals.post_save.disconnect(
+            sender=EveCharacter,
+            dispatch_uid="populate_eve_character_private_data",
+        )
+        self.pilot = EveCharacter.objects.create(
+            character_id=1234, character_name="Pilot"
+        )
+        self.rookie = EveCharacter.objects.create(
+            character_id=1235, character_name="Rookie"
+        )
+        for char, level in ((self.pilot, 5), (self.rookie, 2)):
+            for name in ("Gunnery", "Navigation"):
+                EveCharacterSkill.objects.create(
+                    character=char,
+                    skill_id=len(name),
+                    skill_name=name,
+                    skill_points=0,
+                    skill_level=level,
+                )
+        self.skillset = EveSkillset.objects.create(
+            name="Doctrine",
+            total_skill_points=0,
+            skills="Gunnery IV\nNavigation III",
+        )
+
+    def test_refresh_character_writes_only_changes(self):
+        self.assertEqual(1, refresh_character_skillsets(self.rookie))
+        row = EveCharacterSkillset.objects.get(character=self.rookie)
+        self.assertFalse(row.is_ready)
+        self.assertEqual(
+            ["Gunnery 4", "Navigation 3"], json.loads(row.missing_skills)
+        )
+        self.assertEqual(
+            compare_skills_to_skillset(
+                self.rookie.character_id, self.skillset
+            ),
+            (json.loads(row.missing_skills), row.progress),
+        )
+
+        self.assertEqual(0, refresh_character_skillsets(self.rookie))
+        EveCharacterSkill.objects.filter(character=self.rookie).update(
+            skill_level=4
+        )
+        self.assertEqual(
+            0, refresh_character_skillsets(self.rookie, only_missing=True)
+        )
+        self.assertEqual(1, refresh_character_skillsets(self.rookie))
+        self.assertTrue(
+            EveCharacterSkillset.objects.get(character=self.rookie).is_ready
+        )
+
+    def test_skillset_edit_refreshes_every_character(self):
+        self.assertEqual(2, refresh_skillset_readiness(self.skillset))
+        with self.assertNumQueries(1):
+            ready = list(characters_ready_for_skillset(self.skillset))
+        self.assertEqual([self.pilot], ready)
+
+        self.skillset.skills = "Gunnery II"
+        self.skillset.save()
+        self.assertEqual(1, refresh_skillset_readiness(self.skillset))
+        self.assertEqual(
+            {self.pilot, self.rookie},
+            set(characters_ready_for_skillset(self.skillset)),
+        )
+        self.assertEqual(2, EveCharacterSkillset.objects.count())
@@ -1,3 +1,4 @@
+import time
 from unittest.mock import MagicMock, patch
 
 from django.test import SimpleTestCase
@@ -8,6 +9,7 @@ from eveonline.client import (
     SUCCESS,
     EsiClient,
     EsiResponse,
+    get_region_market_orders_pages,
 )
 
 
@@ -307,3 +309,58 @@ class EsiClientTest(SimpleTestCase):
         self.assertEqual(response.response_code, SUCCESS)
         self.assertEqual(response.results()["name"], "Gankproof Dex")
         self.assertIsInstance(response.results(), dict)
+
+
+def _orders_response(page: int, total_pages: int, status: int = 200):
+    resp = MagicMock()
+    resp.status_code = status
+    resp.content = b"[...]"
+    resp.json.return_value = [{"order_id": page, "type_id": 34}]
+    resp.headers = {
+        "X-Pages": str(total_pages),
+        "X-ESI-Error-Limit-Remain": "100",
+    }
+    return resp
+
+
+class RegionMarketOrdersPagesTest(SimpleTestCase):
+    """Concurrent region order-book fetcher"""
+
+    @patch("eveonline.client.esi_transport")
+    def test_yields_all_pages_in_order(self, transport):
+        def fake_get(url, params, timeout):
+            # Later pages answer first; output must still be ordered.
+            time.sleep(0.001 * (10 - params["page"]))
+            return _orders_response(params["page"], 6)
+
+        transport.return_value.get.side_effect = fake_get
+
+        pages = list(get_region_market_orders_pages(10000002, concurrency=4))
+
+        self.assertEqual([p[0]["order_id"] for p in pages], [1, 2, 3, 4, 5, 6])
+        self.assertEqual(transport.return_value.get.call_count, 6)
+
+    @patch("eveonline.client.esi_transport")
+    def test_failed_page_yields_none_and_stops(self, transport):
+        def fake_get(url, params, timeout):
+            status = 503 if params["page"] == 3 else 200
+            return _orders_response(params["page"], 5, status=status)
+
+        transport.return_value.get.side_effect = fake_get
+
+        pages = list(get_region_market_orders_pages(10000002, concurrency=2))
+
+        self.assertEqual([p[0]["order_id"] for p in pages[:2]], [1, 2])
+        self.assertEqual(len(pages), 3)
+        self.assertIsNone(pages[-1])
+
+    @patch("eveonline.client.esi_transport")
+    def test_passes_type_filter_on_every_page(self, transport):
+        transport.return_value.get.side_effect = lambda url, params, timeout: (
+            _orders_response(params["page"], 2)
+        )
+
+        list(get_region_market_orders_pages(10000002, type_id=587))
+
+        for call in transport.return_value.get.call_args_list:
+            self.assertEqual(call.kwargs["params"]["type_id"], 587)
@@ -0,0 +1,203 @@
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+import factory
+from django.contrib.auth.models import User
+from django.db.models import signals
+from django.utils import timezone
+from esi.models import Token
+
+from app.test import TestCase
+from eveonline.models import (
+    EveAlliance,
+    EveCharacter,
+    EveCharacterRefreshState,
+)
+from eveonline.refresh_scheduler import (
+    REFRESH_COSTS,
+    RefreshOutcome,
+    due_refreshes,
+    ensure_refresh_states,
+    percentile,
+    record_refreshes,
+    refresh_backlog_summary,
+)
+from eveonline.tasks import (
+    refresh_character_data,
+    schedule_character_refreshes,
+)
+
+DataType = EveCharacterRefreshState.DataType
+
+
+class RefreshSchedulerTestCase(TestCase):
+    def setUp(self):
+        with factory.django.mute_signals(signals.pre_save, signals.post_save):
+            alliance = EveAlliance.objects.create(
+                alliance_id=99011978, name="Minmatar Fleet Alliance"
+            )
+            self.active = self._character(
+                1001, "active", timezone.now(), alliance.alliance_id
+            )
+            self.idle = self._character(
+                1002,
+                "idle",
+                timezone.now() - timedelta(days=60),
+                alliance.alliance_id,
+            )
+
+    def _character(self, character_id, username, last_login, alliance_id):
+        user = User.objects.create_user(username=username)
+        User.objects.filter(pk=user.pk).update(last_login=last_login)
+        token = Token.objects.create(character_id=character_id)
+        EveCharacter.objects.create(
+            character_id=character_id,
+            character_name=username.title(),
+            alliance_id=alliance_id,
+            user=user,
+            token=token,
+        )
+        return EveCharacter.objects.select_related("user").get(
+            character_id=character_id
+        )
+
+    def test_new_characters_are_due_now(self):
+        self.assertEqual(2 * len(DataType.values), ensure_refresh_states())
+        self.assertEqual(0, ensure_refresh_states())
+        self.assertEqual(
+            2 * len(DataType.values), EveCharacterRefreshState.objects.count()
+        )
+
+    def test_data_types_added_later_are_seeded(self):
+        ensure_refresh_states()
+        # As if CLONES had been added after both characters were seeded.
+        EveCharacterRefreshState.objects.filter(
+            data_type=DataType.CLONES
+        ).delete()
+
+        self.assertEqual(2, ensure_refresh_states())
+        self.assertEqual(
+            {1001, 1002},
+            set(
+                EveCharacterRefreshState.objects.filter(
+                    data_type=DataType.CLONES
+                ).values_list("character__character_id", flat=True)
+            ),
+        )
+
+    def test_budget_prefers_active_then_overdue(self):
+        ensure_refresh_states()
+        EveCharacterRefreshState.objects.filter(character=self.idle).update(
+            due_at=timezone.now() - timedelta(days=2)
+        )
+        budget = sum(REFRESH_COSTS.values())
+
+        due = due_refreshes(budget)
+
+        self.assertEqual({1001: list(DataType.values)}, due)
+        self.assertEqual(
+            len(DataType.values),
+            EveCharacterRefreshState.objects.exclude(queued_at=None).count(),
+        )
+        # Queued rows are not picked again; the idle character is next.
+        self.assertEqual([1002], list(due_refreshes(budget)))
+        self.assertEqual({}, due_refreshes(budget))
+
+    def test_expires_and_activity_set_next_due(self):
+        ensure_refresh_states()
+        started = timezone.now()
+        expires = (started + timedelta(hours=6)).timestamp()
+        record_refreshes(
+            self.active,
+            [
+                RefreshOutcome(DataType.SKILLS, started),
+                RefreshOutcome(DataType.ASSETS, started, expires_at=expires),
+                RefreshOutcome(DataType.MINING, started, skipped=True),
+                RefreshOutcome(DataType.CLONES, started, error="boom"),
+            ],
+        )
+        record_refreshes(self.idle, [RefreshOutcome(DataType.SKILLS, started)])
+
+        states = {
+            (s.character_id, s.data_type): s
+            for s in EveCharacterRefreshState.objects.all()
+        }
+        skills = states[(self.active.pk, DataType.SKILLS)]
+        self.assertIsNotNone(skills.refreshed_at)
+        self.assertEqual(0, skills.lag_seconds)
+        self.assertAlmostEqual(
+            4 * 3600,
+            (skills.due_at - started).total_seconds(),
+            delta=60,
+        )
+        self.assertAlmostEqual(
+            expires,
+            states[(self.active.pk, DataType.ASSETS)].due_at.timestamp(),
+            delta=1,
+        )
+        self.assertIsNone(
+            states[(self.active.pk, DataType.MINING)].refreshed_at
+        )
+        self.assertEqual(
+            "boom", states[(self.active.pk, DataType.CLONES)].last_error
+        )
+        self.assertAlmostEqual(
+            24 * 3600,
+            (
+                states[(self.idle.pk, DataType.SKILLS)].due_at - started
+            ).total_seconds(),
+            delta=60,
+        )
+
+    def test_schedule_queues_one_task_per_character(self):
+        with patch(
+            "eveonline.tasks.characters.refresh_character_data"
+        ) as task:
+            self.assertEqual(2, schedule_character_refreshes())
+        queued = sorted(
+            call.kwargs["args"][0] for call in task.apply_async.mock_calls
+        )
+        self.assertEqual([1001, 1002], queued)
+
+    def test_refresh_runs_only_requested_types(self):
+        ensure_refresh_states()
+        steps = tuple(
+            (data_type, (), MagicMock()) for data_type in DataType.values
+        )
+        with patch(
+            "eveonline.tasks.characters.CHARACTER_REFRESH_STEPS", steps
+        ):
+            refresh_character_data(1001, [DataType.SKILLS, DataType.CLONES])
+
+        for data_type, _, refresh in steps:
+            if data_type in (DataType.SKILLS, DataType.CLONES):
+                refresh.assert_called_once_with(1001)
+            else:
+                refresh.assert_not_called()
+        self.assertEqual(
+            {DataType.SKILLS, DataType.CLONES},
+            set(
+                EveCharacterRefreshState.objects.filter(
+                    refreshed_at__isnull=False
+                ).values_list("data_type", flat=True)
+            ),
+        )
+
+    def test_backlog_summary(self):
+        ensure_refresh_states()
+        EveCharacterRefreshState.objects.filter(character=self.active).update(
+            lag_seconds=10
+        )
+        EveCharacterRefreshState.objects.filter(
+            character=self.idle, data_type=DataType.SKILLS
+        ).update(lag_seconds=1000)
+
+        summary = refresh_backlog_summary()
+
+        self.assertEqual(2 * len(DataType.values), summary["due"])
+        self.assertEqual(0, summary["queued"])
+        self.assertEqual(
+            [("p50", 10), ("p90", 10), ("p99", 1000)],
+            summary["lag_percentiles"],
+        )
+        self.assertIsNone(percentile([], 50))
@@ -0,0 +1,143 @@
+import time
+from email.utils import formatdate
+from unittest.mock import MagicMock, patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from eveonline.client import SUCCESS, EsiClient
+from eveonline.response_cache import (
+    conditional_get,
+    esi_cache_stats,
+    reset_esi_cache_stats,
+)
+
+URL = "https://esi.evetech.net/latest/corporations/98705678/members/"
+
+
+def _response(status=200, data=None, etag='"abc"', expires_in=None):
+    resp = MagicMock()
+    resp.status_code = status
+    resp.content = b"x" if data is not None else b""
+    resp.json.return_value = data
+    resp.headers = {"X-Pages": "1"}
+    if etag:
+        resp.headers["ETag"] = etag
+    if expires_in is not None:
+        resp.headers["Expires"] = formatdate(
+            time.time() + expires_in, usegmt=True
+        )
+    return resp
+
+
+class ConditionalGetTest(SimpleTestCase):
+    """ETag / Expires-aware ESI response cache"""
+
+    def setUp(self):
+        cache.clear()
+        reset_esi_cache_stats()
+
+    @patch("eveonline.response_cache.esi_transport")
+    def test_first_fetch_is_a_miss(self, transport):
+        transport.return_value.get.return_value = _response(data=[1, 2])
+
+        resp = conditional_get(URL, character_id=1)
+
+        self.assertEqual(resp.data, [1, 2])
+        self.assertFalse(resp.not_modified)
+        self.assertEqual(
+            esi_cache_stats()["/latest/corporations/{id}/members/"]["miss"], 1
+        )
+
+    @patch("eveonline.response_cache.esi_transport")
+    def test_unexpired_entry_skips_esi(self, transport):
+        transport.return_value.get.return_value = _response(
+            data=[1, 2], expires_in=300
+        )
+        conditional_get(URL, character_id=1)
+
+        resp = conditional_get(URL, character_id=1)
+
+        self.assertTrue(resp.not_modified)
+        self.assertEqual(resp.data, [1, 2])
+        self.assertEqual(transport.return_value.get.call_count, 1)
+        self.assertEqual(
+            esi_cache_stats()["/latest/corporations/{id}/members/"]["hit"], 1
+        )
+
+    @patch("eveonline.response_cache.esi_transport")
+    def test_expired_entry_revalidates_with_etag(self, transport):
+        get = transport.return_value.get
+        get.side_effect = [
+            _response(data=[1, 2], expires_in=-1),
+            _response(status=304, etag='"abc"', expires_in=300),
+        ]
+        conditional_get(URL, character_id=1)
+
+        resp = conditional_get(URL, character_id=1)
+
+        self.assertEqual(
+            get.call_args.kwargs["headers"]["If-None-Match"], '"abc"'
+        )
+        self.assertTrue(resp.not_modified)
+        self.assertEqual(resp.data, [1, 2])
+        self.assertEqual(
+            esi_cache_stats()["/latest/corporations/{id}/members/"][
+                "not_modified"
+            ],
+            1,
+        )
+
+    @patch("eveonline.response_cache.esi_transport")
+    def test_cache_is_keyed_per_character(self, transport):
+        transport.return_value.get.return_value = _response(
+            data=[1], expires_in=300
+        )
+        conditional_get(URL, character_id=1)
+
+        resp = conditional_get(URL, character_id=2)
+
+        self.assertFalse(resp.not_modified)
+        self.assertEqual(transport.return_value.get.call_count, 2)
+
+    @patch("eveonline.response_cache.esi_transport")
+    def test_errors_are_not_cached(self, transport):
+        transport.return_value.get.return_value = _response(
+            status=503, data=None
+        )
+
+        resp = conditional_get(URL, character_id=1)
+
+        self.assertEqual(resp.status_code, 503)
+        resp = conditional_get(URL, character_id=1)
+        self.assertEqual(transport.return_value.get.call_count, 2)
+        self.assertNotIn(
+            "If-None-Match",
+            transport.return_value.get.call_args.kwargs["headers"],
+        )
+
+
+class EsiClientConditionalTest(SimpleTestCase):
+    """EsiClient methods backed by the conditional cache"""
+
+    def setUp(self):
+        cache.clear()
+
+    @patch("eveonline.response_cache.esi_transport")
+    @patch("eveonline.client.Token.get_token")
+    def test_structure_orders_report_not_modified(self, get_token, transport):
+        get_token.return_value.valid_access_token.return_value = "tok"
+        transport.return_value.get.return_value = _response(
+            data=[{"order_id": 1}], expires_in=300
+        )
+        client = EsiClient(634915984)
+
+        first = client.get_structure_market_orders(1022167642188)
+        second = client.get_structure_market_orders(1022167642188)
+
+        self.assertEqual(first.response_code, SUCCESS)
+        self.assertFalse(first.not_modified)
+        self.assertTrue(second.not_modified)
+        self.assertEqual(second.data, [{"order_id": 1}])
+        self.assertIsNotNone(first.etag)
+        self.assertEqual(first.etag, second.etag)
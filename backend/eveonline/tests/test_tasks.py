@@ -2,6 +2,7 @@ import factory
 from typing import List
 from unittest.mock import patch, MagicMock
 
+from django.core.cache import cache
 from django.utils import timezone
 from django.db.models import signals
 
@@ -14,7 +15,15 @@ from eveonline.scopes import scopes_for, TokenType
 from eveonline.helpers.characters import (
     update_character_assets as helper_update_character_assets,
 )
-from eveonline.helpers.characters.update import update_character_killmails
+from eveonline.helpers.characters.update import (
+    _killmail_fetch_claim_key,
+    update_character_killmails,
+)
+from eveonline.tasks.characters import (
+    CHARACTER_REFRESH_STEPS,
+    SCOPE_CLONES,
+    SCOPE_IMPLANTS,
+)
 from eveonline.tasks import (
     update_character,
     update_corporation,
@@ -28,8 +37,10 @@ from eveonline.models import (
     EveAlliance,
     EvePlayer,
     EveCharacterKillmail,
+    EveCharacterKillmailAttacker,
     EveLocation,
     EveCharacterAsset,
+    EveCharacterRefreshState,
 )
 
 
@@ -335,6 +346,58 @@ class EveOnlineTaskTests(TestCase):
             EveCharacter.objects.get(character_id=10001).corporation_id
         )
 
+    @factory.django.mute_signals(signals.pre_save, signals.post_save)
+    @patch("eveonline.tasks.affiliations.update_affiliation")
+    @patch("eveonline.tasks.affiliations.EsiClient")
+    def test_update_character_affilliations_applies_changes_in_bulk(
+        self, esi_mock, update_affiliation_mock
+    ):
+        task_config["async_apply_affiliations"] = False
+        for character_id, corporation_id in (
+            (10001, 20001),
+            (10002, 20001),
+            (10003, 20002),
+        ):
+            EveCharacter.objects.create(
+                character_id=character_id,
+                character_name=f"Char{character_id}",
+                corporation_id=corporation_id,
+                user=self.user,
+            )
+        esi_mock.return_value.get_character_affiliations.return_value = (
+            EsiResponse(
+                response_code=200,
+                data=[
+                    {"character_id": 10001, "corporation_id": 20001},
+                    {
+                        "character_id": 10002,
+                        "corporation_id": 20003,
+                        "alliance_id": 30001,
+                    },
+                    {"character_id": 10003, "corporation_id": 20003},
+                ],
+            )
+        )
+
+        # Character ids, then one read and one bulk update for the batch.
+        with self.assertNumQueries(3):
+            updated = update_character_affilliations()
+
+        self.assertEqual(2, updated)
+        self.assertEqual(
+            [
+                (10001, 20001, None),
+                (10002, 20003, 30001),
+                (10003, 20003, None),
+            ],
+            list(
+                EveCharacter.objects.order_by("character_id").values_list(
+                    "character_id", "corporation_id", "alliance_id"
+                )
+            ),
+        )
+        update_affiliation_mock.assert_called_once_with(self.user.id)
+
     @factory.django.mute_signals(signals.pre_save, signals.post_save)
     @patch("eveonline.helpers.characters.skills.EsiClient")
     @patch("eveonline.helpers.characters.update.EsiClient")
@@ -410,18 +473,127 @@ class EveOnlineTaskTests(TestCase):
         self.assertEqual(0, EveCharacterKillmail.objects.count())
 
     @factory.django.mute_signals(signals.pre_save, signals.post_save)
-    @patch("eveonline.tasks.characters.refresh_character_clones")
-    @patch("eveonline.tasks.characters.Token.get_token")
-    def test_update_character_calls_clone_sync_when_scopes_present(
-        self, token_mock, clones_mock
+    @patch("eveonline.helpers.characters.update.EsiClient")
+    def test_update_character_killmails_fetches_only_unknown_killmails(
+        self, update_esi_mock
     ):
-        token_mock.side_effect = lambda char_id, scopes: scopes in (
-            ["esi-clones.read_clones.v1"],
-            ["esi-clones.read_implants.v1"],
+        esi = update_esi_mock.return_value
+        esi.get_recent_killmails.return_value = EsiResponse(
+            response_code=200,
+            data=[
+                {"killmail_id": 2001, "killmail_hash": "aaa"},
+                {"killmail_id": 2002, "killmail_hash": "bbb"},
+            ],
+        )
+        esi.get_character_killmail.side_effect = (
+            lambda killmail_id, killmail_hash: EsiResponse(
+                response_code=200,
+                data={
+                    "solar_system_id": 30002538,
+                    "killmail_time": timezone.now(),
+                    "victim": {
+                        "ship_type_id": 587,
+                        "character_id": 9001,
+                        "items": [],
+                    },
+                    "attackers": [
+                        {"character_id": 9002, "ship_type_id": 11371},
+                        {"corporation_id": 1000127},
+                    ],
+                },
+            )
+        )
+        first = EveCharacter.objects.create(
+            character_id=1003, character_name="First Pilot"
+        )
+        second = EveCharacter.objects.create(
+            character_id=1004, character_name="Second Pilot"
+        )
+
+        self.assertEqual(2, update_character_killmails(first.character_id))
+        self.assertEqual(2, esi.get_character_killmail.call_count)
+        self.assertEqual(4, EveCharacterKillmailAttacker.objects.count())
+        self.assertEqual(
+            [None, 9002],
+            sorted(
+                EveCharacterKillmailAttacker.objects.filter(
+                    killmail_id=2001
+                ).values_list("character_id", flat=True),
+                key=lambda value: value or 0,
+            ),
+        )
+
+        # The same fight on another pilot's refresh: nothing is re-fetched.
+        self.assertEqual(0, update_character_killmails(second.character_id))
+        self.assertEqual(2, esi.get_character_killmail.call_count)
+        self.assertEqual(2, EveCharacterKillmail.objects.count())
+        self.assertEqual(
+            {first.pk},
+            set(
+                EveCharacterKillmail.objects.values_list(
+                    "character_id", flat=True
+                )
+            ),
+        )
+
+    @factory.django.mute_signals(signals.pre_save, signals.post_save)
+    @patch("eveonline.helpers.characters.update.EsiClient")
+    def test_update_character_killmails_skips_killmails_being_fetched(
+        self, update_esi_mock
+    ):
+        esi = update_esi_mock.return_value
+        esi.get_recent_killmails.return_value = EsiResponse(
+            response_code=200,
+            data=[{"killmail_id": 3001, "killmail_hash": "ccc"}],
         )
+        char = EveCharacter.objects.create(
+            character_id=1005, character_name="Late Pilot"
+        )
+        cache.add(_killmail_fetch_claim_key(3001), 1004)
+        try:
+            self.assertEqual(0, update_character_killmails(char.character_id))
+        finally:
+            cache.delete(_killmail_fetch_claim_key(3001))
+
+        esi.get_character_killmail.assert_not_called()
+
+    @factory.django.mute_signals(signals.pre_save, signals.post_save)
+    @patch("eveonline.tasks.characters.refresh_character_public_data")
+    def test_update_character_calls_clone_sync_when_scopes_present(
+        self, public_data_mock
+    ):
+        clones_mock = MagicMock()
         char = EveCharacter.objects.create(
             character_id=2001,
             character_name="Clone Pilot",
         )
-        update_character(char.character_id)
+        clone_token = Token.objects.create(character_id=char.character_id)
+        self.add_token_scopes(clone_token, ["esi-clones.read_clones.v1"])
+        implant_token = Token.objects.create(character_id=char.character_id)
+        self.add_token_scopes(implant_token, ["esi-clones.read_implants.v1"])
+        steps = tuple(
+            (
+                data_type,
+                scopes,
+                (
+                    clones_mock
+                    if scopes == (SCOPE_CLONES, SCOPE_IMPLANTS)
+                    else MagicMock()
+                ),
+            )
+            for data_type, scopes, _ in CHARACTER_REFRESH_STEPS
+        )
+        # Character, tokens + scopes, then the refresh states read and
+        # created in bulk.
+        with patch(
+            "eveonline.tasks.characters.CHARACTER_REFRESH_STEPS", steps
+        ), self.assertNumQueries(5):
+            update_character(char.character_id)
         clones_mock.assert_called_once_with(2001)
+        for _, scopes, refresh in steps:
+            if refresh is not clones_mock:
+                refresh.assert_not_called()
+        refreshed = EveCharacterRefreshState.objects.filter(
+            character=char, refreshed_at__isnull=False
+        ).values_list("data_type", flat=True)
+        self.assertEqual(["clones"], list(refreshed))
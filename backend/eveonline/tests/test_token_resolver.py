@@ -0,0 +1,88 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from esi.models import Scope, Token
+
+from eveonline.client import SUCCESS, EsiClient
+from eveonline.token_resolver import (
+    CharacterTokens,
+    _refresh_lock_key,
+    use_character_tokens,
+    valid_access_token,
+)
+
+CHARACTER_ID = 634915984
+SKILLS = "esi-skills.read_skills.v1"
+ASSETS = "esi-assets.read_assets.v1"
+
+
+class TokenResolverTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def _token(self, *scopes, expired=False):
+        token = Token.objects.create(
+            character_id=CHARACTER_ID,
+            access_token="access",
+            refresh_token="refresh",
+        )
+        for name in scopes:
+            token.scopes.add(Scope.objects.get_or_create(name=name)[0])
+        if expired:
+            # created is auto_now_add, so age the row after the insert.
+            Token.objects.filter(pk=token.pk).update(
+                created=timezone.now() - timedelta(hours=1)
+            )
+            token.refresh_from_db()
+        return token
+
+    def test_token_for_matches_get_token(self):
+        skills_only = self._token(SKILLS)
+        both = self._token(SKILLS, ASSETS)
+        self._token(ASSETS)
+
+        with self.assertNumQueries(2):
+            tokens = CharacterTokens.load(CHARACTER_ID)
+        with self.assertNumQueries(0):
+            self.assertEqual(skills_only, tokens.token_for([SKILLS]))
+            self.assertEqual(both, tokens.token_for([SKILLS, ASSETS]))
+            self.assertTrue(tokens.has_scopes([SKILLS], [ASSETS]))
+            self.assertIsNone(tokens.token_for(["esi-mail.send_mail.v1"]))
+        self.assertEqual(
+            Token.get_token(CHARACTER_ID, [SKILLS, ASSETS]),
+            tokens.token_for([SKILLS, ASSETS]),
+        )
+
+    def test_client_uses_run_tokens_without_queries(self):
+        token = self._token(SKILLS)
+        tokens = CharacterTokens.load(CHARACTER_ID)
+        client = EsiClient(CHARACTER_ID)
+        with use_character_tokens(tokens), self.assertNumQueries(0):
+            # pylint: disable-next=protected-access
+            result, status = client._valid_token([SKILLS])
+        self.assertEqual(SUCCESS, status)
+        self.assertEqual(token, result)
+
+    @patch("eveonline.token_resolver.TOKEN_REFRESH_POLL_SECONDS", 0)
+    @patch.object(Token, "refresh")
+    def test_waits_for_concurrent_refresh(self, refresh_mock):
+        stale = self._token(SKILLS, expired=True)
+        Token.objects.filter(pk=stale.pk).update(
+            created=timezone.now(), access_token="refreshed"
+        )
+        cache.set(_refresh_lock_key(stale.pk), "1")
+
+        self.assertEqual("refreshed", valid_access_token(stale))
+        refresh_mock.assert_not_called()
+
+    @patch.object(Token, "refresh")
+    def test_lock_holder_refreshes_once(self, refresh_mock):
+        stale = self._token(SKILLS, expired=True)
+
+        valid_access_token(stale)
+
+        refresh_mock.assert_called_once()
+        self.assertIsNone(cache.get(_refresh_lock_key(stale.pk)))
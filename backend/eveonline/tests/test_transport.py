@@ -0,0 +1,93 @@
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase
+
+from eveonline.transport import EsiTransport, esi_route, esi_transport
+
+
+def _response(status=200, body=b"[]", headers=None):
+    resp = MagicMock()
+    resp.status_code = status
+    resp.content = body
+    resp.headers = headers or {}
+    return resp
+
+
+class EsiTransportTest(SimpleTestCase):
+    """Shared pooled transport for raw ESI requests"""
+
+    def test_route_collapses_numeric_segments(self):
+        self.assertEqual(
+            esi_route(
+                "https://esi.evetech.net/latest/corporations/98705678/wallets/3/journal/"
+            ),
+            "/latest/corporations/{id}/wallets/{id}/journal/",
+        )
+
+    def test_get_records_latency_bytes_and_errors_per_route(self):
+        transport = EsiTransport()
+        with patch.object(
+            transport.session,
+            "get",
+            side_effect=[_response(body=b"[1,2,3]"), _response(status=404)],
+        ):
+            transport.get(
+                "https://esi.evetech.net/latest/characters/1/clones/"
+            )
+            transport.get(
+                "https://esi.evetech.net/latest/characters/2/clones/"
+            )
+
+        stats = transport.stats()["/latest/characters/{id}/clones/"]
+        self.assertEqual(stats["requests"], 2)
+        self.assertEqual(stats["errors"], 1)
+        self.assertEqual(stats["bytes"], 9)
+
+    def test_connection_errors_are_counted_and_reraised(self):
+        transport = EsiTransport()
+        with patch.object(
+            transport.session, "get", side_effect=ConnectionError("boom")
+        ):
+            with self.assertRaises(ConnectionError):
+                transport.get("https://esi.evetech.net/latest/universe/names/")
+
+        self.assertEqual(
+            transport.stats()["/latest/universe/names/"]["errors"], 1
+        )
+
+    @patch("eveonline.transport.time.sleep")
+    def test_low_error_limit_pauses_next_request(self, sleep):
+        transport = EsiTransport()
+        low = _response(
+            headers={
+                "X-ESI-Error-Limit-Remain": "5",
+                "X-ESI-Error-Limit-Reset": "12",
+            }
+        )
+        with patch.object(transport.session, "get", return_value=low):
+            transport.get("https://esi.evetech.net/latest/markets/1/orders/")
+            sleep.assert_not_called()
+            transport.get("https://esi.evetech.net/latest/markets/1/orders/")
+
+        sleep.assert_called_once()
+        self.assertLessEqual(sleep.call_args.args[0], 12)
+        self.assertEqual(transport.error_limit_remain, 5)
+
+    def test_healthy_error_budget_does_not_pause(self):
+        transport = EsiTransport()
+        ok = _response(
+            headers={
+                "X-ESI-Error-Limit-Remain": "100",
+                "X-ESI-Error-Limit-Reset": "30",
+            }
+        )
+        with patch.object(transport.session, "get", return_value=ok), patch(
+            "eveonline.transport.time.sleep"
+        ) as sleep:
+            transport.get("https://esi.evetech.net/latest/markets/1/orders/")
+            transport.get("https://esi.evetech.net/latest/markets/1/orders/")
+
+        sleep.assert_not_called()
+
+    def test_esi_transport_is_shared_within_process(self):
+        self.assertIs(esi_transport(), esi_transport())
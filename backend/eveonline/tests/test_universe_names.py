@@ -0,0 +1,128 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from eveonline.client import EsiResponse
+from eveonline.models import EveUniverseName
+from eveonline.universe_names import (
+    UniverseName,
+    clear_universe_name_cache,
+    reset_universe_name_stats,
+    resolve_universe_name_map,
+    resolve_universe_names,
+    universe_name_stats,
+)
+
+KNOWN = {
+    30000142: ("Jita", "solar_system"),
+    587: ("Rifter", "inventory_type"),
+    634915984: ("Pilot One", "character"),
+}
+
+
+def _fake_esi(ids):
+    if any(i not in KNOWN for i in ids):
+        return EsiResponse(404)
+    return EsiResponse(
+        200,
+        data=[
+            {"id": i, "name": KNOWN[i][0], "category": KNOWN[i][1]}
+            for i in ids
+        ],
+    )
+
+
+@patch("eveonline.universe_names.EsiClient")
+class UniverseNamesTest(TestCase):
+    def setUp(self):
+        clear_universe_name_cache()
+        reset_universe_name_stats()
+
+    def test_layers_answer_before_esi(self, esi_client):
+        esi = esi_client.return_value
+        esi.resolve_universe_names.side_effect = _fake_esi
+
+        self.assertEqual(
+            UniverseName(30000142, "Jita", "solar_system"),
+            resolve_universe_names([30000142, 587])[30000142],
+        )
+        self.assertEqual(1, esi.resolve_universe_names.call_count)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                {30000142: "Jita", 587: "Rifter"},
+                resolve_universe_name_map([587, 30000142]),
+            )
+
+        clear_universe_name_cache()
+        with self.assertNumQueries(1):
+            resolve_universe_names([587])
+        self.assertEqual(1, esi.resolve_universe_names.call_count)
+
+        stats = universe_name_stats()
+        self.assertEqual(
+            (2, 2, 1, 1),
+            (
+                stats["esi_resolved"],
+                stats["lru_hit"],
+                stats["db_hit"],
+                stats["esi_requests"],
+            ),
+        )
+        self.assertEqual(0.6, stats["hit_rate"])
+
+    def test_unknown_ids_are_isolated_and_negative_cached(self, esi_client):
+        esi = esi_client.return_value
+        esi.resolve_universe_names.side_effect = _fake_esi
+
+        names = resolve_universe_name_map([30000142, 587, 634915984, 1])
+
+        self.assertEqual({30000142, 587, 634915984}, set(names))
+        self.assertTrue(EveUniverseName.objects.get(id=1).missing)
+        calls = esi.resolve_universe_names.call_count
+
+        clear_universe_name_cache()
+        self.assertEqual({}, resolve_universe_names([1]))
+        self.assertEqual(calls, esi.resolve_universe_names.call_count)
+
+    def test_expired_mutable_names_are_refreshed(self, esi_client):
+        esi = esi_client.return_value
+        esi.resolve_universe_names.side_effect = _fake_esi
+        old = timezone.now() - timedelta(days=30)
+        EveUniverseName.objects.create(
+            id=634915984,
+            name="Old Name",
+            category="character",
+            resolved_at=old,
+        )
+        EveUniverseName.objects.create(
+            id=587, name="Rifter", category="inventory_type", resolved_at=old
+        )
+
+        names = resolve_universe_name_map([634915984, 587])
+
+        self.assertEqual("Pilot One", names[634915984])
+        esi.resolve_universe_names.assert_called_once_with([634915984])
+
+    def test_no_conflict_target_without_backend_support(self, esi_client):
+        """MySQL upserts with ON DUPLICATE KEY UPDATE and no target."""
+        esi_client.return_value.resolve_universe_names.side_effect = _fake_esi
+
+        with patch.object(
+            connection.features, "supports_update_conflicts_with_target", False
+        ), patch.object(EveUniverseName.objects, "bulk_create") as bulk_create:
+            resolve_universe_names([587])
+
+        self.assertTrue(bulk_create.call_args.kwargs["update_conflicts"])
+        self.assertIsNone(bulk_create.call_args.kwargs["unique_fields"])
+
+    def test_esi_failure_is_not_cached(self, esi_client):
+        esi_client.return_value.resolve_universe_names.return_value = (
+            EsiResponse(502)
+        )
+
+        self.assertEqual({}, resolve_universe_names([30000142]))
+        self.assertFalse(EveUniverseName.objects.exists())
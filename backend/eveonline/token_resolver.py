@@ -0,0 +1,122 @@
+"""
+Per-run resolution of a character's ESI tokens.
+
+update_character refreshes about ten data sets per character, each behind a
+scope check, and every EsiClient call looked its token up again
+(``Token.get_token``: a token + scopes join) before validating it.
+CharacterTokens loads all of a character's tokens and scope names in two
+queries and answers scope checks from memory. While ``use_character_tokens``
+is active, EsiClient for that character takes its tokens from it, so each
+token is validated (and refreshed at most once) per run.
+
+Expired tokens are refreshed through ``valid_access_token``, which takes a
+per-token cache lock so concurrent Celery workers make one SSO refresh call;
+the others wait for it and reload the refreshed row.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import FrozenSet, Iterable, List, Optional, Tuple
+
+from django.core.cache import cache
+from esi.models import Token
+
+logger = logging.getLogger(__name__)
+
+TOKEN_REFRESH_LOCK_TTL = 30
+TOKEN_REFRESH_WAIT_SECONDS = 10
+TOKEN_REFRESH_POLL_SECONDS = 0.25
+
+_local = threading.local()
+
+
+def _refresh_lock_key(token_pk: int) -> str:
+    return f"esi:token_refresh:{token_pk}"
+
+
+def valid_access_token(token: Token) -> str:
+    """
+    ``token.valid_access_token()`` with refreshes coalesced across workers.
+
+    Raises whatever django-esi raises when the token cannot be refreshed.
+    """
+    if not token.expired:
+        return token.valid_access_token()
+
+    lock_key = _refresh_lock_key(token.pk)
+    if cache.add(lock_key, "1", timeout=TOKEN_REFRESH_LOCK_TTL):
+        try:
+            # Another worker may have refreshed it since we loaded the row.
+            token.refresh_from_db()
+            return token.valid_access_token()
+        finally:
+            cache.delete(lock_key)
+
+    logger.debug("Waiting for concurrent refresh of token %s", token.pk)
+    deadline = time.monotonic() + TOKEN_REFRESH_WAIT_SECONDS
+    while time.monotonic() < deadline:
+        time.sleep(TOKEN_REFRESH_POLL_SECONDS)
+        token.refresh_from_db()
+        if not token.expired or cache.get(lock_key) is None:
+            break
+    return token.valid_access_token()
+
+
+class CharacterTokens:
+    """A character's tokens and their scope names, loaded once."""
+
+    def __init__(
+        self,
+        character_id: int,
+        tokens: Iterable[Tuple[Token, FrozenSet[str]]],
+    ):
+        self.character_id = character_id
+        self._tokens: List[Tuple[Token, FrozenSet[str]]] = list(tokens)
+
+    @classmethod
+    def load(cls, character_id: int) -> CharacterTokens:
+        return cls(
+            character_id,
+            [
+                (token, frozenset(scope.name for scope in token.scopes.all()))
+                for token in Token.objects.filter(character_id=character_id)
+                .order_by("pk")
+                .prefetch_related("scopes")
+            ],
+        )
+
+    def token_for(self, scopes: Iterable[str]) -> Optional[Token]:
+        """The token ``Token.get_token`` would pick, or None."""
+        required = set(scopes)
+        for token, names in self._tokens:
+            if required <= names:
+                return token
+        return None
+
+    def has_scopes(self, *scope_lists: Iterable[str]) -> bool:
+        """True when every scope list is covered by some token."""
+        return all(
+            self.token_for(scopes) is not None for scopes in scope_lists
+        )
+
+
+@contextmanager
+def use_character_tokens(tokens: CharacterTokens):
+    """Let EsiClient for ``tokens.character_id`` resolve tokens from memory."""
+    previous = getattr(_local, "tokens", None)
+    _local.tokens = tokens
+    try:
+        yield tokens
+    finally:
+        _local.tokens = previous
+
+
+def active_character_tokens(character_id: int) -> Optional[CharacterTokens]:
+    tokens = getattr(_local, "tokens", None)
+    if tokens is not None and tokens.character_id == character_id:
+        return tokens
+    return None
@@ -0,0 +1,204 @@
+"""
+Pooled HTTP transport for the raw ESI requests made by EsiClient.
+
+Most EsiClient methods go through django-esi's OpenAPI client, but paginated
+corporation routes, planets, clones, wallet journals, region order books and
+a few others call ESI directly. They all share one EsiTransport per process
+so connections are kept alive between calls, transient 5xx responses are
+retried with backoff, and the X-ESI-Error-Limit-* headers from every
+response feed a single error budget.
+
+Per-endpoint latency and byte counters are available from
+``esi_transport().stats()``.
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+logger = logging.getLogger(__name__)
+
+# Large enough for the concurrent region order-book fetcher.
+ESI_POOL_MAXSIZE = 16
+# Back off once X-ESI-Error-Limit-Remain drops to this many errors.
+ESI_ERROR_LIMIT_SAFETY_MARGIN = 10
+ESI_USER_AGENT = "MinmatarOrg/1.0.0 (+https://minmatar.org)"
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def esi_route(url: str) -> str:
+    """Collapse numeric path segments so counters aggregate per endpoint."""
+    path = url.split("://", 1)[-1]
+    path = path[path.find("/") :] if "/" in path else "/"
+    return _ID_SEGMENT.sub("/{id}", path)
+
+
+@dataclass
+class EndpointStats:
+    """Running counters for one ESI route."""
+
+    requests: int = 0
+    errors: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    bytes: int = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "total_seconds": round(self.total_seconds, 3),
+            "avg_ms": (
+                round(self.total_seconds * 1000 / self.requests, 1)
+                if self.requests
+                else 0.0
+            ),
+            "max_ms": round(self.max_seconds * 1000, 1),
+            "bytes": self.bytes,
+        }
+
+
+class EsiTransport:
+    """Keep-alive session with retries and central ESI error-limit tracking."""
+
+    def __init__(self, pool_maxsize: int = ESI_POOL_MAXSIZE):
+        retry = Retry(
+            total=getattr(settings, "ESI_SERVER_ERROR_MAX_RETRIES", 3),
+            connect=getattr(settings, "ESI_CONNECTION_ERROR_MAX_RETRIES", 3),
+            status_forcelist=[502, 503, 504],
+            allowed_methods=["GET"],
+            backoff_factor=0.5,
+            raise_on_status=False,
+        )
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4, pool_maxsize=pool_maxsize, max_retries=retry
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(
+            {
+                "Accept-Encoding": "gzip, deflate",
+                "User-Agent": ESI_USER_AGENT,
+            }
+        )
+        self._lock = threading.Lock()
+        self._stats: dict[str, EndpointStats] = {}
+        self.error_limit_remain: int | None = None
+        self.error_limit_reset_at: float = 0.0
+
+    def get(
+        self,
+        url: str,
+        params: dict | None = None,
+        headers: dict | None = None,
+        timeout: int = 30,
+    ) -> requests.Response:
+        """GET an ESI URL through the shared session and record its stats."""
+        self._wait_for_error_budget()
+        route = esi_route(url)
+        start = time.perf_counter()
+        try:
+            resp = self.session.get(
+                url, params=params, headers=headers, timeout=timeout
+            )
+        except Exception:
+            self._record(route, time.perf_counter() - start, 0, error=True)
+            raise
+        self._record(
+            route,
+            time.perf_counter() - start,
+            len(resp.content or b""),
+            error=resp.status_code >= 400,
+        )
+        self._track_error_limit(resp)
+        return resp
+
+    def stats(self) -> dict[str, dict]:
+        """Snapshot of per-route counters, keyed by route template."""
+        with self._lock:
+            return {
+                route: stats.as_dict()
+                for route, stats in sorted(self._stats.items())
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def _record(
+        self, route: str, seconds: float, size: int, error: bool
+    ) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(route, EndpointStats())
+            stats.requests += 1
+            stats.errors += int(error)
+            stats.total_seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            stats.bytes += size
+
+    def _track_error_limit(self, resp) -> None:
+        remain = resp.headers.get("X-ESI-Error-Limit-Remain")
+        if remain is None:
+            return
+        try:
+            remain = int(remain)
+            reset = int(resp.headers.get("X-ESI-Error-Limit-Reset", 0))
+        except ValueError:
+            return
+        with self._lock:
+            self.error_limit_remain = remain
+            self.error_limit_reset_at = time.monotonic() + reset
+
+    def _wait_for_error_budget(self) -> None:
+        """
+        Pause when ESI's error budget is nearly spent.
+
+        ESI bans clients that exhaust X-ESI-Error-Limit-Remain inside one
+        window, so once it drops to the safety margin every caller waits
+        out the rest of the window before sending another request.
+        """
+        with self._lock:
+            remain = self.error_limit_remain
+            wait = self.error_limit_reset_at - time.monotonic()
+        if remain is None or remain > ESI_ERROR_LIMIT_SAFETY_MARGIN:
+            return
+        if wait <= 0:
+            return
+        logger.warning(
+            "ESI error limit low (remain=%s), pausing %.1fs before next request",
+            remain,
+            wait,
+        )
+        time.sleep(wait)
+
+
+_transport: EsiTransport | None = None
+_transport_pid: int | None = None
+_transport_lock = threading.Lock()
+
+
+def esi_transport() -> EsiTransport:
+    """
+    Returns the process-wide EsiTransport.
+
+    Recreated after fork so Celery workers never share pooled sockets
+    with their parent.
+    """
+    global _transport, _transport_pid  # pylint: disable=global-statement
+    pid = os.getpid()
+    if _transport is None or _transport_pid != pid:
+        with _transport_lock:
+            if _transport is None or _transport_pid != pid:
+                _transport = EsiTransport()
+                _transport_pid = pid
+    return _transport
@@ -0,0 +1,249 @@
+"""
+Shared resolution of ids to names through ESI POST /universe/names/.
+
+Lookups go through three layers:
+
+- an in-process LRU of recent results;
+- the EveUniverseName table, shared by every worker;
+- ESI, for whatever is left, in requests of up to 1000 ids.
+
+ESI rejects a whole request with 404 when any id in it is unknown. Such
+batches are split until the unknown ids are isolated; those are stored as
+``missing`` so they are not asked for again for a day. Type, system and
+station names never change and are kept for 90 days; character,
+corporation and alliance names can change and are kept for a week.
+
+    names = resolve_universe_names([30000142, 587])
+    names[30000142].name  # "Jita"
+
+Per-layer counters are available from ``universe_name_stats()``.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Dict, Iterable, List, NamedTuple, Set
+
+from django.db import router
+from django.utils import timezone
+
+from eveonline.client import EsiClient
+from eveonline.helpers.db_sync import conflict_unique_fields
+from eveonline.models import EveUniverseName
+
+logger = logging.getLogger(__name__)
+
+UNIVERSE_NAMES_BATCH = 1000
+UNIVERSE_NAME_LRU_SIZE = 50000
+
+IMMUTABLE_CATEGORIES = frozenset(
+    {
+        "constellation",
+        "faction",
+        "inventory_type",
+        "region",
+        "solar_system",
+        "station",
+    }
+)
+IMMUTABLE_NAME_TTL = timedelta(days=90)
+MUTABLE_NAME_TTL = timedelta(days=7)
+MISSING_NAME_TTL = timedelta(days=1)
+
+
+class UniverseName(NamedTuple):
+    id: int
+    name: str
+    category: str
+
+
+def _ttl(category: str, missing: bool) -> timedelta:
+    if missing:
+        return MISSING_NAME_TTL
+    if category in IMMUTABLE_CATEGORIES:
+        return IMMUTABLE_NAME_TTL
+    return MUTABLE_NAME_TTL
+
+
+def _chunks(items: List[int], size: int):
+    for index in range(0, len(items), size):
+        yield items[index : index + size]
+
+
+_lock = threading.Lock()
+# id -> (UniverseName, or None for a missing id; expiry as epoch seconds)
+_lru: "OrderedDict[int, tuple]" = OrderedDict()
+_stats = {"lru_hit": 0, "db_hit": 0, "esi_resolved": 0, "missing": 0}
+_esi_calls = {"requests": 0}
+
+
+def universe_name_stats() -> Dict[str, float]:
+    """Lookup counters per layer and the share answered without ESI."""
+    with _lock:
+        stats = dict(_stats, esi_requests=_esi_calls["requests"])
+    looked_up = (
+        stats["lru_hit"]
+        + stats["db_hit"]
+        + stats["esi_resolved"]
+        + stats["missing"]
+    )
+    stats["hit_rate"] = (
+        (stats["lru_hit"] + stats["db_hit"]) / looked_up if looked_up else 0.0
+    )
+    return stats
+
+
+def reset_universe_name_stats() -> None:
+    with _lock:
+        for key in _stats:
+            _stats[key] = 0
+        _esi_calls["requests"] = 0
+
+
+def clear_universe_name_cache() -> None:
+    """Drop the in-process LRU (the table is left alone)."""
+    with _lock:
+        _lru.clear()
+
+
+def _remember(entries: Dict[int, tuple]) -> None:
+    with _lock:
+        for entity_id, entry in entries.items():
+            _lru[entity_id] = entry
+            _lru.move_to_end(entity_id)
+        while len(_lru) > UNIVERSE_NAME_LRU_SIZE:
+            _lru.popitem(last=False)
+
+
+def _count(key: str, amount: int) -> None:
+    if amount:
+        with _lock:
+            _stats[key] += amount
+
+
+def _fetch(ids: List[int], client: EsiClient) -> tuple:
+    """(rows, missing ids) from ESI; ids of failed requests are in neither."""
+    with _lock:
+        _esi_calls["requests"] += 1
+    try:
+        response = client.resolve_universe_names(ids)
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.warning("ESI universe/names failed: %s", exc)
+        return [], []
+    if response.success():
+        rows = response.results() or []
+        found = {row["id"] for row in rows}
+        return rows, [i for i in ids if i not in found]
+    if response.response_code == 404:
+        if len(ids) == 1:
+            return [], ids
+        middle = len(ids) // 2
+        left_rows, left_missing = _fetch(ids[:middle], client)
+        right_rows, right_missing = _fetch(ids[middle:], client)
+        return left_rows + right_rows, left_missing + right_missing
+    logger.warning(
+        "ESI universe/names failed for %d id(s): %s",
+        len(ids),
+        response.response_code,
+    )
+    return [], []
+
+
+def _resolve_via_esi(ids: Set[int]) -> Dict[int, tuple]:
+    now = timezone.now()
+    client = EsiClient(None)
+    records = []
+    for chunk in _chunks(sorted(ids), UNIVERSE_NAMES_BATCH):
+        rows, missing = _fetch(chunk, client)
+        records.extend(
+            EveUniverseName(
+                id=row["id"],
+                name=row.get("name") or "",
+                category=row.get("category") or "",
+                resolved_at=now,
+            )
+            for row in rows
+        )
+        records.extend(
+            EveUniverseName(id=i, missing=True, resolved_at=now)
+            for i in missing
+        )
+    if records:
+        EveUniverseName.objects.bulk_create(
+            records,
+            update_conflicts=True,
+            unique_fields=conflict_unique_fields(
+                router.db_for_write(EveUniverseName), ["id"]
+            ),
+            update_fields=["name", "category", "missing", "resolved_at"],
+        )
+    return {record.id: _entry(record) for record in records}
+
+
+def _entry(record: EveUniverseName) -> tuple:
+    expires = record.resolved_at + _ttl(record.category, record.missing)
+    if record.missing:
+        return None, expires.timestamp()
+    return (
+        UniverseName(record.id, record.name, record.category),
+        expires.timestamp(),
+    )
+
+
+def resolve_universe_names(ids: Iterable[int]) -> Dict[int, UniverseName]:
+    """
+    Names for ``ids``. Ids ESI does not know, or that could not be resolved
+    because ESI failed, are left out of the result.
+    """
+    wanted = {int(i) for i in ids if i}
+    now = time.time()
+    entries: Dict[int, tuple] = {}
+    with _lock:
+        for entity_id in wanted:
+            entry = _lru.get(entity_id)
+            if entry is not None and entry[1] > now:
+                _lru.move_to_end(entity_id)
+                entries[entity_id] = entry
+    _count("lru_hit", len(entries))
+
+    pending = wanted - entries.keys()
+    if pending:
+        stored = {}
+        for chunk in _chunks(sorted(pending), UNIVERSE_NAMES_BATCH):
+            for record in EveUniverseName.objects.filter(id__in=chunk):
+                entry = _entry(record)
+                if entry[1] > now:
+                    stored[record.id] = entry
+        _count("db_hit", len(stored))
+        pending -= stored.keys()
+        if pending:
+            fetched = _resolve_via_esi(pending)
+            _count(
+                "esi_resolved",
+                sum(1 for name, _ in fetched.values() if name is not None),
+            )
+            _count(
+                "missing",
+                sum(1 for name, _ in fetched.values() if name is None),
+            )
+            stored.update(fetched)
+        _remember(stored)
+        entries.update(stored)
+
+    return {
+        entity_id: name
+        for entity_id, (name, _) in entries.items()
+        if name is not None
+    }
+
+
+def resolve_universe_name_map(ids: Iterable[int]) -> Dict[int, str]:
+    """``resolve_universe_names`` as a plain id -> name dict."""
+    return {
+        entity_id: resolved.name
+        for entity_id, resolved in resolve_universe_names(ids).items()
+    }
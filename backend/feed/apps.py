@@ -9,13 +9,30 @@ class FeedConfig(AppConfig):
     verbose_name = "Activity Feed"
 
     def ready(self):
+        from eveuniverse.models import EveSolarSystem
+
         from feed.helpers.monitored_systems import (
             invalidate_monitored_systems_cache,
         )
+        from feed.helpers.system_distance import (
+            invalidate_solar_system_index,
+        )
         from feed.models import FeedMonitoredSystem
 
         def _invalidate(*args, **kwargs):
             invalidate_monitored_systems_cache()
 
-        post_save.connect(_invalidate, sender=FeedMonitoredSystem)
-        post_delete.connect(_invalidate, sender=FeedMonitoredSystem)
+        post_save.connect(_invalidate, sender=FeedMonitoredSystem, weak=False)
+        post_delete.connect(
+            _invalidate, sender=FeedMonitoredSystem, weak=False
+        )
+
+        def _invalidate_system_index(*args, **kwargs):
+            invalidate_solar_system_index()
+
+        post_save.connect(
+            _invalidate_system_index, sender=EveSolarSystem, weak=False
+        )
+        post_delete.connect(
+            _invalidate_system_index, sender=EveSolarSystem, weak=False
+        )
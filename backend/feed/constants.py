@@ -34,9 +34,28 @@ R2Z2_POLL_SOFT_TIME_LIMIT_SECONDS = 25
 R2Z2_LIVE_GAP_WARN = 50
 R2Z2_CATCHUP_GAP_WARN = 500
 R2Z2_BAN_PAUSE_WARN_SECONDS = 1800
+# Pipelined fetch: once a phase has seen this many consecutive 200s it is
+# behind the tip, so keep up to R2Z2_PIPELINE_WINDOW sequences in flight.
+# Request starts stay R2Z2_SUCCESS_SLEEP_MS apart (<= 10/s), so the window
+# only hides latency and never raises the request rate. 1 disables it.
+R2Z2_PIPELINE_WINDOW = 4
+R2Z2_PIPELINE_RAMP_AFTER = 3
+
+# Incremental cluster detection. Each system keeps the sliding-window walk
+# positions of the last FEED_CLUSTER_RESUME_HORIZON_MINUTES of kill time so
+# late killmails inside that horizon resume the walk instead of rescanning
+# 48h. A full rescan still runs every FEED_CLUSTER_FULL_RESCAN_MINUTES to
+# pick up affiliation changes and anything the pk watermark missed.
+FEED_CLUSTER_RESUME_HORIZON_MINUTES = 120
+FEED_CLUSTER_FULL_RESCAN_MINUTES = 60
 
 # Retention
 FEED_KILLMAIL_RETENTION_DAYS = 30
+# Past this age (well beyond the 48h detection window) killmails are
+# archived: attacker_summary is emptied and only the compressed payload
+# keeps the attackers.
+FEED_KILLMAIL_HOT_DAYS = 3
+FEED_KILLMAIL_ARCHIVE_BATCH = 1000
 FEED_CONTESTED_SNAPSHOT_RETENTION_DAYS = 8
 
 # ESI faction warfare
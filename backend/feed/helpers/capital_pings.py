@@ -34,6 +34,7 @@ from feed.helpers.eve_names import (
 from feed.helpers.ingest import parse_r2z2_payload
 from feed.helpers.killmail_classify import attacker_pilot_count, is_npc_kill
 from feed.helpers.system_distance import light_years_between_systems
+from feed.live import publish_capital_alert
 from feed.models import FeedCapitalAlert, FeedCapitalPing
 from requests.exceptions import HTTPError
 
@@ -893,9 +894,6 @@ def maybe_notify_capital_kill(
     Returns True if a Discord message was created or edited, False if skipped
     (not eligible), and None if skipped solely due to the killmail age gate.
     """
-    if not _capital_ping_channel_ids():
-        return False
-
     raw, zkb, _ = parse_r2z2_payload(payload)
     if is_npc_kill(zkb):
         return False
@@ -904,6 +902,21 @@ def maybe_notify_capital_kill(
     solar_system_id = raw.get("solar_system_id")
     if not killmail_id or not solar_system_id:
         return False
+    # Range check against the in-memory index before any query: almost
+    # every killmail is far from Amamake. Unknown systems fall through to
+    # the full distance check below.
+    known_distance_ly = light_years_between_systems(
+        AMAMAKE_SOLAR_SYSTEM_ID,
+        int(solar_system_id),
+        fetch_missing=False,
+    )
+    if (
+        known_distance_ly is not None
+        and known_distance_ly > CAPITAL_PING_MAX_LIGHT_YEARS
+    ):
+        return False
+    if not _capital_ping_channel_ids():
+        return False
     if FeedCapitalPing.objects.filter(killmail_id=killmail_id).exists():
         return False
     if not killmail_involves_capital(raw):
@@ -952,4 +965,5 @@ def maybe_notify_capital_kill(
         distance_ly=distance_ly,
         created=created,
     )
+    publish_capital_alert(alert)
     return True
@@ -1,18 +1,29 @@
 from __future__ import annotations
 
+from bisect import bisect_left
 from collections import Counter, defaultdict
-from datetime import timedelta
+from datetime import datetime, timedelta
 from typing import Any
 
-from django.db.models import F
+from django.db import transaction
+from django.db.models import F, Max
 from django.utils import timezone
 
-from feed.constants import MILITIA_FACTION_IDS
+from feed.constants import (
+    FEED_CLUSTER_FULL_RESCAN_MINUTES,
+    FEED_CLUSTER_RESUME_HORIZON_MINUTES,
+    MILITIA_FACTION_IDS,
+)
 from feed.helpers.killmail_classify import (
     dominant_attacker_faction,
     resolve_attacker_militia_factions,
 )
-from feed.models import FeedCluster, FeedKillmail
+from feed.models import (
+    FeedCluster,
+    FeedClusterCursor,
+    FeedClusterWalkState,
+    FeedKillmail,
+)
 from feed.rollups.config import get_rollup_config
 
 
@@ -109,6 +120,7 @@ def _find_active_fleet_cluster(
     window_start,
     *,
     stale_minutes: int,
+    last_kill_at=None,
 ) -> FeedCluster | None:
     cutoff = window_start - timedelta(minutes=stale_minutes)
     active = FeedCluster.objects.filter(
@@ -117,6 +129,9 @@ def _find_active_fleet_cluster(
         is_active=True,
         last_kill_at__gte=cutoff,
     ).order_by("-last_kill_at")
+    if last_kill_at is not None:
+        # Re-walking an old window must not fold it into a later fight.
+        active = active.filter(started_at__lte=last_kill_at)
 
     exact = active.filter(dominant_faction_id=faction_id).first()
     if exact is not None:
@@ -216,7 +231,7 @@ def build_cluster_stats(
             "killmail_ids": [],
         }
 
-    raw_kms = [km.raw_killmail for km in killmails]
+    raw_kms = FeedKillmail.summaries(killmails)
     char_factions = (
         resolve_attacker_militia_factions(raw_kms)
         if faction_id is not None
@@ -230,7 +245,7 @@ def build_cluster_stats(
 
     for km in killmails:
         faction_on_mail = False
-        for attacker in km.attacker_summary or []:
+        for attacker in km.attackers:
             char_id = attacker.get("character_id")
             if not char_id:
                 continue
@@ -284,7 +299,7 @@ def _militia_factions_in_window(
     killmails: list[FeedKillmail],
 ) -> dict[int, set[int]]:
     """Map militia faction_id -> attacker character ids in the window."""
-    raw_kms = [km.raw_killmail for km in killmails]
+    raw_kms = FeedKillmail.summaries(killmails)
     char_factions = resolve_attacker_militia_factions(raw_kms)
     faction_pilots: dict[int, set[int]] = defaultdict(set)
     for char_id, resolved in char_factions.items():
@@ -293,6 +308,25 @@ def _militia_factions_in_window(
     return faction_pilots
 
 
+def _fleet_window_already_clustered(
+    solar_system_id: int, stats: dict[str, Any]
+) -> bool:
+    """True when one same-faction cluster already holds every window kill.
+
+    Re-walking an applied window (every rescan does) is then a no-op rather
+    than overwriting a closed cluster with just this window's kills.
+    """
+    window_ids = set(stats["killmail_ids"])
+    candidates = FeedCluster.objects.filter(
+        cluster_type=FeedCluster.ClusterType.FLEET_ENGAGEMENT,
+        solar_system_id=solar_system_id,
+        dominant_faction_id=stats["dominant_faction_id"],
+        started_at__lte=stats["started_at"],
+        last_kill_at__gte=stats["last_kill_at"],
+    ).values_list("killmail_ids", flat=True)
+    return any(window_ids <= set(ids or []) for ids in candidates)
+
+
 def _upsert_one_fleet_cluster(
     solar_system_id: int,
     stats: dict[str, Any],
@@ -304,12 +338,15 @@ def _upsert_one_fleet_cluster(
     """Merge into an active same-faction cluster or create a new one."""
     if stats["kill_count"] <= 0 or stats["started_at"] is None:
         return 0
+    if _fleet_window_already_clustered(solar_system_id, stats):
+        return 1
 
     existing = _find_active_fleet_cluster(
         solar_system_id,
         stats["dominant_faction_id"],
         window_start,
         stale_minutes=stale_minutes,
+        last_kill_at=stats["last_kill_at"],
     )
     if existing is not None:
         if stats["last_kill_at"] - existing.started_at > max_duration:
@@ -343,72 +380,260 @@ def _upsert_one_fleet_cluster(
     return 1
 
 
-def detect_clusters(*, since_hours: int = 48) -> int:
-    """Detect kill_burst and fleet_engagement clusters from FeedKillmail rows."""
-    now = timezone.now()
-    since = now - timedelta(hours=since_hours)
+def _detection_settings() -> dict[str, Any]:
+    """Read rollup config once per run instead of once per window."""
     kill_burst_cfg = get_rollup_config("kill_burst")
     fleet_cfg = get_rollup_config("fleet_active")
+    return {
+        # cluster_type -> (window_minutes, min_kills, min_pilots)
+        "walks": {
+            FeedCluster.ClusterType.KILL_BURST: (
+                kill_burst_cfg.get("window_minutes", 15),
+                kill_burst_cfg.get("min_kills", 8),
+                0,
+            ),
+            FeedCluster.ClusterType.FLEET_ENGAGEMENT: (
+                fleet_cfg.get("window_minutes", 20),
+                fleet_cfg.get("min_kills", 5),
+                fleet_cfg.get("min_pilots", 8),
+            ),
+        },
+        "stale_minutes": fleet_cfg.get("stale_minutes", 20),
+        "max_duration": timedelta(
+            minutes=fleet_cfg.get("max_duration_minutes", 90)
+        ),
+    }
 
-    kb_window = kill_burst_cfg.get("window_minutes", 15)
-    kb_min_kills = kill_burst_cfg.get("min_kills", 8)
-    fleet_window = fleet_cfg.get("window_minutes", 20)
-    fleet_min_kills = fleet_cfg.get("min_kills", 5)
-    fleet_min_pilots = fleet_cfg.get("min_pilots", 8)
-    stale_minutes = fleet_cfg.get("stale_minutes", 20)
 
-    killmails = list(
-        FeedKillmail.objects.filter(killmail_time__gte=since).order_by(
-            "killmail_time"
-        )
-    )
+def _load_system_kills(
+    since, solar_system_ids=None
+) -> dict[int, list[FeedKillmail]]:
+    qs = FeedKillmail.objects.filter(killmail_time__gte=since)
+    if solar_system_ids is not None:
+        qs = qs.filter(solar_system_id__in=list(solar_system_ids))
     by_system: dict[int, list[FeedKillmail]] = defaultdict(list)
-    for km in killmails:
+    for km in qs.order_by("solar_system_id", "killmail_time", "killmail_id"):
         by_system[km.solar_system_id].append(km)
+    return by_system
+
+
+def _max_killmail_pk() -> int:
+    return FeedKillmail.objects.aggregate(pk=Max("pk"))["pk"] or 0
+
+
+def detect_clusters(*, since_hours: int = 48) -> int:
+    """Detect kill_burst and fleet_engagement clusters from FeedKillmail rows.
+
+    Full rescan of the window. Also rebuilds the walk state and watermark
+    that ``detect_clusters_incremental`` resumes from.
+    """
+    now = timezone.now()
+    since = now - timedelta(hours=since_hours)
+    settings = _detection_settings()
+    # Read before loading so rows committed mid-scan are picked up next run.
+    watermark = _max_killmail_pk()
 
     upserted = 0
-    for solar_system_id, system_kills in by_system.items():
-        upserted += _detect_for_system(
-            solar_system_id,
-            system_kills,
-            kb_window,
-            kb_min_kills,
-            fleet_window,
-            fleet_min_kills,
-            fleet_min_pilots,
+    walk_states: list[FeedClusterWalkState] = []
+    for solar_system_id, system_kills in _load_system_kills(since).items():
+        count, states = _detect_for_system(
+            solar_system_id, system_kills, settings
+        )
+        upserted += count
+        walk_states.extend(states)
+
+    with transaction.atomic():
+        FeedClusterWalkState.objects.all().delete()
+        FeedClusterWalkState.objects.bulk_create(walk_states)
+        FeedClusterCursor.objects.update_or_create(
+            pk=1,
+            defaults={
+                "last_killmail_pk": watermark,
+                "last_full_rescan_at": now,
+            },
         )
 
-    _mark_stale_fleet_clusters(stale_minutes)
+    _mark_stale_fleet_clusters(settings["stale_minutes"])
     return upserted
 
 
+def detect_clusters_incremental(
+    *,
+    since_hours: int = 48,
+    full_rescan_minutes: int | None = FEED_CLUSTER_FULL_RESCAN_MINUTES,
+) -> int:
+    """Detect clusters from killmails ingested since the last run.
+
+    Only systems with a FeedKillmail past the pk watermark are walked, and
+    each walk resumes from its saved tail (see ``_resume_point``) so the
+    clusters written match a ``detect_clusters`` rescan. Falls back to the
+    full rescan when there is no watermark yet or the last one is older
+    than ``full_rescan_minutes`` (None never forces one).
+    """
+    now = timezone.now()
+    cursor = FeedClusterCursor.get_singleton()
+    if cursor.last_full_rescan_at is None or (
+        full_rescan_minutes is not None
+        and now - cursor.last_full_rescan_at
+        >= timedelta(minutes=full_rescan_minutes)
+    ):
+        return detect_clusters(since_hours=since_hours)
+
+    since = now - timedelta(hours=since_hours)
+    settings = _detection_settings()
+    watermark = _max_killmail_pk()
+
+    earliest_new: dict[int, tuple] = {}
+    for (
+        solar_system_id,
+        killmail_time,
+        killmail_id,
+    ) in FeedKillmail.objects.filter(
+        pk__gt=cursor.last_killmail_pk,
+        pk__lte=watermark,
+        killmail_time__gte=since,
+    ).values_list(
+        "solar_system_id", "killmail_time", "killmail_id"
+    ):
+        key = (killmail_time, killmail_id)
+        current = earliest_new.get(solar_system_id)
+        if current is None or key < current:
+            earliest_new[solar_system_id] = key
+
+    upserted = 0
+    if earliest_new:
+        saved = {
+            (state.solar_system_id, state.cluster_type): state
+            for state in FeedClusterWalkState.objects.filter(
+                solar_system_id__in=list(earliest_new)
+            )
+        }
+        by_system = _load_system_kills(since, earliest_new)
+        for solar_system_id, system_kills in by_system.items():
+            resume = {
+                cluster_type: _resume_point(
+                    saved.get((solar_system_id, cluster_type)),
+                    earliest_new[solar_system_id],
+                    window_minutes,
+                    system_kills,
+                )
+                for cluster_type, (window_minutes, _, _) in settings[
+                    "walks"
+                ].items()
+            }
+            count, states = _detect_for_system(
+                solar_system_id, system_kills, settings, resume=resume
+            )
+            upserted += count
+            for state in states:
+                FeedClusterWalkState.objects.update_or_create(
+                    solar_system_id=state.solar_system_id,
+                    cluster_type=state.cluster_type,
+                    defaults={
+                        "positions": state.positions,
+                        "horizon_start": state.horizon_start,
+                    },
+                )
+
+    FeedClusterCursor.objects.filter(pk=cursor.pk).update(
+        last_killmail_pk=watermark, updated_at=now
+    )
+    _mark_stale_fleet_clusters(settings["stale_minutes"])
+    return upserted
+
+
+def _resume_point(
+    state: FeedClusterWalkState | None,
+    new_key: tuple,
+    window_minutes: int,
+    kills: list[FeedKillmail],
+) -> tuple[int, list[tuple], Any]:
+    """Where a system's walk must restart once ``new_key`` has arrived.
+
+    Walk positions whose window closes before the earliest new kill saw
+    exactly the same kills as last run, so they made the same decisions
+    and led to the same next position. The walk therefore restarts at the
+    first saved position whose window reaches the new kill, or at the new
+    kill itself if that sorts earlier.
+
+    Returns ``(start_index, kept_positions, horizon_start)``; a start of 0
+    with no kept positions means walk the whole window.
+    """
+    if state is None:
+        return 0, [], None
+    window = timedelta(minutes=window_minutes)
+    new_time = new_key[0]
+    # Every position that could see the new kill must be in the saved tail.
+    if new_time - window < state.horizon_start:
+        return 0, [], None
+
+    positions = [
+        (datetime.fromisoformat(killmail_time), killmail_id)
+        for killmail_time, killmail_id in state.positions
+    ]
+    resume_key = new_key
+    for position in positions:
+        if position[0] + window >= new_time:
+            resume_key = min(resume_key, position)
+            break
+
+    start = bisect_left(
+        [(km.killmail_time, km.killmail_id) for km in kills], resume_key
+    )
+    if start == 0:
+        return 0, [], None
+    kept = [position for position in positions if position < resume_key]
+    return start, kept, state.horizon_start
+
+
 def _detect_for_system(
     solar_system_id: int,
     kills: list[FeedKillmail],
-    kb_window: int,
-    kb_min_kills: int,
-    fleet_window: int,
-    fleet_min_kills: int,
-    fleet_min_pilots: int,
-) -> int:
+    settings: dict[str, Any],
+    *,
+    resume: dict[str, tuple] | None = None,
+) -> tuple[int, list[FeedClusterWalkState]]:
     count = 0
-    count += _sliding_window_clusters(
-        kills,
-        solar_system_id,
-        FeedCluster.ClusterType.KILL_BURST,
-        kb_window,
-        kb_min_kills,
-        min_pilots=0,
+    states = []
+    tail_horizon = kills[-1].killmail_time - timedelta(
+        minutes=FEED_CLUSTER_RESUME_HORIZON_MINUTES
     )
-    count += _sliding_window_clusters(
-        kills,
-        solar_system_id,
-        FeedCluster.ClusterType.FLEET_ENGAGEMENT,
-        fleet_window,
-        fleet_min_kills,
-        min_pilots=fleet_min_pilots,
-    )
-    return count
+    for cluster_type, (window_minutes, min_kills, min_pilots) in settings[
+        "walks"
+    ].items():
+        start, kept, horizon_start = (resume or {}).get(
+            cluster_type, (0, [], None)
+        )
+        visited: list[int] = []
+        count += _sliding_window_clusters(
+            kills,
+            solar_system_id,
+            cluster_type,
+            window_minutes,
+            min_kills,
+            min_pilots=min_pilots,
+            stale_minutes=settings["stale_minutes"],
+            max_duration=settings["max_duration"],
+            start=start,
+            visited=visited,
+        )
+        horizon_start = max(horizon_start or tail_horizon, tail_horizon)
+        positions = kept + [
+            (kills[i].killmail_time, kills[i].killmail_id) for i in visited
+        ]
+        states.append(
+            FeedClusterWalkState(
+                solar_system_id=solar_system_id,
+                cluster_type=cluster_type,
+                positions=[
+                    [killmail_time.isoformat(), killmail_id]
+                    for killmail_time, killmail_id in positions
+                    if killmail_time >= horizon_start
+                ],
+                horizon_start=horizon_start,
+            )
+        )
+    return count, states
 
 
 def _sliding_window_clusters(
@@ -419,29 +644,39 @@ def _sliding_window_clusters(
     min_kills: int,
     *,
     min_pilots: int,
+    stale_minutes: int,
+    max_duration: timedelta,
+    start: int = 0,
+    visited: list[int] | None = None,
 ) -> int:
-    if len(kills) < min_kills:
+    """Greedy walk over ``kills`` (sorted by time) from index ``start``.
+
+    Each visited index opens a window; a window that yields a cluster jumps
+    the walk past its last kill. ``j`` only moves forward because window
+    ends never decrease, so a walk is O(n) plus the work per emitted window.
+    Visited indexes are appended to ``visited`` for resuming later.
+    """
+    if len(kills) - start < min_kills:
+        if visited is not None:
+            visited.extend(range(start, len(kills)))
         return 0
 
     upserted = 0
     window_delta = timedelta(minutes=window_minutes)
-    i = 0
+    i = start
+    j = start
     while i < len(kills):
+        if visited is not None:
+            visited.append(i)
         window_start = kills[i].killmail_time
         window_end = window_start + window_delta
-        window_kills = [kills[i]]
-        j = i + 1
+        j = max(j, i + 1)
         while j < len(kills) and kills[j].killmail_time <= window_end:
-            window_kills.append(kills[j])
             j += 1
 
-        if len(window_kills) >= min_kills:
+        if j - i >= min_kills:
+            window_kills = kills[i:j]
             if cluster_type == FeedCluster.ClusterType.FLEET_ENGAGEMENT:
-                fleet_cfg = get_rollup_config("fleet_active")
-                stale_minutes = fleet_cfg.get("stale_minutes", 20)
-                max_duration = timedelta(
-                    minutes=fleet_cfg.get("max_duration_minutes", 90)
-                )
                 created = _upsert_fleet_engagement_window(
                     solar_system_id,
                     window_kills,
@@ -2,8 +2,8 @@ from __future__ import annotations
 
 from typing import Iterable
 
-from eveonline.client import EsiClient
 from eveonline.models import EveCharacter
+from eveonline.universe_names import resolve_universe_name_map
 from eveuniverse.models import EveType
 
 from feed.models import FeedCharacterAffiliation
@@ -45,11 +45,6 @@ def _join_natural_list(items: list[str]) -> str:
     return f"{', '.join(items[:-1])}, and {items[-1]}"
 
 
-def _chunks(items: list[int], size: int):
-    for index in range(0, len(items), size):
-        yield items[index : index + size]
-
-
 def resolve_type_names(type_ids: Iterable[int]) -> dict[int, str]:
     ids = {int(type_id) for type_id in type_ids if type_id}
     if not ids:
@@ -72,13 +67,7 @@ def _resolve_universe_names_via_esi(
     if not ids:
         return {}
 
-    client = EsiClient(None)
-    names: dict[int, str] = {}
-    for chunk in _chunks(sorted(ids), 1000):
-        response = client.resolve_universe_names(chunk)
-        if response.success():
-            for row in response.results():
-                names[row["id"]] = row["name"]
+    names = resolve_universe_name_map(ids)
     for entity_id in ids:
         names.setdefault(entity_id, f"{missing_label} {entity_id}")
     return names
@@ -51,18 +51,7 @@ def upsert_feed_killmail_from_r2z2(
 
     victim = raw.get("victim") or {}
     attackers = raw.get("attackers") or []
-    attacker_summary = [
-        {
-            "character_id": a.get("character_id"),
-            "corporation_id": a.get("corporation_id"),
-            "alliance_id": a.get("alliance_id"),
-            "faction_id": a.get("faction_id"),
-            "ship_type_id": a.get("ship_type_id"),
-            "damage_done": a.get("damage_done"),
-            "final_blow": a.get("final_blow"),
-        }
-        for a in attackers
-    ]
+    attacker_summary = FeedKillmail.summarize_attackers(attackers)
 
     with transaction.atomic():
         killmail, _ = FeedKillmail.objects.update_or_create(
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 import logging
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
 from typing import Any, Literal
 
@@ -16,6 +19,8 @@ from feed.constants import (
     R2Z2_CATCHUP_GAP_WARN,
     R2Z2_LIVE_GAP_WARN,
     R2Z2_NOT_FOUND_SLEEP_MS,
+    R2Z2_PIPELINE_RAMP_AFTER,
+    R2Z2_PIPELINE_WINDOW,
     R2Z2_POLL_SOFT_TIME_LIMIT_SECONDS,
     R2Z2_RATE_LIMIT_SLEEP_SECONDS,
     R2Z2_SEQUENCE_URL,
@@ -85,6 +90,11 @@ def _empty_stats(*, outcome: str) -> dict[str, Any]:
         "catchup_gap": 0,
         "paused_until": None,
         "live_idle_until": None,
+        "live_seconds": 0.0,
+        "catchup_seconds": 0.0,
+        "live_per_second": 0.0,
+        "catchup_per_second": 0.0,
+        "pipelined": False,
     }
 
 
@@ -99,6 +109,11 @@ def _attach_cursor_stats(
     stats["paused_until"] = _iso(cursor.paused_until)
     stats["live_idle_until"] = _iso(cursor.live_idle_until)
     stats["processed"] = stats["live_processed"] + stats["catchup_processed"]
+    for role in ("live", "catchup"):
+        seconds = stats[f"{role}_seconds"]
+        stats[f"{role}_per_second"] = (
+            round(stats[f"{role}_processed"] / seconds, 2) if seconds else 0.0
+        )
 
 
 def _warn_throttle(
@@ -292,7 +307,73 @@ def _flush_capital_notifications(
             logger.exception("Capital ping evaluation failed")
 
 
-def _poll_phase(
+def _apply_sequence_result(
+    cursor: FeedR2z2Cursor,
+    *,
+    role: CursorRole,
+    sequence: int,
+    result: tuple[int, dict[str, Any] | None, float | None],
+    allowlist: frozenset[int],
+    stats: dict[str, Any],
+    apply_age_gate: bool,
+    pending_capital: list[tuple[dict[str, Any], bool]],
+) -> str | None:
+    """Apply one fetched sequence in cursor order.
+
+    Returns the phase result for 429/403/404 (throttled | tip), or None
+    once a 200 has been ingested and the cursor advanced.
+    """
+    status, payload, retry_after = result
+    processed_key = "live_processed" if role == "live" else "catchup_processed"
+
+    if status == 429:
+        pause = retry_after or float(R2Z2_RATE_LIMIT_SLEEP_SECONDS)
+        _set_paused(cursor, pause)
+        stats["rate_limited"] += 1
+        _warn_throttle(
+            status=429,
+            sequence=sequence,
+            pause_seconds=pause,
+            paused_until=cursor.paused_until,
+            cursor=cursor,
+        )
+        return "throttled"
+
+    if status == 403:
+        pause = retry_after or float(R2Z2_BANNED_SLEEP_SECONDS)
+        _set_paused(cursor, pause)
+        stats["banned"] += 1
+        _warn_throttle(
+            status=403,
+            sequence=sequence,
+            pause_seconds=pause,
+            paused_until=cursor.paused_until,
+            cursor=cursor,
+        )
+        return "throttled"
+
+    if status == 404:
+        if role == "live":
+            cursor.live_idle_until = timezone.now() + timedelta(
+                milliseconds=R2Z2_NOT_FOUND_SLEEP_MS
+            )
+            cursor.save(update_fields=["live_idle_until", "updated_at"])
+        return "tip"
+
+    stats[processed_key] += 1
+    _advance_cursor(cursor, role=role, sequence=sequence)
+    if payload:
+        _process_payload(
+            payload,
+            allowlist=allowlist,
+            apply_age_gate=apply_age_gate,
+            stats=stats,
+            pending_capital=pending_capital,
+        )
+    return None
+
+
+def _poll_phase(  # noqa: C901
     cursor: FeedR2z2Cursor,
     *,
     role: CursorRole,
@@ -303,13 +384,18 @@ def _poll_phase(
     stats: dict[str, Any],
     apply_age_gate: bool,
     pending_capital: list[tuple[dict[str, Any], bool]],
+    pipeline_window: int = 1,
 ) -> str:
     """Fetch sequences until tip, throttle, budget, or stop_before.
 
+    Starts one sequence at a time; after R2Z2_PIPELINE_RAMP_AFTER
+    consecutive 200s (i.e. behind the tip) hands over to the pipelined
+    fetcher when pipeline_window > 1.
+
     Returns: tip | budget | throttled | error | stopped
     """
     sequence = start_sequence
-    processed_key = "live_processed" if role == "live" else "catchup_processed"
+    streak = 0
 
     while time.monotonic() < deadline:
         if stop_before is not None and sequence > stop_before:
@@ -317,10 +403,24 @@ def _poll_phase(
         if role == "catchup" and cursor.live_idle_until is not None:
             if timezone.now() >= cursor.live_idle_until:
                 return "stopped"
+        if pipeline_window > 1 and streak >= R2Z2_PIPELINE_RAMP_AFTER:
+            stats["pipelined"] = True
+            return _poll_phase_pipelined(
+                cursor,
+                role=role,
+                start_sequence=sequence,
+                stop_before=stop_before,
+                deadline=deadline,
+                allowlist=allowlist,
+                stats=stats,
+                apply_age_gate=apply_age_gate,
+                pending_capital=pending_capital,
+                window=pipeline_window,
+            )
 
         _enforce_request_spacing(cursor)
         try:
-            status, payload, retry_after = fetch_sequence_payload(sequence)
+            result = fetch_sequence_payload(sequence)
             _mark_request(cursor)
         except requests.RequestException as exc:
             _mark_request(cursor)
@@ -330,67 +430,159 @@ def _poll_phase(
             stats["errors"] += 1
             return "error"
 
-        if status == 429:
-            pause = retry_after or float(R2Z2_RATE_LIMIT_SLEEP_SECONDS)
-            _set_paused(cursor, pause)
-            stats["rate_limited"] += 1
-            _warn_throttle(
-                status=429,
-                sequence=sequence,
-                pause_seconds=pause,
-                paused_until=cursor.paused_until,
-                cursor=cursor,
-            )
-            return "throttled"
-
-        if status == 403:
-            pause = retry_after or float(R2Z2_BANNED_SLEEP_SECONDS)
-            _set_paused(cursor, pause)
-            stats["banned"] += 1
-            _warn_throttle(
-                status=403,
-                sequence=sequence,
-                pause_seconds=pause,
-                paused_until=cursor.paused_until,
-                cursor=cursor,
-            )
-            return "throttled"
-
-        if status == 404:
-            if role == "live":
-                cursor.live_idle_until = timezone.now() + timedelta(
-                    milliseconds=R2Z2_NOT_FOUND_SLEEP_MS
-                )
-                cursor.save(update_fields=["live_idle_until", "updated_at"])
-            return "tip"
-
-        stats[processed_key] += 1
-        _advance_cursor(cursor, role=role, sequence=sequence)
-        if payload:
-            _process_payload(
-                payload,
-                allowlist=allowlist,
-                apply_age_gate=apply_age_gate,
-                stats=stats,
-                pending_capital=pending_capital,
-            )
+        outcome = _apply_sequence_result(
+            cursor,
+            role=role,
+            sequence=sequence,
+            result=result,
+            allowlist=allowlist,
+            stats=stats,
+            apply_age_gate=apply_age_gate,
+            pending_capital=pending_capital,
+        )
+        if outcome is not None:
+            return outcome
 
+        streak += 1
         sequence += 1
         time.sleep(R2Z2_SUCCESS_SLEEP_MS / 1000)
 
     return "budget"
 
 
+class _PipelineHalt:
+    """First 404/429/403 of a pipelined phase; later fetches are skipped."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.sequence: int | None = None
+        self.result: tuple | None = None
+
+    def is_set(self) -> bool:
+        return self.result is not None
+
+    def fetch(
+        self, sequence: int
+    ) -> tuple[int, dict[str, Any] | None, float | None] | None:
+        """fetch_sequence_payload, or None once another fetch halted."""
+        if self.is_set():
+            return None
+        result = fetch_sequence_payload(sequence)
+        if result[0] != 200:
+            with self._lock:
+                if not self.is_set():
+                    self.sequence, self.result = sequence, result
+        return result
+
+
+def _poll_phase_pipelined(  # noqa: C901
+    cursor: FeedR2z2Cursor,
+    *,
+    role: CursorRole,
+    start_sequence: int,
+    stop_before: int | None,
+    deadline: float,
+    allowlist: frozenset[int],
+    stats: dict[str, Any],
+    apply_age_gate: bool,
+    pending_capital: list[tuple[dict[str, Any], bool]],
+    window: int,
+) -> str:
+    """Keep up to `window` sequence fetches in flight, applied in order.
+
+    Request starts keep the same R2Z2_SUCCESS_SLEEP_MS spacing as the
+    sequential path, so the zKill rate contract is unchanged; only the
+    response latency overlaps. Results are applied strictly in sequence
+    order, so the cursor still advances monotonically and a 404/429/403
+    ends the phase exactly where the sequential fetcher would. Once any
+    fetch gets one, no further request is sent: queued fetches are skipped
+    and those already in flight are discarded.
+
+    Returns: tip | budget | throttled | error | stopped
+    """
+    in_flight: deque = deque()
+    next_sequence = start_sequence
+    stop_reason = "budget"
+    halt = _PipelineHalt()
+
+    with ThreadPoolExecutor(max_workers=window) as pool:
+        try:
+            while True:
+                while len(in_flight) < window:
+                    if time.monotonic() >= deadline:
+                        stop_reason = "budget"
+                        break
+                    if stop_before is not None and next_sequence > stop_before:
+                        stop_reason = "stopped"
+                        break
+                    if (
+                        role == "catchup"
+                        and cursor.live_idle_until is not None
+                        and timezone.now() >= cursor.live_idle_until
+                    ):
+                        stop_reason = "stopped"
+                        break
+                    _enforce_request_spacing(cursor)
+                    if halt.is_set():
+                        break
+                    in_flight.append(
+                        (next_sequence, pool.submit(halt.fetch, next_sequence))
+                    )
+                    _mark_request(cursor)
+                    next_sequence += 1
+
+                if not in_flight:
+                    return stop_reason
+
+                sequence, future = in_flight.popleft()
+                try:
+                    result = future.result()
+                except requests.RequestException as exc:
+                    logger.warning(
+                        "R2Z2 fetch error at sequence %s: %s", sequence, exc
+                    )
+                    stats["errors"] += 1
+                    return "error"
+                if result is None:
+                    # Skipped after a later sequence halted the phase; that
+                    # answer does not advance the cursor, so apply it here.
+                    sequence, result = halt.sequence, halt.result
+
+                outcome = _apply_sequence_result(
+                    cursor,
+                    role=role,
+                    sequence=sequence,
+                    result=result,
+                    allowlist=allowlist,
+                    stats=stats,
+                    apply_age_gate=apply_age_gate,
+                    pending_capital=pending_capital,
+                )
+                if outcome is not None:
+                    return outcome
+        finally:
+            for _, future in in_flight:
+                future.cancel()
+
+
 def poll_r2z2_batch(  # noqa: C901
-    *, max_seconds: float | None = None
+    *,
+    max_seconds: float | None = None,
+    pipeline_window: int | None = None,
 ) -> dict[str, Any]:
     """Orchestrate live-first then catch-up on leftover budget.
 
     Holds a DB row lock for the window so only one poller runs cluster-wide.
     Never sleeps for ban/cooldown windows — sets paused_until instead.
     Capital Discord/ESI runs after the cursor transaction commits.
+
+    pipeline_window defaults to R2Z2_PIPELINE_WINDOW; pass 1 to fetch
+    strictly one sequence at a time. Stats include sustained
+    killmails/sec for the live and catch-up phases.
     """
     budget = max_seconds or R2Z2_POLL_SOFT_TIME_LIMIT_SECONDS
+    if pipeline_window is None:
+        pipeline_window = R2Z2_PIPELINE_WINDOW
     started = time.monotonic()
     deadline = started + budget
     stats = _empty_stats(outcome="ok")
@@ -463,6 +655,7 @@ def poll_r2z2_batch(  # noqa: C901
                 )
 
             live_start = cursor.live_sequence_id + 1
+            phase_started = time.monotonic()
             live_result = _poll_phase(
                 cursor,
                 role="live",
@@ -475,7 +668,9 @@ def poll_r2z2_batch(  # noqa: C901
                 # the live phase churn stale sequences, which must not ping.
                 apply_age_gate=True,
                 pending_capital=pending_capital,
+                pipeline_window=pipeline_window,
             )
+            stats["live_seconds"] = round(time.monotonic() - phase_started, 3)
 
             if live_result == "throttled":
                 stats["outcome"] = (
@@ -486,6 +681,7 @@ def poll_r2z2_batch(  # noqa: C901
                 and cursor.catchup_sequence_id < cursor.live_sequence_id
                 and time.monotonic() < deadline
             ):
+                phase_started = time.monotonic()
                 catchup_result = _poll_phase(
                     cursor,
                     role="catchup",
@@ -496,6 +692,10 @@ def poll_r2z2_batch(  # noqa: C901
                     stats=stats,
                     apply_age_gate=True,
                     pending_capital=pending_capital,
+                    pipeline_window=pipeline_window,
+                )
+                stats["catchup_seconds"] = round(
+                    time.monotonic() - phase_started, 3
                 )
                 if catchup_result == "throttled":
                     stats["outcome"] = (
@@ -1,15 +1,155 @@
 from __future__ import annotations
 
 import math
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterable
 
 from eveuniverse.models import EveSolarSystem
 
 from feed.constants import METERS_PER_LIGHT_YEAR
 
+Position = tuple[float, float, float]
+
+
+class SolarSystemIndex:
+    """Coordinates of every known solar system in flat arrays.
+
+    Rows are sorted by x so radius queries only scan the slab of systems
+    whose x is within range. Systems fetched later (ESI fallback) go into
+    a small overflow dict instead of reshuffling the arrays.
+    """
+
+    def __init__(self, rows: Iterable[tuple[int, float, float, float]]):
+        rows = sorted(rows, key=lambda row: row[1])
+        self._ids = array("q", (row[0] for row in rows))
+        self._xs = array("d", (row[1] for row in rows))
+        self._ys = array("d", (row[2] for row in rows))
+        self._zs = array("d", (row[3] for row in rows))
+        self._slots = {system_id: i for i, system_id in enumerate(self._ids)}
+        self._extra: dict[int, Position] = {}
+        self._radius_cache: dict[tuple[int, float], dict[int, float]] = {}
+
+    @classmethod
+    def load(cls) -> SolarSystemIndex:
+        return cls(
+            EveSolarSystem.objects.filter(
+                position_x__isnull=False,
+                position_y__isnull=False,
+                position_z__isnull=False,
+            ).values_list("id", "position_x", "position_y", "position_z")
+        )
+
+    def __len__(self) -> int:
+        return len(self._ids) + len(self._extra)
+
+    def __contains__(self, solar_system_id: int) -> bool:
+        return solar_system_id in self._slots or solar_system_id in self._extra
+
+    def position(self, solar_system_id: int) -> Position | None:
+        slot = self._slots.get(solar_system_id)
+        if slot is None:
+            return self._extra.get(solar_system_id)
+        return self._xs[slot], self._ys[slot], self._zs[slot]
+
+    def add(self, solar_system_id: int, position: Position) -> None:
+        if solar_system_id in self:
+            return
+        self._extra[solar_system_id] = position
+        self._radius_cache.clear()
+
+    def distances_ly(
+        self,
+        origin_system_id: int,
+        target_system_ids: Iterable[int],
+    ) -> dict[int, float | None]:
+        """Light-years from one system to many; None when unknown."""
+        origin = self.position(origin_system_id)
+        distances: dict[int, float | None] = {}
+        for target_id in target_system_ids:
+            target = self.position(target_id) if origin else None
+            distances[target_id] = (
+                None if target is None else _light_years(origin, target)
+            )
+        return distances
+
+    def within_light_years(
+        self,
+        origin_system_id: int,
+        light_years: float,
+    ) -> dict[int, float]:
+        """Every known system within ``light_years`` of the origin."""
+        key = (origin_system_id, light_years)
+        cached = self._radius_cache.get(key)
+        if cached is not None:
+            return cached
+
+        origin = self.position(origin_system_id)
+        if origin is None:
+            return {}
+        radius = light_years * METERS_PER_LIGHT_YEAR
+        ox, oy, oz = origin
+        found: dict[int, float] = {}
+        lo = bisect_left(self._xs, ox - radius)
+        hi = bisect_right(self._xs, ox + radius)
+        for i in range(lo, hi):
+            dx = self._xs[i] - ox
+            dy = self._ys[i] - oy
+            dz = self._zs[i] - oz
+            meters = math.sqrt(dx * dx + dy * dy + dz * dz)
+            if meters <= radius:
+                found[self._ids[i]] = meters / METERS_PER_LIGHT_YEAR
+        for system_id, position in self._extra.items():
+            distance = _light_years(origin, position)
+            if distance <= light_years:
+                found[system_id] = distance
+        self._radius_cache[key] = found
+        return found
+
+
+def _light_years(origin: Position, target: Position) -> float:
+    dx = target[0] - origin[0]
+    dy = target[1] - origin[1]
+    dz = target[2] - origin[2]
+    return math.sqrt(dx * dx + dy * dy + dz * dz) / METERS_PER_LIGHT_YEAR
+
+
+_index_lock = threading.Lock()
+_index: SolarSystemIndex | None = None
+
+
+def solar_system_index() -> SolarSystemIndex:
+    """Process-wide index, loaded from EveSolarSystem on first use."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = SolarSystemIndex.load()
+        return _index
+
+
+def invalidate_solar_system_index() -> None:
+    """
+    Drop this process's index (EveSolarSystem post_save / post_delete).
+
+    Other processes keep theirs until restart. That is safe: coordinates of
+    existing systems do not change, and a system their index lacks is
+    loaded and added by ``_system_position`` on first use.
+    """
+    global _index
+    with _index_lock:
+        _index = None
+
 
 def _system_position(
     solar_system_id: int,
-) -> tuple[float, float, float] | None:
+    *,
+    fetch_missing: bool = True,
+) -> Position | None:
+    index = solar_system_index()
+    if solar_system_id in index or not fetch_missing:
+        return index.position(solar_system_id)
+
     system = EveSolarSystem.objects.filter(id=solar_system_id).first()
     if system is None:
         system, _ = EveSolarSystem.objects.get_or_create_esi(
@@ -21,24 +161,48 @@ def _system_position(
         or system.position_z is None
     ):
         return None
-    return system.position_x, system.position_y, system.position_z
+    position = (system.position_x, system.position_y, system.position_z)
+    solar_system_index().add(solar_system_id, position)
+    return position
 
 
 def light_years_between_systems(
     origin_system_id: int,
     target_system_id: int,
+    *,
+    fetch_missing: bool = True,
 ) -> float | None:
-    """Euclidean distance in light-years between two solar systems."""
+    """Euclidean distance in light-years between two solar systems.
+
+    Reads the in-memory index; a system it does not know is loaded from
+    the database or ESI unless ``fetch_missing`` is False, in which case
+    the distance is None.
+    """
     if origin_system_id == target_system_id:
         return 0.0
 
-    origin = _system_position(origin_system_id)
-    target = _system_position(target_system_id)
+    origin = _system_position(origin_system_id, fetch_missing=fetch_missing)
+    target = _system_position(target_system_id, fetch_missing=fetch_missing)
     if origin is None or target is None:
         return None
+    return _light_years(origin, target)
 
-    dx = target[0] - origin[0]
-    dy = target[1] - origin[1]
-    dz = target[2] - origin[2]
-    meters = math.sqrt(dx * dx + dy * dy + dz * dz)
-    return meters / METERS_PER_LIGHT_YEAR
+
+def light_years_from_system(
+    origin_system_id: int,
+    target_system_ids: Iterable[int],
+) -> dict[int, float | None]:
+    """Distances from one system to many, from the in-memory index only."""
+    return solar_system_index().distances_ly(
+        origin_system_id, target_system_ids
+    )
+
+
+def systems_within_light_years(
+    origin_system_id: int,
+    light_years: float,
+) -> dict[int, float]:
+    """``{solar_system_id: light_years}`` for known systems in range."""
+    return solar_system_index().within_light_years(
+        origin_system_id, light_years
+    )
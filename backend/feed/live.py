@@ -0,0 +1,287 @@
+"""
+Live feed: FeedEvent changes pushed to browsers over server-sent events.
+
+Writers publish one JSON message per change to the ``feed:live`` Redis
+channel after their transaction commits:
+
+- ``feed_event`` / ``upsert``: a FeedEvent was created or updated (rollup
+  writer), with the same fields as the list endpoint and a ``cursor``;
+- ``feed_event`` / ``delete``: a FeedEvent was coalesced away;
+- ``capital_alert``: a capital alert was posted or edited.
+
+Each ASGI worker process holds one Redis subscription (FeedBroadcaster) and
+copies every message to the queues of its connected clients, so an event
+costs one publish and no database query however many pages are open. The
+stream view (feed.views.feed_stream) sends the FeedEvent ``cursor``
+(``updated_at:id``) as the SSE id; a client reconnecting with
+``Last-Event-ID`` is first sent the events updated after it from the
+database, in pages of FEED_LIVE_REPLAY_LIMIT until it has caught up.
+Deletes and capital alerts are not replayed.
+
+Publishing and the stream are off while ``FEED_LIVE_REDIS_URL`` is empty,
+which is the default: the stream needs ``/api/feed/stream`` routed to an
+ASGI server (``uvicorn app.asgi:application``), and app-start.sh serves
+the WSGI application only.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager
+from datetime import datetime
+from functools import partial
+from typing import NamedTuple
+
+import redis
+import redis.asyncio
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from feed.models import FeedCapitalAlert, FeedEvent
+
+logger = logging.getLogger(__name__)
+
+FEED_LIVE_CHANNEL = "feed:live"
+FEED_LIVE_REPLAY_LIMIT = 200
+# Messages buffered per client; a client that falls further behind is
+# disconnected and resumes from its Last-Event-ID.
+FEED_LIVE_QUEUE_SIZE = 256
+FEED_LIVE_KEEPALIVE_SECONDS = 15
+FEED_LIVE_RECONNECT_SECONDS = 1
+
+
+def live_feed_enabled() -> bool:
+    return bool(getattr(settings, "FEED_LIVE_REDIS_URL", None))
+
+
+def encode_live_cursor(event: FeedEvent) -> str:
+    ts = event.updated_at.isoformat().replace("+00:00", "Z")
+    return f"{ts}:{event.id}"
+
+
+def parse_live_cursor(cursor: str | None) -> tuple[datetime, int] | None:
+    if not cursor:
+        return None
+    parts = cursor.rsplit(":", 1)
+    if len(parts) != 2:
+        return None
+    try:
+        updated_at = datetime.fromisoformat(parts[0].replace("Z", "+00:00"))
+        return updated_at, int(parts[1])
+    except (ValueError, TypeError):
+        return None
+
+
+def feed_event_message(event: FeedEvent) -> dict:
+    return {
+        "type": "feed_event",
+        "action": "upsert",
+        "cursor": encode_live_cursor(event),
+        "event": {
+            "id": str(event.id),
+            "kind": event.kind,
+            "occurred_at": event.occurred_at,
+            "title": event.title,
+            "subheader": event.subheader,
+            "preview": event.preview,
+            "body": event.body,
+            "accent": event.accent,
+            "payload": event.payload,
+        },
+    }
+
+
+def capital_alert_message(alert: FeedCapitalAlert) -> dict:
+    return {
+        "type": "capital_alert",
+        "id": alert.pk,
+        "solar_system_id": alert.solar_system_id,
+        "system_name": alert.system_name,
+        "distance_ly": alert.distance_ly,
+        "systems": alert.systems,
+        "capitals": alert.capitals,
+        "kills": alert.kills,
+        "last_activity_at": alert.last_activity_at,
+    }
+
+
+def dump_message(message: dict) -> str:
+    return json.dumps(message, cls=DjangoJSONEncoder)
+
+
+_redis_client = None
+
+
+def _redis():
+    global _redis_client  # pylint: disable=global-statement
+    if _redis_client is None:
+        _redis_client = redis.Redis.from_url(settings.FEED_LIVE_REDIS_URL)
+    return _redis_client
+
+
+def _publish(data: str) -> None:
+    try:
+        _redis().publish(FEED_LIVE_CHANNEL, data)
+    except redis.RedisError as exc:
+        # Clients catch up from the database on their next reconnect.
+        logger.warning("Live feed publish failed: %s", exc)
+
+
+def publish_live_message(message: dict) -> None:
+    """Publish ``message`` once the current transaction commits."""
+    if not live_feed_enabled():
+        return
+    transaction.on_commit(partial(_publish, dump_message(message)))
+
+
+def publish_feed_event(event: FeedEvent) -> None:
+    if event.kind == "militia_joins":
+        return
+    publish_live_message(feed_event_message(event))
+
+
+def publish_feed_event_deletes(event_ids: list[int]) -> None:
+    if event_ids:
+        publish_live_message(
+            {
+                "type": "feed_event",
+                "action": "delete",
+                "ids": [str(event_id) for event_id in event_ids],
+            }
+        )
+
+
+def publish_capital_alert(alert: FeedCapitalAlert) -> None:
+    publish_live_message(capital_alert_message(alert))
+
+
+def replay_feed_events(cursor: str | None) -> list[dict]:
+    """
+    Upsert messages for up to FEED_LIVE_REPLAY_LIMIT events updated after
+    ``cursor``, oldest first. Page by passing the last message's cursor.
+    """
+    parsed = parse_live_cursor(cursor)
+    if parsed is None:
+        return []
+    updated_at, event_id = parsed
+    now = timezone.now()
+    events = (
+        FeedEvent.objects.exclude(kind="militia_joins")
+        .filter(Q(expires_at__isnull=True) | Q(expires_at__gte=now))
+        .filter(
+            Q(updated_at__gt=updated_at)
+            | Q(updated_at=updated_at, id__gt=event_id)
+        )
+        .order_by("updated_at", "id")[:FEED_LIVE_REPLAY_LIMIT]
+    )
+    return [feed_event_message(event) for event in events]
+
+
+class LiveFrame(NamedTuple):
+    """A message as an SSE frame, with its parsed cursor (if any)."""
+
+    text: str
+    position: tuple[datetime, int] | None
+
+
+def sse_frame(data: str, event: str, event_id: str | None = None) -> str:
+    lines = [f"event: {event}"]
+    if event_id:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {data}")
+    return "\n".join(lines) + "\n\n"
+
+
+def live_frame(data: str) -> LiveFrame:
+    message = json.loads(data)
+    cursor = message.get("cursor")
+    return LiveFrame(
+        sse_frame(data, message.get("type", "message"), cursor),
+        parse_live_cursor(cursor),
+    )
+
+
+class LiveSubscriber:
+    def __init__(self):
+        self.queue: asyncio.Queue = asyncio.Queue(FEED_LIVE_QUEUE_SIZE)
+        self.dropped = False
+
+    def offer(self, frame: LiveFrame) -> None:
+        if self.dropped:
+            return
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            self.drop()
+
+    def drop(self) -> None:
+        """Disconnect: the stream ends and the client resumes by cursor."""
+        self.dropped = True
+        try:
+            self.queue.put_nowait(None)
+        except asyncio.QueueFull:
+            pass
+
+
+class FeedBroadcaster:
+    """One Redis subscription per process, fanned out to local clients."""
+
+    def __init__(self):
+        self.subscribers: set[LiveSubscriber] = set()
+        self._reader: asyncio.Task | None = None
+        self._subscribed = asyncio.Event()
+
+    @asynccontextmanager
+    async def subscribe(self):
+        subscriber = LiveSubscriber()
+        self.subscribers.add(subscriber)
+        if self._reader is None or self._reader.done():
+            self._subscribed.clear()
+            self._reader = asyncio.create_task(self._read())
+        try:
+            # Wait for the Redis subscription so a replay that follows
+            # cannot miss messages published meanwhile.
+            await asyncio.wait_for(
+                self._subscribed.wait(), FEED_LIVE_KEEPALIVE_SECONDS
+            )
+        except asyncio.TimeoutError:
+            pass
+        try:
+            yield subscriber
+        finally:
+            self.subscribers.discard(subscriber)
+            if not self.subscribers and self._reader is not None:
+                self._reader.cancel()
+                self._reader = None
+
+    async def _read(self) -> None:
+        while True:
+            client = redis.asyncio.Redis.from_url(settings.FEED_LIVE_REDIS_URL)
+            try:
+                async with client.pubsub() as pubsub:
+                    await pubsub.subscribe(FEED_LIVE_CHANNEL)
+                    self._subscribed.set()
+                    async for message in pubsub.listen():
+                        if message["type"] != "message":
+                            continue
+                        # Framed once here, not once per client.
+                        frame = live_frame(message["data"].decode())
+                        for subscriber in list(self.subscribers):
+                            subscriber.offer(frame)
+            except redis.RedisError as exc:
+                self._subscribed.clear()
+                logger.warning("Live feed subscription failed: %s", exc)
+                # Messages were missed; clients resume from their cursor.
+                for subscriber in list(self.subscribers):
+                    subscriber.drop()
+                await asyncio.sleep(FEED_LIVE_RECONNECT_SECONDS)
+            finally:
+                await client.aclose()
+
+
+broadcaster = FeedBroadcaster()
@@ -7,7 +7,7 @@ from feed.helpers.affiliations import (
     populate_character_affiliations_from_esi,
     refresh_character_affiliation,
 )
-from feed.models import FeedCharacterAffiliation, FeedKillmail
+from feed.models import FeedCharacterAffiliation, FeedKillmailPayload
 
 
 class Command(BaseCommand):
@@ -27,9 +27,10 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
         character_ids: set[int] = set()
-        for raw, killmail_time in FeedKillmail.objects.values_list(
-            "raw_killmail", "killmail_time"
+        for payload, killmail_time in FeedKillmailPayload.objects.values_list(
+            "data", "feed_killmail__killmail_time"
         ).iterator():
+            raw = FeedKillmailPayload.decode_data(payload)["killmail"]
             apply_killmail_affiliations(raw, confirmed_at=killmail_time)
             for attacker in raw.get("attackers") or []:
                 char_id = attacker.get("character_id")
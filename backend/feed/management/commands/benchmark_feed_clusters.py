@@ -0,0 +1,233 @@
+"""
+Replay a synthetic warzone day through cluster detection, twice:
+
+- ``full``: detect_clusters (48h rescan) after every poll, as before;
+- ``incremental``: detect_clusters_incremental after every poll.
+
+Killmails arrive in 3-minute polls (the detect_feed_clusters schedule),
+some of them late. Detection runs on a replay clock so fights go stale as
+they would live. Each mode runs inside a transaction that is rolled back,
+so existing feed rows are untouched. The command fails if the two modes
+leave different FeedCluster rows behind.
+
+    pipenv run python manage.py benchmark_feed_clusters
+    pipenv run python manage.py benchmark_feed_clusters --kills 6000 --systems 12
+"""
+
+import random
+import time
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from feed.constants import FACTION_AMARR, FACTION_MINMATAR
+from feed.helpers.clusters import (
+    detect_clusters,
+    detect_clusters_incremental,
+)
+from feed.models import (
+    FeedCluster,
+    FeedClusterCursor,
+    FeedClusterWalkState,
+    FeedKillmail,
+)
+
+POLL_MINUTES = 3
+FIRST_SYSTEM_ID = 30002500
+FIRST_KILLMAIL_ID = 900000000
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _synthetic_day(kills: int, systems: int, late_percent: int, seed: int):
+    """Return ``(killmail_kwargs, arrival)`` pairs ordered by arrival."""
+    rng = random.Random(seed)
+    day_start = (timezone.now() - timedelta(days=1)).replace(
+        second=0, microsecond=0
+    )
+    rows = []
+    killmail_id = FIRST_KILLMAIL_ID
+    while len(rows) < kills:
+        system_id = FIRST_SYSTEM_ID + rng.randrange(systems)
+        faction_id = rng.choice((FACTION_AMARR, FACTION_MINMATAR))
+        pilots = [
+            rng.randrange(90000000, 90100000)
+            for _ in range(rng.randint(4, 40))
+        ]
+        at = day_start + timedelta(seconds=rng.randrange(23 * 3600))
+        for _ in range(rng.choice((1, 1, 2, 4, 8, 20, 60))):
+            at += timedelta(seconds=rng.randint(5, 240))
+            attackers = [
+                {
+                    "character_id": pilot,
+                    "corporation_id": 98000000,
+                    "alliance_id": 99000000,
+                    "faction_id": faction_id,
+                    "ship_type_id": 22468,
+                    "damage_done": 1000,
+                    "final_blow": n == 0,
+                }
+                for n, pilot in enumerate(
+                    rng.sample(pilots, rng.randint(1, len(pilots)))
+                )
+            ]
+            raw = {
+                "killmail_id": killmail_id,
+                "killmail_time": at.isoformat().replace("+00:00", "Z"),
+                "solar_system_id": system_id,
+                "victim": {
+                    "character_id": 80000000 + killmail_id % 1000,
+                    "ship_type_id": rng.choice((587, 22468, 11371, 12005)),
+                },
+                "attackers": attackers,
+            }
+            arrival = at + timedelta(seconds=rng.randint(10, 90))
+            if rng.randrange(100) < late_percent:
+                arrival += timedelta(minutes=rng.randint(5, 60))
+            rows.append(
+                (
+                    {
+                        "killmail_id": killmail_id,
+                        "hash": f"bench{killmail_id}",
+                        "killmail_time": at,
+                        "solar_system_id": system_id,
+                        "victim_character_id": raw["victim"]["character_id"],
+                        "victim_ship_type_id": raw["victim"]["ship_type_id"],
+                        "attacker_summary": attackers,
+                        "raw_killmail": raw,
+                        "zkb_meta": {"npc": False},
+                    },
+                    arrival,
+                )
+            )
+            killmail_id += 1
+    rows.sort(key=lambda row: row[1])
+    return rows
+
+
+def _polls(rows):
+    """Group arrivals into POLL_MINUTES batches: ``(poll_time, [kwargs])``."""
+    polls = []
+    for kwargs, arrival in rows:
+        poll_at = arrival.replace(second=0, microsecond=0) + timedelta(
+            minutes=POLL_MINUTES - arrival.minute % POLL_MINUTES
+        )
+        if not polls or polls[-1][0] != poll_at:
+            polls.append((poll_at, []))
+        polls[-1][1].append(kwargs)
+    return polls
+
+
+def _snapshot() -> dict:
+    return {
+        cluster.cluster_key: (
+            cluster.cluster_type,
+            cluster.solar_system_id,
+            cluster.dominant_faction_id,
+            cluster.started_at,
+            cluster.last_kill_at,
+            cluster.ended_at,
+            cluster.kill_count,
+            cluster.pilot_count,
+            cluster.ship_counts,
+            sorted(cluster.attacker_ids),
+            sorted(cluster.killmail_ids),
+            cluster.is_active,
+        )
+        for cluster in FeedCluster.objects.all()
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay a synthetic warzone day through full-rescan and incremental "
+        "cluster detection and compare time and output."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--kills", type=int, default=3000)
+        parser.add_argument("--systems", type=int, default=8)
+        parser.add_argument(
+            "--late-percent",
+            type=int,
+            default=5,
+            help="Share of killmails that arrive 5-60 minutes late.",
+        )
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **options):
+        if options["kills"] < 1 or options["systems"] < 1:
+            raise CommandError("--kills and --systems must be at least 1")
+        polls = _polls(
+            _synthetic_day(
+                options["kills"],
+                options["systems"],
+                options["late_percent"],
+                options["seed"],
+            )
+        )
+        self.stdout.write(
+            f"{options['kills']} killmails in {len(polls)} polls "
+            f"across {options['systems']} systems"
+        )
+
+        results = {}
+        for mode in ("full", "incremental"):
+            elapsed, snapshot = self._replay(polls, mode)
+            results[mode] = snapshot
+            self.stdout.write(
+                f"{mode:<12} detect={elapsed:.2f}s "
+                f"per_poll={elapsed * 1000 / len(polls):.1f}ms "
+                f"clusters={len(snapshot)}"
+            )
+
+        full, incremental = results["full"], results["incremental"]
+        if full != incremental:
+            differing = sorted(
+                key
+                for key in full.keys() | incremental.keys()
+                if full.get(key) != incremental.get(key)
+            )
+            raise CommandError(
+                f"{len(differing)} clusters differ, e.g. {differing[:5]}"
+            )
+        self.stdout.write("Cluster output identical")
+
+    def _replay(self, polls, mode: str):
+        elapsed = 0.0
+        snapshot = {}
+        try:
+            with transaction.atomic():
+                for model in (
+                    FeedKillmail,
+                    FeedCluster,
+                    FeedClusterWalkState,
+                    FeedClusterCursor,
+                ):
+                    model.objects.all().delete()
+                for poll_at, batch in polls:
+                    FeedKillmail.objects.bulk_create(
+                        [FeedKillmail(**kwargs) for kwargs in batch]
+                    )
+                    with patch(
+                        "feed.helpers.clusters.timezone.now",
+                        return_value=poll_at,
+                    ):
+                        start = time.perf_counter()
+                        if mode == "full":
+                            detect_clusters(since_hours=48)
+                        else:
+                            detect_clusters_incremental(
+                                since_hours=48, full_rescan_minutes=None
+                            )
+                        elapsed += time.perf_counter() - start
+                snapshot = _snapshot()
+                raise _Rollback
+        except _Rollback:
+            pass
+        return elapsed, snapshot
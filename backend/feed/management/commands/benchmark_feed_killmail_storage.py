@@ -0,0 +1,168 @@
+"""
+Measure FeedKillmail storage per killmail and cluster-detection load time.
+
+Stores a synthetic warzone day (the benchmark_feed_clusters generator, with
+victim items so payloads are killmail-sized) and reports the JSON bytes
+per killmail for:
+
+- ``inline``: raw_killmail, zkb_meta and attacker_summary as JSON columns
+  (the layout before FeedKillmailPayload);
+- ``hot``: attacker_summary plus the compressed payload;
+- ``archived``: the compressed payload only (archive_feed_killmails).
+
+Then times loading the 48h detection window the way detect_clusters does
+(``_load_system_kills`` plus ``build_cluster_stats`` per system): hot rows,
+archived rows (payloads read and decompressed), and hot rows with every
+payload decoded on load, which is what the inline columns cost. Everything
+runs in a transaction that is rolled back.
+
+    pipenv run python manage.py benchmark_feed_killmail_storage
+    pipenv run python manage.py benchmark_feed_killmail_storage --kills 20000
+"""
+
+import json
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from feed.helpers.clusters import _load_system_kills, build_cluster_stats
+from feed.management.commands.benchmark_feed_clusters import _synthetic_day
+from feed.models import FeedKillmail, FeedKillmailPayload
+
+ITEM_TYPE_IDS = (2048, 3841, 4405, 5975, 12058, 19814, 21640, 31055)
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _json_size(value) -> int:
+    return len(json.dumps(value, separators=(",", ":")).encode())
+
+
+def _with_items(kwargs: dict, rng: random.Random) -> dict:
+    """Add victim items (absent from the cluster benchmark's killmails)."""
+    raw = dict(kwargs["raw_killmail"])
+    raw["victim"] = dict(
+        raw["victim"],
+        items=[
+            {
+                "item_type_id": rng.choice(ITEM_TYPE_IDS),
+                "flag": rng.randint(11, 34),
+                "quantity_destroyed": rng.randint(1, 3),
+                "singleton": 0,
+            }
+            for _ in range(rng.randint(15, 45))
+        ],
+    )
+    return dict(kwargs, raw_killmail=raw)
+
+
+def _load_window(since) -> int:
+    clusters = 0
+    for system_kills in _load_system_kills(since).values():
+        build_cluster_stats(system_kills)
+        clusters += 1
+    return clusters
+
+
+def _load_window_decoding_payloads(since) -> int:
+    payloads = {
+        pk: FeedKillmailPayload.decode_data(data)
+        for pk, data in FeedKillmailPayload.objects.values_list(
+            "feed_killmail_id", "data"
+        )
+    }
+    clusters = 0
+    for system_kills in _load_system_kills(since).values():
+        for km in system_kills:
+            km.set_loaded_payload(payloads[km.pk])
+        build_cluster_stats(system_kills)
+        clusters += 1
+    return clusters
+
+
+class Command(BaseCommand):
+    help = "Report FeedKillmail bytes per killmail and window load times."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--kills", type=int, default=5000)
+        parser.add_argument("--systems", type=int, default=8)
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **options):
+        if options["kills"] < 1 or options["systems"] < 1:
+            raise CommandError("--kills and --systems must be at least 1")
+        rng = random.Random(options["seed"])
+        rows = [
+            _with_items(kwargs, rng)
+            for kwargs, _ in _synthetic_day(
+                options["kills"], options["systems"], 0, options["seed"]
+            )
+        ]
+        try:
+            with transaction.atomic():
+                self._run(rows)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _run(self, rows):
+        FeedKillmail.objects.all().delete()
+        killmails = FeedKillmail.objects.bulk_create(
+            [FeedKillmail(**kwargs) for kwargs in rows]
+        )
+        payloads = []
+        for km, kwargs in zip(killmails, rows):
+            data, raw_size = FeedKillmailPayload.encode(
+                {"killmail": kwargs["raw_killmail"], "zkb": kwargs["zkb_meta"]}
+            )
+            payloads.append(
+                FeedKillmailPayload(
+                    feed_killmail_id=km.pk, data=data, raw_size=raw_size
+                )
+            )
+        FeedKillmailPayload.objects.bulk_create(payloads)
+
+        count = len(rows)
+        summary = sum(_json_size(kw["attacker_summary"]) for kw in rows)
+        inline = summary + sum(
+            _json_size(kw["raw_killmail"]) + _json_size(kw["zkb_meta"])
+            for kw in rows
+        )
+        compressed = sum(len(payload.data) for payload in payloads)
+        self.stdout.write(f"{count} killmails, JSON bytes per killmail:")
+        for label, total in (
+            ("inline", inline),
+            ("hot", summary + compressed),
+            ("archived", compressed),
+        ):
+            self.stdout.write(
+                f"  {label:<9} {total / count:8.0f} "
+                f"({total * 100 / inline:5.1f}%)"
+            )
+
+        since = timezone.now() - timedelta(hours=48)
+        for label, load in (
+            ("hot", _load_window),
+            ("inline", _load_window_decoding_payloads),
+        ):
+            started = time.perf_counter()
+            systems = load(since)
+            self.stdout.write(
+                f"load {label:<9} {time.perf_counter() - started:.3f}s "
+                f"({systems} systems)"
+            )
+        FeedKillmail.objects.update(
+            attacker_summary=[], archived_at=timezone.now()
+        )
+        started = time.perf_counter()
+        systems = _load_window(since)
+        self.stdout.write(
+            f"load {'archived':<9} {time.perf_counter() - started:.3f}s "
+            f"({systems} systems)"
+        )
@@ -0,0 +1,141 @@
+"""
+Load test the live feed stream (feed.live) with many concurrent clients.
+
+Opens ``--clients`` SSE connections to a running ASGI server, waits until
+every one is connected, then publishes ``--events`` synthetic messages to
+the live feed Redis channel ``--interval`` seconds apart. Each client
+records when every message arrived. Reported: clients connected, messages
+delivered out of expected, and publish-to-delivery latency (p50/p95/max).
+The command fails if any message is lost.
+
+Nothing is written to the database; the messages have type ``loadtest``.
+Needs Redis (FEED_LIVE_REDIS_URL) and the app served through app.asgi:
+
+    uvicorn app.asgi:application --port 8000 --workers 2
+    pipenv run python manage.py loadtest_feed_stream --clients 1000
+    pipenv run python manage.py loadtest_feed_stream \\
+        --url http://localhost:8000/api/feed/stream --clients 200 --events 50
+"""
+
+import asyncio
+import json
+import statistics
+import time
+
+import httpx
+import redis
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from feed.live import FEED_LIVE_CHANNEL, dump_message
+
+CONNECT_TIMEOUT_SECONDS = 60
+DRAIN_TIMEOUT_SECONDS = 30
+
+
+class _Client:
+    def __init__(self):
+        self.connected = asyncio.Event()
+        self.received: dict[int, float] = {}
+
+
+async def _listen(http: httpx.AsyncClient, url: str, client: _Client, run):
+    async with http.stream("GET", url) as response:
+        if response.status_code != 200:
+            raise CommandError(f"Stream returned HTTP {response.status_code}")
+        event = None
+        async for line in response.aiter_lines():
+            if line.startswith("retry:"):
+                client.connected.set()
+            elif line.startswith("event:"):
+                event = line[6:].strip()
+            elif line.startswith("data:") and event == "loadtest":
+                message = json.loads(line[5:])
+                if message.get("run") == run:
+                    client.received[message["seq"]] = time.time()
+
+
+def _percentile(values: list[float], percent: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100)[percent - 1]
+
+
+class Command(BaseCommand):
+    help = "Measure live feed fan-out to many concurrent SSE clients"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--url", default="http://localhost:8000/api/feed/stream"
+        )
+        parser.add_argument("--clients", type=int, default=500)
+        parser.add_argument("--events", type=int, default=20)
+        parser.add_argument("--interval", type=float, default=0.25)
+        parser.add_argument(
+            "--redis-url", default=getattr(settings, "FEED_LIVE_REDIS_URL")
+        )
+
+    def handle(self, *args, **options):
+        if not options["redis_url"]:
+            raise CommandError("FEED_LIVE_REDIS_URL is not set")
+        result = asyncio.run(self._run(options))
+        self._report(result, options)
+
+    async def _run(self, options):
+        run = f"{time.time():.6f}"
+        clients = [_Client() for _ in range(options["clients"])]
+        limits = httpx.Limits(max_connections=options["clients"] + 10)
+        timeout = httpx.Timeout(10.0, read=None)
+        publisher = redis.Redis.from_url(options["redis_url"])
+        sent: dict[int, float] = {}
+        async with httpx.AsyncClient(limits=limits, timeout=timeout) as http:
+            tasks = [
+                asyncio.create_task(_listen(http, options["url"], client, run))
+                for client in clients
+            ]
+            started = time.perf_counter()
+            await asyncio.wait_for(
+                asyncio.gather(*(c.connected.wait() for c in clients)),
+                CONNECT_TIMEOUT_SECONDS,
+            )
+            connect_seconds = time.perf_counter() - started
+            for seq in range(options["events"]):
+                sent[seq] = time.time()
+                publisher.publish(
+                    FEED_LIVE_CHANNEL,
+                    dump_message({"type": "loadtest", "run": run, "seq": seq}),
+                )
+                await asyncio.sleep(options["interval"])
+            deadline = time.monotonic() + DRAIN_TIMEOUT_SECONDS
+            while time.monotonic() < deadline and any(
+                len(c.received) < len(sent) for c in clients
+            ):
+                await asyncio.sleep(0.1)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return clients, sent, connect_seconds
+
+    def _report(self, result, options):
+        clients, sent, connect_seconds = result
+        latencies = [
+            (at - sent[seq]) * 1000
+            for client in clients
+            for seq, at in client.received.items()
+        ]
+        expected = len(clients) * len(sent)
+        self.stdout.write(
+            f"clients={len(clients)} connected in {connect_seconds:.2f}s"
+        )
+        self.stdout.write(
+            f"delivered {len(latencies)}/{expected} messages "
+            f"({options['events']} events)"
+        )
+        if latencies:
+            self.stdout.write(
+                f"latency ms p50={_percentile(latencies, 50):.1f} "
+                f"p95={_percentile(latencies, 95):.1f} "
+                f"max={max(latencies):.1f}"
+            )
+        if len(latencies) != expected:
+            raise CommandError("Some subscribers missed messages")
@@ -0,0 +1,72 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("feed", "0014_remove_stale_celery_beat_tasks"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FeedClusterCursor",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("last_killmail_pk", models.BigIntegerField(default=0)),
+                (
+                    "last_full_rescan_at",
+                    models.DateTimeField(blank=True, null=True),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "cluster detection cursor",
+            },
+        ),
+        migrations.CreateModel(
+            name="FeedClusterWalkState",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("solar_system_id", models.BigIntegerField()),
+                (
+                    "cluster_type",
+                    models.CharField(
+                        choices=[
+                            ("kill_burst", "Kill burst"),
+                            ("fleet_engagement", "Fleet engagement"),
+                        ],
+                        max_length=32,
+                    ),
+                ),
+                ("positions", models.JSONField(default=list)),
+                ("horizon_start", models.DateTimeField()),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("solar_system_id", "cluster_type"),
+                        name="feed_cluster_walk_state_unique",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,92 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:12
+
+import json
+import zlib
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+BATCH = 500
+
+
+def _encode(payload):
+    text = json.dumps(payload, separators=(",", ":")).encode()
+    return zlib.compress(text, 6), len(text)
+
+
+def move_payloads(apps, schema_editor):
+    FeedKillmail = apps.get_model("feed", "FeedKillmail")
+    FeedKillmailPayload = apps.get_model("feed", "FeedKillmailPayload")
+    rows = []
+    for pk, raw, zkb in (
+        FeedKillmail.objects.order_by("pk")
+        .values_list("pk", "raw_killmail", "zkb_meta")
+        .iterator(chunk_size=BATCH)
+    ):
+        data, raw_size = _encode({"killmail": raw or {}, "zkb": zkb or {}})
+        rows.append(
+            FeedKillmailPayload(
+                feed_killmail_id=pk, data=data, raw_size=raw_size
+            )
+        )
+        if len(rows) >= BATCH:
+            FeedKillmailPayload.objects.bulk_create(rows)
+            rows = []
+    FeedKillmailPayload.objects.bulk_create(rows)
+
+
+def restore_payloads(apps, schema_editor):
+    FeedKillmail = apps.get_model("feed", "FeedKillmail")
+    FeedKillmailPayload = apps.get_model("feed", "FeedKillmailPayload")
+    for payload in FeedKillmailPayload.objects.iterator(chunk_size=BATCH):
+        decoded = json.loads(zlib.decompress(bytes(payload.data)))
+        FeedKillmail.objects.filter(pk=payload.feed_killmail_id).update(
+            raw_killmail=decoded["killmail"], zkb_meta=decoded["zkb"]
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("feed", "0015_feed_cluster_incremental_state"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FeedKillmailPayload",
+            fields=[
+                (
+                    "feed_killmail",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="payload",
+                        serialize=False,
+                        to="feed.feedkillmail",
+                    ),
+                ),
+                ("data", models.BinaryField()),
+                ("raw_size", models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        # A default lets the column be re-added when migrating backwards.
+        migrations.AlterField(
+            model_name="feedkillmail",
+            name="raw_killmail",
+            field=models.JSONField(default=dict),
+        ),
+        migrations.RunPython(move_payloads, restore_payloads),
+        migrations.RemoveField(
+            model_name="feedkillmail",
+            name="raw_killmail",
+        ),
+        migrations.RemoveField(
+            model_name="feedkillmail",
+            name="zkb_meta",
+        ),
+        migrations.AddField(
+            model_name="feedkillmail",
+            name="archived_at",
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
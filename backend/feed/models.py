@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import json
+import zlib
+
 from django.db import models
 from django.utils import timezone
 
@@ -70,6 +73,15 @@ class FeedR2z2Cursor(models.Model):
 
 
 class FeedKillmail(models.Model):
+    """A killmail seen by the feed: the fields the feed pipeline queries.
+
+    The full ESI killmail and the zKillboard metadata live compressed in
+    FeedKillmailPayload and are read lazily through ``raw_killmail`` and
+    ``zkb_meta``. Rows older than FEED_KILLMAIL_HOT_DAYS are archived
+    (``archive_feed_killmails``): ``attacker_summary`` is emptied and
+    ``attackers`` rebuilds it from the payload.
+    """
+
     killmail_id = models.BigIntegerField(unique=True, db_index=True)
     hash = models.CharField(max_length=64)
     killmail_time = models.DateTimeField(db_index=True)
@@ -77,9 +89,8 @@ class FeedKillmail(models.Model):
     victim_character_id = models.BigIntegerField(null=True, blank=True)
     victim_ship_type_id = models.BigIntegerField(null=True, blank=True)
     attacker_summary = models.JSONField(default=list)
-    raw_killmail = models.JSONField()
-    zkb_meta = models.JSONField(default=dict)
     zkill_sequence_id = models.BigIntegerField(null=True, blank=True)
+    archived_at = models.DateTimeField(null=True, blank=True, db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -91,6 +102,144 @@ class FeedKillmail(models.Model):
     def __str__(self) -> str:
         return f"Killmail {self.killmail_id}"
 
+    @staticmethod
+    def summarize_attackers(attackers: list[dict]) -> list[dict]:
+        return [
+            {
+                "character_id": a.get("character_id"),
+                "corporation_id": a.get("corporation_id"),
+                "alliance_id": a.get("alliance_id"),
+                "faction_id": a.get("faction_id"),
+                "ship_type_id": a.get("ship_type_id"),
+                "damage_done": a.get("damage_done"),
+                "final_blow": a.get("final_blow"),
+            }
+            for a in attackers
+        ]
+
+    def _payload(self) -> dict:
+        payload = self.__dict__.get("_payload_data")
+        if payload is None:
+            row = None
+            if self.pk is not None:
+                row = FeedKillmailPayload.objects.filter(
+                    feed_killmail_id=self.pk
+                ).first()
+            payload = row.decode() if row else {"killmail": {}, "zkb": {}}
+            self._payload_data = payload
+        return payload
+
+    def _set_payload(self, key: str, value: dict) -> None:
+        payload = self.__dict__.get("_payload_data")
+        if payload is None:
+            # Set by a constructor or update_or_create: no need to read the
+            # stored payload when both parts are replaced.
+            payload = self._payload_data = {"killmail": {}, "zkb": {}}
+        payload[key] = value
+        self._payload_dirty = True
+
+    @property
+    def raw_killmail(self) -> dict:
+        return self._payload()["killmail"]
+
+    @raw_killmail.setter
+    def raw_killmail(self, value: dict) -> None:
+        self._set_payload("killmail", value)
+
+    @property
+    def zkb_meta(self) -> dict:
+        return self._payload()["zkb"]
+
+    @zkb_meta.setter
+    def zkb_meta(self, value: dict) -> None:
+        self._set_payload("zkb", value or {})
+
+    @property
+    def attackers(self) -> list[dict]:
+        """Attacker summary rows, from the payload once archived."""
+        if self.archived_at is None:
+            return self.attacker_summary or []
+        return self.summarize_attackers(
+            self.raw_killmail.get("attackers") or []
+        )
+
+    def summary(self) -> dict:
+        """The killmail shape feed.helpers.killmail_classify reads."""
+        return {
+            "killmail_id": self.killmail_id,
+            "victim": {
+                "character_id": self.victim_character_id,
+                "ship_type_id": self.victim_ship_type_id,
+            },
+            "attackers": self.attackers,
+        }
+
+    @classmethod
+    def load_payloads(cls, killmails) -> None:
+        """Read the payloads of archived ``killmails`` in one query."""
+        pending = {
+            km.pk: km
+            for km in killmails
+            if km.archived_at is not None
+            and "_payload_data" not in km.__dict__
+        }
+        if not pending:
+            return
+        for row in FeedKillmailPayload.objects.filter(
+            feed_killmail_id__in=list(pending)
+        ):
+            pending.pop(row.feed_killmail_id).set_loaded_payload(row.decode())
+        for km in pending.values():
+            km.set_loaded_payload({"killmail": {}, "zkb": {}})
+
+    def set_loaded_payload(self, payload: dict) -> None:
+        """Use ``payload``, read by the caller, as the stored payload."""
+        self._payload_data = payload
+
+    @classmethod
+    def summaries(cls, killmails) -> list[dict]:
+        cls.load_payloads(killmails)
+        return [km.summary() for km in killmails]
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        if self.__dict__.get("_payload_dirty"):
+            FeedKillmailPayload.store(self, self._payload_data)
+            self._payload_dirty = False
+
+
+class FeedKillmailPayload(models.Model):
+    """zlib-compressed JSON ``{"killmail": ..., "zkb": ...}`` of a killmail."""
+
+    feed_killmail = models.OneToOneField(
+        FeedKillmail,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="payload",
+    )
+    data = models.BinaryField()
+    raw_size = models.PositiveIntegerField(default=0)
+
+    @staticmethod
+    def encode(payload: dict) -> tuple[bytes, int]:
+        text = json.dumps(payload, separators=(",", ":")).encode()
+        return zlib.compress(text, 6), len(text)
+
+    @staticmethod
+    def decode_data(data: bytes) -> dict:
+        return json.loads(zlib.decompress(bytes(data)))
+
+    def decode(self) -> dict:
+        return self.decode_data(self.data)
+
+    @classmethod
+    def store(cls, feed_killmail: FeedKillmail, payload: dict) -> None:
+        data, raw_size = cls.encode(payload)
+        cls.objects.update_or_create(
+            feed_killmail=feed_killmail,
+            defaults={"data": data, "raw_size": raw_size},
+        )
+
 
 class FeedCharacterAffiliation(models.Model):
     """Cached militia enlistment for characters seen in the feed."""
@@ -155,6 +304,48 @@ class FeedCluster(models.Model):
         return self.cluster_key
 
 
+class FeedClusterCursor(models.Model):
+    """Singleton watermark for incremental cluster detection."""
+
+    # Highest FeedKillmail.pk already fed through detect_clusters.
+    last_killmail_pk = models.BigIntegerField(default=0)
+    last_full_rescan_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "cluster detection cursor"
+
+    @classmethod
+    def get_singleton(cls) -> FeedClusterCursor:
+        obj, _ = cls.objects.get_or_create(pk=1)
+        return obj
+
+
+class FeedClusterWalkState(models.Model):
+    """Tail of the sliding-window walk for one system and cluster type."""
+
+    solar_system_id = models.BigIntegerField()
+    cluster_type = models.CharField(
+        max_length=32, choices=FeedCluster.ClusterType.choices
+    )
+    # Every walk position starting at or after horizon_start, oldest first,
+    # as [killmail_time ISO, killmail_id].
+    positions = models.JSONField(default=list)
+    horizon_start = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["solar_system_id", "cluster_type"],
+                name="feed_cluster_walk_state_unique",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.cluster_type}:{self.solar_system_id}"
+
+
 class FeedRollupConfig(models.Model):
     rollup_code = models.CharField(max_length=64, unique=True)
     is_enabled = models.BooleanField(default=True)
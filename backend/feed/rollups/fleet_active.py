@@ -49,7 +49,7 @@ def _dominant_faction_for_cluster(cluster: FeedCluster) -> int | None:
         return None
 
     killmails = list(FeedKillmail.objects.filter(killmail_id__in=killmail_ids))
-    raw = [km.raw_killmail for km in killmails]
+    raw = FeedKillmail.summaries(killmails)
     fleet_cfg = get_rollup_config("fleet_active")
     stored = cluster.dominant_faction_id
 
@@ -6,6 +6,7 @@ from datetime import timedelta
 from django.utils import timezone
 
 from feed.helpers.amarr_fleet_pings import maybe_notify_amarr_fleet
+from feed.live import publish_feed_event, publish_feed_event_deletes
 from feed.models import (
     FeedEvent,
     FeedEventKillmailLink,
@@ -27,6 +28,7 @@ def write_rollup_results(results: list[RollupResult]) -> int:
         event = _upsert_event(result)
         _sync_killmail_links(event, result.killmail_ids)
         _maybe_notify_amarr_fleet(event)
+        publish_feed_event(event)
         written += 1
     return written
 
@@ -94,6 +96,7 @@ def _upsert_event(result: RollupResult) -> FeedEvent:
             FeedEvent.objects.filter(
                 pk__in=[row.pk for row in matches[1:]]
             ).delete()
+            publish_feed_event_deletes([row.pk for row in matches[1:]])
         for field, value in defaults.items():
             setattr(event, field, value)
         event.save()
@@ -203,10 +206,11 @@ def _apply_upgrade_metadata(
 
     if changed:
         event.payload = payload
+        event.updated_at = timezone.now()
         # Concurrent coalesce may delete this row; queryset.update is race-safe.
         FeedEvent.objects.filter(pk=event.pk).update(
             payload=payload,
-            updated_at=timezone.now(),
+            updated_at=event.updated_at,
         )
 
 
@@ -224,6 +228,7 @@ def _coalesce_fleet_active_event(
         FeedEvent.objects.filter(
             pk__in=[dup.pk for dup in duplicates]
         ).delete()
+        publish_feed_event_deletes([dup.pk for dup in duplicates])
 
 
 def _sync_killmail_links(event: FeedEvent, killmail_ids: list[int]) -> None:
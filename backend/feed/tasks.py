@@ -10,13 +10,15 @@ from celery_once import QueueOnce
 from app.celery import app
 from feed.constants import (
     FEED_CONTESTED_SNAPSHOT_RETENTION_DAYS,
+    FEED_KILLMAIL_ARCHIVE_BATCH,
+    FEED_KILLMAIL_HOT_DAYS,
     FEED_KILLMAIL_RETENTION_DAYS,
 )
 from feed.helpers.affiliations import (
     populate_pending_character_affiliations_batch,
     refresh_stale_character_affiliations_batch,
 )
-from feed.helpers.clusters import detect_clusters
+from feed.helpers.clusters import detect_clusters_incremental
 from feed.helpers.fw_contested import poll_monitored_contested_snapshots
 from feed.helpers.r2z2 import poll_r2z2_batch
 from feed.models import FeedKillmail, FeedSystemContestedSnapshot
@@ -36,7 +38,7 @@ def poll_zkill_r2z2() -> dict:
 
 @app.task(queue="celery")
 def detect_feed_clusters() -> int:
-    count = detect_clusters(since_hours=48)
+    count = detect_clusters_incremental(since_hours=48)
     logger.info("Detected/updated %s feed clusters", count)
     return count
 
@@ -97,3 +99,30 @@ def purge_feed_killmails() -> dict:
         "killmails": deleted_killmails,
         "contested_snapshots": deleted_snapshots,
     }
+
+
+@app.task(queue="celery")
+def archive_feed_killmails() -> dict:
+    """Empty attacker_summary on killmails past FEED_KILLMAIL_HOT_DAYS."""
+    now = timezone.now()
+    cutoff = now - timedelta(days=FEED_KILLMAIL_HOT_DAYS)
+    # Only rows whose payload holds the attackers can give up the summary.
+    pending = FeedKillmail.objects.filter(
+        archived_at__isnull=True,
+        killmail_time__lt=cutoff,
+        payload__isnull=False,
+    )
+    archived = 0
+    while True:
+        ids = list(
+            pending.order_by("pk").values_list("pk", flat=True)[
+                :FEED_KILLMAIL_ARCHIVE_BATCH
+            ]
+        )
+        if not ids:
+            break
+        archived += FeedKillmail.objects.filter(pk__in=ids).update(
+            attacker_summary=[], archived_at=now
+        )
+    logger.info("Archived %s FeedKillmail rows", archived)
+    return {"killmails": archived}
@@ -20,6 +20,7 @@ from feed.constants import (
     AMAMAKE_SOLAR_SYSTEM_ID,
     FACTION_AMARR,
     FACTION_MINMATAR,
+    METERS_PER_LIGHT_YEAR,
 )
 from feed.helpers.capital_pings import (
     CAPITAL_ALERT_TITLE,
@@ -33,7 +34,12 @@ from feed.helpers.capital_ships import (
     is_capital_ship_type,
     killmail_involves_capital,
 )
-from feed.helpers.system_distance import light_years_between_systems
+from feed.helpers.system_distance import (
+    light_years_between_systems,
+    light_years_from_system,
+    solar_system_index,
+    systems_within_light_years,
+)
 from feed.models import (
     FeedCapitalAlert,
     FeedCapitalPing,
@@ -204,6 +210,69 @@ class SystemDistanceTestCase(TestCase):
         )
         self.assertAlmostEqual(distance, 0.8, places=1)
 
+    def _seed_line_of_systems(self):
+        """Amamake at the origin plus systems 1, 5 and 20 ly along x."""
+        make_test_solar_system(
+            solar_system_id=AMAMAKE_SOLAR_SYSTEM_ID,
+            name="Amamake",
+            position_x=0.0,
+            position_y=0.0,
+            position_z=0.0,
+        )
+        for solar_system_id, light_years in (
+            (30002538, 1),
+            (30002539, 5),
+            (30002540, 20),
+        ):
+            make_test_solar_system(
+                solar_system_id=solar_system_id,
+                name=f"System {solar_system_id}",
+                position_x=light_years * METERS_PER_LIGHT_YEAR,
+                position_y=0.0,
+                position_z=0.0,
+            )
+
+    def test_systems_within_light_years(self):
+        self._seed_line_of_systems()
+        within = systems_within_light_years(AMAMAKE_SOLAR_SYSTEM_ID, 8.0)
+        self.assertEqual(
+            set(within), {AMAMAKE_SOLAR_SYSTEM_ID, 30002538, 30002539}
+        )
+        self.assertAlmostEqual(within[30002539], 5.0)
+
+    def test_distances_from_one_system_to_many(self):
+        self._seed_line_of_systems()
+        distances = light_years_from_system(
+            AMAMAKE_SOLAR_SYSTEM_ID, [30002538, 30002540, 30099999]
+        )
+        self.assertAlmostEqual(distances[30002538], 1.0)
+        self.assertAlmostEqual(distances[30002540], 20.0)
+        self.assertIsNone(distances[30099999])
+
+    def test_index_serves_distances_without_queries(self):
+        self._seed_line_of_systems()
+        solar_system_index()
+        with self.assertNumQueries(0):
+            distance = light_years_between_systems(
+                AMAMAKE_SOLAR_SYSTEM_ID, 30002539
+            )
+            systems_within_light_years(AMAMAKE_SOLAR_SYSTEM_ID, 3.0)
+        self.assertAlmostEqual(distance, 5.0)
+
+    def test_index_reloads_after_solar_system_saved(self):
+        self._seed_line_of_systems()
+        self.assertEqual(
+            len(systems_within_light_years(AMAMAKE_SOLAR_SYSTEM_ID, 2.0)),
+            2,
+        )
+        EveSolarSystem.objects.filter(id=30002539).update(position_x=0.0)
+        system = EveSolarSystem.objects.get(id=30002539)
+        system.save()
+        self.assertEqual(
+            len(systems_within_light_years(AMAMAKE_SOLAR_SYSTEM_ID, 2.0)),
+            3,
+        )
+
 
 class CapitalPingTestCase(TestCase):
     @classmethod
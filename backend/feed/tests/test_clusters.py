@@ -1,18 +1,29 @@
 from __future__ import annotations
 
 from datetime import timedelta
+from unittest.mock import patch
 
 from django.test import TestCase
 from django.utils import timezone
 
 from feed.constants import FACTION_AMARR, FACTION_MINMATAR
-from feed.helpers.clusters import _mark_stale_fleet_clusters, detect_clusters
+from feed.helpers.clusters import (
+    _mark_stale_fleet_clusters,
+    _resume_point,
+    detect_clusters,
+    detect_clusters_incremental,
+)
 from feed.helpers.ingest import upsert_feed_killmail_from_r2z2
 from feed.helpers.monitored_systems import invalidate_monitored_systems_cache
 from feed.management.commands.seed_feed_monitored_systems import (
     seed_from_fixture,
 )
-from feed.models import FeedCluster, FeedKillmail
+from feed.models import (
+    FeedCluster,
+    FeedClusterCursor,
+    FeedClusterWalkState,
+    FeedKillmail,
+)
 from feed.rollups.registry import build_context, run_rollup
 from feed.tests.helpers import make_killmail_payload
 
@@ -289,3 +300,132 @@ class ClusterRollupTestCase(TestCase):
         # Neither side should absorb the other's full pilot count.
         self.assertLess(amarr_cluster.pilot_count, 22)
         self.assertLess(minmatar_cluster.pilot_count, 22)
+
+
+class IncrementalClusterDetectionTestCase(TestCase):
+    def setUp(self):
+        seed_from_fixture()
+        invalidate_monitored_systems_cache()
+        self.base = timezone.now() - timedelta(hours=3)
+
+    def _polls(self):
+        """Long fight (split by the 90m cap) arriving over four polls."""
+        kills = []
+        killmail_id = 600000
+        for segment in range(9):
+            for i in range(6):
+                kills.append(
+                    (
+                        killmail_id,
+                        self.base
+                        + timedelta(minutes=segment * 15, seconds=i * 20),
+                    )
+                )
+                killmail_id += 1
+        # One killmail reaches zKill 40 minutes late.
+        late = kills.pop(20)
+        return [kills[:15], kills[15:30], kills[30:] + [late], []]
+
+    def _ingest(self, batch):
+        for killmail_id, killmail_time in batch:
+            upsert_feed_killmail_from_r2z2(
+                make_killmail_payload(killmail_id, killmail_time=killmail_time)
+            )
+
+    def _snapshot(self):
+        return {
+            cluster.cluster_key: (
+                cluster.started_at,
+                cluster.last_kill_at,
+                cluster.ended_at,
+                cluster.is_active,
+                sorted(cluster.killmail_ids),
+            )
+            for cluster in FeedCluster.objects.all()
+        }
+
+    def _replay(self, detect):
+        FeedKillmail.objects.all().delete()
+        FeedCluster.objects.all().delete()
+        FeedClusterCursor.objects.all().delete()
+        for batch in self._polls():
+            self._ingest(batch)
+            detect()
+        return self._snapshot()
+
+    def test_incremental_matches_full_rescan(self):
+        full = self._replay(lambda: detect_clusters(since_hours=4))
+        incremental = self._replay(
+            lambda: detect_clusters_incremental(since_hours=4)
+        )
+
+        self.assertTrue(full)
+        self.assertEqual(incremental, full)
+        cursor = FeedClusterCursor.get_singleton()
+        self.assertEqual(
+            cursor.last_killmail_pk,
+            FeedKillmail.objects.order_by("-pk").first().pk,
+        )
+
+    def test_full_rescan_is_idempotent(self):
+        snapshot = self._replay(lambda: detect_clusters(since_hours=4))
+        detect_clusters(since_hours=4)
+        self.assertEqual(self._snapshot(), snapshot)
+
+    def test_first_run_is_a_full_rescan(self):
+        self._ingest(self._polls()[0])
+        detect_clusters_incremental(since_hours=4)
+
+        cursor = FeedClusterCursor.get_singleton()
+        self.assertIsNotNone(cursor.last_full_rescan_at)
+        self.assertTrue(
+            FeedClusterWalkState.objects.filter(
+                solar_system_id=30002538
+            ).exists()
+        )
+
+    def test_only_systems_with_new_kills_are_walked(self):
+        self._ingest(self._polls()[0])
+        detect_clusters(since_hours=4)
+        upsert_feed_killmail_from_r2z2(
+            make_killmail_payload(
+                610000,
+                solar_system_id=30003067,
+                killmail_time=self.base + timedelta(minutes=30),
+            )
+        )
+
+        with patch(
+            "feed.helpers.clusters._detect_for_system", return_value=(0, [])
+        ) as walk:
+            detect_clusters_incremental(since_hours=4)
+
+        self.assertEqual(
+            [call.args[0] for call in walk.call_args_list], [30003067]
+        )
+
+    def test_no_new_kills_skips_walk(self):
+        self._ingest(self._polls()[0])
+        detect_clusters(since_hours=4)
+
+        with patch("feed.helpers.clusters._detect_for_system") as walk:
+            self.assertEqual(detect_clusters_incremental(since_hours=4), 0)
+        walk.assert_not_called()
+
+    def test_resume_point_falls_back_outside_saved_horizon(self):
+        self._ingest(self._polls()[0])
+        detect_clusters(since_hours=4)
+        state = FeedClusterWalkState.objects.get(
+            solar_system_id=30002538,
+            cluster_type=FeedCluster.ClusterType.FLEET_ENGAGEMENT,
+        )
+        kills = list(FeedKillmail.objects.order_by("killmail_time"))
+
+        too_late = (state.horizon_start - timedelta(minutes=1), 1)
+        self.assertEqual(_resume_point(state, too_late, 20, kills)[0], 0)
+
+        tail = (kills[-1].killmail_time + timedelta(minutes=5), 10**9)
+        start, kept, horizon_start = _resume_point(state, tail, 20, kills)
+        self.assertGreater(start, 0)
+        self.assertEqual(horizon_start, state.horizon_start)
+        self.assertTrue(all(position < tail for position in kept))
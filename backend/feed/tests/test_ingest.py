@@ -2,12 +2,14 @@ from __future__ import annotations
 
 from django.test import TestCase
 
+from feed.helpers.clusters import build_cluster_stats
 from feed.helpers.ingest import upsert_feed_killmail_from_r2z2
 from feed.helpers.killmail_classify import is_npc_kill
 from feed.management.commands.seed_feed_monitored_systems import (
     seed_from_fixture,
 )
-from feed.models import FeedKillmail
+from feed.models import FeedKillmail, FeedKillmailPayload
+from feed.tasks import archive_feed_killmails
 from feed.tests.helpers import jita_killmail_payload, make_killmail_payload
 
 
@@ -56,3 +58,33 @@ class IngestTestCase(TestCase):
     def test_is_npc_kill(self):
         self.assertTrue(is_npc_kill({"npc": True}))
         self.assertFalse(is_npc_kill({"npc": False}))
+
+    def test_payload_is_stored_compressed_and_read_lazily(self):
+        payload = make_killmail_payload(136398967)
+        upsert_feed_killmail_from_r2z2(payload)
+
+        stored = FeedKillmailPayload.objects.get()
+        self.assertLess(len(bytes(stored.data)), stored.raw_size)
+        km = FeedKillmail.objects.get()
+        with self.assertNumQueries(1):
+            self.assertEqual(payload["killmail"], km.raw_killmail)
+            self.assertEqual(payload["zkb"], km.zkb_meta)
+
+    def test_archived_killmails_keep_attackers_in_payload(self):
+        for killmail_id in (136398967, 136398968):
+            upsert_feed_killmail_from_r2z2(make_killmail_payload(killmail_id))
+        hot = list(FeedKillmail.objects.order_by("killmail_id"))
+        hot_stats = build_cluster_stats(hot, faction_id=500002)
+
+        self.assertEqual({"killmails": 2}, archive_feed_killmails())
+
+        archived = list(FeedKillmail.objects.order_by("killmail_id"))
+        self.assertEqual([], archived[0].attacker_summary)
+        self.assertIsNotNone(archived[0].archived_at)
+        self.assertEqual(hot[0].attackers, archived[0].attackers)
+        with self.assertNumQueries(1):
+            FeedKillmail.load_payloads(archived)
+        self.assertEqual(
+            hot_stats, build_cluster_stats(archived, faction_id=500002)
+        )
+        self.assertEqual({"killmails": 0}, archive_feed_killmails())
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import json
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+
+from feed.live import (
+    FEED_LIVE_CHANNEL,
+    LiveSubscriber,
+    dump_message,
+    encode_live_cursor,
+    feed_event_message,
+    live_frame,
+    replay_feed_events,
+)
+from feed.models import FeedEvent
+from feed.rollups.types import RollupResult
+from feed.rollups.writer import write_rollup_results
+from feed.views import feed_event_stream, feed_stream
+
+
+def _result(cluster_key: str, subheader: str) -> RollupResult:
+    return RollupResult(
+        kind=FeedEvent.Kind.KILLMAIL_BATCH,
+        occurred_at=timezone.now(),
+        title="Kills in Auga",
+        subheader=subheader,
+        preview="",
+        body="",
+        accent=FeedEvent.Accent.COMBAT,
+        payload={"system_id": 30002542},
+        rollup_code="killmail_batch",
+        rollup_version=1,
+        cluster_key=cluster_key,
+    )
+
+
+def _event(title: str, updated_at) -> FeedEvent:
+    event = FeedEvent.objects.create(
+        kind=FeedEvent.Kind.KILLMAIL_BATCH,
+        occurred_at=updated_at,
+        title=title,
+        rollup_code="killmail_batch",
+        cluster_key=f"killmail_batch:{title}",
+    )
+    FeedEvent.objects.filter(pk=event.pk).update(updated_at=updated_at)
+    event.refresh_from_db()
+    return event
+
+
+class _FakeBroadcaster:
+    def __init__(self, frames):
+        self.frames = frames
+
+    @asynccontextmanager
+    async def subscribe(self):
+        subscriber = LiveSubscriber()
+        for frame in self.frames:
+            subscriber.offer(frame)
+        subscriber.offer(None)
+        yield subscriber
+
+
+def _collect(cursor, frames) -> list[str]:
+    async def run():
+        return [chunk async for chunk in feed_event_stream(cursor)]
+
+    with patch("feed.views.broadcaster", _FakeBroadcaster(frames)):
+        return async_to_sync(run)()
+
+
+class LiveFeedPublishTestCase(TestCase):
+    @override_settings(FEED_LIVE_REDIS_URL="redis://localhost:6379/2")
+    @patch("feed.live._redis")
+    def test_writer_publishes_event_after_commit(self, redis_mock):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            write_rollup_results(
+                [_result("killmail_batch:30002542", "3 kills")]
+            )
+        redis_mock.return_value.publish.assert_not_called()
+
+        for callback in callbacks:
+            callback()
+
+        channel, data = redis_mock.return_value.publish.call_args.args
+        self.assertEqual(FEED_LIVE_CHANNEL, channel)
+        message = json.loads(data)
+        event = FeedEvent.objects.get()
+        self.assertEqual("upsert", message["action"])
+        self.assertEqual(str(event.id), message["event"]["id"])
+        self.assertEqual("3 kills", message["event"]["subheader"])
+        self.assertEqual(encode_live_cursor(event), message["cursor"])
+
+    @patch("feed.live._redis")
+    def test_nothing_is_published_without_redis_url(self, redis_mock):
+        with self.captureOnCommitCallbacks(execute=True):
+            write_rollup_results(
+                [_result("killmail_batch:30002542", "3 kills")]
+            )
+
+        redis_mock.assert_not_called()
+
+
+class LiveFeedStreamTestCase(TestCase):
+    def test_replay_returns_events_updated_after_cursor(self):
+        now = timezone.now()
+        first = _event("first", now - timedelta(minutes=3))
+        second = _event("second", now - timedelta(minutes=2))
+        third = _event("third", now - timedelta(minutes=1))
+
+        replayed = replay_feed_events(encode_live_cursor(first))
+
+        self.assertEqual(
+            [str(second.id), str(third.id)],
+            [message["event"]["id"] for message in replayed],
+        )
+        self.assertEqual([], replay_feed_events("not-a-cursor"))
+
+    def test_stream_replays_then_skips_already_sent_messages(self):
+        now = timezone.now()
+        first = _event("first", now - timedelta(minutes=2))
+        second = _event("second", now - timedelta(minutes=1))
+        live = [
+            # Published while the replay ran: already sent, skipped.
+            live_frame(dump_message(feed_event_message(second))),
+            live_frame(dump_message({"type": "capital_alert", "id": 7})),
+        ]
+
+        chunks = _collect(encode_live_cursor(first), live)
+
+        self.assertTrue(chunks[0].startswith("retry:"))
+        self.assertEqual(3, len(chunks))
+        self.assertIn(f"id: {encode_live_cursor(second)}\n", chunks[1])
+        self.assertTrue(chunks[2].startswith("event: capital_alert\n"))
+
+    @patch("feed.views.FEED_LIVE_REPLAY_LIMIT", 2)
+    @patch("feed.live.FEED_LIVE_REPLAY_LIMIT", 2)
+    def test_stream_pages_replay_until_caught_up(self):
+        now = timezone.now()
+        first = _event("first", now - timedelta(minutes=6))
+        rest = [
+            _event(f"event {minutes}", now - timedelta(minutes=minutes))
+            for minutes in range(5, 0, -1)
+        ]
+
+        chunks = _collect(encode_live_cursor(first), [])
+
+        self.assertEqual(
+            [f"id: {encode_live_cursor(event)}\n" for event in rest],
+            [chunk.splitlines(keepends=True)[1] for chunk in chunks[1:]],
+        )
+
+    def test_stream_ends_when_subscriber_is_dropped(self):
+        subscriber = LiveSubscriber()
+        frame = live_frame(dump_message({"type": "capital_alert", "id": 7}))
+        for _ in range(subscriber.queue.maxsize + 1):
+            subscriber.offer(frame)
+
+        self.assertTrue(subscriber.dropped)
+
+    @override_settings(FEED_LIVE_REDIS_URL="redis://localhost:6379/2")
+    def test_stream_is_not_served_over_wsgi(self):
+        request = RequestFactory().get("/api/feed/stream")
+
+        response = async_to_sync(feed_stream)(request)
+
+        self.assertEqual(503, response.status_code)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import time
 from datetime import timedelta
 from unittest.mock import patch
 
@@ -14,6 +15,8 @@ from feed.management.commands.seed_feed_monitored_systems import (
 from feed.models import FeedKillmail, FeedR2z2Cursor
 from feed.tests.helpers import make_killmail_payload
 
+real_sleep = time.sleep
+
 
 class R2z2PollTestCase(TestCase):
     def setUp(self):
@@ -194,3 +197,113 @@ class R2z2PollTestCase(TestCase):
         remaining = (cursor.paused_until - timezone.now()).total_seconds()
         self.assertLess(remaining, 120)
         self.assertGreater(remaining, 0)
+
+
+class R2z2PipelinedPollTestCase(TestCase):
+    """Pipelined catch-up keeps cursor order and throttle semantics."""
+
+    def setUp(self):
+        seed_from_fixture()
+        FeedR2z2Cursor.objects.create(
+            pk=1,
+            live_sequence_id=130,
+            catchup_sequence_id=100,
+            last_sequence_id=130,
+            live_idle_until=timezone.now() + timedelta(minutes=5),
+        )
+
+    @staticmethod
+    def _fetch_by_sequence(
+        throttle_at: int | None = None, slow_at: int | None = None
+    ):
+        fetched = []
+
+        def fetch(sequence):
+            fetched.append(sequence)
+            # Later sequences answer first to exercise reordering.
+            real_sleep(0.001 * (sequence % 4))
+            if sequence == slow_at:
+                real_sleep(0.1)
+            if sequence == 131:
+                return 404, None, None
+            if sequence == throttle_at:
+                return 429, None, 30.0
+            return 200, make_killmail_payload(1000 + sequence), None
+
+        return fetch, fetched
+
+    @patch("feed.helpers.r2z2.maybe_notify_capital_kill")
+    @patch("feed.helpers.r2z2.time.sleep")
+    @patch("feed.helpers.r2z2.fetch_sequence_payload")
+    @patch("feed.helpers.r2z2.fetch_latest_sequence", return_value=131)
+    def test_catchup_pipelines_in_order_up_to_live(
+        self, mock_latest, mock_fetch, mock_sleep, mock_ping
+    ):
+        mock_ping.return_value = False
+        mock_fetch.side_effect, fetched = self._fetch_by_sequence()
+
+        stats = poll_r2z2_batch(max_seconds=10, pipeline_window=4)
+
+        cursor = FeedR2z2Cursor.get_singleton()
+        self.assertTrue(stats["pipelined"])
+        self.assertEqual(stats["catchup_processed"], 30)
+        self.assertEqual(cursor.catchup_sequence_id, 130)
+        self.assertEqual(cursor.live_sequence_id, 130)
+        self.assertLessEqual(max(fetched), 131)
+        self.assertEqual(FeedKillmail.objects.count(), 30)
+        self.assertGreater(stats["catchup_per_second"], 0)
+
+    @patch("feed.helpers.r2z2.maybe_notify_capital_kill")
+    @patch("feed.helpers.r2z2.time.sleep")
+    @patch("feed.helpers.r2z2.fetch_sequence_payload")
+    @patch("feed.helpers.r2z2.fetch_latest_sequence", return_value=131)
+    def test_throttle_mid_window_stops_cursor_before_it(
+        self, mock_latest, mock_fetch, mock_sleep, mock_ping
+    ):
+        mock_ping.return_value = False
+        mock_fetch.side_effect, _ = self._fetch_by_sequence(throttle_at=110)
+
+        stats = poll_r2z2_batch(max_seconds=10, pipeline_window=4)
+
+        cursor = FeedR2z2Cursor.get_singleton()
+        self.assertEqual(stats["outcome"], "rate_limited")
+        self.assertEqual(stats["rate_limited"], 1)
+        self.assertEqual(cursor.catchup_sequence_id, 109)
+        self.assertIsNotNone(cursor.paused_until)
+
+    @patch("feed.helpers.r2z2.maybe_notify_capital_kill")
+    @patch("feed.helpers.r2z2.time.sleep")
+    @patch("feed.helpers.r2z2.fetch_sequence_payload")
+    @patch("feed.helpers.r2z2.fetch_latest_sequence", return_value=131)
+    def test_no_request_is_sent_after_a_throttle(
+        self, mock_latest, mock_fetch, mock_sleep, mock_ping
+    ):
+        mock_ping.return_value = False
+        # 106 is throttled while the poller still waits on 105.
+        mock_fetch.side_effect, fetched = self._fetch_by_sequence(
+            throttle_at=106, slow_at=105
+        )
+
+        stats = poll_r2z2_batch(max_seconds=10, pipeline_window=4)
+
+        cursor = FeedR2z2Cursor.get_singleton()
+        self.assertEqual(stats["outcome"], "rate_limited")
+        self.assertEqual(cursor.catchup_sequence_id, 105)
+        # 107 and 108 were already in flight; nothing was sent after them.
+        self.assertNotIn(109, fetched)
+
+    @patch("feed.helpers.r2z2.maybe_notify_capital_kill")
+    @patch("feed.helpers.r2z2.time.sleep")
+    @patch("feed.helpers.r2z2.fetch_sequence_payload")
+    @patch("feed.helpers.r2z2.fetch_latest_sequence", return_value=131)
+    def test_window_of_one_stays_sequential(
+        self, mock_latest, mock_fetch, mock_sleep, mock_ping
+    ):
+        mock_ping.return_value = False
+        mock_fetch.side_effect, _ = self._fetch_by_sequence()
+
+        stats = poll_r2z2_batch(max_seconds=10, pipeline_window=1)
+
+        cursor = FeedR2z2Cursor.get_singleton()
+        self.assertFalse(stats["pipelined"])
+        self.assertEqual(cursor.catchup_sequence_id, 130)
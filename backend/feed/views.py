@@ -0,0 +1,70 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
+
+from feed.live import (
+    FEED_LIVE_KEEPALIVE_SECONDS,
+    FEED_LIVE_REPLAY_LIMIT,
+    broadcaster,
+    dump_message,
+    live_feed_enabled,
+    live_frame,
+    parse_live_cursor,
+    replay_feed_events,
+)
+
+# Client reconnect delay, sent as the SSE ``retry`` field.
+FEED_STREAM_RETRY_MS = 3000
+
+
+async def feed_event_stream(cursor: str | None):
+    async with broadcaster.subscribe() as subscriber:
+        yield f"retry: {FEED_STREAM_RETRY_MS}\n\n"
+        # Subscribed before the replay query, so nothing falls in between;
+        # messages the replay already covered are skipped below.
+        after = None
+        while parse_live_cursor(cursor):
+            # Paged until caught up, so a long gap is never skipped.
+            messages = await sync_to_async(replay_feed_events)(cursor)
+            for message in messages:
+                frame = live_frame(dump_message(message))
+                after = frame.position
+                yield frame.text
+            if len(messages) < FEED_LIVE_REPLAY_LIMIT:
+                break
+            cursor = messages[-1]["cursor"]
+        while True:
+            try:
+                frame = await asyncio.wait_for(
+                    subscriber.queue.get(), FEED_LIVE_KEEPALIVE_SECONDS
+                )
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if frame is None or subscriber.dropped:
+                return
+            if after and frame.position and frame.position <= after:
+                continue
+            yield frame.text
+
+
+async def feed_stream(request):
+    """
+    Server-sent events for the public feed (see feed.live).
+
+    Only served by the ASGI application: under WSGI a stream would hold a
+    worker for as long as the page is open.
+    """
+    if not isinstance(request, ASGIRequest) or not live_feed_enabled():
+        return HttpResponse("Live feed unavailable", status=503)
+    cursor = request.headers.get("Last-Event-ID") or request.GET.get(
+        "last_event_id"
+    )
+    response = StreamingHttpResponse(
+        feed_event_stream(cursor), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
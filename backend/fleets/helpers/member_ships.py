@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Callable, Iterable
+
+from django.utils import timezone
+
+from eveonline.helpers.esi import parse_esi_date
 
 if TYPE_CHECKING:
     from fleets.models import (
@@ -210,7 +214,7 @@ def apply_esi_fleet_member(
     solar_system_name = resolved_ids[solar_system_id]
 
     member_fields = {
-        "join_time": esi_fleet_member["join_time"],
+        "join_time": parse_esi_date(esi_fleet_member["join_time"]),
         "role": esi_fleet_member["role"],
         "role_name": esi_fleet_member["role_name"],
         "ship_type_id": ship_type_id,
@@ -259,3 +263,202 @@ def apply_esi_fleet_member(
         solar_system_name=solar_system_name,
     )
     return member
+
+
+MEMBER_SYNC_FIELDS = (
+    "character_name",
+    "join_time",
+    "role",
+    "role_name",
+    "ship_type_id",
+    "ship_name",
+    "solar_system_id",
+    "solar_system_name",
+    "squad_id",
+    "station_id",
+    "takes_fleet_warp",
+    "wing_id",
+)
+
+
+def resolve_member_names(
+    ids: Iterable[int],
+    known: dict[int, str],
+    resolve: Callable[[list[int]], dict[int, str]],
+) -> dict[int, str]:
+    """Names for ``ids`` from ``known`` (existing member rows), else ``resolve``."""
+    names = {i: known[i] for i in ids if known.get(i)}
+    missing = [i for i in ids if i not in names]
+    if missing:
+        names.update(resolve(missing))
+    return names
+
+
+def _latest_snapshot_ships(members) -> dict[int, int]:
+    """Ship type of each member's most recent snapshot, in one query."""
+    _, ship_snapshot_model = _fleet_models()
+    latest: dict[int, int] = {}
+    for member_id, ship_type_id in (
+        ship_snapshot_model.objects.filter(member__in=members)
+        .order_by("created_at", "pk")
+        .values_list("member_id", "ship_type_id")
+    ):
+        latest[member_id] = ship_type_id
+    return latest
+
+
+def _snapshot(member, ship_type_id, ship_name, system_id, system_name):
+    _, ship_snapshot_model = _fleet_models()
+    return ship_snapshot_model(
+        member=member,
+        ship_type_id=ship_type_id,
+        ship_name=ship_name,
+        solar_system_id=system_id,
+        solar_system_name=system_name,
+    )
+
+
+def _member_fields(esi_member: dict, names: dict[int, str]) -> dict:
+    return {
+        "character_name": names.get(esi_member["character_id"], ""),
+        # ESI responses are JSON-dumped, so this is an ISO string; parsed
+        # so it compares equal to the stored datetime.
+        "join_time": parse_esi_date(esi_member["join_time"]),
+        "role": esi_member["role"],
+        "role_name": esi_member["role_name"],
+        "ship_type_id": esi_member["ship_type_id"],
+        "ship_name": names.get(esi_member["ship_type_id"], ""),
+        "solar_system_id": esi_member["solar_system_id"],
+        "solar_system_name": names.get(esi_member["solar_system_id"], ""),
+        "squad_id": esi_member["squad_id"],
+        "station_id": esi_member["station_id"],
+        "takes_fleet_warp": esi_member["takes_fleet_warp"],
+        "wing_id": esi_member["wing_id"],
+    }
+
+
+def _ship_change_snapshots(
+    member: EveFleetInstanceMember, fields: dict, last_ship: int | None
+) -> list:
+    """Unsaved snapshots record_ship_snapshots_for_change would create."""
+    new_ship = (
+        fields["ship_type_id"],
+        fields["ship_name"],
+        fields["solar_system_id"],
+        fields["solar_system_name"],
+    )
+    if member.ship_type_id == fields["ship_type_id"]:
+        return [_snapshot(member, *new_ship)] if last_ship is None else []
+    snapshots = []
+    if last_ship != member.ship_type_id:
+        snapshots.append(
+            _snapshot(
+                member,
+                member.ship_type_id,
+                member.ship_name,
+                member.solar_system_id,
+                member.solar_system_name,
+            )
+        )
+    snapshots.append(_snapshot(member, *new_ship))
+    return snapshots
+
+
+def sync_esi_fleet_members(
+    fleet_instance: EveFleetInstance,
+    esi_fleet_members: list[dict],
+    resolve: Callable[[list[int]], dict[int, str]],
+) -> dict[str, int]:
+    """
+    Bulk apply_esi_fleet_member for a whole ESI fleet member list.
+
+    Existing members and their latest ship snapshots are loaded once, names
+    come from those rows or ``resolve`` (only for unknown ids), and
+    only new or changed members are written. Ship history follows the same
+    rules as record_initial_ship_snapshot / record_ship_snapshots_for_change.
+    Returns created / updated / unchanged / snapshot counts.
+    """
+    member_model, ship_snapshot_model = _fleet_models()
+    existing: dict[int, EveFleetInstanceMember] = {}
+    for member in member_model.objects.filter(
+        eve_fleet_instance=fleet_instance
+    ).order_by("pk"):
+        existing.setdefault(member.character_id, member)
+
+    known: dict[int, str] = {}
+    for member in existing.values():
+        known[member.character_id] = member.character_name
+        known[member.ship_type_id] = member.ship_name
+        known[member.solar_system_id] = member.solar_system_name
+    ids = {
+        id_
+        for esi_member in esi_fleet_members
+        for id_ in (
+            esi_member["character_id"],
+            esi_member["ship_type_id"],
+            esi_member["solar_system_id"],
+        )
+    }
+    names = resolve_member_names(sorted(ids), known, resolve)
+    latest_ships = _latest_snapshot_ships(list(existing.values()))
+
+    now = timezone.now()
+    created: list[EveFleetInstanceMember] = []
+    updated: list[EveFleetInstanceMember] = []
+    snapshots = []
+    for esi_member in esi_fleet_members:
+        character_id = esi_member["character_id"]
+        fields = _member_fields(esi_member, names)
+        member = existing.get(character_id)
+        if member is None:
+            created.append(
+                member_model(
+                    eve_fleet_instance=fleet_instance,
+                    character_id=character_id,
+                    **fields,
+                )
+            )
+            continue
+
+        snapshots.extend(
+            _ship_change_snapshots(member, fields, latest_ships.get(member.pk))
+        )
+        if any(getattr(member, f) != v for f, v in fields.items()):
+            for field, value in fields.items():
+                setattr(member, field, value)
+            member.updated_at = now
+            updated.append(member)
+
+    if updated:
+        member_model.objects.bulk_update(
+            updated, [*MEMBER_SYNC_FIELDS, "updated_at"], batch_size=500
+        )
+    if created:
+        member_model.objects.bulk_create(created, batch_size=500)
+        # Not every backend returns primary keys from a bulk insert.
+        by_character = {
+            member.character_id: member
+            for member in member_model.objects.filter(
+                eve_fleet_instance=fleet_instance,
+                character_id__in=[m.character_id for m in created],
+            )
+        }
+        for member in created:
+            stored = by_character[member.character_id]
+            snapshots.append(
+                _snapshot(
+                    stored,
+                    stored.ship_type_id,
+                    stored.ship_name,
+                    stored.solar_system_id,
+                    stored.solar_system_name,
+                )
+            )
+    if snapshots:
+        ship_snapshot_model.objects.bulk_create(snapshots, batch_size=500)
+    return {
+        "created": len(created),
+        "updated": len(updated),
+        "unchanged": len(esi_fleet_members) - len(created) - len(updated),
+        "snapshots": len(snapshots),
+    }
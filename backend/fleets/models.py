@@ -10,8 +10,9 @@ from discord.client import DiscordClient
 from eveonline.client import EsiClient
 from eveonline.models import EveCharacter, EveLocation
 from eveonline.helpers.characters import user_primary_character
+from eveonline.universe_names import resolve_universe_name_map
 from fittings.models import EveDoctrine
-from fleets.helpers.member_ships import apply_esi_fleet_member
+from fleets.helpers.member_ships import sync_esi_fleet_members
 from fleets.motd import get_motd
 from fleets.notifications import get_fleet_discord_notification
 
@@ -403,19 +404,18 @@ class EveFleetInstance(models.Model):
             "Fleet member count %d = %d ", self.eve_fleet.id, len(response)
         )
 
-        ids_to_resolve = set()
-        for esi_fleet_member in response:
-            ids_to_resolve.add(esi_fleet_member["character_id"])
-            ids_to_resolve.add(esi_fleet_member["ship_type_id"])
-            ids_to_resolve.add(esi_fleet_member["solar_system_id"])
-        ids_to_resolve = list(ids_to_resolve)
-        resolved_ids = (
-            EsiClient(None).resolve_universe_names(ids_to_resolve).results()
+        stats = sync_esi_fleet_members(
+            self, response, resolve_universe_name_map
+        )
+        logger.info(
+            "Fleet members %d: %d new, %d changed, %d unchanged, "
+            "%d ship snapshot(s)",
+            self.eve_fleet.id,
+            stats["created"],
+            stats["updated"],
+            stats["unchanged"],
+            stats["snapshots"],
         )
-        resolved_ids = {x["id"]: x["name"] for x in resolved_ids}
-
-        for esi_fleet_member in response:
-            apply_esi_fleet_member(self, esi_fleet_member, resolved_ids)
 
         self.last_updated = timezone.now()
         self.save()
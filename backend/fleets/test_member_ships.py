@@ -1,18 +1,20 @@
 """Tests for fleet member ship snapshot history."""
 
 import factory
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 from django.db.models import signals
 from django.utils import timezone
 
 from app.test import TestCase
 from eveonline.client import EsiResponse
+from eveonline.universe_names import clear_universe_name_cache
 from fleets.helpers.member_ships import (
     CAPSULE_TYPE_ID,
     apply_esi_fleet_member,
     effective_fleet_ship,
     record_ship_snapshots_for_change,
+    sync_esi_fleet_members,
 )
 from fleets.models import (
     EveFleet,
@@ -32,7 +34,8 @@ def _esi_member(
 ) -> dict:
     return {
         "character_id": character_id,
-        "join_time": timezone.now(),
+        # As EsiClient returns it (model_dump(mode="json")).
+        "join_time": "2026-10-17T18:30:00Z",
         "role": "squad_member",
         "role_name": "Squad Member",
         "ship_type_id": ship_type_id,
@@ -58,6 +61,8 @@ class FleetMemberShipSnapshotTest(TestCase):
     def setUp(self):
         disconnect_fleet_signals()
         super().setUp()
+        clear_universe_name_cache()
+        self.addCleanup(clear_universe_name_cache)
         self.audience = EveFleetAudience.objects.create(name="Test Audience")
         self.fleet = EveFleet.objects.create(
             audience=self.audience,
@@ -160,9 +165,13 @@ class FleetMemberShipSnapshotTest(TestCase):
         self.assertEqual(ship_name, "Apocalypse Navy Issue")
 
     @factory.django.mute_signals(signals.pre_save, signals.post_save)
+    @patch("eveonline.universe_names.EsiClient")
     @patch("fleets.models.EsiClient")
-    def test_update_fleet_members_records_pod_transition(self, esi_mock):
+    def test_update_fleet_members_records_pod_transition(
+        self, esi_mock, names_esi_mock
+    ):
         esi = esi_mock.return_value
+        names_esi_mock.return_value = esi
         esi.get_fleet_members.return_value = EsiResponse(
             response_code=200,
             data=[_esi_member(12345, CAPSULE_TYPE_ID)],
@@ -191,3 +200,56 @@ class FleetMemberShipSnapshotTest(TestCase):
         ship_type_id, ship_name = effective_fleet_ship(self.member)
         self.assertEqual(ship_type_id, 22468)
         self.assertEqual(ship_name, "Apocalypse Navy Issue")
+
+    @factory.django.mute_signals(signals.pre_save, signals.post_save)
+    def test_sync_writes_only_changed_members(self):
+        resolve = MagicMock(
+            return_value={99999: "Pilot Two", 17740: "Vindicator"}
+        )
+        poll = [
+            _esi_member(12345, 22468),
+            _esi_member(99999, 17740),
+        ]
+
+        stats = sync_esi_fleet_members(self.instance, poll, resolve)
+
+        resolve.assert_called_once_with([17740, 99999])
+        self.assertEqual(1, stats["created"])
+        self.assertEqual(
+            ["Apocalypse Navy Issue", "Vindicator"],
+            sorted(
+                EveFleetInstanceMemberShipSnapshot.objects.values_list(
+                    "ship_name", flat=True
+                )
+            ),
+        )
+
+        # join_time is auto_now_add, so ESI's value lands on the next poll.
+        stats = sync_esi_fleet_members(self.instance, poll, resolve)
+        self.assertEqual(1, stats["updated"])
+
+        # Steady state: names from the stored rows, two reads, no writes.
+        resolve.reset_mock()
+        with self.assertNumQueries(2):
+            stats = sync_esi_fleet_members(self.instance, poll, resolve)
+        resolve.assert_not_called()
+        self.assertEqual(
+            {"created": 0, "updated": 0, "unchanged": 2, "snapshots": 0},
+            stats,
+        )
+
+        # A pod: the member row is updated and the capsule appended.
+        poll[0] = {**poll[0], "ship_type_id": CAPSULE_TYPE_ID}
+        resolve.return_value = {CAPSULE_TYPE_ID: "Capsule"}
+        stats = sync_esi_fleet_members(self.instance, poll, resolve)
+        self.assertEqual(1, stats["updated"])
+        self.assertEqual(
+            ["Apocalypse Navy Issue", "Capsule"],
+            list(
+                EveFleetInstanceMemberShipSnapshot.objects.filter(
+                    member=self.member
+                )
+                .order_by("created_at")
+                .values_list("ship_name", flat=True)
+            ),
+        )
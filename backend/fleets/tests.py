@@ -1036,10 +1036,12 @@ class FleetTaskTests(TestCase):
                 self.assertIn("<:training:999999>", content)
 
     @factory.django.mute_signals(signals.pre_save, signals.post_save)
+    @patch("eveonline.universe_names.EsiClient")
     @patch("fleets.models.EsiClient")
     @patch("fleets.models.discord")
-    def test_fleet_member_update(self, discord, esi):
+    def test_fleet_member_update(self, discord, esi, names_esi):
         esi_mock = esi.return_value
+        names_esi.return_value = esi_mock
 
         fc_id = setup_fc(self.user)
         fleet = make_test_fleet("Test", self.user)
@@ -1122,10 +1124,12 @@ class FleetTaskTests(TestCase):
         self.assertIsNotNone(efi.end_time)
 
     @factory.django.mute_signals(signals.pre_save, signals.post_save)
+    @patch("eveonline.universe_names.EsiClient")
     @patch("fleets.models.EsiClient")
     @patch("fleets.models.discord")
-    def test_update_fleet_instances(self, discord, esi):
+    def test_update_fleet_instances(self, discord, esi, names_esi):
         esi_mock = esi.return_value
+        names_esi.return_value = esi_mock
 
         fc_id = setup_fc(self.user)
         fleet = make_test_fleet("Test", self.user)
@@ -3,6 +3,10 @@ Full manufacture + reaction job tree planner for alliance freeports.
 
 Expands a product (default Typhoon) into explicit jobs with facility ME/TE,
 ME-adjusted materials, TE-adjusted durations, and EIV-based installation costs.
+
+Recipes come from the shared in-memory recipe graph (recipe_graph.py), and
+the names / groups of every type under the root are read in one query per
+plan, so a capital hull plans without per-node ORM round trips.
 """
 
 from __future__ import annotations
@@ -14,13 +18,7 @@ from enum import Enum
 from math import ceil
 from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
-from eveuniverse.models import (
-    EveIndustryActivityDuration,
-    EveIndustryActivityMaterial,
-    EveIndustryActivityProduct,
-    EveMarketPrice,
-    EveType,
-)
+from eveuniverse.models import EveMarketPrice, EveType
 
 from industry.helpers.cost_indices import fetch_system_cost_indices
 from industry.helpers.facility_profiles import (
@@ -38,10 +36,13 @@ from industry.helpers.industry_formulas import (
     required_material_quantity,
     time_efficiency_multiplier,
 )
-from industry.helpers.type_breakdown import (
+from industry.helpers.recipe_graph import (
     ACTIVITY_MANUFACTURING,
     ACTIVITY_REACTION,
-    get_blueprint_or_reaction_type_id,
+    RecipeGraph,
+    TypeInfoMap,
+    load_type_info,
+    recipe_graph,
 )
 
 logger = logging.getLogger(__name__)
@@ -168,85 +169,60 @@ def resolve_product(name_or_id: str) -> EveType:
     raise ValueError(f"Unknown product {text!r}")
 
 
-def _get_recipe(product_type_id: int) -> Optional[Recipe]:
-    product = EveType.objects.filter(id=product_type_id).first()
-    if product is None:
+def _get_recipe(
+    product_type_id: int,
+    graph: Optional[RecipeGraph] = None,
+    types: Optional[TypeInfoMap] = None,
+) -> Optional[Recipe]:
+    graph = graph if graph is not None else recipe_graph()
+    types = types if types is not None else TypeInfoMap()
+    if types[product_type_id] is None:
         return None
-    # Ensures industry activity rows are loaded from SDE when available.
-    get_blueprint_or_reaction_type_id(product)
-
-    products = list(
-        EveIndustryActivityProduct.objects.filter(
-            product_eve_type_id=product_type_id,
-            activity_id__in=(ACTIVITY_MANUFACTURING, ACTIVITY_REACTION),
-        )
-    )
-    if not products:
+    # Loads industry activity rows from the SDE when the graph lacks them.
+    chosen = graph.recipe(product_type_id)
+    if chosen is None:
         return None
-
-    manuf = [p for p in products if p.activity_id == ACTIVITY_MANUFACTURING]
-    chosen = manuf[0] if manuf else products[0]
-
-    duration = (
-        EveIndustryActivityDuration.objects.filter(
-            eve_type_id=chosen.eve_type_id,
-            activity_id=chosen.activity_id,
-        )
-        .values_list("time", flat=True)
-        .first()
-    )
-    if duration is None:
-        duration = 0
-
-    mats = list(
-        EveIndustryActivityMaterial.objects.filter(
-            eve_type_id=chosen.eve_type_id,
-            activity_id=chosen.activity_id,
-        ).select_related("material_eve_type")
-    )
-    materials = [
-        (m.material_eve_type_id, m.material_eve_type.name, m.quantity)
-        for m in mats
-    ]
     return Recipe(
-        blueprint_type_id=chosen.eve_type_id,
+        blueprint_type_id=chosen.blueprint_type_id,
         activity_id=chosen.activity_id,
         product_type_id=product_type_id,
-        product_name=product.name,
-        product_quantity=chosen.quantity or 1,
-        base_time=int(duration),
-        materials=materials,
+        product_name=types.name(product_type_id),
+        product_quantity=chosen.product_quantity,
+        base_time=chosen.base_time,
+        materials=[
+            (mid, types.name(mid), quantity)
+            for mid, quantity in chosen.materials
+        ],
     )
 
 
-def _classify_job_class(recipe: Recipe, root_type_id: int) -> JobClass:
+def _classify_job_class(
+    recipe: Recipe,
+    root_type_id: int,
+    types: Optional[TypeInfoMap] = None,
+) -> JobClass:
     if recipe.activity_id == ACTIVITY_REACTION:
         return JobClass.REACTION
     if recipe.product_type_id == root_type_id:
         return JobClass.SHIP_MANUFACTURING
-    eve_type = (
-        EveType.objects.select_related("eve_group", "eve_group__eve_category")
-        .filter(id=recipe.product_type_id)
-        .first()
-    )
-    if eve_type is not None and eve_type.eve_group is not None:
-        category_id = (
-            eve_type.eve_group.eve_category_id
-            if eve_type.eve_group.eve_category_id
-            else None
-        )
-        if category_id == CATEGORY_SHIP:
-            return JobClass.SHIP_MANUFACTURING
+    types = types if types is not None else TypeInfoMap()
+    info = types[recipe.product_type_id]
+    if info is not None and info.category_id == CATEGORY_SHIP:
+        return JobClass.SHIP_MANUFACTURING
     return JobClass.COMPONENT_MANUFACTURING
 
 
-def _is_advanced_component(type_id: int) -> bool:
-    eve_type = (
-        EveType.objects.filter(id=type_id).select_related("eve_group").first()
-    )
-    if eve_type is None or eve_type.eve_group_id is None:
-        return False
-    return eve_type.eve_group_id == GROUP_CONSTRUCTION_COMPONENTS
+def _is_advanced_component(
+    type_id: int, types: Optional[TypeInfoMap] = None
+) -> bool:
+    types = types if types is not None else TypeInfoMap()
+    info = types[type_id]
+    return info is not None and info.group_id == GROUP_CONSTRUCTION_COMPONENTS
+
+
+def _is_fuel_block(type_id: int, types: TypeInfoMap) -> bool:
+    info = types[type_id]
+    return info is not None and info.group_id == GROUP_FUEL_BLOCK
 
 
 def resolve_cost_indices(
@@ -302,6 +278,7 @@ def _adjusted_prices(type_ids: Iterable[int]) -> Dict[int, float]:
 def _assign_buckets(
     jobs_meta: Dict[int, Tuple[Recipe, int, JobClass]],
     root_type_id: int,
+    types: Optional[TypeInfoMap] = None,
 ) -> Dict[int, JobBucket]:
     """Classify each planned product into Ravworks-style buckets."""
     reaction_ids = {
@@ -326,7 +303,7 @@ def _assign_buckets(
             buckets[pid] = JobBucket.FIRST_STAGE_REACTIONS
         elif pid in second_stage:
             buckets[pid] = JobBucket.SECOND_STAGE_REACTIONS
-        elif _is_advanced_component(pid):
+        elif _is_advanced_component(pid, types):
             buckets[pid] = JobBucket.ADVANCED_COMPONENTS
         else:
             buckets[pid] = JobBucket.OTHER
@@ -349,6 +326,7 @@ def _stabilize_demand(
     profile: Dict[JobClass, FacilityBonuses],
     is_buildable,
     recipe_for,
+    types: Optional[TypeInfoMap] = None,
 ) -> Tuple[Dict[int, int], Dict[int, Tuple[Recipe, int, JobClass]]]:
     """Iterate until run counts stabilize (ME can change upstream demand)."""
     demand: Dict[int, int] = defaultdict(int)
@@ -367,7 +345,7 @@ def _stabilize_demand(
             if recipe is None:
                 continue
             runs = ceil(needed / recipe.product_quantity)
-            job_class = _classify_job_class(recipe, root_id)
+            job_class = _classify_job_class(recipe, root_id, types)
             bonuses = profile[job_class]
             bp_me = (
                 0.0
@@ -472,15 +450,14 @@ def _build_job_plan(
 def _collect_leaf_materials(
     demand: Dict[int, int],
     is_buildable,
+    types: Optional[TypeInfoMap] = None,
 ) -> Dict[int, Tuple[str, int]]:
+    types = types if types is not None else TypeInfoMap()
     leaf_materials: Dict[int, Tuple[str, int]] = {}
     for type_id, qty in demand.items():
         if is_buildable(type_id) or qty <= 0:
             continue
-        name = EveType.objects.filter(id=type_id).values_list(
-            "name", flat=True
-        ).first() or str(type_id)
-        leaf_materials[type_id] = (name, qty)
+        leaf_materials[type_id] = (types.name(type_id), qty)
     return leaf_materials
 
 
@@ -530,20 +507,18 @@ def plan_build(
         )
     )
 
-    fuel_type_ids: Set[int] = set(
-        EveType.objects.filter(eve_group_id=GROUP_FUEL_BLOCK).values_list(
-            "id", flat=True
-        )
-    )
     excluded: Set[int] = {int(tid) for tid in (exclude_type_ids or [])}
     excluded.discard(int(root.id))
     root_id = int(root.id)
 
+    graph = recipe_graph()
+    types = TypeInfoMap(load_type_info(graph.reachable_type_ids([root_id])))
+
     recipe_cache: Dict[int, Optional[Recipe]] = {}
 
     def recipe_for(type_id: int) -> Optional[Recipe]:
         if type_id not in recipe_cache:
-            recipe_cache[type_id] = _get_recipe(type_id)
+            recipe_cache[type_id] = _get_recipe(type_id, graph, types)
         return recipe_cache[type_id]
 
     def is_buildable(type_id: int) -> bool:
@@ -553,8 +528,8 @@ def plan_build(
         # build_fuel_blocks=False only skips intermediate fuel-block inputs.
         if (
             not build_fuel_blocks
-            and type_id in fuel_type_ids
             and type_id != root_id
+            and _is_fuel_block(type_id, types)
         ):
             return False
         return recipe_for(type_id) is not None
@@ -566,8 +541,9 @@ def plan_build(
         profile=profile,
         is_buildable=is_buildable,
         recipe_for=recipe_for,
+        types=types,
     )
-    buckets = _assign_buckets(jobs_meta, root.id)
+    buckets = _assign_buckets(jobs_meta, root.id, types)
 
     all_mat_ids: List[int] = []
     for recipe, _, _ in jobs_meta.values():
@@ -606,7 +582,7 @@ def plan_build(
         reaction_index=reaction_index,
         indices_from_esi=not indices_overridden,
         jobs=job_plans,
-        leaf_materials=_collect_leaf_materials(demand, is_buildable),
+        leaf_materials=_collect_leaf_materials(demand, is_buildable, types),
     )
 
 
@@ -53,6 +53,7 @@ from typing import Dict, List, Optional, Sequence, Tuple
 from eveuniverse.models import EveMarketPrice, EveType, EveTypeMaterial
 
 from industry.helpers.producers import DEFAULT_REFINE_RATE, ORE_BATCH_SIZE
+from industry.helpers.recipe_graph import recipe_graph_load
 from moons.models import ore_yield_map
 
 MINERAL_NAMES = frozenset(
@@ -357,10 +358,11 @@ def marketable_compressed_names(ore_names: Sequence[str]) -> List[str]:
 
 
 def _ensure_type_materials_loaded(eve_type_id: int) -> None:
-    EveType.objects.get_or_create_esi(
-        id=eve_type_id,
-        enabled_sections=[EveType.Section.TYPE_MATERIALS],
-    )
+    with recipe_graph_load():
+        EveType.objects.get_or_create_esi(
+            id=eve_type_id,
+            enabled_sections=[EveType.Section.TYPE_MATERIALS],
+        )
 
 
 def ore_materials_per_portion(ore_name: str) -> Dict[str, float]:
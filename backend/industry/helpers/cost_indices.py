@@ -5,7 +5,7 @@ from __future__ import annotations
 import logging
 from typing import List, Tuple
 
-from django.utils import timezone
+from django.db import transaction
 
 from eveonline.client import (
     _esi_to_python,
@@ -13,7 +13,7 @@ from eveonline.client import (
     esi_provider,
     live_esi_allowed,
 )
-from eveonline.helpers.db_sync import replace_with_bulk_create
+from eveonline.helpers.db_sync import bulk_upsert
 from industry.helpers.facility_profiles import AMAMAKE_SYSTEM_ID
 from industry.models import IndustrySystemCostIndex
 
@@ -62,12 +62,13 @@ def fetch_industry_systems_from_esi() -> List[dict]:
 
 def sync_industry_system_cost_indices() -> int:
     """
-    Pull ESI industry systems and replace the local cost-index cache.
+    Pull ESI industry systems and sync the local cost-index cache.
 
-    Returns the number of systems stored.
+    Only rows whose indices changed are written, so ``updated_at`` tells
+    the LP offer economics rebuild which systems actually moved. Returns
+    the number of systems stored.
     """
     rows = fetch_industry_systems_from_esi()
-    now = timezone.now()
     instances: List[IndustrySystemCostIndex] = []
     for row in rows:
         parsed = _parse_system_indices(row)
@@ -79,16 +80,24 @@ def sync_industry_system_cost_indices() -> int:
                 solar_system_id=system_id,
                 manufacturing=manufacturing,
                 reaction=reaction,
-                updated_at=now,
             )
         )
-    count = replace_with_bulk_create(
-        delete_queryset=IndustrySystemCostIndex.objects.all(),
-        instances=instances,
-    )
+    with transaction.atomic():
+        IndustrySystemCostIndex.objects.exclude(
+            solar_system_id__in=[i.solar_system_id for i in instances]
+        ).delete()
+        result = bulk_upsert(
+            queryset=IndustrySystemCostIndex.objects.all(),
+            instances=instances,
+            key_fields=["solar_system_id"],
+            update_fields=["manufacturing", "reaction"],
+        )
+    count = result.inserted + result.updated + result.unchanged
     logger.info(
-        "Synced industry system cost indices for %s solar system(s)",
+        "Synced industry system cost indices for %s solar system(s), "
+        "%s changed",
         count,
+        result.inserted + result.updated,
     )
     return count
 
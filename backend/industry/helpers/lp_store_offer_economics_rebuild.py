@@ -1,11 +1,27 @@
-"""Rebuild persisted LP store offer economics from local caches (no ESI)."""
+"""
+Rebuild persisted LP store offer economics from local caches (no ESI).
+
+Two modes share the row builder:
+
+- ``rebuild_lp_store_offer_economics`` recomputes every tracked offer and
+  replaces the whole snapshot;
+- ``rebuild_lp_store_offer_economics_incremental`` recomputes only offers
+  whose inputs changed since the last rebuild (see ``_dirty_offer_pks``)
+  and replaces just those rows. It falls back to a full rebuild when no
+  rebuild has run yet or the last full one is older than
+  ``LP_OFFER_ECONOMICS_FULL_REBUILD_HOURS``; the periodic full rebuild
+  also picks up inputs the dirty set does not watch (rolling volume
+  windows, blueprint and product configuration).
+"""
 
 from __future__ import annotations
 
 import logging
-from datetime import datetime
-from typing import List, Optional, Set
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set
 
+from django.db.models import Max, Q
 from django.utils import timezone
 
 from eveonline.helpers.db_sync import replace_with_bulk_create
@@ -17,6 +33,7 @@ from industry.helpers.lp_catalog import (
 )
 from industry.helpers.lp_store_economics import (
     LpStoreOfferEconomics,
+    bpc_type_id_to_product_type_id,
     display_type_name,
     offer_economics_for_queryset,
     offer_is_below_set_lp_price,
@@ -27,14 +44,22 @@ from industry.helpers.lp_store_useless import (
     offer_is_useless,
     peer_stats_by_corporation,
 )
+from industry.helpers.recipe_graph import recipe_graph
 from industry.models import (
+    IndustryLoyaltyPoint,
+    IndustryLpStoreEconomicsCursor,
     IndustryLpStoreOffer,
     IndustryLpStoreOfferEconomics,
     IndustryLpStoreOfferRequiredItem,
+    IndustrySystemCostIndex,
 )
+from market.models import EveMarketItemLocationPrice
+from market.models.history import EveMarketItemHistory
 
 logger = logging.getLogger(__name__)
 
+LP_OFFER_ECONOMICS_FULL_REBUILD_HOURS = 24
+
 
 def _offer_pks_involving_types(type_ids: Set[int]) -> Set[int]:
     if not type_ids:
@@ -102,32 +127,17 @@ def economics_row_from_offer(
     )
 
 
-def rebuild_lp_store_offer_economics() -> int:
-    """
-    Recompute economics for tracked LP store offers and replace the snapshot.
-
-    Uses cached IndustryLpStoreOffer rows plus local Jita/Forge price data —
-    no ESI. Returns the number of snapshot rows written.
-    """
-    corp_ids = tracked_corporation_ids()
-    if not corp_ids:
-        count = replace_with_bulk_create(
-            delete_queryset=IndustryLpStoreOfferEconomics.objects.all(),
-            instances=[],
-        )
-        logger.info("LP offer economics rebuild: no tracked corps, cleared")
-        return count
-
-    offers = list(
-        IndustryLpStoreOffer.objects.filter(corporation_id__in=corp_ids)
-    )
-    economics = offer_economics_for_queryset(offers)
-    peers = peer_stats_by_corporation(economics)
+def _snapshot_rows(
+    offers: Iterable[IndustryLpStoreOffer],
+    economics: Dict[int, LpStoreOfferEconomics],
+    peers: Dict[int, CurrencyPeerStats],
+    rebuilt_at: datetime,
+) -> List[IndustryLpStoreOfferEconomics]:
+    """Snapshot rows for the offers that have economics."""
     tag_pks = _offer_pks_involving_types(set(tag_type_ids()))
     package_pks = _offer_pks_involving_types(set(supply_package_type_ids()))
     chip_pks = _offer_pks_involving_types(set(chip_type_ids()))
     skin_pks = _offer_pks_involving_types(set(skin_type_ids()))
-    now = timezone.now()
 
     rows: List[IndustryLpStoreOfferEconomics] = []
     for offer in offers:
@@ -143,14 +153,71 @@ def rebuild_lp_store_offer_economics() -> int:
                 package_pks=package_pks,
                 chip_pks=chip_pks,
                 skin_pks=skin_pks,
-                rebuilt_at=now,
+                rebuilt_at=rebuilt_at,
             )
         )
+    return rows
+
+
+def _latest_history_pk() -> int:
+    return (
+        EveMarketItemHistory.objects.aggregate(latest=Max("pk"))["latest"] or 0
+    )
+
+
+def _advance_cursor(
+    cursor: IndustryLpStoreEconomicsCursor,
+    *,
+    started_at: datetime,
+    history_pk: int,
+    full: bool,
+) -> None:
+    cursor.last_history_pk = history_pk
+    cursor.last_rebuild_at = started_at
+    update_fields = ["last_history_pk", "last_rebuild_at", "updated_at"]
+    if full:
+        cursor.last_full_rebuild_at = started_at
+        update_fields.append("last_full_rebuild_at")
+    cursor.save(update_fields=update_fields)
+
+
+def rebuild_lp_store_offer_economics() -> int:
+    """
+    Recompute economics for tracked LP store offers and replace the snapshot.
+
+    Uses cached IndustryLpStoreOffer rows plus local Jita/Forge price data —
+    no ESI. Returns the number of snapshot rows written.
+    """
+    cursor = IndustryLpStoreEconomicsCursor.get_singleton()
+    started_at = timezone.now()
+    history_pk = _latest_history_pk()
+
+    corp_ids = tracked_corporation_ids()
+    if not corp_ids:
+        count = replace_with_bulk_create(
+            delete_queryset=IndustryLpStoreOfferEconomics.objects.all(),
+            instances=[],
+        )
+        _advance_cursor(
+            cursor, started_at=started_at, history_pk=history_pk, full=True
+        )
+        logger.info("LP offer economics rebuild: no tracked corps, cleared")
+        return count
+
+    offers = list(
+        IndustryLpStoreOffer.objects.filter(corporation_id__in=corp_ids)
+    )
+    economics = offer_economics_for_queryset(offers)
+    peers = peer_stats_by_corporation(economics)
+    rows = _snapshot_rows(offers, economics, peers, timezone.now())
 
     count = replace_with_bulk_create(
         delete_queryset=IndustryLpStoreOfferEconomics.objects.all(),
         instances=rows,
     )
+    _advance_cursor(
+        cursor, started_at=started_at, history_pk=history_pk, full=True
+    )
     logger.info(
         "LP offer economics rebuild: wrote %s row(s) for %s offer(s)",
         count,
@@ -159,7 +226,204 @@ def rebuild_lp_store_offer_economics() -> int:
     return count
 
 
+def _dirty_offer_pks(
+    offers: Dict[int, IndustryLpStoreOffer],
+    stored: Dict[int, IndustryLpStoreOfferEconomics],
+    *,
+    since: datetime,
+    after_history_pk: int,
+) -> Set[int]:
+    """
+    Offers whose snapshot row is missing or may be out of date.
+
+    - offer rows without a snapshot row or with a newer ``updated_at``;
+    - offers whose output or required-item type got a new Forge history
+      day (rows past ``after_history_pk``; ESI history for closed days
+      does not change) or a baseline location price update since
+      ``since``;
+    - blueprint offers whose product build tree touches such a type;
+    - offers of corporations whose LP currency row changed, plus every
+      blueprint offer (navy BPC costing reads LP rates);
+    - every blueprint offer when system cost indices were refreshed.
+    """
+    dirty = {
+        pk
+        for pk, offer in offers.items()
+        if pk not in stored or stored[pk].offer_updated_at != offer.updated_at
+    }
+
+    changed_type_ids = set(
+        EveMarketItemHistory.objects.filter(
+            pk__gt=after_history_pk
+        ).values_list("item_id", flat=True)
+    ) | set(
+        EveMarketItemLocationPrice.objects.filter(
+            location__price_baseline=True, updated_at__gt=since
+        ).values_list("item_id", flat=True)
+    )
+    dirty |= _offer_pks_involving_types(changed_type_ids) & offers.keys()
+
+    changed_corp_ids = set(
+        IndustryLoyaltyPoint.objects.filter(updated_at__gt=since).values_list(
+            "corporation_id", flat=True
+        )
+    )
+    dirty |= {
+        pk
+        for pk, offer in offers.items()
+        if offer.corporation_id in changed_corp_ids
+    }
+
+    bpc_to_product = bpc_type_id_to_product_type_id()
+    blueprint_pks = {
+        pk for pk, offer in offers.items() if offer.type_id in bpc_to_product
+    }
+    if (
+        changed_corp_ids
+        or IndustrySystemCostIndex.objects.filter(
+            updated_at__gt=since
+        ).exists()
+    ):
+        return dirty | blueprint_pks
+
+    if changed_type_ids:
+        graph = recipe_graph()
+        touched: Dict[int, bool] = {}
+        for pk in blueprint_pks - dirty:
+            product_type_id = bpc_to_product[offers[pk].type_id]
+            if product_type_id not in touched:
+                touched[product_type_id] = not changed_type_ids.isdisjoint(
+                    graph.reachable_type_ids([product_type_id])
+                )
+            if touched[product_type_id]:
+                dirty.add(pk)
+    return dirty
+
+
+def rebuild_lp_store_offer_economics_incremental(
+    *,
+    full_rebuild_hours: Optional[int] = LP_OFFER_ECONOMICS_FULL_REBUILD_HOURS,
+) -> int:
+    """
+    Recompute only offers whose inputs changed and replace just their rows.
+
+    Corporations whose peer median moves as a result get their remaining
+    offers recomputed too, since ``is_useless`` depends on it. Logs a
+    per-phase timing breakdown. Returns the number of rows written.
+    ``full_rebuild_hours=None`` never forces a full rebuild.
+    """
+    cursor = IndustryLpStoreEconomicsCursor.get_singleton()
+    started_at = timezone.now()
+    if cursor.last_rebuild_at is None or (
+        full_rebuild_hours is not None
+        and (
+            cursor.last_full_rebuild_at is None
+            or started_at - cursor.last_full_rebuild_at
+            >= timedelta(hours=full_rebuild_hours)
+        )
+    ):
+        return rebuild_lp_store_offer_economics()
+
+    corp_ids = tracked_corporation_ids()
+    if not corp_ids:
+        return rebuild_lp_store_offer_economics()
+
+    timings: Dict[str, float] = {}
+    clock = time.perf_counter()
+
+    def lap(phase: str) -> None:
+        nonlocal clock
+        now = time.perf_counter()
+        timings[phase] = timings.get(phase, 0.0) + now - clock
+        clock = now
+
+    history_pk = _latest_history_pk()
+    offers = {
+        offer.pk: offer
+        for offer in IndustryLpStoreOffer.objects.filter(
+            corporation_id__in=corp_ids
+        )
+    }
+    stored = {
+        row.offer_id: row
+        for row in IndustryLpStoreOfferEconomics.objects.filter(
+            offer_id__in=list(offers)
+        )
+    }
+    dirty = _dirty_offer_pks(
+        offers,
+        stored,
+        since=cursor.last_rebuild_at,
+        after_history_pk=cursor.last_history_pk,
+    )
+    lap("detect")
+
+    economics = offer_economics_for_queryset(offers[pk] for pk in dirty)
+    lap("economics")
+
+    old_peers = peer_stats_by_corporation(stored)
+    merged = {pk: row for pk, row in stored.items() if pk not in dirty}
+    merged.update(economics)
+    peers = peer_stats_by_corporation(merged)
+    shifted_corp_ids = {
+        corp_id
+        for corp_id in old_peers.keys() | peers.keys()
+        if old_peers.get(corp_id) != peers.get(corp_id)
+    }
+    lap("peers")
+    if shifted_corp_ids:
+        # is_useless compares each offer to its corporation's peer median,
+        # so the rest of those corporations is recomputed with the new one.
+        extra = {
+            pk
+            for pk, offer in offers.items()
+            if pk not in dirty and offer.corporation_id in shifted_corp_ids
+        }
+        economics.update(
+            offer_economics_for_queryset(offers[pk] for pk in extra)
+        )
+        dirty |= extra
+        lap("economics")
+        merged.update(economics)
+        peers = peer_stats_by_corporation(merged)
+        lap("peers")
+
+    rows = _snapshot_rows(
+        (offers[pk] for pk in sorted(dirty)),
+        economics,
+        peers,
+        timezone.now(),
+    )
+    lap("rows")
+
+    count = replace_with_bulk_create(
+        delete_queryset=IndustryLpStoreOfferEconomics.objects.filter(
+            Q(offer_id__in=dirty) | ~Q(corporation_id__in=corp_ids)
+        ),
+        instances=rows,
+    )
+    _advance_cursor(
+        cursor, started_at=started_at, history_pk=history_pk, full=False
+    )
+    lap("write")
+    logger.info(
+        "LP offer economics incremental rebuild: wrote %s row(s) for %s "
+        "of %s offer(s), %s corp(s) re-peered; %s",
+        count,
+        len(dirty),
+        len(offers),
+        len(shifted_corp_ids),
+        " ".join(
+            f"{phase}={seconds * 1000:.0f}ms"
+            for phase, seconds in timings.items()
+        ),
+    )
+    return count
+
+
 __all__ = [
+    "LP_OFFER_ECONOMICS_FULL_REBUILD_HOURS",
     "economics_row_from_offer",
     "rebuild_lp_store_offer_economics",
+    "rebuild_lp_store_offer_economics_incremental",
 ]
@@ -0,0 +1,396 @@
+"""
+Process-level cache of the SDE manufacturing / reaction recipe graph.
+
+plan_build, break_down_type and plan_costing walk the same blueprint data
+for every plan, LP offer and breakdown. Instead of several ORM queries per
+node, RecipeGraph loads every manufacturing and reaction recipe
+(EveIndustryActivityProduct / Material / Duration) and every
+EveTypeMaterial row in a few bulk queries, and keeps the result for the
+life of the process.
+
+The graph is versioned through the Django cache: writes to those SDE
+tables (eveuniverse's SDE load or an on-demand blueprint fetch) bump
+RECIPE_GRAPH_VERSION_KEY, and each process reloads on its next
+``recipe_graph()`` call. eveuniverse writes one row at a time, in its own
+transaction, so a load can bump the version once per row. Inside a
+``recipe_graph_load()`` block or an outer transaction the bumps are
+collected into one; otherwise other processes keep their graph until the
+version has been still for RECIPE_GRAPH_SETTLE_SECONDS and then reload
+once. Products the graph does not know are still loaded on demand from
+the SDE, one at a time, and added to the current graph.
+Type names and groups are not cached here; see TypeInfoMap.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from django.core.cache import cache
+from django.db import transaction
+from eveuniverse.models import (
+    EveIndustryActivityDuration,
+    EveIndustryActivityMaterial,
+    EveIndustryActivityProduct,
+    EveType,
+    EveTypeMaterial,
+)
+
+logger = logging.getLogger(__name__)
+
+ACTIVITY_MANUFACTURING = 1
+ACTIVITY_REACTION = 11
+RECIPE_ACTIVITIES = (ACTIVITY_MANUFACTURING, ACTIVITY_REACTION)
+
+RECIPE_GRAPH_VERSION_KEY = "industry:recipe_graph:version"
+RECIPE_GRAPH_BUMPED_AT_KEY = "industry:recipe_graph:bumped_at"
+# Quiet time after the last bump before other processes reload.
+RECIPE_GRAPH_SETTLE_SECONDS = 30
+# Keep the version for as long as any process might hold a graph.
+RECIPE_GRAPH_VERSION_TTL = 60 * 60 * 24 * 30
+_TYPE_INFO_CHUNK = 2000
+
+
+@dataclass(frozen=True)
+class GraphRecipe:
+    """The blueprint or reaction chosen to make one product."""
+
+    blueprint_type_id: int
+    activity_id: int
+    product_type_id: int
+    product_quantity: int
+    base_time: int
+    # (material type_id, quantity per run)
+    materials: Tuple[Tuple[int, int], ...]
+
+
+@dataclass(frozen=True)
+class TypeInfo:
+    name: str
+    group_id: Optional[int]
+    category_id: Optional[int]
+
+
+def _preferred(current: Optional[tuple], candidate: tuple) -> tuple:
+    """Manufacturing beats reaction; then the lowest blueprint id wins."""
+    if current is None:
+        return candidate
+    rank = (candidate[1] != ACTIVITY_MANUFACTURING, candidate[0])
+    if rank < (current[1] != ACTIVITY_MANUFACTURING, current[0]):
+        return candidate
+    return current
+
+
+def load_type_info(type_ids: Iterable[int]) -> Dict[int, TypeInfo]:
+    """Name, group and category for many types in chunked queries."""
+    ids = sorted(set(type_ids))
+    infos: Dict[int, TypeInfo] = {}
+    for start in range(0, len(ids), _TYPE_INFO_CHUNK):
+        for type_id, name, group_id, category_id in EveType.objects.filter(
+            id__in=ids[start : start + _TYPE_INFO_CHUNK]
+        ).values_list(
+            "id", "name", "eve_group_id", "eve_group__eve_category_id"
+        ):
+            infos[type_id] = TypeInfo(name, group_id, category_id)
+    return infos
+
+
+class TypeInfoMap(dict):
+    """``{type_id: TypeInfo | None}`` that loads unknown ids on access.
+
+    Type names and groups are not part of the cached graph (EveType rows
+    change far more often than recipes); a planner preloads the types it
+    will touch with one query and falls back to single lookups for any it
+    missed.
+    """
+
+    def __missing__(self, type_id: int) -> Optional[TypeInfo]:
+        info = load_type_info([type_id]).get(type_id)
+        self[type_id] = info
+        return info
+
+    def name(self, type_id: int) -> str:
+        info = self[type_id]
+        return info.name if info is not None else str(type_id)
+
+
+class RecipeGraph:
+    """Recipe lookups by product type_id plus on-demand additions."""
+
+    def __init__(
+        self,
+        version,
+        recipes: Dict[int, GraphRecipe],
+        type_materials: Dict[int, Tuple[Tuple[int, int], ...]],
+    ):
+        self.version = version
+        self._recipes = recipes
+        self._type_materials = type_materials
+        self._checked: Set[int] = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, version=None) -> RecipeGraph:
+        chosen: Dict[int, tuple] = {}
+        for (
+            blueprint_id,
+            activity_id,
+            product_id,
+            quantity,
+        ) in EveIndustryActivityProduct.objects.filter(
+            activity_id__in=RECIPE_ACTIVITIES
+        ).values_list(
+            "eve_type_id", "activity_id", "product_eve_type_id", "quantity"
+        ):
+            chosen[product_id] = _preferred(
+                chosen.get(product_id),
+                (blueprint_id, activity_id, quantity or 1),
+            )
+
+        durations = {
+            (blueprint_id, activity_id): time
+            for blueprint_id, activity_id, time in (
+                EveIndustryActivityDuration.objects.filter(
+                    activity_id__in=RECIPE_ACTIVITIES
+                ).values_list("eve_type_id", "activity_id", "time")
+            )
+        }
+        materials: Dict[Tuple[int, int], list] = defaultdict(list)
+        for blueprint_id, activity_id, material_id, quantity in (
+            EveIndustryActivityMaterial.objects.filter(
+                activity_id__in=RECIPE_ACTIVITIES
+            )
+            .order_by("id")
+            .values_list(
+                "eve_type_id",
+                "activity_id",
+                "material_eve_type_id",
+                "quantity",
+            )
+        ):
+            materials[(blueprint_id, activity_id)].append(
+                (material_id, quantity)
+            )
+
+        recipes = {
+            product_id: GraphRecipe(
+                blueprint_type_id=blueprint_id,
+                activity_id=activity_id,
+                product_type_id=product_id,
+                product_quantity=quantity,
+                base_time=int(durations.get((blueprint_id, activity_id)) or 0),
+                materials=tuple(
+                    materials.get((blueprint_id, activity_id), ())
+                ),
+            )
+            for product_id, (blueprint_id, activity_id, quantity) in (
+                chosen.items()
+            )
+        }
+
+        type_materials: Dict[int, list] = defaultdict(list)
+        for type_id, material_id, quantity in EveTypeMaterial.objects.order_by(
+            "id"
+        ).values_list("eve_type_id", "material_eve_type_id", "quantity"):
+            type_materials[type_id].append((material_id, quantity))
+
+        return cls(
+            version,
+            recipes,
+            {tid: tuple(rows) for tid, rows in type_materials.items()},
+        )
+
+    def __len__(self) -> int:
+        return len(self._recipes)
+
+    def recipe(
+        self, type_id: int, *, load_missing: bool = True
+    ) -> Optional[GraphRecipe]:
+        """
+        Recipe producing ``type_id``, or None for raw materials.
+
+        A product missing from the graph is looked up once per graph via
+        the SDE (which may fetch its blueprint from ESI) and kept.
+        """
+        recipe = self._recipes.get(type_id)
+        if recipe is not None or not load_missing:
+            return recipe
+        with self._lock:
+            if type_id in self._checked:
+                return self._recipes.get(type_id)
+            self._checked.add(type_id)
+        return self._load_missing_recipe(type_id)
+
+    def type_materials(self, type_id: int) -> Tuple[Tuple[int, int], ...]:
+        """EveTypeMaterial rows (reprocessing output) for ``type_id``."""
+        return self._type_materials.get(type_id, ())
+
+    def reachable_type_ids(
+        self,
+        root_type_ids: Iterable[int],
+        *,
+        include_type_materials: bool = False,
+    ) -> Set[int]:
+        """Every type in the recipe trees under the roots, roots included.
+
+        Walks the in-memory graph only; products not loaded yet are not
+        fetched.
+        """
+        seen: Set[int] = set()
+        stack = list(root_type_ids)
+        while stack:
+            type_id = stack.pop()
+            if type_id in seen:
+                continue
+            seen.add(type_id)
+            recipe = self._recipes.get(type_id)
+            if recipe is not None:
+                stack.extend(mid for mid, _ in recipe.materials)
+            elif include_type_materials:
+                stack.extend(mid for mid, _ in self.type_materials(type_id))
+        return seen
+
+    def _load_missing_recipe(self, type_id: int) -> Optional[GraphRecipe]:
+        # pylint: disable=import-outside-toplevel
+        from industry.helpers.type_breakdown import (
+            _ensure_industry_data_loaded_for_product,
+        )
+
+        product = EveType.objects.filter(id=type_id).first()
+        if product is None:
+            return None
+        _ensure_industry_data_loaded_for_product(product)
+
+        chosen = None
+        for (
+            blueprint_id,
+            activity_id,
+            quantity,
+        ) in EveIndustryActivityProduct.objects.filter(
+            product_eve_type_id=type_id,
+            activity_id__in=RECIPE_ACTIVITIES,
+        ).values_list(
+            "eve_type_id", "activity_id", "quantity"
+        ):
+            chosen = _preferred(
+                chosen, (blueprint_id, activity_id, quantity or 1)
+            )
+        if chosen is None:
+            return None
+
+        blueprint_id, activity_id, quantity = chosen
+        base_time = (
+            EveIndustryActivityDuration.objects.filter(
+                eve_type_id=blueprint_id, activity_id=activity_id
+            )
+            .values_list("time", flat=True)
+            .first()
+        )
+        recipe = GraphRecipe(
+            blueprint_type_id=blueprint_id,
+            activity_id=activity_id,
+            product_type_id=type_id,
+            product_quantity=quantity,
+            base_time=int(base_time or 0),
+            materials=tuple(
+                EveIndustryActivityMaterial.objects.filter(
+                    eve_type_id=blueprint_id, activity_id=activity_id
+                )
+                .order_by("id")
+                .values_list("material_eve_type_id", "quantity")
+            ),
+        )
+        with self._lock:
+            self._recipes[type_id] = recipe
+        return recipe
+
+
+_graph_lock = threading.Lock()
+_graph: Optional[RecipeGraph] = None
+
+
+def recipe_graph() -> RecipeGraph:
+    """
+    The process-wide recipe graph, reloaded when the SDE version moves.
+
+    Costs one cache read per call; hold on to the result for the length
+    of one plan or breakdown.
+    """
+    global _graph  # pylint: disable=global-statement
+    values = cache.get_many(
+        [RECIPE_GRAPH_VERSION_KEY, RECIPE_GRAPH_BUMPED_AT_KEY]
+    )
+    version = values.get(RECIPE_GRAPH_VERSION_KEY)
+    graph = _graph
+    if graph is not None and graph.version == version:
+        return graph
+    bumped_at = values.get(RECIPE_GRAPH_BUMPED_AT_KEY) or 0.0
+    if (
+        graph is not None
+        and time.time() - bumped_at < RECIPE_GRAPH_SETTLE_SECONDS
+    ):
+        # An SDE load may still be writing rows; reload once it settles.
+        return graph
+    with _graph_lock:
+        if _graph is None or _graph.version != version:
+            _graph = RecipeGraph.load(version)
+            logger.info(
+                "Loaded recipe graph version=%s recipes=%s",
+                version,
+                len(_graph),
+            )
+        return _graph
+
+
+def invalidate_recipe_graph() -> None:
+    """Bump the graph version so every process reloads on next use."""
+    global _graph  # pylint: disable=global-statement
+    try:
+        cache.incr(RECIPE_GRAPH_VERSION_KEY)
+    except ValueError:
+        cache.set(RECIPE_GRAPH_VERSION_KEY, 1, RECIPE_GRAPH_VERSION_TTL)
+    cache.set(
+        RECIPE_GRAPH_BUMPED_AT_KEY, time.time(), RECIPE_GRAPH_VERSION_TTL
+    )
+    _graph = None
+
+
+_load = threading.local()
+
+
+def schedule_recipe_graph_invalidation() -> None:
+    """
+    Invalidate the graph for an SDE row write: once at the end of the
+    enclosing ``recipe_graph_load()`` block, else once the transaction
+    commits. This process drops its graph right away.
+    """
+    global _graph  # pylint: disable=global-statement
+    _graph = None
+    if getattr(_load, "depth", 0):
+        _load.dirty = True
+        return
+    connection = transaction.get_connection()
+    if any(
+        callback is invalidate_recipe_graph
+        for _, callback, _ in connection.run_on_commit
+    ):
+        return
+    transaction.on_commit(invalidate_recipe_graph)
+
+
+@contextmanager
+def recipe_graph_load():
+    """Collect the graph invalidations of an SDE load into one bump."""
+    _load.depth = getattr(_load, "depth", 0) + 1
+    try:
+        yield
+    finally:
+        _load.depth -= 1
+        if not _load.depth and getattr(_load, "dirty", False):
+            _load.dirty = False
+            schedule_recipe_graph_invalidation()
@@ -5,8 +5,9 @@ Components come from: EveTypeMaterial (e.g. reprocessing), blueprint
 manufacturing (activity_id=1), or reactions (activity_id=11). Components
 that are themselves built from blueprints/reactions are expanded recursively.
 
-Blueprint/reaction data is loaded from the SDE on demand when breaking down
-a product type (e.g. a ship).
+Recipes are read from the process-level recipe graph (recipe_graph.py);
+blueprint/reaction data the graph lacks is loaded from the SDE on demand
+when breaking down a product type (e.g. a ship).
 
 IndustryProduct.breakdown stores the full tree (all the way to leaves) so
 callers can traverse to any depth; use get_breakdown_for_industry_product()
@@ -25,18 +26,17 @@ import copy
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Set, Tuple
 
-from eveuniverse.models import (
-    EveIndustryActivityMaterial,
-    EveIndustryActivityProduct,
-    EveType,
-    EveTypeMaterial,
-)
+from eveuniverse.models import EveIndustryActivityProduct, EveType
 
+from industry.helpers.recipe_graph import (
+    ACTIVITY_MANUFACTURING,
+    ACTIVITY_REACTION,
+    RecipeGraph,
+    recipe_graph,
+    recipe_graph_load,
+)
 from industry.models import IndustryOrder, IndustryProduct, Strategy
 
-ACTIVITY_MANUFACTURING = 1
-ACTIVITY_REACTION = 11
-
 # Strategy.PRODUCED = we build it; expand to direct components (all import unless they are also produced).
 
 # Cap recursion depth to avoid stack overflow and long-running requests (e.g. gunicorn worker exit).
@@ -71,10 +71,11 @@ def _ensure_industry_data_loaded_for_product(
                     continue
             except (TypeError, ValueError):
                 continue
-            EveType.objects.get_or_create_esi(
-                id=blueprint_type_id,
-                enabled_sections=[EveType.Section.INDUSTRY_ACTIVITIES],
-            )
+            with recipe_graph_load():
+                EveType.objects.get_or_create_esi(
+                    id=blueprint_type_id,
+                    enabled_sections=[EveType.Section.INDUSTRY_ACTIVITIES],
+                )
             return
 
 
@@ -98,24 +99,24 @@ def _get_blueprint_or_reaction_materials(
     """Return (blueprint_type, activity_id, source_label, product_quantity) or None.
     product_quantity is output units per run (1 for manufacturing, often >1 for reactions).
     """
-    _ensure_industry_data_loaded_for_product(product_eve_type)
-    products = EveIndustryActivityProduct.objects.filter(
-        product_eve_type_id=product_eve_type.id,
-        activity_id__in=(ACTIVITY_MANUFACTURING, ACTIVITY_REACTION),
-    ).select_related("eve_type", "activity")
-
-    for prod in products:
-        product_qty = prod.quantity or 1
-        if prod.activity_id == ACTIVITY_MANUFACTURING:
-            return (
-                prod.eve_type,
-                ACTIVITY_MANUFACTURING,
-                "blueprint",
-                product_qty,
-            )
-        if prod.activity_id == ACTIVITY_REACTION:
-            return (prod.eve_type, ACTIVITY_REACTION, "reaction", product_qty)
-    return None
+    recipe = recipe_graph().recipe(product_eve_type.id)
+    if recipe is None:
+        return None
+    blueprint_type = EveType.objects.filter(
+        id=recipe.blueprint_type_id
+    ).first()
+    if blueprint_type is None:
+        return None
+    return (
+        blueprint_type,
+        recipe.activity_id,
+        _source_label(recipe.activity_id),
+        recipe.product_quantity,
+    )
+
+
+def _source_label(activity_id: int) -> str:
+    return "reaction" if activity_id == ACTIVITY_REACTION else "blueprint"
 
 
 def get_blueprint_or_reaction_type_id(eve_type: EveType) -> Optional[int]:
@@ -123,8 +124,34 @@ def get_blueprint_or_reaction_type_id(eve_type: EveType) -> Optional[int]:
     Return the Eve type ID of the blueprint or reaction that produces this type,
     or None if this type has no manufacturing/reaction recipe (e.g. ore, mineral).
     """
-    result = _get_blueprint_or_reaction_materials(eve_type)
-    return result[0].id if result else None
+    recipe = recipe_graph().recipe(eve_type.id)
+    return recipe.blueprint_type_id if recipe else None
+
+
+def _component_rows(
+    graph: RecipeGraph, type_id: int
+) -> Tuple[Tuple[Tuple[int, int], ...], str, int]:
+    """((material_type_id, quantity_per_run), ...), source, product_quantity)."""
+    recipe = graph.recipe(type_id)
+    if recipe is not None:
+        return (
+            recipe.materials,
+            _source_label(recipe.activity_id),
+            recipe.product_quantity,
+        )
+    return graph.type_materials(type_id), "type_material", 1
+
+
+def _has_breakdown(graph: RecipeGraph, type_id: int) -> bool:
+    return graph.recipe(type_id) is not None or bool(
+        graph.type_materials(type_id)
+    )
+
+
+def _runs(quantity: int, product_qty: int) -> int:
+    if not product_qty:
+        return quantity
+    return (quantity + product_qty - 1) // product_qty
 
 
 def _get_direct_components(
@@ -133,28 +160,18 @@ def _get_direct_components(
     """Direct components as (EveType, quantity_per_run, source, product_quantity).
     product_quantity: output units per run for this recipe (1 for manufacturing/type_material).
     """
-    result: List[Tuple[EveType, int, str, int]] = []
-
-    blueprint_or_reaction = _get_blueprint_or_reaction_materials(eve_type)
-    if blueprint_or_reaction is not None:
-        source_type, activity_id, source_label, product_qty = (
-            blueprint_or_reaction
-        )
-        materials = EveIndustryActivityMaterial.objects.filter(
-            eve_type_id=source_type.id,
-            activity_id=activity_id,
-        ).select_related("material_eve_type")
-        for m in materials:
-            result.append(
-                (m.material_eve_type, m.quantity, source_label, product_qty)
-            )
-        return result
+    rows, source_label, product_qty = _component_rows(
+        recipe_graph(), eve_type.id
+    )
+    if not rows:
+        return []
 
-    for m in EveTypeMaterial.objects.filter(
-        eve_type_id=eve_type.id
-    ).select_related("material_eve_type"):
-        result.append((m.material_eve_type, m.quantity, "type_material", 1))
-    return result
+    material_types = EveType.objects.in_bulk([mid for mid, _ in rows])
+    return [
+        (material_types[mid], quantity, source_label, product_qty)
+        for mid, quantity in rows
+        if mid in material_types
+    ]
 
 
 def get_direct_components(
@@ -171,17 +188,10 @@ def get_direct_components(
     raw = _get_direct_components(eve_type)
     if not raw:
         return []
-    out: List[Tuple[EveType, int]] = []
-    for item in raw:
-        material_type, q_per_run, product_qty = item[0], item[1], item[3]
-        runs = (
-            ((quantity + product_qty - 1) // product_qty)
-            if product_qty
-            else quantity
-        )
-        total_q = q_per_run * runs
-        out.append((material_type, total_q))
-    return out
+    return [
+        (material_type, q_per_run * _runs(quantity, product_qty))
+        for material_type, q_per_run, _, product_qty in raw
+    ]
 
 
 def break_down_type(
@@ -191,76 +201,67 @@ def break_down_type(
     visited: Optional[Set[int]] = None,
     max_depth: Optional[int] = None,
 ) -> ComponentNode:
-    """Recursively break down a type into a tree of ComponentNodes."""
-    if visited is None:
-        visited = set()
-
-    direct = _get_direct_components(eve_type)
-    if not direct:
-        return ComponentNode(
-            eve_type=eve_type,
-            quantity=quantity,
-            source="raw",
-            depth=depth,
-            children=[],
-        )
-
-    stop_deeper = max_depth is not None and depth >= max_depth
-    children: List[ComponentNode] = []
-    seen = visited | {eve_type.id}
-
-    for material_type, q_per_run, source, product_qty in direct:
-        runs = (
-            ((quantity + product_qty - 1) // product_qty)
-            if product_qty
-            else quantity
-        )
-        total_q = q_per_run * runs
-        if stop_deeper or material_type.id in seen:
-            children.append(
-                ComponentNode(
-                    eve_type=material_type,
-                    quantity=total_q,
-                    source=source,
-                    depth=depth + 1,
-                    children=[],
-                )
-            )
-            continue
-        child_has_breakdown = (
-            _get_blueprint_or_reaction_materials(material_type) is not None
-            or EveTypeMaterial.objects.filter(eve_type=material_type).exists()
-        )
-        if child_has_breakdown:
-            child_node = break_down_type(
-                material_type,
-                quantity=total_q,
-                depth=depth + 1,
-                visited=seen | {material_type.id},
-                max_depth=max_depth,
-            )
-            child_node.source = source
-            child_node.quantity = total_q
-            children.append(child_node)
-        else:
-            children.append(
-                ComponentNode(
-                    eve_type=material_type,
-                    quantity=total_q,
-                    source=source,
-                    depth=depth + 1,
-                    children=[],
-                )
-            )
-        seen = seen | {material_type.id}
+    """
+    Break down a type into a tree of ComponentNodes, one tree level at a time.
 
-    return ComponentNode(
+    Recipes come from the recipe graph, so the walk costs one EveType query
+    per tree level (for the material types first seen on that level), plus a
+    one-off SDE lookup for any product the graph has not loaded yet. A type
+    already on the path from the root (or earlier among its siblings) is kept
+    as a leaf to break cycles.
+    """
+    graph = recipe_graph()
+    types: Dict[int, EveType] = {eve_type.id: eve_type}
+    root = ComponentNode(
         eve_type=eve_type,
         quantity=quantity,
         source="raw" if depth == 0 else "composite",
         depth=depth,
-        children=children,
     )
+    level: List[Tuple[ComponentNode, Set[int]]] = [
+        (root, (visited or set()) | {eve_type.id})
+    ]
+
+    while level:
+        rows_by_node = [
+            _component_rows(graph, node.eve_type.id) for node, _ in level
+        ]
+        missing = {
+            mid
+            for rows, _, _ in rows_by_node
+            for mid, _ in rows
+            if mid not in types
+        }
+        if missing:
+            types.update(EveType.objects.in_bulk(missing))
+
+        next_level: List[Tuple[ComponentNode, Set[int]]] = []
+        for (node, seen), (rows, source, product_qty) in zip(
+            level, rows_by_node
+        ):
+            rows = [(mid, q) for mid, q in rows if mid in types]
+            if not rows:
+                if node is root:
+                    node.source = "raw"
+                continue
+            stop_deeper = max_depth is not None and node.depth >= max_depth
+            runs = _runs(node.quantity, product_qty)
+            for mid, q_per_run in rows:
+                child = ComponentNode(
+                    eve_type=types[mid],
+                    quantity=q_per_run * runs,
+                    source=source,
+                    depth=node.depth + 1,
+                )
+                node.children.append(child)
+                if stop_deeper or mid in seen:
+                    continue
+                if _has_breakdown(graph, mid):
+                    next_level.append((child, seen | {mid}))
+                seen = seen | {mid}
+        level = next_level
+
+    return root
 
 
 def flatten_components(node: ComponentNode) -> Dict[int, int]:
@@ -376,6 +377,8 @@ def get_full_nested_breakdown(eve_type: EveType) -> Dict[str, Any]:
     """
     Compute the full breakdown tree (no depth limit) as a nested dict.
     Used when storing on IndustryProduct so the stored tree goes all the way down.
+    Costs one EveType query per tree level (see break_down_type), not one
+    per node.
     """
     tree = break_down_type(
         eve_type,
@@ -500,44 +503,54 @@ def enrich_breakdown_with_industry_product_ids(
     return data
 
 
+def _produced_type_ids() -> Set[int]:
+    return set(
+        IndustryProduct.objects.filter(strategy=Strategy.PRODUCED).values_list(
+            "eve_type_id", flat=True
+        )
+    )
+
+
+def _direct_component_quantities(
+    graph: RecipeGraph, type_id: int, quantity: int
+) -> List[Tuple[int, int]]:
+    rows, _, product_qty = _component_rows(graph, type_id)
+    runs = _runs(quantity, product_qty)
+    return [(mid, q_per_run * runs) for mid, q_per_run in rows]
+
+
 def _resolve_product_to_imports_impl(
-    eve_type: EveType,
+    type_id: int,
     quantity: int,
     agg: Dict[int, int],
     visited: Set[int],
+    produced: Set[int],
+    graph: RecipeGraph,
 ) -> None:
     """
-    Resolve one product (eve_type, quantity) into a flat type_id -> quantity
+    Resolve one product (type_id, quantity) into a flat type_id -> quantity
     map of imports. Mutates agg. BUILD/INTEGRATED: expand to direct components
     (each import unless its strategy is also BUILD/INTEGRATED). IMPORT/EXPORT
-    or no product: add (eve_type.id, quantity) to agg. Uses visited to break
-    cycles.
+    or no product: add (type_id, quantity) to agg. Uses visited to break
+    cycles. ``produced`` is the preloaded set of PRODUCED type ids, so the
+    walk itself runs no queries.
     """
-    if eve_type.id in visited:
-        agg[eve_type.id] = agg.get(eve_type.id, 0) + quantity
-        return
-    product = IndustryProduct.objects.filter(eve_type=eve_type).first()
-    if not product or product.strategy != Strategy.PRODUCED:
-        agg[eve_type.id] = agg.get(eve_type.id, 0) + quantity
+    if type_id in visited or type_id not in produced:
+        agg[type_id] = agg.get(type_id, 0) + quantity
         return
-    visited.add(eve_type.id)
+    visited.add(type_id)
     try:
-        for comp_type, comp_qty in get_direct_components(eve_type, quantity):
-            comp_product = IndustryProduct.objects.filter(
-                eve_type=comp_type
-            ).first()
-            if (
-                comp_product
-                and comp_product.strategy == Strategy.PRODUCED
-                and comp_type.id not in visited
-            ):
+        for comp_id, comp_qty in _direct_component_quantities(
+            graph, type_id, quantity
+        ):
+            if comp_id in produced and comp_id not in visited:
                 _resolve_product_to_imports_impl(
-                    comp_type, comp_qty, agg, visited
+                    comp_id, comp_qty, agg, visited, produced, graph
                 )
             else:
-                agg[comp_type.id] = agg.get(comp_type.id, 0) + comp_qty
+                agg[comp_id] = agg.get(comp_id, 0) + comp_qty
     finally:
-        visited.discard(eve_type.id)
+        visited.discard(type_id)
 
 
 def resolve_product_to_imports(
@@ -549,9 +562,14 @@ def resolve_product_to_imports(
     total quantity that must be imported. Respects industry product flow:
     Import → leaf; Build → expand to direct components (import unless they are
     Build, then recurse).
+
+    Query budget: one query for the produced product ids, plus a one-off SDE
+    lookup for any product the recipe graph has not loaded yet.
     """
     agg: Dict[int, int] = {}
-    _resolve_product_to_imports_impl(eve_type, quantity, agg, set())
+    _resolve_product_to_imports_impl(
+        eve_type.id, quantity, agg, set(), _produced_type_ids(), recipe_graph()
+    )
     return agg
 
 
@@ -560,20 +578,30 @@ def resolve_order_to_imports(order: IndustryOrder) -> Dict[int, int]:
     Resolve a full order to a flat map of type_id -> total quantity that must
     be imported. Aggregates over all order items using the industry product
     flow (Import = leaf, Build = expand to direct components, then recurse).
+
+    Query budget: two queries (order items, produced product ids) however
+    deep the trees are, plus one-off SDE lookups for products the recipe
+    graph has not loaded yet.
     """
     agg: Dict[int, int] = {}
-    for item in order.items.select_related("eve_type"):
+    produced = _produced_type_ids()
+    graph = recipe_graph()
+    for type_id, quantity in order.items.values_list(
+        "eve_type_id", "quantity"
+    ):
         _resolve_product_to_imports_impl(
-            item.eve_type, item.quantity, agg, set()
+            type_id, quantity, agg, set(), produced, graph
         )
     return agg
 
 
 def _resolve_type_to_demand_import_leaves_impl(
-    eve_type: EveType,
+    type_id: int,
     quantity: int,
     agg: Dict[int, int],
     visited: Set[int],
+    produced: Set[int],
+    graph: RecipeGraph,
 ) -> None:
     """
     Resolve import leaves for supply-chain demand.
@@ -583,37 +611,33 @@ def _resolve_type_to_demand_import_leaves_impl(
     blueprint, expand one level of components: produced children recurse;
     others are import leaves. Pure import leaves with no blueprint stay leaves.
     """
-    if eve_type.id in visited:
-        agg[eve_type.id] = agg.get(eve_type.id, 0) + quantity
+    if type_id in visited:
+        agg[type_id] = agg.get(type_id, 0) + quantity
         return
 
-    product = IndustryProduct.objects.filter(eve_type=eve_type).first()
-    if product and product.strategy == Strategy.PRODUCED:
-        _resolve_product_to_imports_impl(eve_type, quantity, agg, visited)
+    if type_id in produced:
+        _resolve_product_to_imports_impl(
+            type_id, quantity, agg, visited, produced, graph
+        )
         return
 
-    if get_blueprint_or_reaction_type_id(eve_type) is None:
-        agg[eve_type.id] = agg.get(eve_type.id, 0) + quantity
+    if graph.recipe(type_id) is None:
+        agg[type_id] = agg.get(type_id, 0) + quantity
         return
 
-    visited.add(eve_type.id)
+    visited.add(type_id)
     try:
-        for comp_type, comp_qty in get_direct_components(eve_type, quantity):
-            comp_product = IndustryProduct.objects.filter(
-                eve_type=comp_type
-            ).first()
-            if (
-                comp_product
-                and comp_product.strategy == Strategy.PRODUCED
-                and comp_type.id not in visited
-            ):
+        for comp_id, comp_qty in _direct_component_quantities(
+            graph, type_id, quantity
+        ):
+            if comp_id in produced and comp_id not in visited:
                 _resolve_type_to_demand_import_leaves_impl(
-                    comp_type, comp_qty, agg, visited
+                    comp_id, comp_qty, agg, visited, produced, graph
                 )
             else:
-                agg[comp_type.id] = agg.get(comp_type.id, 0) + comp_qty
+                agg[comp_id] = agg.get(comp_id, 0) + comp_qty
     finally:
-        visited.discard(eve_type.id)
+        visited.discard(type_id)
 
 
 def resolve_type_to_demand_import_leaves(
@@ -625,7 +649,9 @@ def resolve_type_to_demand_import_leaves(
     type (see _resolve_type_to_demand_import_leaves_impl).
     """
     agg: Dict[int, int] = {}
-    _resolve_type_to_demand_import_leaves_impl(eve_type, quantity, agg, set())
+    _resolve_type_to_demand_import_leaves_impl(
+        eve_type.id, quantity, agg, set(), _produced_type_ids(), recipe_graph()
+    )
     return agg
 
 
@@ -634,8 +660,12 @@ def resolve_order_to_demand_import_leaves(
 ) -> Dict[int, int]:
     """Aggregate demand import leaves across all items on an order."""
     agg: Dict[int, int] = {}
-    for item in order.items.select_related("eve_type"):
+    produced = _produced_type_ids()
+    graph = recipe_graph()
+    for type_id, quantity in order.items.values_list(
+        "eve_type_id", "quantity"
+    ):
         _resolve_type_to_demand_import_leaves_impl(
-            item.eve_type, item.quantity, agg, set()
+            type_id, quantity, agg, set(), produced, graph
         )
     return agg
@@ -0,0 +1,174 @@
+"""
+Time plan_build for one product (default: Revelation, a capital hull) three ways:
+
+- ``per-node``: the previous planner path, a handful of ORM queries for
+  every recipe node and type lookup;
+- ``cold``: recipe graph invalidated first, so the plan pays the bulk load;
+- ``warm``: recipe graph already in memory (the steady state).
+
+Needs the SDE industry tables loaded for the product's tree. Cost indexes
+are fixed so no ESI calls are made. The command fails if the per-node and
+graph plans disagree on jobs or leaf materials.
+
+    pipenv run python manage.py benchmark_build_plan
+    pipenv run python manage.py benchmark_build_plan Naglfar --repeat 10
+"""
+
+import statistics
+import time
+from typing import Optional
+from unittest.mock import patch
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from eveuniverse.models import (
+    EveIndustryActivityDuration,
+    EveIndustryActivityMaterial,
+    EveIndustryActivityProduct,
+    EveType,
+)
+
+from industry.helpers.build_planner import (
+    Recipe,
+    plan_build,
+    resolve_product,
+)
+from industry.helpers.recipe_graph import (
+    RECIPE_ACTIVITIES,
+    invalidate_recipe_graph,
+    recipe_graph,
+)
+from industry.helpers.type_breakdown import (
+    _ensure_industry_data_loaded_for_product,
+)
+
+DEFAULT_PRODUCT = "19720"  # Revelation
+
+
+def _per_node_recipe(
+    product_type_id: int, *args, **kwargs
+) -> Optional[Recipe]:
+    """The planner's recipe lookup before the recipe graph."""
+    product = EveType.objects.filter(id=product_type_id).first()
+    if product is None:
+        return None
+    _ensure_industry_data_loaded_for_product(product)
+    products = list(
+        EveIndustryActivityProduct.objects.filter(
+            product_eve_type_id=product_type_id,
+            activity_id__in=RECIPE_ACTIVITIES,
+        ).order_by("activity_id", "eve_type_id")
+    )
+    if not products:
+        return None
+    chosen = products[0]
+    duration = (
+        EveIndustryActivityDuration.objects.filter(
+            eve_type_id=chosen.eve_type_id, activity_id=chosen.activity_id
+        )
+        .values_list("time", flat=True)
+        .first()
+    )
+    materials = [
+        (m.material_eve_type_id, m.material_eve_type.name, m.quantity)
+        for m in EveIndustryActivityMaterial.objects.filter(
+            eve_type_id=chosen.eve_type_id, activity_id=chosen.activity_id
+        )
+        .order_by("id")
+        .select_related("material_eve_type")
+    ]
+    return Recipe(
+        blueprint_type_id=chosen.eve_type_id,
+        activity_id=chosen.activity_id,
+        product_type_id=product_type_id,
+        product_name=product.name,
+        product_quantity=chosen.quantity or 1,
+        base_time=int(duration or 0),
+        materials=materials,
+    )
+
+
+def _signature(plan) -> tuple:
+    return (
+        sorted((job.product_type_id, job.runs) for job in plan.jobs),
+        sorted(
+            (type_id, qty) for type_id, (_, qty) in plan.leaf_materials.items()
+        ),
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark plan_build latency with per-node SDE queries versus the "
+        "in-memory recipe graph."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "product",
+            nargs="?",
+            default=DEFAULT_PRODUCT,
+            help="Type ID or name of the product to plan.",
+        )
+        parser.add_argument("--quantity", type=int, default=1)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        if options["repeat"] < 1:
+            raise CommandError("--repeat must be at least 1")
+        try:
+            product = resolve_product(str(options["product"]))
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+        if recipe_graph().recipe(product.id, load_missing=False) is None:
+            raise CommandError(
+                f"No manufacturing recipe for {product.name} in the SDE tables"
+            )
+
+        def run():
+            return plan_build(
+                product,
+                quantity=options["quantity"],
+                manufacturing_index=0.05,
+                reaction_index=0.05,
+            )
+
+        def per_node():
+            with patch(
+                "industry.helpers.build_planner._get_recipe", _per_node_recipe
+            ), patch(
+                "industry.helpers.build_planner.load_type_info",
+                return_value={},
+            ):
+                return run()
+
+        def cold():
+            invalidate_recipe_graph()
+            return run()
+
+        plans = {}
+        for mode, func in (
+            ("per-node", per_node),
+            ("cold", cold),
+            ("warm", run),
+        ):
+            timings = []
+            for _ in range(options["repeat"]):
+                with CaptureQueriesContext(connection) as queries:
+                    start = time.perf_counter()
+                    plans[mode] = func()
+                    timings.append(time.perf_counter() - start)
+            self.stdout.write(
+                f"{mode:<9} median={statistics.median(timings) * 1000:.1f}ms "
+                f"min={min(timings) * 1000:.1f}ms queries={len(queries)}"
+            )
+
+        plan = plans["warm"]
+        self.stdout.write(
+            f"{plan.product_name} x{plan.quantity}: {len(plan.jobs)} jobs, "
+            f"{len(plan.leaf_materials)} leaf materials"
+        )
+        if _signature(plans["per-node"]) != _signature(plan):
+            raise CommandError("Per-node and graph plans differ")
+        self.stdout.write("Plans identical")
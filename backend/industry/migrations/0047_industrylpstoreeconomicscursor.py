@@ -0,0 +1,40 @@
+# Watermark for the incremental LP store offer economics rebuild.
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("industry", "0046_delete_miningupgradecompletion"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IndustryLpStoreEconomicsCursor",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("last_history_pk", models.BigIntegerField(default=0)),
+                (
+                    "last_rebuild_at",
+                    models.DateTimeField(blank=True, null=True),
+                ),
+                (
+                    "last_full_rebuild_at",
+                    models.DateTimeField(blank=True, null=True),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Industry LP store economics cursor",
+            },
+        ),
+    ]
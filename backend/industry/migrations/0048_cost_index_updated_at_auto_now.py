@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("industry", "0047_industrylpstoreeconomicscursor"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="industrysystemcostindex",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
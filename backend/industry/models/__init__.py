@@ -12,6 +12,7 @@ from industry.models.lp_store import (
     IndustryLoyaltyPointMarketOrder,
     IndustryLoyaltyPointMarketOrderClaim,
     IndustryLoyaltyPointPriceHistory,
+    IndustryLpStoreEconomicsCursor,
     IndustryLpStoreOffer,
     IndustryLpStoreOfferEconomics,
     IndustryLpStoreOfferRequiredItem,
@@ -38,6 +39,7 @@ __all__ = [
     "IndustryLoyaltyPointMarketOrder",
     "IndustryLoyaltyPointMarketOrderClaim",
     "IndustryLoyaltyPointPriceHistory",
+    "IndustryLpStoreEconomicsCursor",
     "IndustryLpStoreOffer",
     "IndustryLpStoreOfferEconomics",
     "IndustryLpStoreOfferRequiredItem",
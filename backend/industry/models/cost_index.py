@@ -1,5 +1,4 @@
 from django.db import models
-from django.utils import timezone
 
 
 class IndustrySystemCostIndex(models.Model):
@@ -13,7 +12,8 @@ class IndustrySystemCostIndex(models.Model):
     solar_system_id = models.BigIntegerField(primary_key=True)
     manufacturing = models.FloatField(default=0.0)
     reaction = models.FloatField(default=0.0)
-    updated_at = models.DateTimeField(default=timezone.now)
+    # Moves only when an index changes (see sync_industry_system_cost_indices).
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name = "Industry system cost index"
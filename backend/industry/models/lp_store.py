@@ -458,6 +458,25 @@ class IndustryLpStoreOfferEconomics(models.Model):
         )
 
 
+class IndustryLpStoreEconomicsCursor(models.Model):
+    """Singleton watermark for the incremental offer economics rebuild."""
+
+    # Highest EveMarketItemHistory.pk already priced into the snapshot.
+    last_history_pk = models.BigIntegerField(default=0)
+    # Start of the last rebuild; later input updates mark offers dirty.
+    last_rebuild_at = models.DateTimeField(null=True, blank=True)
+    last_full_rebuild_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Industry LP store economics cursor"
+
+    @classmethod
+    def get_singleton(cls) -> "IndustryLpStoreEconomicsCursor":
+        obj, _ = cls.objects.get_or_create(pk=1)
+        return obj
+
+
 class IndustryLpStoreOfferRequiredItem(models.Model):
     """One required input item for an LP store offer."""
 
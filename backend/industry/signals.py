@@ -4,9 +4,16 @@ from __future__ import annotations
 
 import logging
 
-from django.db.models.signals import m2m_changed
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
+from eveuniverse.models import (
+    EveIndustryActivityDuration,
+    EveIndustryActivityMaterial,
+    EveIndustryActivityProduct,
+    EveTypeMaterial,
+)
 
+from industry.helpers.recipe_graph import schedule_recipe_graph_invalidation
 from industry.models import IndustryOrder
 
 logger = logging.getLogger(__name__)
@@ -51,3 +58,16 @@ def notify_when_order_tribe_groups_added(
             "change on order %s",
             instance.pk,
         )
+
+
+@receiver(post_save, sender=EveIndustryActivityDuration)
+@receiver(post_save, sender=EveIndustryActivityMaterial)
+@receiver(post_save, sender=EveIndustryActivityProduct)
+@receiver(post_save, sender=EveTypeMaterial)
+@receiver(post_delete, sender=EveIndustryActivityDuration)
+@receiver(post_delete, sender=EveIndustryActivityMaterial)
+@receiver(post_delete, sender=EveIndustryActivityProduct)
+@receiver(post_delete, sender=EveTypeMaterial)
+def invalidate_recipe_graph_on_sde_change(sender, **kwargs):
+    """SDE loads and on-demand blueprint fetches change recipes."""
+    schedule_recipe_graph_invalidation()
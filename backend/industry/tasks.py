@@ -16,7 +16,7 @@ from industry.helpers.loyalty_store import (
     sync_loyalty_store_offers,
 )
 from industry.helpers.lp_store_offer_economics_rebuild import (
-    rebuild_lp_store_offer_economics,
+    rebuild_lp_store_offer_economics_incremental,
 )
 from industry.helpers.notifications import (
     emit_order_created,
@@ -322,10 +322,11 @@ def rebuild_lp_store_offer_economics_task() -> int:
     """
     Rebuild LP store offer economics snapshot from local caches (no ESI).
 
-    Hourly Celery beat; also after ESI offer sync.
+    Hourly Celery beat; also after ESI offer sync. Recomputes only offers
+    whose inputs changed, with a daily full rebuild.
     """
     try:
-        return rebuild_lp_store_offer_economics()
+        return rebuild_lp_store_offer_economics_incremental()
     except Exception:
         logger.exception("Failed to rebuild LP store offer economics")
         raise
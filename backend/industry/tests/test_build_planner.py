@@ -1,5 +1,8 @@
 """Tests for Amamake Typhoon build planner (formulas, facilities, plan tree)."""
 
+import time
+
+from django.core.cache import cache
 from django.test import TestCase, override_settings
 from eveuniverse.models import (
     EveCategory,
@@ -36,6 +39,14 @@ from industry.helpers.industry_formulas import (
     required_material_quantity,
     time_efficiency_multiplier,
 )
+from industry.helpers.recipe_graph import (
+    RECIPE_GRAPH_BUMPED_AT_KEY,
+    RECIPE_GRAPH_SETTLE_SECONDS,
+    RECIPE_GRAPH_VERSION_KEY,
+    invalidate_recipe_graph,
+    recipe_graph,
+    recipe_graph_load,
+)
 from industry.models import IndustrySystemCostIndex
 
 # Ravworks Typhoon ME0 plan 0XLRST5 reference (facility may differ slightly).
@@ -616,6 +627,85 @@ class BuildPlannerFixtureTestCase(TestCase):
         trit10 = plan10.leaf_materials[34][1]
         self.assertGreater(trit0, trit10)
 
+    def test_warm_plan_reads_recipes_from_graph(self):
+        def plan():
+            return plan_build(
+                self.hull,
+                quantity=1,
+                blueprint_me=0.0,
+                blueprint_te=0.0,
+                facility="amamake",
+                manufacturing_index=0.05,
+                reaction_index=0.04,
+            )
+
+        invalidate_recipe_graph()
+        cold = plan()
+        # One query for the names / groups of the tree, one for prices.
+        with self.assertNumQueries(2):
+            warm = plan()
+        self.assertEqual(
+            [(j.product_type_id, j.runs) for j in warm.jobs],
+            [(j.product_type_id, j.runs) for j in cold.jobs],
+        )
+        self.assertEqual(warm.leaf_materials, cold.leaf_materials)
+        self.assertEqual(
+            recipe_graph().reachable_type_ids([self.hull.id]),
+            {self.hull.id, self.adv.id, self.composite.id, self.trit.id},
+        )
+
+    def test_recipe_change_invalidates_graph(self):
+        before = recipe_graph()
+        self.assertEqual(len(before.recipe(self.hull.id).materials), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            EveIndustryActivityMaterial.objects.create(
+                eve_type=self.bp_hull,
+                activity_id=1,
+                material_eve_type=self.composite,
+                quantity=7,
+            )
+
+        after = recipe_graph()
+        self.assertIsNot(after, before)
+        self.assertIn(
+            (self.composite.id, 7), after.recipe(self.hull.id).materials
+        )
+
+    def test_other_process_reloads_once_the_sde_load_settles(self):
+        graph = recipe_graph()
+        # Another process writing SDE rows bumps the shared version.
+        cache.set(RECIPE_GRAPH_VERSION_KEY, (graph.version or 0) + 1)
+        cache.set(RECIPE_GRAPH_BUMPED_AT_KEY, time.time())
+
+        self.assertIs(recipe_graph(), graph)
+
+        cache.set(
+            RECIPE_GRAPH_BUMPED_AT_KEY,
+            time.time() - RECIPE_GRAPH_SETTLE_SECONDS,
+        )
+        reloaded = recipe_graph()
+        self.assertIsNot(reloaded, graph)
+        self.assertEqual(reloaded.version, cache.get(RECIPE_GRAPH_VERSION_KEY))
+
+    @patch("industry.helpers.recipe_graph.invalidate_recipe_graph")
+    def test_sde_load_bumps_graph_version_once(self, invalidate):
+        with self.captureOnCommitCallbacks(execute=True):
+            with recipe_graph_load():
+                for quantity in (7, 8):
+                    EveIndustryActivityMaterial.objects.update_or_create(
+                        eve_type=self.bp_hull,
+                        activity_id=1,
+                        material_eve_type=self.composite,
+                        defaults={"quantity": quantity},
+                    )
+                invalidate.assert_not_called()
+            EveIndustryActivityMaterial.objects.filter(
+                eve_type=self.bp_hull, material_eve_type=self.composite
+            ).delete()
+
+        invalidate.assert_called_once_with()
+
     def test_ravworks_reference_shape_documented(self):
         """
         Ravworks ME0 bucket times (plan 0XLRST5) are the verification target.
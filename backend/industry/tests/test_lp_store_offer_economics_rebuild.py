@@ -8,19 +8,27 @@ from django.test import TestCase
 from django.utils import timezone
 from eveonline.models import EveLocation
 from eveuniverse.models import EveCategory, EveGroup, EveType
+from market.helpers.location_price import (
+    fetch_and_update_market_location_prices,
+)
 from market.models import EveMarketItemHistory
 
+from industry.helpers.cost_indices import sync_industry_system_cost_indices
 from industry.helpers.lp_store_offer_economics_rebuild import (
     rebuild_lp_store_offer_economics,
+    rebuild_lp_store_offer_economics_incremental,
 )
 from industry.models import (
     IndustryLoyaltyPoint,
+    IndustryLpStoreEconomicsCursor,
     IndustryLpStoreOffer,
     IndustryLpStoreOfferEconomics,
 )
 
 TLIB_CORP_ID = 1000182
+FDU_CORP_ID = 1000181
 HULL_TYPE_ID = 17740
+OTHER_HULL_TYPE_ID = 17812
 JITA_REGION_ID = 10000002
 
 _AMAMAKE_PATCH = patch(
@@ -29,7 +37,7 @@ _AMAMAKE_PATCH = patch(
 )
 
 
-class LpStoreOfferEconomicsRebuildTestCase(TestCase):
+class _RebuildFixtureTestCase(TestCase):
     def setUp(self):
         EveLocation.objects.create(
             location_id=60003760,
@@ -81,6 +89,8 @@ class LpStoreOfferEconomicsRebuildTestCase(TestCase):
             quantity=1,
         )
 
+
+class LpStoreOfferEconomicsRebuildTestCase(_RebuildFixtureTestCase):
     def test_rebuild_writes_snapshot_rows(self):
         with _AMAMAKE_PATCH:
             count = rebuild_lp_store_offer_economics()
@@ -142,3 +152,182 @@ class LpStoreOfferEconomicsRebuildTestCase(TestCase):
             count = rebuild_lp_store_offer_economics()
         self.assertEqual(count, 2)
         self.assertEqual(IndustryLpStoreOfferEconomics.objects.count(), 2)
+
+
+class IncrementalLpStoreOfferEconomicsRebuildTestCase(_RebuildFixtureTestCase):
+
+    def setUp(self):
+        super().setUp()
+        IndustryLoyaltyPoint.objects.update_or_create(
+            corporation_id=FDU_CORP_ID,
+            defaults={
+                "name": "Federal Defense Union",
+                "default_isk_per_lp": 800,
+                "is_active": True,
+            },
+        )
+        other_hull = EveType.objects.create(
+            id=OTHER_HULL_TYPE_ID,
+            name="Republic Fleet Stabber",
+            published=True,
+            eve_group=self.hull.eve_group,
+        )
+        EveMarketItemHistory.objects.create(
+            region_id=JITA_REGION_ID,
+            item=other_hull,
+            date=timezone.now().date() - timedelta(days=1),
+            average=Decimal("90000000"),
+            highest=Decimal("95000000"),
+            lowest=Decimal("85000000"),
+            order_count=5,
+            volume=20,
+        )
+        self.other_offer = IndustryLpStoreOffer.objects.create(
+            offer_id=4001,
+            corporation_id=FDU_CORP_ID,
+            type_id=OTHER_HULL_TYPE_ID,
+            lp_cost=30_000,
+            isk_cost=1_000_000,
+            quantity=1,
+        )
+
+    def _rebuilt_at(self, offer):
+        return IndustryLpStoreOfferEconomics.objects.get(
+            offer=offer
+        ).rebuilt_at
+
+    def test_first_run_is_a_full_rebuild(self):
+        with _AMAMAKE_PATCH:
+            count = rebuild_lp_store_offer_economics_incremental()
+        self.assertEqual(count, 2)
+        cursor = IndustryLpStoreEconomicsCursor.get_singleton()
+        self.assertIsNotNone(cursor.last_full_rebuild_at)
+        self.assertEqual(cursor.last_rebuild_at, cursor.last_full_rebuild_at)
+        self.assertEqual(
+            cursor.last_history_pk,
+            EveMarketItemHistory.objects.latest("pk").pk,
+        )
+
+    def test_nothing_changed_writes_nothing(self):
+        with _AMAMAKE_PATCH:
+            rebuild_lp_store_offer_economics()
+            before = self._rebuilt_at(self.offer)
+            count = rebuild_lp_store_offer_economics_incremental()
+        self.assertEqual(count, 0)
+        self.assertEqual(IndustryLpStoreOfferEconomics.objects.count(), 2)
+        self.assertEqual(self._rebuilt_at(self.offer), before)
+
+    def test_new_history_day_recomputes_only_that_offer(self):
+        with _AMAMAKE_PATCH:
+            rebuild_lp_store_offer_economics()
+            other_before = self._rebuilt_at(self.other_offer)
+            EveMarketItemHistory.objects.create(
+                region_id=JITA_REGION_ID,
+                item=self.hull,
+                date=timezone.now().date(),
+                average=Decimal("300000000"),
+                highest=Decimal("310000000"),
+                lowest=Decimal("290000000"),
+                order_count=5,
+                volume=20,
+            )
+            count = rebuild_lp_store_offer_economics_incremental()
+        self.assertEqual(count, 1)
+        row = IndustryLpStoreOfferEconomics.objects.get(offer=self.offer)
+        self.assertEqual(row.jita_sell, 300_000_000)
+        self.assertEqual(self._rebuilt_at(self.other_offer), other_before)
+
+    def test_new_offer_and_currency_change_are_dirty(self):
+        with _AMAMAKE_PATCH:
+            rebuild_lp_store_offer_economics()
+            other_before = self._rebuilt_at(self.other_offer)
+            new_offer = IndustryLpStoreOffer.objects.create(
+                offer_id=3002,
+                corporation_id=TLIB_CORP_ID,
+                type_id=HULL_TYPE_ID,
+                lp_cost=10_000,
+                isk_cost=0,
+                quantity=1,
+            )
+            self.assertEqual(rebuild_lp_store_offer_economics_incremental(), 2)
+            self.assertTrue(
+                IndustryLpStoreOfferEconomics.objects.filter(
+                    offer=new_offer
+                ).exists()
+            )
+            self.assertEqual(self._rebuilt_at(self.other_offer), other_before)
+
+            IndustryLoyaltyPoint.objects.get(corporation_id=FDU_CORP_ID).save()
+            self.assertEqual(rebuild_lp_store_offer_economics_incremental(), 1)
+        self.assertGreater(self._rebuilt_at(self.other_offer), other_before)
+
+    def test_untracked_corporation_rows_are_dropped(self):
+        with _AMAMAKE_PATCH:
+            rebuild_lp_store_offer_economics()
+            IndustryLoyaltyPoint.objects.filter(
+                corporation_id=FDU_CORP_ID
+            ).update(is_active=False)
+            rebuild_lp_store_offer_economics_incremental()
+        self.assertFalse(
+            IndustryLpStoreOfferEconomics.objects.filter(
+                offer=self.other_offer
+            ).exists()
+        )
+        self.assertTrue(
+            IndustryLpStoreOfferEconomics.objects.filter(
+                offer=self.offer
+            ).exists()
+        )
+
+    def test_stale_full_rebuild_forces_full(self):
+        with _AMAMAKE_PATCH:
+            rebuild_lp_store_offer_economics()
+            IndustryLpStoreEconomicsCursor.objects.update(
+                last_full_rebuild_at=timezone.now() - timedelta(hours=25)
+            )
+            self.assertEqual(rebuild_lp_store_offer_economics_incremental(), 2)
+            self.assertEqual(
+                rebuild_lp_store_offer_economics_incremental(
+                    full_rebuild_hours=None
+                ),
+                0,
+            )
+
+    @patch(
+        "industry.helpers.lp_store_offer_economics_rebuild."
+        "bpc_type_id_to_product_type_id",
+        # Treat the hull offer as a blueprint offer for the dirty check.
+        return_value={HULL_TYPE_ID: OTHER_HULL_TYPE_ID},
+    )
+    @patch("industry.helpers.cost_indices.fetch_industry_systems_from_esi")
+    def test_rewriting_identical_inputs_recomputes_nothing(
+        self, fetch_systems, bpc_to_product
+    ):
+        fetch_systems.return_value = [
+            {
+                "solar_system_id": 30002537,
+                "cost_indices": [
+                    {"activity": "manufacturing", "cost_index": 0.05}
+                ],
+            }
+        ]
+
+        def sync_inputs(sell_price):
+            sync_industry_system_cost_indices()
+            with patch(
+                "market.helpers.location_price._fetch_orders_into_aggregates",
+                return_value=(
+                    {HULL_TYPE_ID: sell_price},
+                    {HULL_TYPE_ID: 240_000_000.0},
+                ),
+            ):
+                fetch_and_update_market_location_prices(None, 60003760)
+
+        with _AMAMAKE_PATCH:
+            sync_inputs(250_000_000.0)
+            rebuild_lp_store_offer_economics()
+            sync_inputs(250_000_000.0)
+            self.assertEqual(rebuild_lp_store_offer_economics_incremental(), 0)
+
+            sync_inputs(255_000_000.0)
+            self.assertEqual(rebuild_lp_store_offer_economics_incremental(), 1)
@@ -188,7 +188,7 @@ class IndustryCostIndexSyncTestCase(TestCase):
         sync_mock.assert_called_once()
         rebuild_delay.assert_called_once()
 
-    @patch("industry.tasks.rebuild_lp_store_offer_economics")
+    @patch("industry.tasks.rebuild_lp_store_offer_economics_incremental")
     def test_rebuild_lp_econ_celery_task_delegates(self, rebuild_mock):
         rebuild_mock.return_value = 9
         self.assertEqual(rebuild_lp_store_offer_economics_task(), 9)
@@ -1,9 +1,22 @@
 """Tests for industry.helpers.type_breakdown."""
 
+from datetime import timedelta
+
 from django.test import TestCase
+from django.utils import timezone
 
-from eveuniverse.models import EveCategory, EveGroup, EveType
+from eveonline.models import EveCharacter
+from eveuniverse.models import (
+    EveCategory,
+    EveGroup,
+    EveIndustryActivity,
+    EveIndustryActivityMaterial,
+    EveIndustryActivityProduct,
+    EveType,
+    EveTypeMaterial,
+)
 
+from industry.helpers.recipe_graph import recipe_graph
 from industry.helpers.type_breakdown import (
     ACTIVITY_MANUFACTURING,
     ACTIVITY_REACTION,
@@ -11,7 +24,11 @@ from industry.helpers.type_breakdown import (
     break_down_type,
     flatten_components,
     get_flat_breakdown,
+    resolve_order_to_imports,
+    tree_to_nested,
 )
+from industry.models import IndustryOrderItem, IndustryProduct, Strategy
+from industry.test_utils import create_industry_order
 
 
 class TypeBreakdownTestCase(TestCase):
@@ -114,3 +131,197 @@ class TypeBreakdownTestCase(TestCase):
         """Industry activity IDs match Eve SDE."""
         self.assertEqual(ACTIVITY_MANUFACTURING, 1)
         self.assertEqual(ACTIVITY_REACTION, 11)
+
+
+class LevelOrderBreakdownTestCase(TestCase):
+    """Hull -> component -> reaction -> moon goo, plus a reprocessed input."""
+
+    @classmethod
+    def setUpTestData(cls):
+        category, _ = EveCategory.objects.get_or_create(
+            id=1, defaults={"name": "Test Category", "published": True}
+        )
+        group, _ = EveGroup.objects.get_or_create(
+            id=1,
+            defaults={
+                "name": "Test Group",
+                "published": True,
+                "eve_category": category,
+            },
+        )
+        for activity_id, name in (
+            (ACTIVITY_MANUFACTURING, "Manufacturing"),
+            (ACTIVITY_REACTION, "Reaction"),
+        ):
+            EveIndustryActivity.objects.get_or_create(
+                id=activity_id, defaults={"name": name, "description": name}
+            )
+
+        def make_type(type_id, name):
+            return EveType.objects.create(
+                id=type_id, name=name, published=True, eve_group=group
+            )
+
+        cls.trit = make_type(998001, "Trit")
+        cls.moon = make_type(998002, "Moon Goo")
+        cls.scrap = make_type(998003, "Scrap")
+        cls.composite = make_type(998004, "Composite")
+        cls.component = make_type(998005, "Component")
+        cls.hull = make_type(998006, "Hull")
+
+        def recipe(blueprint_id, activity_id, product, quantity, materials):
+            blueprint = make_type(blueprint_id, f"{product.name} Blueprint")
+            EveIndustryActivityProduct.objects.create(
+                eve_type=blueprint,
+                activity_id=activity_id,
+                product_eve_type=product,
+                quantity=quantity,
+            )
+            for material, material_qty in materials:
+                EveIndustryActivityMaterial.objects.create(
+                    eve_type=blueprint,
+                    activity_id=activity_id,
+                    material_eve_type=material,
+                    quantity=material_qty,
+                )
+
+        recipe(998101, ACTIVITY_REACTION, cls.composite, 20, [(cls.moon, 100)])
+        recipe(
+            998102,
+            ACTIVITY_MANUFACTURING,
+            cls.component,
+            1,
+            [(cls.composite, 50), (cls.trit, 10), (cls.scrap, 1)],
+        )
+        recipe(
+            998103,
+            ACTIVITY_MANUFACTURING,
+            cls.hull,
+            1,
+            [(cls.component, 2), (cls.trit, 100)],
+        )
+        EveTypeMaterial.objects.create(
+            eve_type=cls.scrap, material_eve_type=cls.trit, quantity=3
+        )
+
+    def test_tree_matches_recipes(self):
+        tree = break_down_type(self.hull, quantity=2)
+        self.assertEqual(
+            tree_to_nested(tree),
+            {
+                "name": "Hull",
+                "type_id": self.hull.id,
+                "quantity": 2,
+                "source": "raw",
+                "depth": 0,
+                "children": [
+                    {
+                        "name": "Component",
+                        "type_id": self.component.id,
+                        "quantity": 4,
+                        "source": "blueprint",
+                        "depth": 1,
+                        "children": [
+                            {
+                                "name": "Composite",
+                                "type_id": self.composite.id,
+                                "quantity": 200,
+                                "source": "blueprint",
+                                "depth": 2,
+                                "children": [
+                                    {
+                                        "name": "Moon Goo",
+                                        "type_id": self.moon.id,
+                                        "quantity": 1000,
+                                        "source": "reaction",
+                                        "depth": 3,
+                                        "children": [],
+                                    }
+                                ],
+                            },
+                            {
+                                "name": "Trit",
+                                "type_id": self.trit.id,
+                                "quantity": 40,
+                                "source": "blueprint",
+                                "depth": 2,
+                                "children": [],
+                            },
+                            {
+                                "name": "Scrap",
+                                "type_id": self.scrap.id,
+                                "quantity": 4,
+                                "source": "blueprint",
+                                "depth": 2,
+                                "children": [
+                                    {
+                                        "name": "Trit",
+                                        "type_id": self.trit.id,
+                                        "quantity": 12,
+                                        "source": "type_material",
+                                        "depth": 3,
+                                        "children": [],
+                                    }
+                                ],
+                            },
+                        ],
+                    },
+                    {
+                        "name": "Trit",
+                        "type_id": self.trit.id,
+                        "quantity": 200,
+                        "source": "blueprint",
+                        "depth": 1,
+                        "children": [],
+                    },
+                ],
+            },
+        )
+
+    def test_one_type_query_per_level(self):
+        graph = recipe_graph()
+        for type_id in (self.trit.id, self.moon.id, self.scrap.id):
+            graph.recipe(type_id)  # settle the one-off SDE lookups
+        with self.assertNumQueries(3):
+            tree = break_down_type(self.hull)
+        self.assertEqual(
+            flatten_components(tree),
+            {self.moon.id: 500, self.trit.id: 100 + 20 + 6},
+        )
+
+    def test_max_depth_keeps_children_as_leaves(self):
+        tree = break_down_type(self.hull, max_depth=1)
+        component = tree.children[0]
+        self.assertEqual(len(component.children), 3)
+        self.assertTrue(all(not c.children for c in component.children))
+
+    def test_resolve_order_to_imports_in_bounded_queries(self):
+        character = EveCharacter.objects.create(
+            character_id=998900, character_name="Builder"
+        )
+        order = create_industry_order(
+            needed_by=(timezone.now() + timedelta(days=7)).date(),
+            character=character,
+        )
+        IndustryOrderItem.objects.create(
+            order=order, eve_type=self.hull, quantity=1
+        )
+        IndustryOrderItem.objects.create(
+            order=order, eve_type=self.trit, quantity=5
+        )
+        for eve_type in (self.hull, self.component):
+            IndustryProduct.objects.update_or_create(
+                eve_type=eve_type, defaults={"strategy": Strategy.PRODUCED}
+            )
+        recipe_graph().recipe(self.trit.id)
+
+        with self.assertNumQueries(2):
+            imports = resolve_order_to_imports(order)
+        self.assertEqual(
+            imports,
+            {
+                self.composite.id: 100,
+                self.trit.id: 100 + 20 + 5,
+                self.scrap.id: 2,
+            },
+        )
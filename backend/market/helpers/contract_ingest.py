@@ -0,0 +1,242 @@
+"""
+Bulk ingest of public (ESI) and private (character/corporation) contracts.
+
+create_or_update_contract and create_or_update_contract_from_db_contract do
+a fitting lookup, a get_or_create and a full save per contract. This stage
+stages a whole step instead: fitting titles resolve through one
+FittingTitleIndex, existing EveMarketContract rows are read in chunks, and
+each contract is classified as new, changed or unchanged. New rows are
+bulk created, changed rows bulk updated, and unchanged rows only get
+``last_updated`` touched (update_completed_contracts treats public
+contracts not seen since the run started as finished).
+
+Field rules are the same as the per-contract helpers: price is only set on
+create, and a fitting frozen by an item match (items_fetched) is kept.
+"""
+
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from eveonline.models import EveLocation
+from fittings.forms import normalize_fitting_aliases
+from fittings.models import EveFitting
+
+from market.helpers.contract_match import strip_fitting_tag
+from market.helpers.contracts import _map_contract_status
+from market.models import EveMarketContract
+
+CONTRACT_UPSERT_BATCH = 500
+
+# Fields a contract sync may change (price and created_at are create-only).
+CONTRACT_SYNC_FIELDS = (
+    "title",
+    "status",
+    "issued_at",
+    "expires_at",
+    "completed_at",
+    "fitting_id",
+    "location_id",
+    "is_public",
+    "assignee_id",
+    "acceptor_id",
+    "issuer_external_id",
+    "issuer_corporation_id",
+)
+
+
+class FittingTitleIndex:
+    """
+    Contract title -> fitting, with the rules of get_fitting_for_contract
+    (exact name, then alias, then unique tag-stripped name) over fittings
+    loaded once.
+    """
+
+    def __init__(self, fittings: Iterable[EveFitting]):
+        self.by_name: Dict[str, EveFitting] = {}
+        self.by_alias: Dict[str, EveFitting] = {}
+        by_bare: Dict[str, List[EveFitting]] = {}
+        for fitting in fittings:
+            self.by_name.setdefault(fitting.name.lower(), fitting)
+            for alias in (
+                normalize_fitting_aliases(fitting.aliases or "") or ""
+            ).split(","):
+                if alias.strip():
+                    self.by_alias.setdefault(alias.strip().lower(), fitting)
+            if fitting.deleted is None:
+                by_bare.setdefault(strip_fitting_tag(fitting.name), []).append(
+                    fitting
+                )
+        self.by_bare = {
+            bare: matches[0]
+            for bare, matches in by_bare.items()
+            if len(matches) == 1
+        }
+        self.cache: Dict[str, Optional[EveFitting]] = {}
+
+    @classmethod
+    def load(cls) -> "FittingTitleIndex":
+        return cls(EveFitting.all_objects.order_by("pk"))
+
+    def resolve(self, title: Optional[str]) -> Optional[EveFitting]:
+        if title is None or title.strip() == "":
+            return None
+        if title not in self.cache:
+            self.cache[title] = self._resolve(title)
+        return self.cache[title]
+
+    def _resolve(self, title: str) -> Optional[EveFitting]:
+        title = title.replace("[FLEET]", "[FL33T]")
+        key = title.lower().strip()
+        fitting = self.by_name.get(title.lower()) or self.by_alias.get(key)
+        if fitting:
+            return fitting
+        bare = strip_fitting_tag(title)
+        return self.by_bare.get(bare) if bare else None
+
+
+@dataclass
+class ContractIngestStats:
+    seen: int = 0
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    seconds: float = 0.0
+
+    def as_dict(self) -> dict:
+        return dict(asdict(self), seconds=round(self.seconds, 3))
+
+
+def _as_datetime(value) -> Optional[datetime]:
+    if isinstance(value, str):
+        return parse_datetime(value)
+    return value
+
+
+def public_contract_fields(
+    esi_contract: dict, location: EveLocation, fittings: FittingTitleIndex
+) -> Optional[dict]:
+    """Staged fields for an ESI public contract, or None when not stored."""
+    if esi_contract["type"] != EveMarketContract.esi_contract_type:
+        return None
+    if esi_contract["start_location_id"] != location.location_id:
+        return None
+    fitting = fittings.resolve(esi_contract["title"])
+    return {
+        "price": esi_contract["price"],
+        "title": esi_contract["title"],
+        "status": "outstanding",
+        "issued_at": _as_datetime(esi_contract.get("date_issued")),
+        "expires_at": _as_datetime(esi_contract.get("date_expired")),
+        "fitting_id": fitting.id if fitting else None,
+        "location_id": location.pk,
+        "is_public": True,
+        "issuer_external_id": esi_contract["issuer_id"],
+        "issuer_corporation_id": (
+            esi_contract.get("issuer_corporation_id")
+            if esi_contract.get("for_corporation")
+            else None
+        ),
+    }
+
+
+def db_contract_fields(
+    db_contract, location: EveLocation, fittings: FittingTitleIndex
+) -> Optional[dict]:
+    """Staged fields for an EveCharacterContract / EveCorporationContract."""
+    if db_contract.type != EveMarketContract.esi_contract_type:
+        return None
+    if db_contract.start_location_id != location.location_id:
+        return None
+    fitting = fittings.resolve(db_contract.title or "")
+    return {
+        "price": db_contract.price or 0,
+        "title": db_contract.title or "",
+        "status": _map_contract_status(db_contract.status or ""),
+        "issued_at": db_contract.date_issued,
+        "expires_at": db_contract.date_expired,
+        "completed_at": db_contract.date_completed,
+        "fitting_id": fitting.id if fitting else None,
+        "location_id": location.pk,
+        "is_public": False,
+        "assignee_id": db_contract.assignee_id,
+        "acceptor_id": db_contract.acceptor_id,
+        "issuer_external_id": db_contract.issuer_id,
+        "issuer_corporation_id": (
+            getattr(db_contract, "issuer_corporation_id", None)
+            if getattr(db_contract, "for_corporation", False)
+            else None
+        ),
+    }
+
+
+def _chunks(items: List[int], size: int):
+    for index in range(0, len(items), size):
+        yield items[index : index + size]
+
+
+def _existing_contracts(ids: List[int]) -> Dict[int, EveMarketContract]:
+    existing = {}
+    for chunk in _chunks(ids, CONTRACT_UPSERT_BATCH):
+        for contract in EveMarketContract.objects.filter(id__in=chunk).only(
+            "id", "items_fetched", *CONTRACT_SYNC_FIELDS
+        ):
+            existing[contract.id] = contract
+    return existing
+
+
+def _apply(contract: EveMarketContract, fields: dict) -> bool:
+    """Copy staged fields onto ``contract``; True when anything changed."""
+    changed = False
+    for name, value in fields.items():
+        if name == "price":
+            continue
+        if name == "fitting_id" and contract.items_fetched:
+            continue
+        if getattr(contract, name) != value:
+            setattr(contract, name, value)
+            changed = True
+    return changed
+
+
+def ingest_contracts(
+    staged: Dict[int, dict], now: Optional[datetime] = None
+) -> ContractIngestStats:
+    """Write ``{contract_id: fields}`` as creates, updates and touches."""
+    started = time.perf_counter()
+    now = now or timezone.now()
+    stats = ContractIngestStats(seen=len(staged))
+    existing = _existing_contracts(sorted(staged))
+    created, changed, unchanged_ids = [], [], []
+    for contract_id, fields in staged.items():
+        contract = existing.get(contract_id)
+        if contract is None:
+            created.append(
+                EveMarketContract(id=contract_id, last_updated=now, **fields)
+            )
+        elif _apply(contract, fields):
+            contract.last_updated = now
+            changed.append(contract)
+        else:
+            unchanged_ids.append(contract_id)
+
+    EveMarketContract.objects.bulk_create(
+        created, batch_size=CONTRACT_UPSERT_BATCH
+    )
+    EveMarketContract.objects.bulk_update(
+        changed,
+        [*CONTRACT_SYNC_FIELDS, "last_updated"],
+        batch_size=CONTRACT_UPSERT_BATCH,
+    )
+    for chunk in _chunks(unchanged_ids, CONTRACT_UPSERT_BATCH):
+        EveMarketContract.objects.filter(id__in=chunk).update(last_updated=now)
+
+    stats.created = len(created)
+    stats.updated = len(changed)
+    stats.unchanged = len(unchanged_ids)
+    stats.seconds = time.perf_counter() - started
+    return stats
@@ -7,10 +7,10 @@ from eveuniverse.models import EveType
 from fittings.models import EveFitting
 
 from market.helpers.contract_stock import MATCH_THRESHOLD
-from market.models.item import parse_eft_items
-
-# Hull, modules, subsystems, and rigs — exclude charges/drones/paste/fuel.
-_STRUCTURAL_CATEGORIES = frozenset({"Ship", "Module", "Subsystem"})
+from market.helpers.fitting_signature import (
+    FittingSignature,
+    fitting_signatures,
+)
 
 _TAG_PREFIX = re.compile(r"^\[[^\]]+\]\s*")
 
@@ -45,26 +45,10 @@ def fitting_type_quantities_bulk(
 
     Returns ``{fitting_id: {type_id: qty}}``.
     """
-    if not fittings:
-        return {}
-    per_fitting_names: dict[int, dict[str, int]] = {}
-    all_names: set[str] = set()
-    for fitting in fittings:
-        names = parse_eft_items(fitting.eft_format)
-        per_fitting_names[fitting.id] = names
-        all_names.update(names.keys())
-    name_to_id = dict(
-        EveType.objects.filter(name__in=all_names).values_list("name", "id")
-    )
-    result: dict[int, dict[int, int]] = {}
-    for fit_id, names in per_fitting_names.items():
-        aggregated: dict[int, int] = defaultdict(int)
-        for name, qty in names.items():
-            type_id = name_to_id.get(name)
-            if type_id:
-                aggregated[type_id] += qty
-        result[fit_id] = dict(aggregated)
-    return result
+    return {
+        fitting_id: signature.display
+        for fitting_id, signature in fitting_signatures(fittings).items()
+    }
 
 
 def fitting_structural_type_quantities(fitting: EveFitting) -> dict[int, int]:
@@ -74,26 +58,8 @@ def fitting_structural_type_quantities(fitting: EveFitting) -> dict[int, int]:
     Bulk charges and other consumables dominate FAX fits and erase Active vs
     Buffer discrimination if left in the match score.
     """
-    per_name = parse_eft_items(fitting.eft_format)
-    if not per_name:
-        return {}
-    names = list(per_name.keys())
-    type_rows = EveType.objects.filter(name__in=names).values_list(
-        "name", "id", "eve_group__eve_category__name"
-    )
-    name_to_meta = {
-        name: (type_id, category) for name, type_id, category in type_rows
-    }
-    aggregated = defaultdict(int)
-    for name, qty in per_name.items():
-        meta = name_to_meta.get(name)
-        if not meta:
-            continue
-        type_id, category = meta
-        if category not in _STRUCTURAL_CATEGORIES:
-            continue
-        aggregated[type_id] += qty
-    return dict(aggregated)
+    signature = fitting_signatures([fitting]).get(fitting.id)
+    return dict(signature.structural) if signature else {}
 
 
 def _type_names_for_ids(type_ids: set[int]) -> dict[int, str]:
@@ -114,36 +80,66 @@ def score_contract_against_fitting(
     Score uses structural items only. Missing/extra lists still include the
     full EFT (consumables) for admin display.
     """
-    score_items = fitting_structural_type_quantities(fitting)
-    display_items = fitting_type_quantities(fitting)
+    signature = fitting_signatures([fitting]).get(fitting.id)
+    if signature is None:
+        return 0.0, [], []
+    return score_contract_against_signature(
+        contract_items,
+        signature,
+        _contract_type_names(contract_items, [signature]),
+    )
+
+
+def _contract_type_names(
+    contract_items: dict[int, int], signatures
+) -> dict[int, str]:
+    """Names of contract types the signatures do not already know."""
+    known: dict[int, str] = {}
+    for signature in signatures:
+        known.update(signature.type_names)
+    known.update(_type_names_for_ids(set(contract_items) - set(known)))
+    return known
+
+
+def score_contract_against_signature(
+    contract_items: dict[int, int],
+    signature: FittingSignature,
+    type_names: dict[int, str],
+) -> tuple[float, list[tuple[str, int]], list[tuple[str, int]]]:
+    """
+    ``score_contract_against_fitting`` on a compiled signature, in memory.
+
+    ``type_names`` must cover the contract's types (fitting types come from
+    the signature); unknown ids are shown as numbers.
+    """
+    score_items = signature.structural
+    display_items = signature.display
     if not score_items and not display_items:
         return 0.0, [], []
 
+    def name_of(type_id):
+        return signature.type_names.get(type_id) or type_names.get(
+            type_id, str(type_id)
+        )
+
     total_required = sum(score_items.values())
     matched = 0
-    missing = []
-    fit_type_ids = set(display_items.keys())
-    type_names = _type_names_for_ids(fit_type_ids | set(contract_items.keys()))
-
     for type_id, required in score_items.items():
-        have = contract_items.get(type_id, 0)
-        matched += min(have, required)
+        matched += min(contract_items.get(type_id, 0), required)
 
+    missing = []
     for type_id, required in display_items.items():
         have = contract_items.get(type_id, 0)
         if have < required:
-            name = type_names.get(type_id, str(type_id))
-            missing.append((name, required - have))
+            missing.append((name_of(type_id), required - have))
 
     extra = []
     for type_id, have in contract_items.items():
         required = display_items.get(type_id, 0)
         if have > required:
-            name = type_names.get(type_id, str(type_id))
-            extra.append((name, have - required))
-        elif type_id not in fit_type_ids:
-            name = type_names.get(type_id, str(type_id))
-            extra.append((name, have))
+            extra.append((name_of(type_id), have - required))
+        elif type_id not in display_items:
+            extra.append((name_of(type_id), have))
 
     score = matched / total_required if total_required else 0.0
     return score, missing, extra
@@ -174,16 +170,45 @@ def match_contract_to_fitting(
     EveFitting | None, float, list[tuple[str, int]], list[tuple[str, int]]
 ]:
     """Pick the highest-scoring candidate; ties prefer preferred_fitting."""
+    candidates = list(candidates)
+    signatures = fitting_signatures(candidates)
+    type_names = _contract_type_names(contract_items, signatures.values())
+
+    def scored():
+        for fitting in candidates:
+            signature = signatures.get(fitting.id)
+            if signature is None:
+                yield fitting, 0.0, [], []
+                continue
+            yield (
+                fitting,
+                *score_contract_against_signature(
+                    contract_items, signature, type_names
+                ),
+            )
+
+    return pick_best_fitting(contract_items, scored(), preferred_fitting)
+
+
+def pick_best_fitting(
+    contract_items: dict[int, int],
+    scored,
+    preferred_fitting: EveFitting | None = None,
+) -> tuple[
+    EveFitting | None, float, list[tuple[str, int]], list[tuple[str, int]]
+]:
+    """
+    Best of ``scored`` ``(fitting, score, missing, extra)`` rows. Ties go to
+    ``preferred_fitting``, or without one to a fitting whose hull is in the
+    contract.
+    """
     best_fitting = None
     best_score = -1.0
     best_missing: list[tuple[str, int]] = []
     best_extra: list[tuple[str, int]] = []
     preferred_pk = preferred_fitting.pk if preferred_fitting else None
 
-    for fitting in candidates:
-        score, missing, extra = score_contract_against_fitting(
-            contract_items, fitting
-        )
+    for fitting, score, missing, extra in scored:
         if score > best_score:
             best_score = score
             best_fitting = fitting
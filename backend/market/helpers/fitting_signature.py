@@ -0,0 +1,173 @@
+"""
+Fittings compiled once into type-quantity signatures for contract matching.
+
+Scoring a contract against a fitting used to parse the EFT twice and look
+the names up in EveType three times, for every contract x candidate pair.
+The signature (EveFittingSignature) stores the result of that work, split
+into structural (hull/module/subsystem, the match score) and consumable
+types, plus the names used for missing/extra display. It is compiled when
+a fitting save commits (market.signals) and otherwise on first use:
+``fitting_signatures`` recompiles rows whose EFT changed, or whose
+unresolved names (e.g. saved before the SDE types were loaded) now have an
+EveType; checking those names is one query and nothing is written while
+they stay unresolved.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from django.utils import timezone
+from eveuniverse.models import EveType
+from fittings.models import EveFitting
+
+from eveonline.helpers.db_sync import bulk_upsert
+from market.models import EveFittingSignature, parse_eft_items
+
+# Hull, modules, subsystems, and rigs — exclude charges/drones/paste/fuel.
+STRUCTURAL_CATEGORIES = frozenset({"Ship", "Module", "Subsystem"})
+
+
+@dataclass
+class FittingSignature:
+    fitting_id: int
+    structural: dict[int, int] = field(default_factory=dict)
+    consumables: dict[int, int] = field(default_factory=dict)
+    type_names: dict[int, str] = field(default_factory=dict)
+
+    @property
+    def display(self) -> dict[int, int]:
+        """Every resolved EFT type (structural and consumables)."""
+        return {**self.structural, **self.consumables}
+
+    @classmethod
+    def from_row(cls, row: EveFittingSignature) -> FittingSignature:
+        return cls(
+            fitting_id=row.fitting_id,
+            structural={int(k): v for k, v in row.structural.items()},
+            consumables={int(k): v for k, v in row.consumables.items()},
+            type_names={int(k): v for k, v in row.type_names.items()},
+        )
+
+
+def eft_hash(eft_format: str) -> str:
+    return hashlib.sha1((eft_format or "").encode()).hexdigest()
+
+
+def compile_fitting_signatures(
+    fittings: Iterable[EveFitting],
+) -> dict[int, FittingSignature]:
+    """Parse and resolve ``fittings`` with one EveType query, and store them."""
+    fittings = list(fittings)
+    if not fittings:
+        return {}
+    per_fitting_names = {
+        fitting.id: parse_eft_items(fitting.eft_format) for fitting in fittings
+    }
+    all_names = {
+        name for names in per_fitting_names.values() for name in names
+    }
+    name_to_meta = {
+        name: (type_id, category)
+        for name, type_id, category in EveType.objects.filter(
+            name__in=all_names
+        ).values_list("name", "id", "eve_group__eve_category__name")
+    }
+
+    now = timezone.now()
+    rows = []
+    signatures = {}
+    for fitting in fittings:
+        structural: dict[int, int] = defaultdict(int)
+        consumables: dict[int, int] = defaultdict(int)
+        type_names: dict[int, str] = {}
+        unresolved = []
+        for name, qty in per_fitting_names[fitting.id].items():
+            meta = name_to_meta.get(name)
+            if not meta:
+                unresolved.append(name)
+                continue
+            type_id, category = meta
+            type_names[type_id] = name
+            if category in STRUCTURAL_CATEGORIES:
+                structural[type_id] += qty
+            else:
+                consumables[type_id] += qty
+        signatures[fitting.id] = FittingSignature(
+            fitting.id, dict(structural), dict(consumables), type_names
+        )
+        rows.append(
+            EveFittingSignature(
+                fitting_id=fitting.id,
+                eft_hash=eft_hash(fitting.eft_format),
+                structural=structural,
+                consumables=consumables,
+                type_names=type_names,
+                unresolved=sorted(unresolved),
+                compiled_at=now,
+            )
+        )
+    bulk_upsert(
+        queryset=EveFittingSignature.objects.all(),
+        instances=rows,
+        key_fields=["fitting"],
+        update_fields=[
+            "eft_hash",
+            "structural",
+            "consumables",
+            "type_names",
+            "unresolved",
+            "compiled_at",
+        ],
+    )
+    return signatures
+
+
+def fitting_signatures(
+    fittings: Iterable[EveFitting],
+) -> dict[int, FittingSignature]:
+    """
+    Signatures for ``fittings``: one read when all are compiled and current,
+    otherwise the stale or missing ones are compiled first.
+    """
+    fittings = list(fittings)
+    if not fittings:
+        return {}
+    stored = {
+        row.fitting_id: row
+        for row in EveFittingSignature.objects.filter(
+            fitting_id__in=[fitting.id for fitting in fittings]
+        )
+    }
+    current = {}
+    stale = []
+    for fitting in fittings:
+        row = stored.get(fitting.id)
+        if row is None or row.eft_hash != eft_hash(fitting.eft_format):
+            stale.append(fitting)
+        else:
+            current[fitting.id] = (fitting, row)
+
+    unresolved = {
+        name for _, row in current.values() for name in row.unresolved
+    }
+    if unresolved:
+        resolved = set(
+            EveType.objects.filter(name__in=unresolved).values_list(
+                "name", flat=True
+            )
+        )
+        for fitting_id, (fitting, row) in list(current.items()):
+            if resolved.intersection(row.unresolved):
+                stale.append(fitting)
+                del current[fitting_id]
+
+    result = {
+        fitting_id: FittingSignature.from_row(row)
+        for fitting_id, (_, row) in current.items()
+    }
+    result.update(compile_fitting_signatures(stale))
+    return result
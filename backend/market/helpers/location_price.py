@@ -12,10 +12,9 @@ and “Jita buy/sell” baselines, use market.helpers.pricing.get_prices_by_type
 import logging
 from decimal import Decimal
 
-from django.db import transaction
-from django.utils import timezone
 
 from eveonline.client import EsiClient, get_region_market_orders_pages
+from eveonline.helpers.db_sync import bulk_upsert
 from eveonline.models import EveLocation
 from eveuniverse.models import EveType
 
@@ -171,7 +170,7 @@ def _persist_location_prices(
     buy_max: dict,
     filter_type_id: int | None,
 ) -> int:
-    """Delete stale rows, create/update EveMarketItemLocationPrice. Returns count of rows written."""
+    """Delete stale rows, upsert EveMarketItemLocationPrice. Returns count of rows written."""
     logger.info(
         "Persisting location prices: location_id=%s type_count=%s filter_type_id=%s",
         location_id,
@@ -192,15 +191,12 @@ def _persist_location_prices(
     types_cache: dict[int, EveType] = {}
     _ensure_eve_types(type_ids, types_cache)
 
-    now = timezone.now()
-    to_create = []
-    to_update = []
-
     if filter_type_id is None:
         EveMarketItemLocationPrice.objects.filter(
             location_id=location_id
         ).exclude(item_id__in=type_ids).delete()
 
+    instances = []
     for tid in type_ids:
         if tid not in types_cache:
             continue
@@ -209,42 +205,32 @@ def _persist_location_prices(
         split_price = (
             (sell_price + buy_price) / 2 if buy_price is not None else None
         )
-
-        existing = EveMarketItemLocationPrice.objects.filter(
-            location_id=location_id, item_id=tid
-        ).first()
-        if existing:
-            existing.sell_price = sell_price
-            existing.buy_price = buy_price
-            existing.split_price = split_price
-            existing.updated_at = now
-            to_update.append(existing)
-        else:
-            to_create.append(
-                EveMarketItemLocationPrice(
-                    location_id=location_id,
-                    item_id=tid,
-                    sell_price=sell_price,
-                    buy_price=buy_price,
-                    split_price=split_price,
-                    updated_at=now,
-                )
+        instances.append(
+            EveMarketItemLocationPrice(
+                location_id=location_id,
+                item_id=tid,
+                sell_price=sell_price,
+                buy_price=buy_price,
+                split_price=split_price,
             )
+        )
 
-    with transaction.atomic():
-        if to_update:
-            EveMarketItemLocationPrice.objects.bulk_update(
-                to_update,
-                ["sell_price", "buy_price", "split_price", "updated_at"],
-            )
-        if to_create:
-            EveMarketItemLocationPrice.objects.bulk_create(to_create)
-
-    n = len(to_create) + len(to_update)
+    # Unchanged prices are not written, so updated_at marks real changes
+    # (the LP offer economics rebuild keys its dirty set on it).
+    result = bulk_upsert(
+        queryset=EveMarketItemLocationPrice.objects.filter(
+            location_id=location_id
+        ),
+        instances=instances,
+        key_fields=["location", "item"],
+        update_fields=["sell_price", "buy_price", "split_price"],
+    )
+    n = result.inserted + result.updated
     logger.info(
-        "Location prices updated: location_id=%s %s row(s)",
+        "Location prices updated: location_id=%s %s row(s), %s unchanged",
         location_id,
         n,
+        result.unchanged,
     )
     return n
 
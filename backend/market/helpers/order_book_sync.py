@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import logging
 from datetime import datetime
+from decimal import Decimal
 
 from django.core.cache import cache
 from django.db import transaction
@@ -30,6 +31,18 @@ logger = logging.getLogger(__name__)
 
 ORDER_BOOK_SYNC_LOCK_TTL = 600
 ORDER_BOOK_SYNC_LOCK_PREFIX = "market:order_book_sync:"
+ORDER_BOOK_WRITE_BATCH_SIZE = 1000
+# Matches EveMarketItemOrder.price decimal_places so unchanged prices compare equal.
+PRICE_QUANTUM = Decimal("0.01")
+ORDER_DIFF_FIELDS = (
+    "item_id",
+    "price",
+    "quantity",
+    "is_buy_order",
+    "issuer_external_id",
+    "issued",
+    "duration_days",
+)
 
 
 def _lock_key(location_id: int) -> str:
@@ -38,24 +51,71 @@ def _lock_key(location_id: int) -> str:
 
 def fetch_structure_orders_for_location(
     character_id: int, location_id: int
-) -> list[dict] | None:
+) -> tuple[list[dict], str | None] | None:
     """
     Fetch all structure market order pages for a location.
 
-    Returns a list of order dicts, or None if the token/request failed.
+    Returns (order dicts, etag), or None if the token/request failed. etag
+    identifies the whole book (None when ESI sent no ETag for some page);
+    compare it with EveMarketOrderBookSync.applied_etag, not with whether
+    the pages came from the shared response cache.
     """
-    client = EsiClient(character_id)
-    orders: list[dict] = []
-    for page_data in client.get_structure_market_orders_pages(location_id):
-        if page_data is None:
-            logger.warning(
-                "Failed to fetch structure orders for location_id=%s "
-                "(invalid token or ESI error)",
-                location_id,
-            )
-            return None
-        orders.extend(page_data)
-    return orders
+    response = EsiClient(character_id).get_structure_market_orders(location_id)
+    if not response.success():
+        logger.warning(
+            "Failed to fetch structure orders for location_id=%s (%s)",
+            location_id,
+            response.error_text(),
+        )
+        return None
+    return response.data or [], response.etag
+
+
+def _order_row(location: EveLocation, parsed, raw: dict) -> EveMarketItemOrder:
+    return EveMarketItemOrder(
+        order_id=parsed.order_id,
+        item_id=parsed.type_id,
+        location=location,
+        price=parsed.price.quantize(PRICE_QUANTUM),
+        quantity=parsed.volume_remain,
+        is_buy_order=parsed.is_buy_order,
+        issuer_external_id=raw.get("issuer"),
+        issued=parsed.issued,
+        duration_days=parsed.duration_days,
+    )
+
+
+def _diff_order_rows(
+    previous_rows: list[EveMarketItemOrder],
+    incoming: dict[int, EveMarketItemOrder],
+) -> tuple[list, list, list]:
+    """
+    Key the stored book by order_id against the new one.
+
+    Returns (rows to insert, rows to update, pks to delete). Stored rows
+    whose fields all match are left alone.
+    """
+    to_update = []
+    to_delete = []
+    seen: set[int] = set()
+    for row in previous_rows:
+        new_row = incoming.get(row.order_id)
+        if new_row is None or row.order_id in seen:
+            to_delete.append(row.pk)
+            continue
+        seen.add(row.order_id)
+        changed = False
+        for field in ORDER_DIFF_FIELDS:
+            value = getattr(new_row, field)
+            if getattr(row, field) != value:
+                setattr(row, field, value)
+                changed = True
+        if changed:
+            to_update.append(row)
+    to_insert = [
+        row for order_id, row in incoming.items() if order_id not in seen
+    ]
+    return to_insert, to_update, to_delete
 
 
 def apply_order_book_snapshot(
@@ -64,12 +124,18 @@ def apply_order_book_snapshot(
     *,
     now: datetime | None = None,
     baseline_by_type: dict[int, int] | None = None,
+    etag: str | None = None,
 ) -> tuple[int, int]:
     """
     Diff previous DB orders against the new book, write inferred sales,
-    replace the location's order snapshot, and stamp the sync watermark.
+    apply the changed orders, and stamp the sync watermark (with the
+    book's etag, in the same transaction).
+
+    Orders are keyed by order_id: new ones are inserted, ones whose
+    price/volume/etc. changed are updated, and vanished ones deleted.
 
-    Returns (sales_created, orders_written).
+    Returns (sales_created, orders_written), where orders_written counts
+    inserted plus updated rows.
     """
     now = now or timezone.now()
     location_id = location.location_id
@@ -84,10 +150,12 @@ def apply_order_book_snapshot(
 
     previous = orders_from_db_rows(previous_rows)
     current: list = []
+    current_raw: list[dict] = []
     for raw in order_dicts:
         parsed = parse_esi_order(raw)
         if parsed is not None:
             current.append(parsed)
+            current_raw.append(raw)
 
     type_ids = {o.type_id for o in previous} | {o.type_id for o in current}
     if baseline_by_type is None and type_ids:
@@ -120,43 +188,46 @@ def apply_order_book_snapshot(
         if draft.type_id in types_cache
     ]
 
-    order_objs = []
-    for raw in order_dicts:
-        parsed = parse_esi_order(raw)
-        if parsed is None or parsed.type_id not in types_cache:
-            continue
-        order_objs.append(
-            EveMarketItemOrder(
-                order_id=parsed.order_id,
-                item_id=parsed.type_id,
-                location=location,
-                price=parsed.price,
-                quantity=parsed.volume_remain,
-                is_buy_order=parsed.is_buy_order,
-                issuer_external_id=raw.get("issuer"),
-                issued=parsed.issued,
-                duration_days=parsed.duration_days,
-            )
-        )
+    incoming = {
+        parsed.order_id: _order_row(location, parsed, raw)
+        for parsed, raw in zip(current, current_raw)
+        if parsed.type_id in types_cache
+    }
+    to_insert, to_update, to_delete = _diff_order_rows(previous_rows, incoming)
 
     with transaction.atomic():
         if sale_objs:
             EveMarketInferredSale.objects.bulk_create(sale_objs)
-        EveMarketItemOrder.objects.filter(location_id=location_id).delete()
-        if order_objs:
-            EveMarketItemOrder.objects.bulk_create(order_objs)
+        if to_delete:
+            EveMarketItemOrder.objects.filter(pk__in=to_delete).delete()
+        if to_update:
+            EveMarketItemOrder.objects.bulk_update(
+                to_update,
+                ORDER_DIFF_FIELDS,
+                batch_size=ORDER_BOOK_WRITE_BATCH_SIZE,
+            )
+        if to_insert:
+            EveMarketItemOrder.objects.bulk_create(
+                to_insert, batch_size=ORDER_BOOK_WRITE_BATCH_SIZE
+            )
         EveMarketOrderBookSync.objects.update_or_create(
             location_id=location_id,
-            defaults={"last_synced_at": now},
+            defaults={"last_synced_at": now, "applied_etag": etag or ""},
         )
 
+    orders_written = len(to_insert) + len(to_update)
     logger.info(
-        "Order book snapshot applied: location_id=%s sales=%s orders=%s",
+        "Order book snapshot applied: location_id=%s sales=%s orders=%s "
+        "inserted=%s updated=%s deleted=%s unchanged=%s",
         location_id,
         len(sale_objs),
-        len(order_objs),
+        len(incoming),
+        len(to_insert),
+        len(to_update),
+        len(to_delete),
+        len(incoming) - orders_written,
     )
-    return len(sale_objs), len(order_objs)
+    return len(sale_objs), orders_written
 
 
 def sync_structure_order_book_for_location(
@@ -166,6 +237,7 @@ def sync_structure_order_book_for_location(
     Lock, fetch, apply snapshot, and prune old inferred sales for one location.
 
     Returns (sales_created, orders_written), or None if lock/fetch skipped.
+    orders_written counts inserted plus updated order rows.
     """
     lock_key = _lock_key(location_id)
     if not cache.add(lock_key, "1", timeout=ORDER_BOOK_SYNC_LOCK_TTL):
@@ -183,13 +255,27 @@ def sync_structure_order_book_for_location(
             )
             return None
 
-        order_dicts = fetch_structure_orders_for_location(
+        fetched = fetch_structure_orders_for_location(
             character_id, location_id
         )
-        if order_dicts is None:
+        if fetched is None:
             return None
+        order_dicts, etag = fetched
 
-        sales, orders = apply_order_book_snapshot(location, order_dicts)
+        if etag and EveMarketOrderBookSync.objects.filter(
+            location_id=location_id, applied_etag=etag
+        ).update(last_synced_at=timezone.now()):
+            # Same book as this sync last applied: no sales to infer and
+            # nothing to rewrite, just move the watermark forward.
+            logger.info(
+                "Order book unchanged for location_id=%s, skipping rewrite",
+                location_id,
+            )
+            return 0, 0
+
+        sales, orders = apply_order_book_snapshot(
+            location, order_dicts, etag=etag
+        )
         prune_inferred_sales()
         return sales, orders
     finally:
@@ -0,0 +1,193 @@
+"""
+Time contract-to-fitting matching over outstanding contracts three ways:
+
+- ``per-pair``: the previous scorer, which parsed the EFT and looked names
+  up in EveType for every contract x candidate fitting;
+- ``cold``: stored fitting signatures dropped first, so the run compiles
+  them in bulk;
+- ``warm``: signatures already stored (the steady state).
+
+Uses outstanding contracts whose items have been fetched; candidates are
+the active fittings whose hull is in the contract plus the contract's
+current fitting. Runs inside a transaction that is rolled back. The
+command fails if any mode disagrees on fitting, score, missing or extra.
+
+    pipenv run python manage.py benchmark_contract_matching
+    pipenv run python manage.py benchmark_contract_matching --limit 5000
+"""
+
+import time
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from eveuniverse.models import EveType
+from fittings.models import EveFitting
+
+from market.helpers.contract_match import (
+    match_contract_to_fitting,
+    pick_best_fitting,
+)
+from market.helpers.fitting_signature import STRUCTURAL_CATEGORIES
+from market.models import (
+    EveFittingSignature,
+    EveMarketContract,
+    EveMarketContractItem,
+    parse_eft_items,
+)
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _per_pair_quantities(fitting, structural_only):
+    per_name = parse_eft_items(fitting.eft_format)
+    rows = EveType.objects.filter(name__in=list(per_name)).values_list(
+        "name", "id", "eve_group__eve_category__name"
+    )
+    meta = {name: (type_id, category) for name, type_id, category in rows}
+    aggregated = defaultdict(int)
+    for name, qty in per_name.items():
+        if name not in meta:
+            continue
+        type_id, category = meta[name]
+        if structural_only and category not in STRUCTURAL_CATEGORIES:
+            continue
+        aggregated[type_id] += qty
+    return dict(aggregated)
+
+
+def _per_pair_score(contract_items, fitting):
+    """The scorer before fitting signatures (two parses, three queries)."""
+    score_items = _per_pair_quantities(fitting, structural_only=True)
+    display_items = _per_pair_quantities(fitting, structural_only=False)
+    if not score_items and not display_items:
+        return 0.0, [], []
+    type_names = dict(
+        EveType.objects.filter(
+            id__in=set(display_items) | set(contract_items)
+        ).values_list("id", "name")
+    )
+    total = sum(score_items.values())
+    matched = sum(
+        min(contract_items.get(type_id, 0), required)
+        for type_id, required in score_items.items()
+    )
+    missing = [
+        (type_names.get(type_id, str(type_id)), required - have)
+        for type_id, required in display_items.items()
+        if (have := contract_items.get(type_id, 0)) < required
+    ]
+    extra = []
+    for type_id, have in contract_items.items():
+        required = display_items.get(type_id, 0)
+        if have > required:
+            extra.append(
+                (type_names.get(type_id, str(type_id)), have - required)
+            )
+        elif type_id not in display_items:
+            extra.append((type_names.get(type_id, str(type_id)), have))
+    return (matched / total if total else 0.0), missing, extra
+
+
+def _per_pair_match(contract_items, candidates, preferred_fitting):
+    scored = (
+        (fitting, *_per_pair_score(contract_items, fitting))
+        for fitting in candidates
+    )
+    return pick_best_fitting(contract_items, scored, preferred_fitting)
+
+
+def _workload(limit):
+    """(contract items, candidates, preferred fitting) per contract."""
+    contracts = list(
+        EveMarketContract.objects.filter(
+            status="outstanding", items_fetched=True
+        ).select_related("fitting")[:limit]
+    )
+    items = defaultdict(lambda: defaultdict(int))
+    for contract_id, type_id, quantity in EveMarketContractItem.objects.filter(
+        contract__in=contracts, is_included=True
+    ).values_list("contract_id", "type_id", "quantity"):
+        items[contract_id][type_id] += quantity or 1
+    by_hull = defaultdict(list)
+    for fitting in EveFitting.objects.filter(deleted__isnull=True):
+        by_hull[fitting.ship_id].append(fitting)
+
+    workload = []
+    for contract in contracts:
+        contract_items = dict(items[contract.id])
+        candidates = {
+            fitting.id: fitting
+            for type_id in contract_items
+            for fitting in by_hull.get(type_id, ())
+        }
+        if contract.fitting is not None:
+            candidates[contract.fitting.id] = contract.fitting
+        if candidates:
+            workload.append(
+                (contract_items, list(candidates.values()), contract.fitting)
+            )
+    return workload
+
+
+def _outcome(result):
+    fitting, score, missing, extra = result
+    return (fitting.id if fitting else None, score, missing, extra)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark contract-to-fitting matching with per-pair EFT parsing "
+        "versus stored fitting signatures."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=3000)
+
+    def handle(self, *args, **options):
+        workload = _workload(options["limit"])
+        if not workload:
+            raise CommandError(
+                "No outstanding contracts with fetched items and candidates"
+            )
+        pairs = sum(len(candidates) for _, candidates, _ in workload)
+        self.stdout.write(
+            f"{len(workload)} contracts, {pairs} contract x fitting pairs"
+        )
+
+        def run(match):
+            return [
+                _outcome(match(contract_items, candidates, preferred))
+                for contract_items, candidates, preferred in workload
+            ]
+
+        def cold():
+            EveFittingSignature.objects.all().delete()
+            return run(match_contract_to_fitting)
+
+        results = {}
+        try:
+            with transaction.atomic():
+                for mode, func in (
+                    ("per-pair", lambda: run(_per_pair_match)),
+                    ("cold", cold),
+                    ("warm", lambda: run(match_contract_to_fitting)),
+                ):
+                    with CaptureQueriesContext(connection) as queries:
+                        start = time.perf_counter()
+                        results[mode] = func()
+                        elapsed = time.perf_counter() - start
+                    self.stdout.write(
+                        f"{mode:<9} {elapsed * 1000:.1f}ms "
+                        f"queries={len(queries)}"
+                    )
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+        if not results["per-pair"] == results["cold"] == results["warm"]:
+            raise CommandError("Per-pair and signature matches differ")
+        self.stdout.write("Matches identical")
@@ -0,0 +1,156 @@
+"""
+Benchmark the region order-book page fetcher against a local stub ESI server.
+
+No live ESI traffic: a threaded HTTP server on 127.0.0.1 serves synthetic
+order pages with X-Pages and a simulated per-request latency. Each run
+streams the pages into the same aggregation used by
+fetch_market_location_prices and reports wall time and pages/sec.
+
+    pipenv run python manage.py benchmark_region_market_orders
+    pipenv run python manage.py benchmark_region_market_orders --pages 400 --latency-ms 120
+    pipenv run python manage.py benchmark_region_market_orders --concurrency 1,4,8,16
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from django.core.management.base import BaseCommand, CommandError
+
+from eveonline.client import get_region_market_orders_pages
+from market.helpers.location_price import (
+    _aggregate_orders_into_prices,
+    _merge_aggregates,
+)
+
+STUB_REGION_ID = 10000002
+STUB_LOCATION_ID = 60003760
+ORDERS_PER_PAGE = 1000
+
+
+def _page_body(page: int) -> bytes:
+    orders = []
+    for i in range(ORDERS_PER_PAGE):
+        n = page * ORDERS_PER_PAGE + i
+        orders.append(
+            {
+                "order_id": n,
+                "type_id": 34 + (n % 5000),
+                "location_id": STUB_LOCATION_ID if n % 3 else 60008494,
+                "price": 10.0 + (n % 997) / 10,
+                "is_buy_order": bool(n % 2),
+                "range": "station" if n % 4 else "region",
+                "volume_remain": 100,
+            }
+        )
+    return json.dumps(orders).encode()
+
+
+def _make_handler(pages: int, latency: float, bodies: dict):
+    class StubEsiHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):  # noqa: N802 pylint: disable=invalid-name
+            query = parse_qs(urlparse(self.path).query)
+            page = int(query.get("page", ["1"])[0])
+            time.sleep(latency)
+            body = bodies[(page - 1) % len(bodies)] if page <= pages else b""
+            self.send_response(200 if page <= pages else 404)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("X-Pages", str(pages))
+            self.send_header("X-ESI-Error-Limit-Remain", "100")
+            self.send_header("X-ESI-Error-Limit-Reset", "60")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(
+            self, format, *args
+        ):  # pylint: disable=redefined-builtin
+            return
+
+    return StubEsiHandler
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark get_region_market_orders_pages against a local stub ESI "
+        "server (wall time and pages/sec per concurrency level)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--pages",
+            type=int,
+            default=400,
+            help="Number of order pages the stub serves (default: 400).",
+        )
+        parser.add_argument(
+            "--latency-ms",
+            type=int,
+            default=80,
+            help="Simulated per-request latency in ms (default: 80).",
+        )
+        parser.add_argument(
+            "--concurrency",
+            default="1,8",
+            help="Comma-separated concurrency levels to compare (default: 1,8).",
+        )
+
+    def handle(self, *args, **options):
+        pages = options["pages"]
+        if pages < 1:
+            raise CommandError("--pages must be at least 1")
+        try:
+            levels = [
+                int(c) for c in options["concurrency"].split(",") if c.strip()
+            ]
+        except ValueError as exc:
+            raise CommandError("--concurrency must be integers") from exc
+
+        # A handful of distinct bodies keeps stub CPU out of the measurement.
+        bodies = {i: _page_body(i + 1) for i in range(min(pages, 8))}
+        handler = _make_handler(pages, options["latency_ms"] / 1000, bodies)
+        server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        server.daemon_threads = True
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+        try:
+            for concurrency in levels:
+                self._run(base_url, pages, concurrency)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def _run(self, base_url: str, pages: int, concurrency: int):
+        sell_min: dict = {}
+        buy_max: dict = {}
+        received = 0
+        start = time.perf_counter()
+        for page_data in get_region_market_orders_pages(
+            STUB_REGION_ID, concurrency=concurrency, base_url=base_url
+        ):
+            if page_data is None:
+                raise CommandError(
+                    f"Stub fetch failed at concurrency={concurrency}"
+                )
+            received += 1
+            s, b = _aggregate_orders_into_prices(
+                page_data, location_id=STUB_LOCATION_ID
+            )
+            _merge_aggregates(sell_min, buy_max, s, b)
+        elapsed = time.perf_counter() - start
+        if received != pages:
+            raise CommandError(
+                f"Expected {pages} pages, received {received} "
+                f"(concurrency={concurrency})"
+            )
+        self.stdout.write(
+            f"concurrency={concurrency:<3} pages={received} "
+            f"wall={elapsed:.2f}s pages/sec={received / elapsed:.1f} "
+            f"types={len(sell_min)}"
+        )
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("fittings", "0033_evefittingchangerequest_refit_set_null"),
+        ("market", "0047_fittingbuyorderline_swap_hull_qty"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EveFittingSignature",
+            fields=[
+                (
+                    "fitting",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="market_signature",
+                        serialize=False,
+                        to="fittings.evefitting",
+                    ),
+                ),
+                ("eft_hash", models.CharField(max_length=40)),
+                ("structural", models.JSONField(default=dict)),
+                ("consumables", models.JSONField(default=dict)),
+                ("type_names", models.JSONField(default=dict)),
+                ("unresolved", models.JSONField(default=list)),
+                ("compiled_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "EVE fitting match signature",
+            },
+        ),
+    ]
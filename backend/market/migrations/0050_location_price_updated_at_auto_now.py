@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("market", "0049_order_book_sync_applied_etag"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="evemarketitemlocationprice",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -5,6 +5,7 @@ from market.models.contract import (
     EveMarketContractExpectation,
     EveMarketContractItem,
 )
+from market.models.fitting_signature import EveFittingSignature
 from market.models.fitting_buy_order import (
     FittingBuyJitaCheck,
     FittingBuyJitaCheckStatus,
@@ -38,6 +39,7 @@ __all__ = [
     "EveMarketContractError",
     "EveMarketContractExpectation",
     "EveMarketContractItem",
+    "EveFittingSignature",
     "EveMarketBuyOrderExpectation",
     "EveMarketFittingExpectation",
     "EveMarketInferredSale",
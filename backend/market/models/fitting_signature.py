@@ -0,0 +1,33 @@
+from django.db import models
+
+from fittings.models import EveFitting
+
+
+class EveFittingSignature(models.Model):
+    """
+    A fitting's EFT compiled to type quantities for contract matching
+    (see market.helpers.fitting_signature).
+
+    ``structural`` holds hull/module/subsystem types (the match score);
+    ``consumables`` the rest (charges, drones, paste...). Keys are type ids
+    as strings (JSON). ``unresolved`` lists EFT names with no EveType yet.
+    """
+
+    fitting = models.OneToOneField(
+        EveFitting,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="market_signature",
+    )
+    eft_hash = models.CharField(max_length=40)
+    structural = models.JSONField(default=dict)
+    consumables = models.JSONField(default=dict)
+    type_names = models.JSONField(default=dict)
+    unresolved = models.JSONField(default=list)
+    compiled_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "EVE fitting match signature"
+
+    def __str__(self):
+        return f"Signature for fitting {self.fitting_id}"
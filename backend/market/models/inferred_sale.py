@@ -15,6 +15,8 @@ class EveMarketOrderBookSync(models.Model):
         related_name="order_book_sync",
     )
     last_synced_at = models.DateTimeField(null=True, blank=True)
+    # Combined ETag of the book last applied; an identical fetch is skipped.
+    applied_etag = models.CharField(max_length=64, blank=True, default="")
 
     class Meta:
         verbose_name = "EVE market order book sync"
@@ -10,7 +10,6 @@ market.helpers.pricing.get_prices_by_type_id — see docs/market-pricing.md.
 """
 
 from django.db import models
-from django.utils import timezone
 
 from eveuniverse.models import EveType
 from eveonline.models import EveLocation
@@ -54,7 +53,8 @@ class EveMarketItemLocationPrice(models.Model):
         blank=True,
         help_text="(sell_price + buy_price) / 2; null when buy_price is null.",
     )
-    updated_at = models.DateTimeField(default=timezone.now)
+    # Moves only when a price changes (see _persist_location_prices).
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name = "EVE market item location price"
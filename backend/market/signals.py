@@ -0,0 +1,23 @@
+from django.db import transaction
+from django.db.models import signals
+from django.dispatch import receiver
+
+from fittings.models import EveFitting
+
+from market.helpers.fitting_signature import compile_fitting_signatures
+
+
+@receiver(
+    signals.post_save,
+    sender=EveFitting,
+    dispatch_uid="compile_market_fitting_signature",
+)
+def compile_market_fitting_signature(sender, instance, **kwargs):
+    """
+    Recompile the contract-matching signature once the fitting save commits.
+    Failures are logged and never fail the save: fitting_signatures
+    recompiles stale signatures on first use.
+    """
+    transaction.on_commit(
+        lambda: compile_fitting_signatures([instance]), robust=True
+    )
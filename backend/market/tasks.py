@@ -15,8 +15,6 @@ from eveonline.models import (
 from industry.helpers.lp_catalog import lp_market_history_type_ids
 from market.helpers import (
     clear_structure_sell_orders_for_location,
-    create_or_update_contract,
-    create_or_update_contract_from_db_contract,
     fetch_and_update_market_location_prices,
     get_character_with_structure_markets_scope,
     known_contract_issuer_ids,
@@ -25,6 +23,12 @@ from market.helpers import (
     update_expired_contracts,
     update_region_market_history_for_type,
 )
+from market.helpers.contract_ingest import (
+    FittingTitleIndex,
+    db_contract_fields,
+    ingest_contracts,
+    public_contract_fields,
+)
 from market.helpers.contract_items import fetch_and_match_contract_items
 from market.helpers.health_snapshot import (
     record_contract_health_snapshots,
@@ -403,8 +407,12 @@ def fetch_eve_market_contracts():
         [loc.location_name for loc in market_locations],
     )
 
+    fittings = FittingTitleIndex.load()
+    steps = {}
+
     # 1. Fetch public contracts from ESI and store them
     logger.info("Step 1: Fetching public contracts from ESI")
+    staged = {}
     for location in market_locations:
         logger.info(
             "Fetching public contracts for %s (region_id=%s)",
@@ -428,14 +436,19 @@ def fetch_eve_market_contracts():
             continue
         contracts = list(esi_response.results())
         for contract in contracts:
-            create_or_update_contract(contract, location)
+            fields = public_contract_fields(contract, location, fittings)
+            if fields is not None:
+                staged[contract["contract_id"]] = fields
         logger.info(
             "Processed %s public contract(s) for %s",
             len(contracts),
             location.location_name,
         )
-
-    logger.info("Step 1 complete: public contracts from ESI updated")
+    steps["public"] = ingest_contracts(staged)
+    logger.info(
+        "Step 1 complete: public contracts from ESI updated (%s)",
+        steps["public"],
+    )
 
     # Contract IDs already stored as finished (private) never change state; skip them
     finished_private_contract_ids = set(
@@ -448,56 +461,43 @@ def fetch_eve_market_contracts():
         len(finished_private_contract_ids),
     )
 
-    # 2. Fetch character contracts from our database, store if they match parameters
-    logger.info("Step 2: Fetching character contracts from database")
-    if not location_ids:
-        logger.info("No market locations, skipping character contracts")
-    else:
-        char_contracts = EveCharacterContract.objects.filter(
-            type=EveMarketContract.esi_contract_type,
-            start_location_id__in=location_ids,
-        ).exclude(contract_id__in=finished_private_contract_ids)
-        char_contracts_list = list(char_contracts)
+    # 2./3. Character then corporation contracts from our database, stored
+    # if they match parameters
+    for step, label, model in (
+        (2, "character", EveCharacterContract),
+        (3, "corporation", EveCorporationContract),
+    ):
         logger.info(
-            "Found %s character contract(s) to process",
-            len(char_contracts_list),
+            "Step %s: Fetching %s contracts from database", step, label
         )
-        char_stored = 0
-        for db_contract in char_contracts_list:
-            location = locations_by_id.get(db_contract.start_location_id)
-            if location and create_or_update_contract_from_db_contract(
-                db_contract, location
-            ):
-                char_stored += 1
-        logger.info(
-            "Step 2 complete: stored %s character contract(s) into EveMarketContract",
-            char_stored,
+        if not location_ids:
+            logger.info("No market locations, skipping %s contracts", label)
+            continue
+        db_contracts = list(
+            model.objects.filter(
+                type=EveMarketContract.esi_contract_type,
+                start_location_id__in=location_ids,
+            ).exclude(contract_id__in=finished_private_contract_ids)
         )
-
-    # 3. Fetch corporation contracts from our database, store if they match parameters
-    logger.info("Step 3: Fetching corporation contracts from database")
-    if not location_ids:
-        logger.info("No market locations, skipping corporation contracts")
-    else:
-        corp_contracts = EveCorporationContract.objects.filter(
-            type=EveMarketContract.esi_contract_type,
-            start_location_id__in=location_ids,
-        ).exclude(contract_id__in=finished_private_contract_ids)
-        corp_contracts_list = list(corp_contracts)
         logger.info(
-            "Found %s corporation contract(s) to process",
-            len(corp_contracts_list),
+            "Found %s %s contract(s) to process", len(db_contracts), label
         )
-        corp_stored = 0
-        for db_contract in corp_contracts_list:
+        staged = {}
+        for db_contract in db_contracts:
             location = locations_by_id.get(db_contract.start_location_id)
-            if location and create_or_update_contract_from_db_contract(
-                db_contract, location
-            ):
-                corp_stored += 1
+            fields = location and db_contract_fields(
+                db_contract, location, fittings
+            )
+            if fields:
+                staged[db_contract.contract_id] = fields
+        steps[label] = ingest_contracts(staged)
         logger.info(
-            "Step 3 complete: stored %s corporation contract(s) into EveMarketContract",
-            corp_stored,
+            "Step %s complete: stored %s %s contract(s) into "
+            "EveMarketContract (%s)",
+            step,
+            len(staged),
+            label,
+            steps[label],
         )
 
     logger.info("Updating completed contract statuses (since %s)", start_time)
@@ -536,6 +536,11 @@ def fetch_eve_market_contracts():
     logger.info("fetch_eve_market_contracts complete in %.1fs", duration)
 
     record_contract_health_snapshot_task.delay()
+    return {
+        "steps": {label: stats.as_dict() for label, stats in steps.items()},
+        "items_scheduled": scheduled,
+        "seconds": round(duration, 3),
+    }
 
 
 @app.task(queue="market")
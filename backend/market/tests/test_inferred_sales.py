@@ -12,7 +12,10 @@ from market.helpers.inferred_sales import (
     infer_sales_from_snapshots,
     velocity_stats,
 )
-from market.helpers.order_book_sync import apply_order_book_snapshot
+from market.helpers.order_book_sync import (
+    apply_order_book_snapshot,
+    sync_structure_order_book_for_location,
+)
 from market.models import (
     EveMarketInferredSale,
     EveMarketItemOrder,
@@ -267,3 +270,100 @@ class ApplyOrderBookSnapshotTestCase(TestCase):
         self.assertEqual(orders, 1)
         self.assertEqual(EveMarketInferredSale.objects.count(), 0)
         self.assertEqual(EveMarketItemOrder.objects.get().order_id, 2)
+
+    def test_apply_only_writes_changed_orders(self):
+        issued = self.now - timedelta(days=1)
+        for order_id, quantity in ((1, 100), (2, 50), (3, 10)):
+            EveMarketItemOrder.objects.create(
+                order_id=order_id,
+                item=self.item,
+                location=self.location,
+                price=Decimal("5.00"),
+                quantity=quantity,
+                is_buy_order=False,
+                issued=issued,
+                duration_days=90,
+            )
+        unchanged_pk = EveMarketItemOrder.objects.get(order_id=1).pk
+        EveMarketOrderBookSync.objects.create(
+            location=self.location,
+            last_synced_at=self.now - timedelta(hours=2),
+        )
+
+        def esi_order(order_id, price, volume):
+            return {
+                "order_id": order_id,
+                "type_id": 34,
+                "price": price,
+                "volume_remain": volume,
+                "is_buy_order": False,
+                "issued": issued.isoformat(),
+                "duration": 90,
+            }
+
+        with self.assertLogs(
+            "market.helpers.order_book_sync", level="INFO"
+        ) as logs:
+            _, orders = apply_order_book_snapshot(
+                self.location,
+                [
+                    esi_order(1, 5.0, 100),
+                    esi_order(2, 4.5, 50),
+                    esi_order(4, 6.0, 20),
+                ],
+                now=self.now,
+                baseline_by_type={34: 5},
+            )
+
+        self.assertEqual(orders, 2)
+        self.assertIn(
+            "inserted=1 updated=1 deleted=1 unchanged=1", logs.output[-1]
+        )
+        rows = {
+            row.order_id: row
+            for row in EveMarketItemOrder.objects.filter(
+                location=self.location
+            )
+        }
+        self.assertEqual(set(rows), {1, 2, 4})
+        self.assertEqual(rows[1].pk, unchanged_pk)
+        self.assertEqual(rows[2].price, Decimal("4.50"))
+        self.assertEqual(rows[4].quantity, 20)
+
+    @patch("market.helpers.order_book_sync.prune_inferred_sales")
+    @patch(
+        "market.helpers.order_book_sync.fetch_structure_orders_for_location"
+    )
+    def test_sync_skips_only_a_book_it_already_applied(self, fetch, prune):
+        book = [
+            {
+                "order_id": 1,
+                "type_id": 34,
+                "price": 5.0,
+                "volume_remain": 40,
+                "is_buy_order": False,
+            }
+        ]
+        # The etag may come from pages another consumer already fetched
+        # into the shared response cache; this sync has not applied it.
+        fetch.return_value = (book, "etag-1")
+
+        with patch(
+            "market.helpers.order_book_sync.get_prices_by_type_id",
+            return_value={34: 5},
+        ):
+            first = sync_structure_order_book_for_location(1, 9001)
+            second = sync_structure_order_book_for_location(1, 9001)
+            fetch.return_value = (book[:0], "etag-2")
+            third = sync_structure_order_book_for_location(1, 9001)
+
+        self.assertEqual((0, 1), first)
+        self.assertEqual((0, 0), second)
+        self.assertEqual((1, 0), third)  # the vanished order sold
+        self.assertFalse(EveMarketItemOrder.objects.exists())
+        self.assertEqual(
+            "etag-2",
+            EveMarketOrderBookSync.objects.get(
+                location=self.location
+            ).applied_etag,
+        )
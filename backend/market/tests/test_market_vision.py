@@ -48,6 +48,7 @@ from market.helpers.expectations_admin import (
     save_contract_expectation_quantities,
     save_fitting_expectation_quantities,
 )
+from market.helpers.fitting_signature import fitting_signatures
 from market.helpers.orders import process_structure_sell_orders_page
 from market.helpers.price_viability import (
     DEFAULT_BASELINE_PRICE_FLOOR,
@@ -78,6 +79,7 @@ from market.helpers.sell_orders_changelist import (
     _sort_sell_order_rows,
 )
 from market.models import (
+    EveFittingSignature,
     EveMarketContract,
     EveMarketContractExpectation,
     EveMarketFittingExpectation,
@@ -268,9 +270,10 @@ class BuyOrderSyncTestCase(TestCase):
 
 class ContractMatchTestCase(TestCase):
     def setUp(self):
-        self.fitting = EveFitting.objects.create(
-            name="[FL33T] Sabre",
-            eft_format="""[Sabre, [FL33T] Sabre]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.fitting = EveFitting.objects.create(
+                name="[FL33T] Sabre",
+                eft_format="""[Sabre, [FL33T] Sabre]
 Nanofiber Internal Structure II
 Nanofiber Internal Structure II
 125mm Gatling AutoCannon II
@@ -280,8 +283,8 @@ Nanofiber Internal Structure II
 125mm Gatling AutoCannon II
 Hail S x2000
 """,
-            ship_id=22456,
-        )
+                ship_id=22456,
+            )
         _make_typed_eve_type(22456, "Sabre", 6, "Ship")
         _make_typed_eve_type(
             2605, "Nanofiber Internal Structure II", 7, "Module"
@@ -429,6 +432,85 @@ Armor Energizing Charge x1000
         self.assertEqual(active.id, active_contract.fitting_id)
         self.assertGreaterEqual(active_contract.match_score, MATCH_THRESHOLD)
 
+    def test_signature_is_recompiled_once_types_resolve(self):
+        # The fitting was saved before its types existed.
+        self.assertEqual(
+            4,
+            len(
+                EveFittingSignature.objects.get(
+                    fitting=self.fitting
+                ).unresolved
+            ),
+        )
+        score_contract_against_fitting({22456: 1}, self.fitting)
+
+        signature = EveFittingSignature.objects.get(fitting=self.fitting)
+        self.assertEqual([], signature.unresolved)
+        self.assertEqual(
+            {"22456": 1, "2605": 2, "2873": 5}, signature.structural
+        )
+        self.assertEqual({"12608": 2000}, signature.consumables)
+
+    def test_still_unresolved_signature_is_not_recompiled(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            fitting = EveFitting.objects.create(
+                name="[FL33T] Sabre Unknown",
+                eft_format=self.fitting.eft_format.replace(
+                    "[FL33T] Sabre]", "[FL33T] Sabre Unknown]", 1
+                )
+                + "Unknown Module\n",
+                ship_id=22456,
+            )
+        compiled_at = EveFittingSignature.objects.get(
+            fitting=fitting
+        ).compiled_at
+
+        # One read for the signatures, one name lookup; no recompile.
+        with self.assertNumQueries(2):
+            signatures = fitting_signatures([fitting])
+
+        self.assertEqual(
+            {22456: 1, 2605: 2, 2873: 5}, signatures[fitting.id].structural
+        )
+        signature = EveFittingSignature.objects.get(fitting=fitting)
+        self.assertEqual(["Unknown Module"], signature.unresolved)
+        self.assertEqual(compiled_at, signature.compiled_at)
+
+    def test_signature_compile_failure_does_not_fail_fitting_save(self):
+        with patch(
+            "market.signals.compile_fitting_signatures",
+            side_effect=RuntimeError("boom"),
+        ), self.captureOnCommitCallbacks(execute=True):
+            self.fitting.save()
+
+        self.assertTrue(EveFitting.objects.filter(pk=self.fitting.pk).exists())
+
+    def test_match_with_compiled_signatures_reads_once(self):
+        other = EveFitting.objects.create(
+            name="[FL33T] Sabre Single Nano",
+            eft_format=self.fitting.eft_format.replace(
+                "[FL33T] Sabre]", "[FL33T] Sabre Single Nano]", 1
+            ).replace("Nanofiber Internal Structure II\n", "", 1),
+            ship_id=22456,
+        )
+        self.fitting.save()
+        contract_items = {22456: 1, 2605: 2, 2873: 4, 12608: 2000}
+        expected = [
+            score_contract_against_fitting(contract_items, fitting)
+            for fitting in (self.fitting, other)
+        ]
+
+        with self.assertNumQueries(1):
+            fitting, score, missing, extra = match_contract_to_fitting(
+                contract_items, [self.fitting, other]
+            )
+
+        self.assertEqual(self.fitting, fitting)
+        self.assertEqual(expected[0], (score, missing, extra))
+        self.assertEqual(
+            (0.875, [("125mm Gatling AutoCannon II", 1)], []), expected[0]
+        )
+
     def test_apply_content_match_clears_fitting_below_threshold(self):
         location = _make_location(location_id=9101)
         contract = EveMarketContract.objects.create(
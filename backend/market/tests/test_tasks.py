@@ -183,6 +183,78 @@ class MarketTaskTestCase(TestCase):
         self.assertEqual("market", kwargs["queue"])
         self.assertEqual(0, kwargs["countdown"])
 
+    @patch("market.tasks.fetch_contract_items_task")
+    @patch("market.tasks.EsiClient")
+    def test_fetch_eve_market_contracts_writes_only_changes(
+        self, esi_mock, items_task_mock
+    ):
+        location = EveLocation.objects.create(
+            location_id=1001,
+            location_name="Home base",
+            market_active=True,
+            region_id=100001,
+            solar_system_id=100002,
+        )
+        fitting = EveFitting.objects.create(
+            name="[FL33T] Thrasher",
+            eft_format="[Thrasher, [FL33T] Thrasher]",
+            ship_id=1001,
+        )
+        issued = timezone.now() - timedelta(days=1)
+        public = [
+            {
+                "contract_id": 10000000 + i,
+                "type": EveMarketContract.esi_contract_type,
+                "start_location_id": location.location_id,
+                "date_issued": issued,
+                "date_expired": issued + timedelta(days=30),
+                "title": "[FLEET] Thrasher",
+                "price": 12.34,
+                "issuer_id": 1,
+            }
+            for i in range(3)
+        ]
+        esi = esi_mock.return_value
+        esi.get_public_contracts.return_value = EsiResponse(
+            response_code=200, data=public
+        )
+
+        first = fetch_eve_market_contracts()
+        self.assertEqual(
+            (3, 3, 0, 0),
+            tuple(
+                first["steps"]["public"][key]
+                for key in ("seen", "created", "updated", "unchanged")
+            ),
+        )
+        self.assertEqual(
+            {fitting.id},
+            set(
+                EveMarketContract.objects.values_list("fitting_id", flat=True)
+            ),
+        )
+
+        EveMarketContract.objects.filter(id=10000001).update(
+            items_fetched=True, fitting=None
+        )
+        public[2]["title"] = "Renamed"
+        second = fetch_eve_market_contracts()
+
+        self.assertEqual(
+            (3, 0, 1, 2),
+            tuple(
+                second["steps"]["public"][key]
+                for key in ("seen", "created", "updated", "unchanged")
+            ),
+        )
+        contracts = {c.id: c for c in EveMarketContract.objects.all()}
+        self.assertIsNone(contracts[10000001].fitting_id)
+        self.assertEqual("Renamed", contracts[10000002].title)
+        self.assertIsNone(contracts[10000002].fitting_id)
+        self.assertEqual(
+            {"outstanding"}, {c.status for c in contracts.values()}
+        )
+
     def test_get_fitting_id_for_contract(self):
         fitting_cache.clear()
         fitting = EveFitting.objects.create(
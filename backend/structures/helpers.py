@@ -7,8 +7,8 @@ from pydantic import BaseModel
 from django.db.models import Count, Q
 
 from eveonline.scopes import DIRECTOR_SCOPES
-from eveonline.client import EsiClient
 from eveonline.models import EveCharacter
+from eveonline.universe_names import resolve_universe_name_map
 
 from structures.models import EveStructure, EveStructurePing
 
@@ -415,10 +415,7 @@ def _attacker_line_from_notification_text(text: str | None) -> str:
         return ""
 
     try:
-        response = EsiClient(None).resolve_universe_names(ids)
-        if not response.success():
-            return ""
-        resolved = {r["id"]: r["name"] for r in response.results()}
+        resolved = resolve_universe_name_map(ids)
     except Exception:
         logger.debug(
             "Failed to resolve aggressor names for Discord ping", exc_info=True
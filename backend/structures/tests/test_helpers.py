@@ -1,14 +1,15 @@
-import unittest
 from unittest.mock import patch
 import factory
 from datetime import datetime, timezone
 
 from django.db.models import signals
+from django.test import TestCase
 
 from esi.models import Token, Scope
 from eveonline.client import EsiResponse
 from eveonline.models import EveCorporation, EveCharacter
 from eveonline.scopes import DIRECTOR_SCOPES
+from eveonline.universe_names import clear_universe_name_cache
 from structures.models import EveStructure, EveStructurePing
 from structures.helpers import (
     get_skyhook_details,
@@ -42,7 +43,11 @@ def make_character(char_id, corp, scopes) -> EveCharacter:
     return char
 
 
-class StructureHelperTest(unittest.TestCase):
+class StructureHelperTest(TestCase):
+    def setUp(self):
+        # resolve_universe_names keeps a process-wide cache of names.
+        clear_universe_name_cache()
+        self.addCleanup(clear_universe_name_cache)
 
     def test_get_skyhook_details(self):
         selected_item_window = "Orbital Skyhook (KBP7-G III) [Sukanan Inititive]\n0.5 AU\nReinforced until 2024.07.17 11:10:47"
@@ -264,7 +269,7 @@ class StructureHelperTest(unittest.TestCase):
         self.assertIn("Orbital", message)
         self.assertIn("Skyhook", message)
 
-    @patch("structures.helpers.EsiClient")
+    @patch("eveonline.universe_names.EsiClient")
     def test_discord_message_includes_attacker_when_in_notification(
         self, esi_client_mock
     ):
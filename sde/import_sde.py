@@ -1,9 +1,17 @@
 import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import contextlib
 import io
 import json
+import multiprocessing
+import os
 from pathlib import Path
+import resource
+import shutil
 import sqlite3
 import sys
+import tempfile
+import time
 import urllib.request
 import zipfile
 
@@ -741,6 +749,48 @@ def q(name):
     return f'"{name}"'
 
 
+# Rows per executemany call when streaming a JSONL file into its table.
+INSERT_BATCH_ROWS = 50000
+
+# The database is built in a temp file that is only moved into place after a
+# successful import, so durability is traded for speed.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode = OFF",
+    "PRAGMA synchronous = OFF",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -262144",
+    "PRAGMA locking_mode = EXCLUSIVE",
+)
+
+
+def tune_connection(conn):
+    for pragma in SQLITE_PRAGMAS:
+        conn.execute(pragma)
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process and of finished workers."""
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # ru_maxrss is in KiB on Linux and bytes on macOS.
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return own / scale, children / scale
+
+
+def _import_file_part(zip_path, member, part_path):
+    """Worker: import one JSONL member into its own SQLite file."""
+    conn = sqlite3.connect(part_path)
+    tune_connection(conn)
+    out = io.StringIO()
+    try:
+        with zipfile.ZipFile(zip_path, "r") as zf, contextlib.redirect_stdout(out):
+            SdeImporter(zf, conn).process_file(member)
+        conn.commit()
+    finally:
+        conn.close()
+    return out.getvalue()
+
+
 activity_id_map = {
     "manufacturing": 1,
     "research_time": 3,
@@ -774,9 +824,10 @@ def transform_row(row, transforms):
 
 
 class SdeImporter:
-    def __init__(self, zf, conn):
+    def __init__(self, zf, conn, workers=1):
         self.zf = zf
         self.conn = conn
+        self.workers = workers
         self.cursor = conn.cursor()
         names = zf.namelist()
         prefix = ""
@@ -848,50 +899,43 @@ class SdeImporter:
         return member if member in self._members else None
 
     def process_jsonl(self, file_path, table_name):
+        """
+        Stream one JSONL file into ``table_name`` in two passes: the first
+        infers column types, the second inserts. Only one batch of rows is
+        held in memory at a time.
+        """
         renames = field_renames.get(table_name, {})
         to_flatten = flatten_fields.get(table_name, [])
         transforms = field_transforms.get(table_name, {})
         row_transform = row_transforms.get(table_name)
 
-        def _prepare(row):
-            flatten_row(row, to_flatten)
-            transform_row(row, transforms)
-            if row_transform:
-                row_transform(row)
-            return row
+        def _prepared_rows():
+            for row in self.read_jsonl(file_path):
+                flatten_row(row, to_flatten)
+                transform_row(row, transforms)
+                if row_transform:
+                    row_transform(row)
+                yield row
 
         key_types = {}
-        all_rows = []
-        for row in self.read_jsonl(file_path):
-            _prepare(row)
-            for key, val in row.items():
-                key_types[key] = update_type(key_types.get(key), val)
-            all_rows.append(row)
-        for key in key_types:
-            if key_types[key] is None:
-                key_types[key] = "TEXT"
+        # Row transforms print their warnings again on the insert pass.
+        with contextlib.redirect_stdout(io.StringIO()):
+            for row in _prepared_rows():
+                for key, val in row.items():
+                    key_types[key] = update_type(key_types.get(key), val)
         columns = {}
         for key, typ in key_types.items():
             new_key = renames.get(key, key)
             if new_key is None:
                 continue
-            columns[new_key] = typ
+            columns[new_key] = typ or "TEXT"
         if not columns:
             print(f"Skipping {table_name}: no columns inferred (empty file?)")
             return
         self.create_table(table_name, columns)
         col_keys = list(columns.keys())
         batch = []
-        for row in all_rows:
-            for key in row:
-                val = row[key]
-                if isinstance(val, dict):
-                    if _is_lang_dict(val):
-                        row[key] = val.get("en", "")
-                    else:
-                        row[key] = json.dumps(val)
-                elif isinstance(val, list):
-                    row[key] = json.dumps(val)
+        for row in _prepared_rows():
             for old_name, new_name in renames.items():
                 if old_name in row:
                     if new_name is None:
@@ -902,15 +946,13 @@ class SdeImporter:
                                 f"WARNING: rename collision in {table_name}: {old_name}->{new_name} overwrites existing value"
                             )
                         row[new_name] = row.pop(old_name)
-            for col in columns:
-                if col not in row:
-                    row[col] = None
             batch.append(row)
-            if len(batch) >= 10000:
+            if len(batch) >= INSERT_BATCH_ROWS:
                 self.insert_data(table_name, batch, col_keys)
                 batch = []
         if batch:
             self.insert_data(table_name, batch, col_keys)
+        self.conn.commit()
 
     def process_file(self, member):
         base_name = member.rsplit("/", 1)[-1].removesuffix(".jsonl")
@@ -2069,21 +2111,87 @@ class SdeImporter:
         else:
             print("Skipping mapSolarSystems compat columns: table missing")
 
+    def import_files_serial(self, files):
+        failed = []
+        for file in files:
+            try:
+                self.process_file(file)
+            except Exception as e:
+                failed.append((file, e))
+        return failed
+
+    def import_files_parallel(self, files):
+        """
+        Import each JSONL member into its own SQLite file in a worker process,
+        then copy the tables into this connection. Returns (file, error) pairs.
+        """
+        main_db = self.conn.execute("PRAGMA database_list").fetchone()[2]
+        work_dir = tempfile.mkdtemp(
+            prefix="sde-parts-", dir=os.path.dirname(main_db) or None
+        )
+        # Largest members first so the long ones do not start last.
+        files = sorted(files, key=lambda m: self.zf.getinfo(m).file_size, reverse=True)
+        failed = []
+        try:
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            ) as pool:
+                futures = {
+                    pool.submit(
+                        _import_file_part,
+                        self.zf.filename,
+                        file,
+                        os.path.join(work_dir, f"part-{index}.sqlite"),
+                    ): (file, os.path.join(work_dir, f"part-{index}.sqlite"))
+                    for index, file in enumerate(files)
+                }
+                for future in as_completed(futures):
+                    file, part_path = futures[future]
+                    try:
+                        print(future.result(), end="")
+                        self.merge_part(part_path)
+                    except Exception as e:
+                        failed.append((file, e))
+                    finally:
+                        if os.path.exists(part_path):
+                            os.unlink(part_path)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        return failed
+
+    def merge_part(self, part_path):
+        """Copy every table of a worker's SQLite file into this database."""
+        self.conn.commit()
+        self.cursor.execute("ATTACH DATABASE ? AS part", (part_path,))
+        try:
+            tables = self.cursor.execute(
+                "SELECT name, sql FROM part.sqlite_master WHERE type = 'table'"
+            ).fetchall()
+            for name, sql in tables:
+                self.cursor.execute(sql)
+                self.cursor.execute(
+                    f"INSERT INTO main.{q(name)} SELECT * FROM part.{q(name)}"
+                )
+            self.conn.commit()
+        finally:
+            self.cursor.execute("DETACH DATABASE part")
+
     def import_sde(self):
         files = [
             m
             for m in self._members
             if m.startswith(self._prefix) and m.endswith(".jsonl")
         ]
+        if self.workers > 1 and len(files) > 1:
+            failed = self.import_files_parallel(files)
+        else:
+            failed = self.import_files_serial(files)
         failed_tables = []
-        for file in files:
-            try:
-                self.process_file(file)
-            except Exception as e:
-                base_name = file.rsplit("/", 1)[-1].removesuffix(".jsonl")
-                table_name = table_mapping.get(base_name, base_name)
-                failed_tables.append(table_name)
-                print(f"Failed {file}: {e}")
+        for file, error in failed:
+            base_name = file.rsplit("/", 1)[-1].removesuffix(".jsonl")
+            failed_tables.append(table_mapping.get(base_name, base_name))
+            print(f"Failed {file}: {error}")
         if failed_tables:
             print(
                 f"WARNING: {len(failed_tables)} table(s) failed to import: {', '.join(failed_tables)}"
@@ -2182,6 +2290,12 @@ def main():
         default=".",
         help="Output directory for sde-{build}.sqlite (default: current directory)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=min(4, os.cpu_count() or 1),
+        help="Worker processes for per-file tables (1 imports serially in-process)",
+    )
     parser.add_argument(
         "--delete-zip-after",
         action="store_true",
@@ -2211,12 +2325,19 @@ def main():
     if tmp_db_path.exists():
         tmp_db_path.unlink()
     conn = sqlite3.connect(tmp_db_path)
+    tune_connection(conn)
 
+    started = time.perf_counter()
     success = False
     try:
-        importer = SdeImporter(zf, conn)
+        importer = SdeImporter(zf, conn, workers=max(1, args.workers))
         importer.import_sde()
         success = True
+        own_rss, worker_rss = peak_rss_mb()
+        print(
+            f"Imported in {time.perf_counter() - started:.1f}s, "
+            f"peak RSS {own_rss:.0f} MB (largest worker {worker_rss:.0f} MB)"
+        )
     finally:
         conn.close()
         zf.close()